@@ -1,3 +1,4 @@
+import json
 import os
 import uuid
 from datetime import datetime
@@ -9,8 +10,9 @@ from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
 from app.core.logger import get_logger, log_structured
+from app.services.agent_service import stream_agent_answer
 from app.services.conversation_service import ConversationService
-from app.services.indexing_service import IndexingService
+from app.services.indexing_jobs import get_indexing_queue
 from app.services.llm_factory import LLMFactory
 
 router = APIRouter()
@@ -63,6 +65,20 @@ async def chat_endpoint(request: ChatMessage):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# 知识库智能体入口
+@router.post("/api/agent")
+async def agent_endpoint(request: ChatMessage):
+    """知识库智能体入口：问题连同 user_id 进入 LangGraph 图，GraphRAG 工具查询该用户上传文件建立的索引。"""
+    query = next((m["content"] for m in reversed(request.messages) if m.get("role") == "user"), "")
+    if not query:
+        raise HTTPException(status_code=400, detail="no user message")
+    logger.info(f"Processing agent request for user {request.user_id} in conversation {request.conversation_id}")
+    return StreamingResponse(
+        stream_agent_answer(query, request.user_id, thread_id=str(request.conversation_id)),
+        media_type="text/event-stream",
+    )
+
+
 # 推理入口
 @router.post("/api/reason")
 async def reason_endpoint(request: ReasonRequest):
@@ -114,7 +130,7 @@ async def upload_file(
     file: UploadFile = File(...),
     user_id: int = Form(...),
 ):
-    """文件上传入口：落盘后立即触发索引构建，返回索引元信息。"""
+    """文件上传入口：落盘后提交索引构建任务，立即返回任务 ID。"""
     try:
         logger.info(f"Uploading file for user {user_id}: {file.filename}")
 
@@ -149,17 +165,40 @@ async def upload_file(
             "directory": str(second_level_dir),
         }
 
-        # 文件入库后直接进入索引流程，前端可拿到 index_result 做后续问答。
-        indexing_service = IndexingService()
-        index_result = await indexing_service.process_file(file_info)
+        # 索引构建在后台任务队列中执行，前端用 job_id 查询状态或订阅进度。
+        job = await get_indexing_queue().submit(user_id, file_info)
 
-        result = {**file_info, "index_result": index_result}
-        return result
+        return {**file_info, "job_id": job["id"], "status": job["status"]}
     except Exception as e:
         logger.error(f"Upload failed for user {user_id}: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# 索引任务状态
+@router.get("/api/upload/jobs/{job_id}")
+async def get_upload_job(job_id: str):
+    """查询索引任务：queued / running / succeeded / failed，以及最近的进度和结果。"""
+    job = await get_indexing_queue().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="job not found")
+    return job
+
+
+# 索引任务进度流
+@router.get("/api/upload/jobs/{job_id}/events")
+async def stream_upload_job_events(job_id: str):
+    """以 SSE 推送索引任务的流水线事件（workflow 开始/结束、进度、错误），任务结束后关闭。"""
+    queue = get_indexing_queue()
+    if await queue.get(job_id) is None:
+        raise HTTPException(status_code=404, detail="job not found")
+
+    async def event_stream():
+        async for event in queue.events(job_id):
+            yield f"data: {json.dumps(event, ensure_ascii=False, default=str)}\n\n"
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
 # RAG聊天入口
 @router.post("/chat-rag")
 async def rag_chat_endpoint(request: RAGChatRequest):
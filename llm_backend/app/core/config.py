@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings
 from enum import Enum
+from typing import Dict
 from pathlib import Path
 
 # 获取项目根目录
@@ -40,6 +41,18 @@ class Settings(BaseSettings):
     # Amap (高德地图) settings
     AMAP_API_KEY: str = ""
     
+    # Provider HTTP transport settings (每个外部数据源主机一个长连接客户端)
+    PROVIDER_HTTP_MAX_CONNECTIONS: int = 20         # 每个主机的最大连接数
+    PROVIDER_HTTP_MAX_KEEPALIVE: int = 10           # 每个主机保留的空闲长连接数
+    PROVIDER_HTTP_KEEPALIVE_EXPIRY: float = 30.0    # 空闲长连接的保留时间(秒)
+    
+    # Provider response cache settings (相同城市+关键词的召回结果在用户之间复用)
+    PROVIDER_CACHE_MAX_ENTRIES: int = 2048          # 进程内 LRU 最大条目数
+    PROVIDER_CACHE_TTL: float = 1800.0              # 默认新鲜期(秒)
+    PROVIDER_CACHE_STALE_TTL: float = 3600.0        # 过期后仍可返回旧结果并后台刷新的时长(秒)
+    PROVIDER_CACHE_TTLS: Dict[str, float] = {}      # 按数据源覆盖新鲜期, 如 {"amap_map": 86400}
+    PROVIDER_CACHE_REDIS: bool = False              # 是否启用 Redis 二级缓存, 多进程共享
+    
     # Database settings
     DB_HOST: str
     DB_PORT: int
@@ -63,8 +76,15 @@ class Settings(BaseSettings):
     REDIS_PORT: int
     REDIS_DB: int = 0
     REDIS_PASSWORD: str = ""
+    REDIS_MAX_CONNECTIONS: int = 50                  # 进程级共享连接池上限
     REDIS_CACHE_EXPIRE: int = 3600
     REDIS_CACHE_THRESHOLD: float = 0.8
+    REDIS_CACHE_VECTOR_BACKEND: str = "auto"        # 向量索引后端: auto, redisearch, local
+    REDIS_CACHE_VECTOR_ALGORITHM: str = "HNSW"      # RediSearch 索引算法: HNSW, FLAT
+    REDIS_CACHE_MAX_ENTRIES: int = 1000             # 每个用户最多缓存条数，超出后按最后访问时间淘汰
+    REDIS_CACHE_CLEANUP_INTERVAL: int = 600         # 缓存清理任务的执行间隔(秒)
+    REDIS_CACHE_REPLAY_MODE: str = "original"       # 命中后的回放方式: instant, paced, original
+    REDIS_CACHE_REPLAY_TOKENS_PER_SECOND: float = 200.0  # paced 模式的目标发送速度，<= 0 时不限速
     
     # Embedding settings 
     EMBEDDING_TYPE: str = "ollama"  # ollama 或 sentence_transformer
@@ -78,6 +98,19 @@ class Settings(BaseSettings):
     GRAPHRAG_RESPONSE_TYPE: str = "text"                    # 响应类型
     GRAPHRAG_COMMUNITY_LEVEL: int = 3                       # 社区级别
     GRAPHRAG_DYNAMIC_COMMUNITY: bool = False                # 是否动态选择社区
+    GRAPHRAG_PRELOAD: bool = True                           # 启动时预加载索引并常驻内存
+    GRAPHRAG_RELOAD_INTERVAL: int = 30                      # 检查索引输出更新的间隔(秒)，0 表示不检查
+    GRAPHRAG_MAX_RESIDENT_INDEXES: int = 8                  # 同时常驻内存的用户索引数上限
+    GRAPHRAG_INDEX_MEMORY_BUDGET_MB: int = 2048             # 常驻用户索引的内存预算(MB)
+    GRAPHRAG_ANSWER_CACHE_SIZE: int = 512                   # 每个索引缓存的答案条数，0 表示不缓存
+    GRAPHRAG_ANSWER_CACHE_SEMANTIC_THRESHOLD: float = 0.0   # 答案缓存语义层的相似度阈值，0 表示只做精确匹配
+
+    # Indexing job queue settings
+    INDEXING_JOB_DB: str = "uploads/indexing_jobs.db"       # 索引任务队列的 SQLite 文件
+    INDEXING_MAX_WORKERS: int = 2                           # 所有进程合计同时运行的索引构建数上限
+    INDEXING_MAX_JOBS_PER_USER: int = 1                     # 每个用户同时运行的索引构建数上限
+    INDEXING_MAX_FILES_PER_RUN: int = 20                    # 一次构建最多合并的同一用户文件数
+    INDEXING_JOB_LEASE_SECONDS: float = 60.0                # 运行中任务的租约，过期未续约才会被其他进程重新排队
     
     @property
     def DATABASE_URL(self) -> str:
@@ -0,0 +1,81 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+
+
+@dataclass
+class StallSample:
+    """一次测量区间内观测到的事件循环阻塞"""
+    stall_seconds: float = 0.0
+    elapsed_seconds: float = 0.0
+
+
+class EventLoopStallMonitor:
+    """事件循环阻塞监控
+
+    后台协程每隔 ``interval`` 秒醒来一次，实际醒来时间晚于预期的部分即为事件循环被同步代码
+    占用的时间（阻塞）。``measure()`` 记录一段代码执行期间累计的阻塞时长，
+    用来评估某个组件（如语义缓存）给每个请求带来的事件循环停顿。
+
+    低于 ``threshold`` 的延迟视为定时器正常抖动，不计入阻塞。
+    注意：并发请求时测得的是区间内整个事件循环的阻塞，而不仅是被测代码本身造成的。
+    """
+
+    def __init__(self, interval: float = 0.005, threshold: float = 0.001):
+        self.interval = interval
+        self.threshold = threshold
+        self.total_stall = 0.0  # 启动以来累计阻塞(秒)
+        self.max_stall = 0.0  # 单次最大阻塞(秒)
+        self._expected = None  # 后台协程本次预期醒来的时间
+        self._task = None
+
+    def ensure_started(self):
+        """在当前事件循环中启动后台探测协程（幂等）"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self):
+        while True:
+            self._expected = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = time.perf_counter() - self._expected
+            if lag > self.threshold:
+                self.total_stall += lag
+                self.max_stall = max(self.max_stall, lag)
+
+    def observed_stall(self) -> float:
+        """累计阻塞，加上后台协程已超时但还没机会醒来记录的那一段"""
+        pending = 0.0
+        if self._expected is not None:
+            lag = time.perf_counter() - self._expected
+            if lag > self.threshold:
+                pending = lag
+        return self.total_stall + pending
+
+    @asynccontextmanager
+    async def measure(self):
+        """测量 ``async with`` 代码块执行期间的事件循环阻塞"""
+        self.ensure_started()
+        sample = StallSample()
+        start_stall = self.observed_stall()
+        start = time.perf_counter()
+        try:
+            yield sample
+        finally:
+            sample.elapsed_seconds = time.perf_counter() - start
+            sample.stall_seconds = self.observed_stall() - start_stall
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            self._expected = None
+
+
+# 进程级共享的监控实例
+stall_monitor = EventLoopStallMonitor()
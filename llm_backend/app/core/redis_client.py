@@ -0,0 +1,26 @@
+import redis.asyncio as aioredis
+from app.core.config import settings
+
+# 进程级共享的异步连接池，所有缓存实例复用，避免每个请求新建连接
+_pool: aioredis.BlockingConnectionPool = None
+
+
+def get_redis() -> aioredis.Redis:
+    """获取基于共享连接池的异步 Redis 客户端"""
+    global _pool
+    if _pool is None:
+        _pool = aioredis.BlockingConnectionPool.from_url(
+            settings.REDIS_URL,
+            max_connections=settings.REDIS_MAX_CONNECTIONS,  # 连接池上限，超出时等待可用连接而不是报错
+            timeout=5,  # 等待可用连接的超时时间(秒)
+            health_check_interval=30,  # 空闲连接的健康检查间隔(秒)
+        )
+    return aioredis.Redis(connection_pool=_pool)
+
+
+async def close_redis():
+    """关闭共享连接池，在应用关闭时调用"""
+    global _pool
+    if _pool is not None:
+        await _pool.disconnect()
+        _pool = None
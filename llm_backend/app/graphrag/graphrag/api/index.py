@@ -17,7 +17,7 @@ from graphrag.config.models.graph_rag_config import GraphRagConfig
 from graphrag.index.run.run_pipeline import run_pipeline
 from graphrag.index.run.utils import create_callback_chain
 from graphrag.index.typing.pipeline_run_result import PipelineRunResult
-from graphrag.index.typing.workflow import WorkflowFunction
+from graphrag.index.typing.workflow import WorkflowFunction, WorkflowTables
 from graphrag.index.workflows.factory import PipelineFactory
 from graphrag.logger.base import ProgressLogger
 from graphrag.logger.null_progress import NullProgressLogger
@@ -88,6 +88,11 @@ async def build_index(
     return outputs
 
 
-def register_workflow_function(name: str, workflow: WorkflowFunction):
-    """Register a custom workflow function. You can then include the name in the settings.yaml workflows list."""
-    PipelineFactory.register(name, workflow)
+def register_workflow_function(
+    name: str, workflow: WorkflowFunction, tables: WorkflowTables | None = None
+):
+    """Register a custom workflow function. You can then include the name in the settings.yaml workflows list.
+
+    Declaring the tables it reads and writes lets it run concurrently with independent workflows.
+    """
+    PipelineFactory.register(name, workflow, tables)
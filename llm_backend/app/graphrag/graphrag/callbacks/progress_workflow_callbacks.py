@@ -12,22 +12,26 @@ class ProgressWorkflowCallbacks(NoopWorkflowCallbacks):
     """A callbackmanager that delegates to a ProgressLogger."""
 
     _root_progress: ProgressLogger
-    _progress_stack: list[ProgressLogger]
+    _progress_stack: list[tuple[str | None, ProgressLogger]]
 
     def __init__(self, progress: ProgressLogger) -> None:
         """Create a new ProgressWorkflowCallbacks."""
         self._progress = progress
-        self._progress_stack = [progress]
+        self._progress_stack = [(None, progress)]
 
-    def _pop(self) -> None:
-        self._progress_stack.pop()
+    def _pop(self, name: str) -> None:
+        # concurrent workflows can end in any order
+        for index in range(len(self._progress_stack) - 1, 0, -1):
+            if self._progress_stack[index][0] == name:
+                del self._progress_stack[index]
+                return
 
     def _push(self, name: str) -> None:
-        self._progress_stack.append(self._latest.child(name))
+        self._progress_stack.append((name, self._progress.child(name)))
 
     @property
     def _latest(self) -> ProgressLogger:
-        return self._progress_stack[-1]
+        return self._progress_stack[-1][1]
 
     def workflow_start(self, name: str, instance: object) -> None:
         """Execute this callback when a workflow starts."""
@@ -35,7 +39,7 @@ class ProgressWorkflowCallbacks(NoopWorkflowCallbacks):
 
     def workflow_end(self, name: str, instance: object) -> None:
         """Execute this callback when a workflow ends."""
-        self._pop()
+        self._pop(name)
 
     def progress(self, progress: Progress) -> None:
         """Handle when progress occurs."""
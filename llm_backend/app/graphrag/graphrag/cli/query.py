@@ -13,6 +13,8 @@ from graphrag.callbacks.noop_query_callbacks import NoopQueryCallbacks
 from graphrag.config.load_config import load_config
 from graphrag.config.models.graph_rag_config import GraphRagConfig
 from graphrag.logger.print_progress import PrintProgressLogger
+from graphrag.query.indexer_adapters import QUERY_TABLE_COLUMNS
+from graphrag.storage.pipeline_storage import PipelineStorage
 from graphrag.utils.api import create_storage_from_config
 from graphrag.utils.storage import load_table_from_storage, storage_has_table
 
@@ -484,6 +486,16 @@ def run_basic_search(
     return response, context_data
 
 
+async def _load_query_table(name: str, storage: PipelineStorage) -> "pd.DataFrame":
+    """Load only the columns of an output table that the query adapters read."""
+    return await load_table_from_storage(
+        name=name,
+        storage=storage,
+        columns=QUERY_TABLE_COLUMNS.get(name),
+        arrow_lists=True,
+    )
+
+
 def _resolve_output_files(
     config: GraphRagConfig,
     output_list: list[str],
@@ -502,9 +514,7 @@ def _resolve_output_files(
             for name in output_list:
                 if name not in dataframe_dict:
                     dataframe_dict[name] = []
-                df_value = asyncio.run(
-                    load_table_from_storage(name=name, storage=storage_obj)
-                )
+                df_value = asyncio.run(_load_query_table(name, storage_obj))
                 dataframe_dict[name].append(df_value)
 
             # for optional output files, do not append if the dataframe does not exist
@@ -517,9 +527,7 @@ def _resolve_output_files(
                     )
                     if file_exists:
                         df_value = asyncio.run(
-                            load_table_from_storage(
-                                name=optional_file, storage=storage_obj
-                            )
+                            _load_query_table(optional_file, storage_obj)
                         )
                         dataframe_dict[optional_file].append(df_value)
         return dataframe_dict
@@ -527,7 +535,7 @@ def _resolve_output_files(
     dataframe_dict["multi-index"] = False
     storage_obj = create_storage_from_config(config.output)
     for name in output_list:
-        df_value = asyncio.run(load_table_from_storage(name=name, storage=storage_obj))
+        df_value = asyncio.run(_load_query_table(name, storage_obj))
         dataframe_dict[name] = df_value
 
     # for optional output files, set the dict entry to None instead of erroring out if it does not exist
@@ -535,9 +543,7 @@ def _resolve_output_files(
         for optional_file in optional_list:
             file_exists = asyncio.run(storage_has_table(optional_file, storage_obj))
             if file_exists:
-                df_value = asyncio.run(
-                    load_table_from_storage(name=optional_file, storage=storage_obj)
-                )
+                df_value = asyncio.run(_load_query_table(optional_file, storage_obj))
                 dataframe_dict[optional_file] = df_value
             else:
                 dataframe_dict[optional_file] = None
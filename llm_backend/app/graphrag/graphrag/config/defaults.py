@@ -62,6 +62,8 @@ class CacheDefaults:
     container_name: None = None
     storage_account_blob_url: None = None
     cosmosdb_account_url: None = None
+    query_embedding_max_entries: int = 1024
+    query_embedding_path: None = None
 
 
 @dataclass
@@ -75,6 +77,7 @@ class ChunksDefaults:
     encoding_model: str = "cl100k_base"
     prepend_metadata: bool = False
     chunk_size_includes_metadata: bool = False
+    num_threads: int = 4
 
 
 @dataclass
@@ -219,6 +222,7 @@ class ExtractGraphNLPDefaults:
     normalize_edge_weights: bool = True
     text_analyzer: TextAnalyzerDefaults = field(default_factory=TextAnalyzerDefaults)
     concurrent_requests: int = 25
+    async_mode: AsyncType = AsyncType.Threaded
 
 
 @dataclass
@@ -236,6 +240,9 @@ class GlobalSearchDefaults:
     map_max_tokens: int = 1000
     reduce_max_tokens: int = 2000
     concurrency: int = 32
+    map_cache_size: int = 2048
+    streaming_reduce: bool = False
+    early_exit_score: int = 80
     dynamic_search_llm: str = "gpt-4o-mini"
     dynamic_search_threshold: int = 1
     dynamic_search_keep_parent: bool = False
@@ -408,6 +415,12 @@ class VectorStoreDefaults:
     api_key: None = None
     audience: None = None
     database_name: None = None
+    index_type: None = None
+    index_num_partitions: None = None
+    index_num_sub_vectors: None = None
+    nprobes: None = None
+    refine_factor: None = None
+    ef: None = None
 
 
 @dataclass
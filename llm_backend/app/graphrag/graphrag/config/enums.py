@@ -134,6 +134,7 @@ class AsyncType(str, Enum):
 
     AsyncIO = "asyncio"
     Threaded = "threaded"
+    Process = "process"
 
 
 class ChunkStrategyType(str, Enum):
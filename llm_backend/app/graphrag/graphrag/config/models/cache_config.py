@@ -36,3 +36,11 @@ class CacheConfig(BaseModel):
         description="The cosmosdb account url to use.",
         default=graphrag_config_defaults.cache.cosmosdb_account_url,
     )
+    query_embedding_max_entries: int = Field(
+        description="The number of query embeddings kept in memory by the search engines (0 disables the in-memory tier).",
+        default=graphrag_config_defaults.cache.query_embedding_max_entries,
+    )
+    query_embedding_path: str | None = Field(
+        description="The SQLite file for persisting query embeddings, relative to the root directory. Disabled if unset.",
+        default=graphrag_config_defaults.cache.query_embedding_path,
+    )
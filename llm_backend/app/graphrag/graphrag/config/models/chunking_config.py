@@ -40,3 +40,7 @@ class ChunkingConfig(BaseModel):
         description="Count metadata in max tokens.",
         default=graphrag_config_defaults.chunks.chunk_size_includes_metadata,
     )
+    num_threads: int = Field(
+        description="The number of threads used to encode texts for the tokens strategy.",
+        default=graphrag_config_defaults.chunks.num_threads,
+    )
@@ -59,6 +59,18 @@ class GlobalSearchConfig(BaseModel):
         description="The number of concurrent requests.",
         default=graphrag_config_defaults.global_search.concurrency,
     )
+    map_cache_size: int = Field(
+        description="The number of map responses to cache across queries (0 disables the cache).",
+        default=graphrag_config_defaults.global_search.map_cache_size,
+    )
+    streaming_reduce: bool = Field(
+        description="Drop outstanding map calls once high-score answers fill the reduce budget.",
+        default=graphrag_config_defaults.global_search.streaming_reduce,
+    )
+    early_exit_score: int = Field(
+        description="The minimum map answer score counted towards the streaming reduce early exit.",
+        default=graphrag_config_defaults.global_search.early_exit_score,
+    )
 
     # configurations for dynamic community selection
     dynamic_search_llm: str = Field(
@@ -85,6 +85,36 @@ class VectorStoreConfig(BaseModel):
         default=vector_store_defaults.overwrite,
     )
 
+    index_type: str | None = Field(
+        description="The ANN index to build after loading when type == lancedb: IVF_PQ, IVF_HNSW_SQ or IVF_HNSW_PQ. Searches are flat scans when unset.",
+        default=vector_store_defaults.index_type,
+    )
+
+    index_num_partitions: int | None = Field(
+        description="The number of IVF partitions. Defaults to the square root of the row count.",
+        default=vector_store_defaults.index_num_partitions,
+    )
+
+    index_num_sub_vectors: int | None = Field(
+        description="The number of PQ sub-vectors. Defaults to one per 16 dimensions.",
+        default=vector_store_defaults.index_num_sub_vectors,
+    )
+
+    nprobes: int | None = Field(
+        description="The number of IVF partitions probed per query.",
+        default=vector_store_defaults.nprobes,
+    )
+
+    refine_factor: int | None = Field(
+        description="Re-rank refine_factor * k index candidates with the full vectors.",
+        default=vector_store_defaults.refine_factor,
+    )
+
+    ef: int | None = Field(
+        description="The HNSW candidate list size per query.",
+        default=vector_store_defaults.ef,
+    )
+
     @model_validator(mode="after")
     def _validate_model(self):
         """Validate the model."""
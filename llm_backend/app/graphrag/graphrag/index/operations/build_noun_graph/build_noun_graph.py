@@ -3,19 +3,23 @@
 
 """Graph extraction using NLP."""
 
-import math
+import logging
 
+import numpy as np
 import pandas as pd
 
 from graphrag.cache.noop_pipeline_cache import NoopPipelineCache
 from graphrag.cache.pipeline_cache import PipelineCache
 from graphrag.config.enums import AsyncType
+from graphrag.config.models.extract_graph_nlp_config import TextAnalyzerConfig
 from graphrag.index.operations.build_noun_graph.np_extractors.base import (
     BaseNounPhraseExtractor,
 )
 from graphrag.index.utils.derive_from_rows import derive_from_rows
 from graphrag.index.utils.hashing import gen_sha512_hash
 
+log = logging.getLogger(__name__)
+
 
 async def build_noun_graph(
     text_unit_df: pd.DataFrame,
@@ -23,11 +27,22 @@ async def build_noun_graph(
     normalize_edge_weights: bool,
     num_threads: int = 4,
     cache: PipelineCache | None = None,
+    async_mode: AsyncType = AsyncType.Threaded,
+    text_analyzer_config: TextAnalyzerConfig | None = None,
 ) -> tuple[pd.DataFrame, pd.DataFrame]:
-    """Build a noun graph from text units."""
+    """Build a noun graph from text units.
+
+    With AsyncType.Process, noun phrases are extracted on a process pool whose
+    workers each build their own analyzer from text_analyzer_config.
+    """
     text_units = text_unit_df.loc[:, ["id", "text"]]
     nodes_df = await _extract_nodes(
-        text_units, text_analyzer, num_threads=num_threads, cache=cache
+        text_units,
+        text_analyzer,
+        num_threads=num_threads,
+        cache=cache,
+        async_mode=async_mode,
+        text_analyzer_config=text_analyzer_config,
     )
     edges_df = _extract_edges(nodes_df, normalize_edge_weights=normalize_edge_weights)
 
@@ -39,6 +54,8 @@ async def _extract_nodes(
     text_analyzer: BaseNounPhraseExtractor,
     num_threads: int = 4,
     cache: PipelineCache | None = None,
+    async_mode: AsyncType = AsyncType.Threaded,
+    text_analyzer_config: TextAnalyzerConfig | None = None,
 ) -> pd.DataFrame:
     """
     Extract initial nodes and edges from text units.
@@ -49,22 +66,50 @@ async def _extract_nodes(
     cache = cache or NoopPipelineCache()
     cache = cache.child("extract_noun_phrases")
 
-    async def extract(row):
-        text = row["text"]
+    def cache_key(text: str) -> str:
         attrs = {"text": text, "analyzer": str(text_analyzer)}
-        key = gen_sha512_hash(attrs, attrs.keys())
-        result = await cache.get(key)
-        if not result:
-            result = text_analyzer.extract(text)
-            await cache.set(key, result)
-        return result
-
-    text_unit_df["noun_phrases"] = await derive_from_rows(
-        text_unit_df,
-        extract,
-        num_threads=num_threads,
-        async_type=AsyncType.Threaded,
-    )
+        return gen_sha512_hash(attrs, attrs.keys())
+
+    if async_mode == AsyncType.Process and text_analyzer_config is None:
+        log.warning(
+            "async_mode is process but no text analyzer config was given to build"
+            " the worker extractors; extracting noun phrases in threads instead"
+        )
+    if async_mode == AsyncType.Process and text_analyzer_config is not None:
+        # the cache is read and written here; only the misses go to the workers
+        keys = [cache_key(text) for text in text_unit_df["text"]]
+        noun_phrases = [await cache.get(key) for key in keys]
+        misses = [i for i, result in enumerate(noun_phrases) if not result]
+        if misses:
+            extracted = await derive_from_rows(
+                text_unit_df.iloc[misses].loc[:, ["text"]],
+                _extract_noun_phrases,
+                num_threads=num_threads,
+                async_type=AsyncType.Process,
+                process_initializer=_init_noun_phrase_worker,
+                process_initargs=(text_analyzer_config,),
+            )
+            for i, result in zip(misses, extracted, strict=True):
+                noun_phrases[i] = result
+                await cache.set(keys[i], result)
+        text_unit_df["noun_phrases"] = noun_phrases
+    else:
+
+        async def extract(row):
+            text = row["text"]
+            key = cache_key(text)
+            result = await cache.get(key)
+            if not result:
+                result = text_analyzer.extract(text)
+                await cache.set(key, result)
+            return result
+
+        text_unit_df["noun_phrases"] = await derive_from_rows(
+            text_unit_df,
+            extract,
+            num_threads=num_threads,
+            async_type=AsyncType.Threaded,
+        )
 
     noun_node_df = text_unit_df.explode("noun_phrases")
     noun_node_df = noun_node_df.rename(
@@ -81,6 +126,24 @@ async def _extract_nodes(
     return grouped_node_df.loc[:, ["title", "frequency", "text_unit_ids"]]
 
 
+_worker_text_analyzer: BaseNounPhraseExtractor | None = None
+
+
+def _init_noun_phrase_worker(text_analyzer_config: TextAnalyzerConfig) -> None:
+    """Load the analyzer (e.g. the SpaCy model) once per worker process."""
+    from graphrag.index.operations.build_noun_graph.np_extractors.factory import (
+        create_noun_phrase_extractor,
+    )
+
+    global _worker_text_analyzer
+    _worker_text_analyzer = create_noun_phrase_extractor(text_analyzer_config)
+
+
+def _extract_noun_phrases(row: pd.Series) -> list[str]:
+    """Extract the noun phrases of a text unit with the worker's analyzer."""
+    return _worker_text_analyzer.extract(row["text"])  # type: ignore
+
+
 def _extract_edges(
     nodes_df: pd.DataFrame,
     normalize_edge_weights: bool = True,
@@ -92,46 +155,38 @@ def _extract_edges(
     Input: nodes_df with schema [id, title, frequency, text_unit_ids]
     Returns: edges_df with schema [source, target, weight, text_unit_ids]
     """
-    text_units_df = nodes_df.explode("text_unit_ids")
-    text_units_df = text_units_df.rename(columns={"text_unit_ids": "text_unit_id"})
-    text_units_df = (
-        text_units_df.groupby("text_unit_id").agg({"title": list}).reset_index()
-    )
-    text_units_df["edges"] = text_units_df["title"].apply(
-        lambda x: _create_relationships(x)
-    )
-    edge_df = text_units_df.explode("edges").loc[:, ["edges", "text_unit_id"]]
+    text_units_df = nodes_df.loc[:, ["title", "text_unit_ids"]].explode("text_unit_ids")
+    text_units_df = text_units_df[text_units_df["text_unit_ids"].notna()]
 
-    edge_df["source"] = edge_df["edges"].apply(
-        lambda x: x[0] if isinstance(x, tuple) else None
-    )
-    edge_df["target"] = edge_df["edges"].apply(
-        lambda x: x[1] if isinstance(x, tuple) else None
-    )
-    edge_df = edge_df[(edge_df.source.notna()) & (edge_df.target.notna())]
-    edge_df = edge_df.drop(columns=["edges"])
-
-    # make sure source is always smaller than target
-    edge_df["source"], edge_df["target"] = zip(
-        *edge_df.apply(
-            lambda x: (x["source"], x["target"])
-            if x["source"] < x["target"]
-            else (x["target"], x["source"]),
-            axis=1,
-        ),
-        strict=False,
-    )
+    # work on integer ids; sorted factorization keeps source < target comparable
+    title_codes, titles = pd.factorize(text_units_df["title"], sort=True)
+    unit_codes, text_unit_ids = pd.factorize(text_units_df["text_unit_ids"], sort=True)
+    titles, text_unit_ids = np.asarray(titles), np.asarray(text_unit_ids)
+    order = np.argsort(unit_codes, kind="stable")
+    title_codes, unit_codes = title_codes[order], unit_codes[order]
 
-    # group by source and target, count the number of text units and collect their ids
-    grouped_edge_df = (
-        edge_df.groupby(["source", "target"]).agg({"text_unit_id": list}).reset_index()
-    )
-    grouped_edge_df = grouped_edge_df.rename(columns={"text_unit_id": "text_unit_ids"})
-    grouped_edge_df["weight"] = grouped_edge_df["text_unit_ids"].apply(len)
+    first, second = _create_relationships(unit_codes)
+    source = np.minimum(title_codes[first], title_codes[second])
+    target = np.maximum(title_codes[first], title_codes[second])
+    unit_codes = unit_codes[first]
 
-    grouped_edge_df = grouped_edge_df.loc[
-        :, ["source", "target", "weight", "text_unit_ids"]
-    ]
+    # group by source and target, count the number of text units and collect their ids
+    order = np.lexsort((unit_codes, target, source))
+    source, target, unit_codes = source[order], target[order], unit_codes[order]
+    is_first = np.ones(len(source), dtype=bool)
+    is_first[1:] = (source[1:] != source[:-1]) | (target[1:] != target[:-1])
+    starts = np.flatnonzero(is_first)
+
+    grouped_edge_df = pd.DataFrame({
+        "source": titles[source[starts]],
+        "target": titles[target[starts]],
+        "weight": np.diff(np.append(starts, len(source))),
+        "text_unit_ids": [
+            ids.tolist() for ids in np.split(text_unit_ids[unit_codes], starts[1:])
+        ]
+        if len(starts)
+        else [],
+    })
 
     if normalize_edge_weights:
         # use PMI weight instead of raw weight
@@ -141,15 +196,24 @@ def _extract_edges(
 
 
 def _create_relationships(
-    noun_phrases: list[str],
-) -> list[tuple[str, str]]:
-    """Create a (source, target) tuple pairwise for all noun phrases in a list."""
-    relationships = []
-    if len(noun_phrases) >= 2:
-        for i in range(len(noun_phrases) - 1):
-            for j in range(i + 1, len(noun_phrases)):
-                relationships.extend([(noun_phrases[i], noun_phrases[j])])
-    return relationships
+    group_codes: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Create (first, second) position pairs for all members of each group.
+
+    group_codes must be sorted so that every group is contiguous; every pair
+    i < j of positions within a group is returned, grouped by group.
+    """
+    _, starts, sizes = np.unique(group_codes, return_index=True, return_counts=True)
+    first_parts = [np.empty(0, dtype=np.intp)]
+    second_parts = [np.empty(0, dtype=np.intp)]
+    # groups of the same size share one upper-triangle offset pattern
+    for size in np.unique(sizes[sizes >= 2]):
+        first, second = np.triu_indices(size, k=1)
+        group_starts = starts[sizes == size][:, None]
+        first_parts.append((group_starts + first).ravel())
+        second_parts.append((group_starts + second).ravel())
+    return np.concatenate(first_parts), np.concatenate(second_parts)
 
 
 def _calculate_pmi_edge_weights(
@@ -168,32 +232,16 @@ def _calculate_pmi_edge_weights(
     p(x,y) = edge_weight(x,y) / total_edge_weights
     p(x) = freq_occurrence(x) / total_freq_occurrences
     """
-    copied_nodes_df = nodes_df[[node_name_col, node_freq_col]]
-
-    total_edge_weights = edges_df[edge_weight_col].sum()
-    total_freq_occurrences = nodes_df[node_freq_col].sum()
-    copied_nodes_df["prop_occurrence"] = (
-        copied_nodes_df[node_freq_col] / total_freq_occurrences
-    )
-    copied_nodes_df = copied_nodes_df.loc[:, [node_name_col, "prop_occurrence"]]
-
-    edges_df["prop_weight"] = edges_df[edge_weight_col] / total_edge_weights
-    edges_df = (
-        edges_df.merge(
-            copied_nodes_df, left_on=edge_source_col, right_on=node_name_col, how="left"
-        )
-        .drop(columns=[node_name_col])
-        .rename(columns={"prop_occurrence": "source_prop"})
-    )
-    edges_df = (
-        edges_df.merge(
-            copied_nodes_df, left_on=edge_target_col, right_on=node_name_col, how="left"
-        )
-        .drop(columns=[node_name_col])
-        .rename(columns={"prop_occurrence": "target_prop"})
-    )
-    edges_df[edge_weight_col] = edges_df.apply(
-        lambda x: math.log2(x["prop_weight"] / (x["source_prop"] * x["target_prop"])),
-        axis=1,
+    node_names = pd.Index(nodes_df[node_name_col])
+    prop_occurrence = np.append(
+        nodes_df[node_freq_col].to_numpy() / nodes_df[node_freq_col].sum(), np.nan
     )
-    return edges_df.drop(columns=["prop_weight", "source_prop", "target_prop"])
+    # unknown nodes index the trailing NaN, as the left merge used to
+    source_prop = prop_occurrence[node_names.get_indexer(edges_df[edge_source_col])]
+    target_prop = prop_occurrence[node_names.get_indexer(edges_df[edge_target_col])]
+
+    weights = edges_df[edge_weight_col].to_numpy()
+    prop_weight = weights / weights.sum()
+    edges_df = edges_df.copy()
+    edges_df[edge_weight_col] = np.log2(prop_weight / (source_prop * target_prop))
+    return edges_df
@@ -1,20 +1,27 @@
 # Copyright (c) 2024 Microsoft Corporation.
 # Licensed under the MIT License
 
-"""A module containing _get_num_total, chunk, run_strategy and load_strategy methods definitions."""
+"""A module containing _get_num_total, chunk, run_strategy, run_tokens_strategy and load_strategy methods definitions."""
 
+import logging
+import time
+from collections.abc import Iterable
 from typing import Any, cast
 
 import pandas as pd
 
 from graphrag.callbacks.workflow_callbacks import WorkflowCallbacks
+from graphrag.config.defaults import graphrag_config_defaults
 from graphrag.config.models.chunking_config import ChunkingConfig, ChunkStrategyType
 from graphrag.index.operations.chunk_text.typing import (
     ChunkInput,
     ChunkStrategy,
+    TextChunk,
 )
 from graphrag.logger.progress import ProgressTicker, progress_ticker
 
+log = logging.getLogger(__name__)
+
 
 def chunk_text(
     input: pd.DataFrame,
@@ -24,6 +31,7 @@ def chunk_text(
     encoding_model: str,
     strategy: ChunkStrategyType,
     callbacks: WorkflowCallbacks,
+    num_threads: int = graphrag_config_defaults.chunks.num_threads,
 ) -> pd.Series:
     """
     Chunk a piece of text into smaller pieces.
@@ -45,8 +53,11 @@ def chunk_text(
     strategy: tokens
     size: 1200 # Optional, The chunk size to use, default: 1200
     overlap: 100 # Optional, The chunk overlap to use, default: 100
+    num_threads: 4 # Optional, The number of threads used to encode the texts, default: 4
     ```
 
+    The texts of all rows are encoded in one batch, then cut into token windows.
+
     ### sentence
     This strategy uses the nltk library to chunk a piece of text into sentences. The strategy config is as follows:
 
@@ -54,12 +65,21 @@ def chunk_text(
     strategy: sentence
     ```
     """
-    strategy_exec = load_strategy(strategy)
     num_total = _get_num_total(input, column)
     tick = progress_ticker(callbacks.progress, num_total)
 
     # collapse the config back to a single object to support "polymorphic" function call
-    config = ChunkingConfig(size=size, overlap=overlap, encoding_model=encoding_model)
+    config = ChunkingConfig(
+        size=size,
+        overlap=overlap,
+        encoding_model=encoding_model,
+        num_threads=num_threads,
+    )
+
+    if strategy == ChunkStrategyType.tokens:
+        return run_tokens_strategy(input[column], config, tick)
+
+    strategy_exec = load_strategy(strategy)
 
     return cast(
         "pd.Series",
@@ -94,7 +114,48 @@ def run_strategy(
     texts = [item if isinstance(item, str) else item[1] for item in input]
 
     strategy_results = strategy_exec(texts, config, tick)
+    return _to_results(input, strategy_results)
+
 
+def run_tokens_strategy(
+    inputs: pd.Series,
+    config: ChunkingConfig,
+    tick: ProgressTicker,
+) -> pd.Series:
+    """Run the tokens strategy over every input at once, as run_strategy would per input."""
+    from graphrag.index.operations.chunk_text.strategies import run_tokens_batched
+
+    start = time.perf_counter()
+    texts = [
+        [input]
+        if isinstance(input, str)
+        else [item if isinstance(item, str) else item[1] for item in input]
+        for input in inputs
+    ]
+    strategy_results = run_tokens_batched(texts, config, tick)
+
+    results = [
+        [item.text_chunk for item in input_results]
+        if isinstance(input, str)
+        else _to_results(input, input_results)
+        for input, input_results in zip(inputs, strategy_results, strict=True)
+    ]
+    elapsed = time.perf_counter() - start
+    num_chunks = sum(len(input_results) for input_results in results)
+    log.info(
+        "chunked %d texts into %d chunks in %.2fs (%.1f chunks/sec)",
+        sum(map(len, texts)),
+        num_chunks,
+        elapsed,
+        num_chunks / elapsed if elapsed > 0 else 0.0,
+    )
+    return pd.Series(results, index=inputs.index, dtype=object)
+
+
+def _to_results(
+    input: list[str] | list[tuple[str, str]],
+    strategy_results: Iterable[TextChunk],
+) -> list[str | tuple[list[str] | None, str, int]]:
     results = []
     for strategy_result in strategy_results:
         doc_indices = strategy_result.source_doc_indices
@@ -11,7 +11,9 @@ import tiktoken
 from graphrag.config.models.chunking_config import ChunkingConfig
 from graphrag.index.operations.chunk_text.typing import TextChunk
 from graphrag.index.text_splitting.text_splitting import (
+    EncodedText,
     Tokenizer,
+    split_multiple_encoded_texts_on_tokens,
     split_multiple_texts_on_tokens,
 )
 from graphrag.logger.progress import ProgressTicker
@@ -32,6 +34,19 @@ def get_encoding_fn(encoding_name):
     return encode, decode
 
 
+def get_batch_encoding_fn(encoding_name, num_threads: int = 1):
+    """Get a function encoding many texts at once on num_threads threads."""
+    enc = tiktoken.get_encoding(encoding_name)
+
+    def encode_batch(texts: list[str]) -> list[EncodedText]:
+        texts = [text if isinstance(text, str) else f"{text}" for text in texts]
+        if num_threads <= 1:
+            return [enc.encode(text) for text in texts]
+        return enc.encode_batch(texts, num_threads=num_threads)
+
+    return encode_batch
+
+
 def run_tokens(
     input: list[str],
     config: ChunkingConfig,
@@ -55,6 +70,36 @@ def run_tokens(
     )
 
 
+def run_tokens_batched(
+    inputs: list[list[str]],
+    config: ChunkingConfig,
+    tick: ProgressTicker,
+) -> list[list[TextChunk]]:
+    """Chunk several inputs like run_tokens, encoding all of their texts in one batch."""
+    encode_batch = get_batch_encoding_fn(config.encoding_model, config.num_threads)
+    encode, decode = get_encoding_fn(config.encoding_model)
+    tokenizer = Tokenizer(
+        chunk_overlap=config.overlap,
+        tokens_per_chunk=config.size,
+        encode=encode,
+        decode=decode,
+    )
+
+    encoded_texts = encode_batch([text for texts in inputs for text in texts])
+    tick(len(encoded_texts))
+
+    results = []
+    start = 0
+    for texts in inputs:
+        results.append(
+            split_multiple_encoded_texts_on_tokens(
+                encoded_texts[start : start + len(texts)], tokenizer
+            )
+        )
+        start += len(texts)
+    return results
+
+
 def run_sentences(
     input: list[str], _config: ChunkingConfig, tick: ProgressTicker
 ) -> Iterable[TextChunk]:
@@ -206,6 +206,9 @@ async def _text_embed_with_vector_store(
         starting_index += len(documents)
         i += 1
 
+    # index once every batch is in, rather than re-training it per batch
+    vector_store.create_index()
+
     return all_results
 
 
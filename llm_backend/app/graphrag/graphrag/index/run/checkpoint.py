@@ -0,0 +1,141 @@
+# Copyright (c) 2024 Microsoft Corporation.
+# Licensed under the MIT License
+
+"""Completion markers that let a pipeline run resume after a failed workflow."""
+
+import asyncio
+import hashlib
+import json
+import logging
+
+from graphrag.index.typing.pipeline import Pipeline
+from graphrag.storage.pipeline_storage import PipelineStorage
+
+log = logging.getLogger(__name__)
+
+CHECKPOINT_FILE = "checkpoint.json"
+
+
+async def table_hash(storage: PipelineStorage, table: str) -> str | None:
+    """Return the sha256 of a stored table, or None when it does not exist."""
+    data = await storage.get(f"{table}.parquet", as_bytes=True)
+    return hashlib.sha256(data).hexdigest() if data is not None else None
+
+
+class PipelineCheckpoint:
+    """Records which workflows of a run finished and the tables they wrote.
+
+    The markers live in checkpoint.json next to the outputs and are keyed by a
+    run key (a digest of the input documents, config and workflow list); a
+    different key starts over, and a run that completes removes them. Every completed workflow stores the sha256 of
+    each declared output table, which is how resume() tells whether the tables
+    a remaining workflow reads are still the ones that were written.
+    """
+
+    def __init__(self, storage: PipelineStorage, run_key: str):
+        self.storage = storage
+        self.run_key = run_key
+        self.completed: dict[str, dict[str, str | None]] = {}
+        self._lock = asyncio.Lock()
+
+    @classmethod
+    async def load(cls, storage: PipelineStorage, run_key: str) -> "PipelineCheckpoint":
+        """Load the markers of run_key from storage, if any."""
+        checkpoint = cls(storage, run_key)
+        data = await storage.get(CHECKPOINT_FILE)
+        if data:
+            saved = json.loads(data)
+            if saved.get("run_key") == run_key:
+                checkpoint.completed = saved.get("workflows", {})
+        return checkpoint
+
+    async def resume(self, pipeline: Pipeline) -> set[str]:
+        """Return the workflows that can be skipped when running pipeline.
+
+        A workflow is skipped when it has a marker and everything it depends on
+        is skipped too. Then, for every table that a remaining workflow (or the
+        end of the pipeline) reads, the current table must still hash to what its
+        last skipped writer recorded; otherwise that writer and everything that
+        depends on it run again.
+        """
+        names = pipeline.names()
+        dependencies = pipeline.dependencies()
+        skipped: set[str] = set()
+        for name in names:
+            if name in self.completed and dependencies[name] <= skipped:
+                skipped.add(name)
+
+        hashes: dict[str, str | None] = {}
+        changed = True
+        while changed and skipped:
+            changed = False
+            for writer, table in self._expected_writers(pipeline, skipped):
+                if table not in hashes:
+                    hashes[table] = await table_hash(self.storage, table)
+                if self.completed[writer].get(table) != hashes[table]:
+                    log.info(
+                        "table %s changed since %s ran, rerunning it", table, writer
+                    )
+                    skipped -= _descendants(writer, names, dependencies)
+                    changed = True
+                    break
+        return skipped
+
+    async def mark_complete(self, name: str, outputs: list[str]) -> None:
+        """Record that name finished, with the hashes of the tables it wrote."""
+        async with self._lock:
+            self.completed[name] = {
+                table: await table_hash(self.storage, table) for table in outputs
+            }
+            await self.storage.set(
+                CHECKPOINT_FILE,
+                json.dumps(
+                    {"run_key": self.run_key, "workflows": self.completed}, indent=4
+                ),
+            )
+
+    async def clear(self) -> None:
+        """Drop the markers once the whole run succeeded.
+
+        A finished run leaves nothing to resume, and stale markers would let the
+        next run skip workflows whose prompts or other files changed since.
+        """
+        async with self._lock:
+            self.completed = {}
+            if await self.storage.has(CHECKPOINT_FILE):
+                await self.storage.delete(CHECKPOINT_FILE)
+
+    def _expected_writers(
+        self, pipeline: Pipeline, skipped: set[str]
+    ) -> list[tuple[str, str]]:
+        """Return (skipped writer, table) pairs whose table is still going to be read."""
+        expected: list[tuple[str, str]] = []
+        last_writer: dict[str, str] = {}
+        for name in pipeline.names():
+            tables = pipeline.tables.get(name)
+            if name not in skipped:
+                reads = tables.inputs if tables is not None else list(last_writer)
+                expected.extend(
+                    (last_writer[table], table)
+                    for table in reads
+                    if last_writer.get(table) in skipped
+                )
+            for table in tables.outputs if tables is not None else []:
+                last_writer[table] = name
+        # the final outputs are read by whoever uses the index
+        expected.extend(
+            (writer, table)
+            for table, writer in last_writer.items()
+            if writer in skipped
+        )
+        return expected
+
+
+def _descendants(
+    name: str, names: list[str], dependencies: dict[str, set[str]]
+) -> set[str]:
+    found = {name}
+    for other in names:
+        if dependencies[other] & found:
+            found.add(other)
+    return found
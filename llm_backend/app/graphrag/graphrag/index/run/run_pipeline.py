@@ -3,6 +3,7 @@
 
 """Different methods to run the pipeline."""
 
+import hashlib
 import json
 import logging
 import re
@@ -18,10 +19,13 @@ from graphrag.callbacks.noop_workflow_callbacks import NoopWorkflowCallbacks
 from graphrag.callbacks.workflow_callbacks import WorkflowCallbacks
 from graphrag.config.models.graph_rag_config import GraphRagConfig
 from graphrag.index.input.factory import create_input
+from graphrag.index.run.checkpoint import PipelineCheckpoint
+from graphrag.index.run.scheduler import critical_path, run_workflows
 from graphrag.index.run.utils import create_run_context
 from graphrag.index.typing.context import PipelineRunContext
 from graphrag.index.typing.pipeline import Pipeline
 from graphrag.index.typing.pipeline_run_result import PipelineRunResult
+from graphrag.index.typing.workflow import WorkflowFunctionOutput
 from graphrag.index.update.incremental_index import (
     get_delta_docs,
     update_dataframe_outputs,
@@ -30,7 +34,7 @@ from graphrag.logger.base import ProgressLogger
 from graphrag.logger.progress import Progress
 from graphrag.storage.pipeline_storage import PipelineStorage
 from graphrag.utils.api import create_cache_from_config, create_storage_from_config
-from graphrag.utils.storage import load_table_from_storage, write_table_to_storage
+from graphrag.utils.storage import write_table_to_storage
 
 log = logging.getLogger(__name__)
 
@@ -139,23 +143,60 @@ async def _run_pipeline(
 
     try:
         await _dump_json(context)
-        await write_table_to_storage(dataset, "documents", context.storage)
 
-        for name, workflow_function in pipeline.run():
-            last_workflow = name
+        # resume after the workflows a previous run on the same input finished
+        checkpoint = await PipelineCheckpoint.load(
+            storage, _run_key(pipeline, config, dataset)
+        )
+        skipped = await checkpoint.resume(pipeline)
+        if skipped:
+            logger.info(f"Resuming, skipping completed workflows: {sorted(skipped)}")  # noqa: G004
+        context.stats.resumed_workflows = [
+            name for name in pipeline.names() if name in skipped
+        ]
+        if not any(
+            "documents" in pipeline.tables[name].outputs
+            for name in skipped
+            if name in pipeline.tables
+        ):
+            await write_table_to_storage(dataset, "documents", context.storage)
+
+        dependencies = pipeline.dependencies()
+        workflow_functions = dict(pipeline.run())
+
+        async def run_workflow(name: str) -> WorkflowFunctionOutput:
             progress = logger.child(name, transient=False)
             callbacks.workflow_start(name, None)
             work_time = time.time()
-            result = await workflow_function(config, context)
+            result = await workflow_functions[name](config, context)
             progress(Progress(percent=1))
             callbacks.workflow_end(name, result)
+            context.stats.workflows[name] = {
+                "overall": time.time() - work_time,
+                "start": work_time - start_time,
+            }
+            tables = pipeline.tables.get(name)
+            await checkpoint.mark_complete(
+                name, tables.outputs if tables is not None else []
+            )
+            return result
+
+        # independent workflows run concurrently
+        async for name, result, error in run_workflows(
+            pipeline.names(), dependencies, run_workflow, done=skipped
+        ):
+            last_workflow = name
+            if error is not None:
+                raise error  # noqa: TRY301
             yield PipelineRunResult(
                 workflow=name, result=result.result, state=context.state, errors=None
             )
 
-            context.stats.workflows[name] = {"overall": time.time() - work_time}
-
+        await checkpoint.clear()
         context.stats.total_runtime = time.time() - start_time
+        context.stats.critical_path, context.stats.critical_path_runtime = (
+            critical_path(pipeline.names(), dependencies, context.stats.workflows)
+        )
         await _dump_json(context)
 
     except Exception as e:
@@ -166,6 +207,15 @@ async def _run_pipeline(
         )
 
 
+def _run_key(pipeline: Pipeline, config: GraphRagConfig, dataset: pd.DataFrame) -> str:
+    """Digest of what a run depends on; checkpoints of another key are ignored."""
+    digest = hashlib.sha256()
+    digest.update(dataset.to_parquet())
+    digest.update(config.model_dump_json().encode("utf-8"))
+    digest.update(json.dumps(pipeline.names()).encode("utf-8"))
+    return digest.hexdigest()
+
+
 async def _dump_json(context: PipelineRunContext) -> None:
     """Dump the stats and context state to the storage."""
     await context.storage.set(
@@ -180,7 +230,6 @@ async def _copy_previous_output(
     storage: PipelineStorage,
     copy_storage: PipelineStorage,
 ):
+    # copied as stored, without decoding; file storages hard-link the parquet files
     for file in storage.find(re.compile(r"\.parquet$")):
-        base_name = file[0].replace(".parquet", "")
-        table = await load_table_from_storage(base_name, storage)
-        await write_table_to_storage(table, base_name, copy_storage)
+        await storage.copy(file[0], copy_storage)
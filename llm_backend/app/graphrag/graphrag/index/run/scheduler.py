@@ -0,0 +1,81 @@
+# Copyright (c) 2024 Microsoft Corporation.
+# Licensed under the MIT License
+
+"""Concurrent scheduling of pipeline workflows along their table dependencies."""
+
+import asyncio
+from collections.abc import AsyncIterable, Awaitable, Callable
+from typing import Any
+
+
+async def run_workflows(
+    names: list[str],
+    dependencies: dict[str, set[str]],
+    run: Callable[[str], Awaitable[Any]],
+    done: set[str] | None = None,
+) -> AsyncIterable[tuple[str, Any, BaseException | None]]:
+    """Run every workflow as soon as the ones it depends on are done.
+
+    Yields (name, result, None) as workflows finish. After a failure nothing new
+    is started; the workflows already running are allowed to finish, then
+    (name, None, error) is yielded for the first failure. Workflows in done
+    count as finished without being run.
+    """
+    done = set(done or ())
+    order = {name: position for position, name in enumerate(names)}
+    running: dict[asyncio.Task, str] = {}
+    failure: tuple[str, BaseException] | None = None
+    while True:
+        if failure is None:
+            for name in names:
+                if (
+                    name not in done
+                    and name not in running.values()
+                    and dependencies[name] <= done
+                ):
+                    running[asyncio.create_task(run(name))] = name
+        if not running:
+            break
+        finished, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+        for task in sorted(finished, key=lambda task: order[running[task]]):
+            name = running.pop(task)
+            error = task.exception()
+            if error is not None:
+                failure = failure or (name, error)
+                continue
+            done.add(name)
+            yield name, task.result(), None
+
+    if failure is not None:
+        yield failure[0], None, failure[1]
+
+
+def critical_path(
+    names: list[str],
+    dependencies: dict[str, set[str]],
+    timings: dict[str, dict[str, float]],
+) -> tuple[list[str], float]:
+    """Return the chain of dependent workflows with the longest total runtime.
+
+    Workflows without an "overall" timing (e.g. skipped on resume) count as zero
+    and are left out of the returned chain.
+    """
+    finish: dict[str, float] = {}
+    previous: dict[str, str | None] = {}
+    # names are in pipeline order, so dependencies are always visited first
+    for name in names:
+        before = max(dependencies[name], key=lambda d: finish[d], default=None)
+        previous[name] = before
+        elapsed = timings.get(name, {}).get("overall", 0.0)
+        finish[name] = elapsed + (finish[before] if before is not None else 0.0)
+    if not finish:
+        return [], 0.0
+
+    last: str | None = max(names, key=lambda name: finish[name])
+    runtime = finish[last]  # type: ignore
+    path = []
+    while last is not None:
+        if last in timings:
+            path.append(last)
+        last = previous[last]
+    return path[::-1], runtime
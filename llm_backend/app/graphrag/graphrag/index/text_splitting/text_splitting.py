@@ -3,12 +3,14 @@
 
 """A module containing the 'Tokenizer', 'TextSplitter', 'NoopTextSplitter' and 'TokenTextSplitter' models."""
 
+import itertools
 import logging
 from abc import ABC, abstractmethod
 from collections.abc import Callable, Collection, Iterable
 from dataclasses import dataclass
 from typing import Any, Literal, cast
 
+import numpy as np
 import pandas as pd
 import tiktoken
 
@@ -165,29 +167,45 @@ def split_multiple_texts_on_tokens(
     texts: list[str], tokenizer: Tokenizer, tick: ProgressTicker
 ) -> list[TextChunk]:
     """Split multiple texts and return chunks with metadata using the tokenizer."""
-    result = []
-    mapped_ids = []
-
-    for source_doc_idx, text in enumerate(texts):
-        encoded = tokenizer.encode(text)
+    encoded_texts = []
+    for text in texts:
+        encoded_texts.append(tokenizer.encode(text))
         if tick:
             tick(1)  # Track progress if tick callback is provided
-        mapped_ids.append((source_doc_idx, encoded))
 
-    input_ids = [
-        (source_doc_idx, id) for source_doc_idx, ids in mapped_ids for id in ids
-    ]
+    return split_multiple_encoded_texts_on_tokens(encoded_texts, tokenizer)
 
-    start_idx = 0
-    cur_idx = min(start_idx + tokenizer.tokens_per_chunk, len(input_ids))
-    chunk_ids = input_ids[start_idx:cur_idx]
 
+def split_multiple_encoded_texts_on_tokens(
+    encoded_texts: list[EncodedText], tokenizer: Tokenizer
+) -> list[TextChunk]:
+    """Split already encoded texts into token windows, as split_multiple_texts_on_tokens does.
+
+    The token ids of all texts are laid out in one array and each chunk is a
+    slice of it, so a window can span several texts; only the windows are decoded.
+    """
+    lengths = np.fromiter(
+        map(len, encoded_texts), dtype=np.int64, count=len(encoded_texts)
+    )
+    input_ids = np.fromiter(
+        itertools.chain.from_iterable(encoded_texts),
+        dtype=np.int64,
+        count=lengths.sum(),
+    )
+    # texts without tokens never appear in a chunk; the others tile input_ids
+    non_empty = np.flatnonzero(lengths)
+    starts = (np.cumsum(lengths) - lengths)[non_empty]
+
+    result = []
+    start_idx = 0
     while start_idx < len(input_ids):
-        chunk_text = tokenizer.decode([id for _, id in chunk_ids])
-        doc_indices = list({doc_idx for doc_idx, _ in chunk_ids})
+        cur_idx = min(start_idx + tokenizer.tokens_per_chunk, len(input_ids))
+        chunk_ids = input_ids[start_idx:cur_idx].tolist()
+        chunk_text = tokenizer.decode(chunk_ids)
+        first = np.searchsorted(starts, start_idx, side="right") - 1
+        last = np.searchsorted(starts, cur_idx, side="left")
+        doc_indices = list(set(non_empty[first:last].tolist()))
         result.append(TextChunk(chunk_text, doc_indices, len(chunk_ids)))
         start_idx += tokenizer.tokens_per_chunk - tokenizer.chunk_overlap
-        cur_idx = min(start_idx + tokenizer.tokens_per_chunk, len(input_ids))
-        chunk_ids = input_ids[start_idx:cur_idx]
 
     return result
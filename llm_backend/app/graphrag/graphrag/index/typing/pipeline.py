@@ -5,14 +5,19 @@
 
 from collections.abc import Generator
 
-from graphrag.index.typing.workflow import Workflow
+from graphrag.index.typing.workflow import Workflow, WorkflowTables
 
 
 class Pipeline:
     """Encapsulates running workflows."""
 
-    def __init__(self, workflows: list[Workflow]):
+    def __init__(
+        self,
+        workflows: list[Workflow],
+        tables: dict[str, WorkflowTables] | None = None,
+    ):
         self.workflows = workflows
+        self.tables = tables or {}
 
     def run(self) -> Generator[Workflow]:
         """Return a Generator over the pipeline workflows."""
@@ -21,3 +26,39 @@ class Pipeline:
     def names(self) -> list[str]:
         """Return the names of the workflows in the pipeline."""
         return [name for name, _ in self.workflows]
+
+    def dependencies(self) -> dict[str, set[str]]:
+        """Return the workflows each workflow has to wait for.
+
+        A workflow waits for the last earlier writer of every table it reads or
+        writes, and for the earlier readers of every table it overwrites, so a
+        concurrent run sees the same tables as running the list in order. A
+        workflow without declared tables waits for, and blocks, all others.
+        """
+        dependencies: dict[str, set[str]] = {}
+        last_writer: dict[str, str] = {}
+        readers: dict[str, list[str]] = {}
+        barrier: str | None = None
+        for position, name in enumerate(self.names()):
+            tables = self.tables.get(name)
+            if tables is None:
+                dependencies[name] = set(self.names()[:position])
+                barrier = name
+                continue
+
+            waits_for = {barrier} if barrier is not None else set()
+            for table in tables.inputs:
+                if table in last_writer:
+                    waits_for.add(last_writer[table])
+            for table in tables.outputs:
+                waits_for.update(readers.get(table, []))
+                if table in last_writer:
+                    waits_for.add(last_writer[table])
+            dependencies[name] = waits_for - {name}
+
+            for table in tables.inputs:
+                readers.setdefault(table, []).append(name)
+            for table in tables.outputs:
+                last_writer[table] = name
+                readers[table] = []
+        return dependencies
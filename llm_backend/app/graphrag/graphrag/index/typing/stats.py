@@ -21,3 +21,12 @@ class PipelineRunStats:
 
     workflows: dict[str, dict[str, float]] = field(default_factory=dict)
     """A dictionary of workflows."""
+
+    resumed_workflows: list[str] = field(default_factory=list)
+    """Workflows skipped because a previous run of the same input completed them."""
+
+    critical_path: list[str] = field(default_factory=list)
+    """The chain of dependent workflows that bounded the total runtime."""
+
+    critical_path_runtime: float = field(default=0)
+    """Float representing the summed runtime of the critical path."""
@@ -4,7 +4,7 @@
 """Pipeline workflow types."""
 
 from collections.abc import Awaitable, Callable
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any
 
 from graphrag.config.models.graph_rag_config import GraphRagConfig
@@ -24,3 +24,14 @@ WorkflowFunction = Callable[
     Awaitable[WorkflowFunctionOutput],
 ]
 Workflow = tuple[str, WorkflowFunction]
+
+
+@dataclass(frozen=True)
+class WorkflowTables:
+    """The storage tables a workflow reads and writes, used to schedule it."""
+
+    inputs: list[str] = field(default_factory=list)
+    """Tables the workflow loads, including ones it only loads when present."""
+
+    outputs: list[str] = field(default_factory=list)
+    """Tables the workflow writes."""
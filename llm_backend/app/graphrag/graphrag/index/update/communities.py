@@ -37,14 +37,55 @@ def _update_and_merge_communities(
     if "period" not in old_communities.columns:
         old_communities["period"] = None
 
-    # Same for delta_communities
+    old_communities["community"] = old_communities["community"].astype(int)
+
+    # Increment all community ids by the max of the old communities
+    old_max_community_id = old_communities["community"].fillna(0).astype(int).max()
+    delta_communities, community_id_mapping = _update_delta_communities(
+        delta_communities, old_max_community_id
+    )
+
+    # Merge the final communities
+    merged_communities = pd.concat(
+        [old_communities, delta_communities], ignore_index=True, copy=False
+    )
+
+    # Rename title
+    merged_communities["title"] = "Community " + merged_communities["community"].astype(
+        str
+    )
+    # Re-assign the human_readable_id
+    merged_communities["human_readable_id"] = merged_communities["community"]
+
+    merged_communities = merged_communities.loc[
+        :,
+        COMMUNITIES_FINAL_COLUMNS,
+    ]
+    return merged_communities, community_id_mapping
+
+
+def _update_delta_communities(
+    delta_communities: pd.DataFrame, old_max_community_id: int
+) -> tuple[pd.DataFrame, dict]:
+    """Renumber the delta communities to follow the old ones.
+
+    Parameters
+    ----------
+    delta_communities : pd.DataFrame
+        The delta communities.
+    old_max_community_id : int
+        The largest community id of the old communities.
+
+    Returns
+    -------
+    tuple[pd.DataFrame, dict]
+        The delta communities in their final columns, and the community id mapping.
+    """
     if "size" not in delta_communities.columns:
         delta_communities["size"] = None
     if "period" not in delta_communities.columns:
         delta_communities["period"] = None
 
-    # Increment all community ids by the max of the old communities
-    old_max_community_id = old_communities["community"].fillna(0).astype(int).max()
     # 为新社区创建ID映射，确保不与旧ID重叠
     community_id_mapping = {
         v: v + old_max_community_id + 1
@@ -66,25 +107,12 @@ def _update_and_merge_communities(
         .apply(lambda x: community_id_mapping.get(x, x))
     )
 
-    old_communities["community"] = old_communities["community"].astype(int)
-
-    # Merge the final communities
-    merged_communities = pd.concat(
-        [old_communities, delta_communities], ignore_index=True, copy=False
-    )
-
-    # Rename title
-    merged_communities["title"] = "Community " + merged_communities["community"].astype(
+    delta_communities["title"] = "Community " + delta_communities["community"].astype(
         str
     )
-    # Re-assign the human_readable_id
-    merged_communities["human_readable_id"] = merged_communities["community"]
+    delta_communities["human_readable_id"] = delta_communities["community"]
 
-    merged_communities = merged_communities.loc[
-        :,
-        COMMUNITIES_FINAL_COLUMNS,
-    ]
-    return merged_communities, community_id_mapping
+    return delta_communities.loc[:, COMMUNITIES_FINAL_COLUMNS], community_id_mapping
 
 
 def _update_and_merge_community_reports(
@@ -114,7 +142,45 @@ def _update_and_merge_community_reports(
     if "period" not in old_community_reports.columns:
         old_community_reports["period"] = None
 
-    # Same for delta_community_reports
+    old_community_reports["community"] = old_community_reports["community"].astype(int)
+    delta_community_reports = _update_delta_community_reports(
+        delta_community_reports, community_id_mapping
+    )
+
+    # Merge the final community reports
+    merged_community_reports = pd.concat(
+        [old_community_reports, delta_community_reports], ignore_index=True, copy=False
+    )
+
+    # Maintain type compat with query
+    merged_community_reports["community"] = merged_community_reports[
+        "community"
+    ].astype(int)
+    # Re-assign the human_readable_id
+    merged_community_reports["human_readable_id"] = merged_community_reports[
+        "community"
+    ]
+
+    return merged_community_reports.loc[:, COMMUNITY_REPORTS_FINAL_COLUMNS]
+
+
+def _update_delta_community_reports(
+    delta_community_reports: pd.DataFrame, community_id_mapping: dict
+) -> pd.DataFrame:
+    """Point the delta community reports at the renumbered delta communities.
+
+    Parameters
+    ----------
+    delta_community_reports : pd.DataFrame
+        The delta community reports.
+    community_id_mapping : dict
+        The community id mapping.
+
+    Returns
+    -------
+    pd.DataFrame
+        The delta community reports in their final columns.
+    """
     if "size" not in delta_community_reports.columns:
         delta_community_reports["size"] = None
     if "period" not in delta_community_reports.columns:
@@ -133,20 +199,6 @@ def _update_and_merge_community_reports(
         .apply(lambda x: community_id_mapping.get(x, x))
     )
 
-    old_community_reports["community"] = old_community_reports["community"].astype(int)
+    delta_community_reports["human_readable_id"] = delta_community_reports["community"]
 
-    # Merge the final community reports
-    merged_community_reports = pd.concat(
-        [old_community_reports, delta_community_reports], ignore_index=True, copy=False
-    )
-
-    # Maintain type compat with query
-    merged_community_reports["community"] = merged_community_reports[
-        "community"
-    ].astype(int)
-    # Re-assign the human_readable_id
-    merged_community_reports["human_readable_id"] = merged_community_reports[
-        "community"
-    ]
-
-    return merged_community_reports.loc[:, COMMUNITY_REPORTS_FINAL_COLUMNS]
+    return delta_community_reports.loc[:, COMMUNITY_REPORTS_FINAL_COLUMNS]
@@ -15,6 +15,8 @@ from graphrag.config.models.graph_rag_config import GraphRagConfig
 from graphrag.index.update.communities import (
     _update_and_merge_communities,
     _update_and_merge_community_reports,
+    _update_delta_communities,
+    _update_delta_community_reports,
 )
 from graphrag.index.update.entities import (
     _group_and_resolve_entities,
@@ -25,6 +27,7 @@ from graphrag.index.workflows.generate_text_embeddings import generate_text_embe
 from graphrag.logger.print_progress import ProgressLogger
 from graphrag.storage.pipeline_storage import PipelineStorage
 from graphrag.utils.storage import (
+    append_table_to_storage,
     load_table_from_storage,
     storage_has_table,
     write_table_to_storage,
@@ -100,7 +103,7 @@ async def update_dataframe_outputs(
     progress_logger.info("Updating Documents")
 
     # 1. 根据 human_readable_id 连接 旧数据和新增数据
-    final_documents_df = await _concat_dataframes(
+    await _concat_dataframes(
         "documents", previous_storage, delta_storage, output_storage
     )
 
@@ -116,7 +119,7 @@ async def update_dataframe_outputs(
 
     # 3. 合并新旧文本单元
     progress_logger.info("Updating Text Units")
-    merged_text_units = await _update_text_units(
+    await _update_text_units(
         previous_storage, delta_storage, output_storage, entity_id_mapping
     )
 
@@ -135,20 +138,29 @@ async def update_dataframe_outputs(
 
     # 合并社区报告
     progress_logger.info("Updating Community Reports")
-    merged_community_reports = await _update_community_reports(
+    await _update_community_reports(
         previous_storage, delta_storage, output_storage, community_id_mapping
     )
 
     # 合并新旧文本嵌入
+    # 只追加了新行的表按嵌入需要的列从输出中读回, 旧行的向量由缓存命中
     progress_logger.info("Updating Text Embeddings")
     embedded_fields = get_embedded_fields(config)
     text_embed = get_embedding_settings(config)
     result = await generate_text_embeddings(
-        documents=final_documents_df,
+        documents=await load_table_from_storage(
+            "documents", output_storage, columns=["id", "text"]
+        ),
         relationships=merged_relationships_df,
-        text_units=merged_text_units,
+        text_units=await load_table_from_storage(
+            "text_units", output_storage, columns=["id", "text"]
+        ),
         entities=merged_entities_df,
-        community_reports=merged_community_reports,
+        community_reports=await load_table_from_storage(
+            "community_reports",
+            output_storage,
+            columns=["id", "title", "summary", "full_content"],
+        ),
         callbacks=callbacks,
         cache=cache,
         text_embed_config=text_embed,
@@ -168,8 +180,19 @@ async def _update_community_reports(
     delta_storage: PipelineStorage,
     output_storage: PipelineStorage,
     community_id_mapping: dict,
-) -> pd.DataFrame:
+) -> None:
     """Update the community reports output."""
+    delta_community_reports = await load_table_from_storage(
+        "community_reports", delta_storage
+    )
+    if await append_table_to_storage(
+        _update_delta_community_reports(delta_community_reports, community_id_mapping),
+        "community_reports",
+        previous_storage,
+        output_storage,
+    ):
+        return
+
     old_community_reports = await load_table_from_storage(
         "community_reports", previous_storage
     )
@@ -184,8 +207,6 @@ async def _update_community_reports(
         merged_community_reports, "community_reports", output_storage
     )
 
-    return merged_community_reports
-
 
 async def _update_communities(
     previous_storage: PipelineStorage,
@@ -193,6 +214,19 @@ async def _update_communities(
     output_storage: PipelineStorage,
 ) -> dict:
     """Update the communities output."""
+    old_community_ids = await load_table_from_storage(
+        "communities", previous_storage, columns=["community"]
+    )
+    delta_communities = await load_table_from_storage("communities", delta_storage)
+    delta_communities, community_id_mapping = _update_delta_communities(
+        delta_communities,
+        old_community_ids["community"].fillna(0).astype(int).max(),
+    )
+    if await append_table_to_storage(
+        delta_communities, "communities", previous_storage, output_storage
+    ):
+        return community_id_mapping
+
     old_communities = await load_table_from_storage("communities", previous_storage)
     delta_communities = await load_table_from_storage("communities", delta_storage)
     merged_communities, community_id_mapping = _update_and_merge_communities(
@@ -210,6 +244,15 @@ async def _update_covariates(
     output_storage: PipelineStorage,
 ) -> None:
     """Update the covariates output."""
+    delta_covariates = await load_table_from_storage("covariates", delta_storage)
+    delta_covariates["human_readable_id"] = await _next_human_readable_ids(
+        "covariates", previous_storage, len(delta_covariates)
+    )
+    if await append_table_to_storage(
+        delta_covariates, "covariates", previous_storage, output_storage
+    ):
+        return
+
     old_covariates = await load_table_from_storage("covariates", previous_storage)
     delta_covariates = await load_table_from_storage("covariates", delta_storage)
     merged_covariates = _merge_covariates(old_covariates, delta_covariates)
@@ -222,8 +265,18 @@ async def _update_text_units(
     delta_storage: PipelineStorage,
     output_storage: PipelineStorage,
     entity_id_mapping: dict,
-) -> pd.DataFrame:
+) -> None:
     """Update the text units output."""
+    delta_text_units = await load_table_from_storage("text_units", delta_storage)
+    _remap_entity_ids(delta_text_units, entity_id_mapping)
+    delta_text_units["human_readable_id"] = await _next_human_readable_ids(
+        "text_units", previous_storage, len(delta_text_units)
+    )
+    if await append_table_to_storage(
+        delta_text_units, "text_units", previous_storage, output_storage
+    ):
+        return
+
     old_text_units = await load_table_from_storage("text_units", previous_storage)
     delta_text_units = await load_table_from_storage("text_units", delta_storage)
     merged_text_units = _update_and_merge_text_units(
@@ -232,8 +285,6 @@ async def _update_text_units(
 
     await write_table_to_storage(merged_text_units, "text_units", output_storage)
 
-    return merged_text_units
-
 
 async def _update_entities_and_relationships(
     previous_storage: PipelineStorage,
@@ -297,8 +348,15 @@ async def _concat_dataframes(
     previous_storage: PipelineStorage,
     delta_storage: PipelineStorage,
     output_storage: PipelineStorage,
-) -> pd.DataFrame:
+) -> None:
     """Concatenate dataframes."""
+    delta_df = await load_table_from_storage(name, delta_storage)
+    delta_df["human_readable_id"] = await _next_human_readable_ids(
+        name, previous_storage, len(delta_df)
+    )
+    if await append_table_to_storage(delta_df, name, previous_storage, output_storage):
+        return
+
     old_df = await load_table_from_storage(name, previous_storage)
     delta_df = await load_table_from_storage(name, delta_storage)
 
@@ -309,7 +367,24 @@ async def _concat_dataframes(
 
     await write_table_to_storage(final_df, name, output_storage)
 
-    return final_df
+
+async def _next_human_readable_ids(
+    name: str, previous_storage: PipelineStorage, count: int
+) -> np.ndarray:
+    """Return count human readable ids following the largest one in the old table."""
+    old_ids = await load_table_from_storage(
+        name, previous_storage, columns=["human_readable_id"]
+    )
+    initial_id = old_ids["human_readable_id"].max() + 1
+    return np.arange(initial_id, initial_id + count)
+
+
+def _remap_entity_ids(text_units: pd.DataFrame, entity_id_mapping: dict) -> None:
+    """Replace the resolved entity ids in the entity_ids of text_units, in place."""
+    if entity_id_mapping:
+        text_units["entity_ids"] = text_units["entity_ids"].apply(
+            lambda x: [entity_id_mapping.get(i, i) for i in x] if x is not None else x
+        )
 
 
 def _update_and_merge_text_units(
@@ -334,10 +409,7 @@ def _update_and_merge_text_units(
         The updated text units.
     """
     # Look for entity ids in entity_ids and replace them with the corresponding id in the mapping
-    if entity_id_mapping:
-        delta_text_units["entity_ids"] = delta_text_units["entity_ids"].apply(
-            lambda x: [entity_id_mapping.get(i, i) for i in x] if x is not None else x
-        )
+    _remap_entity_ids(delta_text_units, entity_id_mapping)
 
     initial_id = old_text_units["human_readable_id"].max() + 1
     delta_text_units["human_readable_id"] = np.arange(
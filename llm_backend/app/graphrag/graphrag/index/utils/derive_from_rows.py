@@ -6,8 +6,11 @@
 import asyncio
 import inspect
 import logging
+import multiprocessing
+import os
 import traceback
 from collections.abc import Awaitable, Callable, Coroutine, Hashable
+from concurrent.futures import ProcessPoolExecutor
 from typing import Any, TypeVar, cast
 
 import pandas as pd
@@ -37,8 +40,15 @@ async def derive_from_rows(
     callbacks: WorkflowCallbacks | None = None,
     num_threads: int = 4,
     async_type: AsyncType = AsyncType.AsyncIO,
+    process_initializer: Callable[..., None] | None = None,
+    process_initargs: tuple = (),
 ) -> list[ItemType | None]:
-    """Apply a generic transform function to each row. Any errors will be reported and thrown."""
+    """Apply a generic transform function to each row. Any errors will be reported and thrown.
+
+    With AsyncType.Process the transform must be a synchronous, picklable
+    (module-level) function; process_initializer runs once in every worker, e.g.
+    to load a model that the transform then reads from a module global.
+    """
     callbacks = callbacks or NoopWorkflowCallbacks()
     match async_type:
         case AsyncType.AsyncIO:
@@ -49,6 +59,15 @@ async def derive_from_rows(
             return await derive_from_rows_asyncio_threads(
                 input, transform, callbacks, num_threads
             )
+        case AsyncType.Process:
+            return await derive_from_rows_processes(
+                input,
+                cast("Callable[[pd.Series], ItemType]", transform),
+                callbacks,
+                num_threads,
+                initializer=process_initializer,
+                initargs=process_initargs,
+            )
         case _:
             msg = f"Unsupported scheduling type {async_type}"
             raise ValueError(msg)
@@ -115,6 +134,91 @@ async def derive_from_rows_asyncio(
     return await _derive_from_rows_base(input, transform, callbacks, gather)
 
 
+"""A module containing the derive_from_rows_processes method."""
+
+# rows per batch sent to a worker process: enough to amortize pickling, small
+# enough to keep every worker busy until the end
+MIN_PROCESS_BATCH_SIZE = 16
+BATCHES_PER_PROCESS = 8
+
+
+def _transform_batch(
+    transform: Callable[[pd.Series], Any], batch: pd.DataFrame
+) -> list[tuple[bool, Any]]:
+    """Run transform over a batch inside a worker; errors are returned, not raised."""
+    results: list[tuple[bool, Any]] = []
+    for _, row in batch.iterrows():
+        try:
+            results.append((True, transform(row)))
+        except Exception as e:  # noqa: BLE001
+            results.append((False, (repr(e), traceback.format_exc())))
+    return results
+
+
+async def derive_from_rows_processes(
+    input: pd.DataFrame,
+    transform: Callable[[pd.Series], ItemType],
+    callbacks: WorkflowCallbacks,
+    num_processes: int | None = None,
+    initializer: Callable[..., None] | None = None,
+    initargs: tuple = (),
+) -> list[ItemType | None]:
+    """
+    Derive from rows on a process pool.
+
+    This is useful for CPU bound operations that hold the GIL, such as NLP
+    parsing. Rows are shipped to the workers in contiguous batches and the
+    results are returned in input order.
+    """
+    num_processes = max(1, min(num_processes or 4, os.cpu_count() or 1))
+    batch_size = max(
+        MIN_PROCESS_BATCH_SIZE,
+        -(-len(input) // (num_processes * BATCHES_PER_PROCESS)),
+    )
+    batches = [
+        input.iloc[start : start + batch_size]
+        for start in range(0, len(input), batch_size)
+    ]
+    tick = progress_ticker(callbacks.progress, num_total=len(input))
+    loop = asyncio.get_running_loop()
+
+    # spawn rather than fork: the parent runs an event loop and client threads
+    with ProcessPoolExecutor(
+        max_workers=num_processes,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=initializer,
+        initargs=initargs,
+    ) as executor:
+
+        async def run_batch(batch: pd.DataFrame) -> list[tuple[bool, Any]]:
+            results = await loop.run_in_executor(
+                executor, _transform_batch, transform, batch
+            )
+            tick(len(batch))
+            return results
+
+        batch_results = await asyncio.gather(*[run_batch(b) for b in batches])
+
+    tick.done()
+
+    result: list[ItemType | None] = []
+    errors: list[tuple[str, str]] = []
+    for ok, value in (item for batch in batch_results for item in batch):
+        if ok:
+            result.append(value)
+        else:
+            errors.append(value)
+            result.append(None)
+
+    for error, stack in errors:
+        callbacks.error("parallel transformation error", None, stack, {"error": error})
+
+    if len(errors) > 0:
+        raise ParallelizationError(len(errors), errors[0][1])
+
+    return result
+
+
 ItemType = TypeVar("ItemType")
 
 ExecuteFn = Callable[[tuple[Hashable, pd.Series]], Awaitable[ItemType | None]]
@@ -4,6 +4,7 @@
 
 """A package containing all built-in workflow definitions."""
 
+from graphrag.index.typing.workflow import WorkflowTables
 from graphrag.index.workflows.factory import PipelineFactory
 
 from .create_base_text_units import (
@@ -58,3 +59,51 @@ PipelineFactory.register_all({
     "generate_text_embeddings": run_generate_text_embeddings,
     "prune_graph": run_prune_graph,
 })
+
+# the tables each built-in workflow loads and writes, used to run independent
+# workflows concurrently
+PipelineFactory.register_tables({
+    "create_base_text_units": WorkflowTables(
+        inputs=["documents"], outputs=["text_units"]
+    ),
+    "create_communities": WorkflowTables(
+        inputs=["entities", "relationships"], outputs=["communities"]
+    ),
+    "create_community_reports_text": WorkflowTables(
+        inputs=["entities", "communities", "text_units"],
+        outputs=["community_reports"],
+    ),
+    "create_community_reports": WorkflowTables(
+        inputs=["relationships", "entities", "communities", "covariates"],
+        outputs=["community_reports"],
+    ),
+    "extract_covariates": WorkflowTables(inputs=["text_units"], outputs=["covariates"]),
+    "create_final_documents": WorkflowTables(
+        inputs=["documents", "text_units"], outputs=["documents"]
+    ),
+    "create_final_text_units": WorkflowTables(
+        inputs=["text_units", "entities", "relationships", "covariates"],
+        outputs=["text_units"],
+    ),
+    "extract_graph_nlp": WorkflowTables(
+        inputs=["text_units"], outputs=["entities", "relationships"]
+    ),
+    "extract_graph": WorkflowTables(
+        inputs=["text_units"], outputs=["entities", "relationships"]
+    ),
+    "finalize_graph": WorkflowTables(
+        inputs=["entities", "relationships"], outputs=["entities", "relationships"]
+    ),
+    "generate_text_embeddings": WorkflowTables(
+        inputs=[
+            "documents",
+            "relationships",
+            "text_units",
+            "entities",
+            "community_reports",
+        ],
+    ),
+    "prune_graph": WorkflowTables(
+        inputs=["entities", "relationships"], outputs=["entities", "relationships"]
+    ),
+})
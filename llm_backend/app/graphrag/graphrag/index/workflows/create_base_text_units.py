@@ -39,6 +39,7 @@ async def run_workflow(
         strategy=chunks.strategy,
         prepend_metadata=chunks.prepend_metadata,
         chunk_size_includes_metadata=chunks.chunk_size_includes_metadata,
+        num_threads=chunks.num_threads,
     )
 
     await write_table_to_storage(output, "text_units", context.storage)
@@ -56,6 +57,7 @@ def create_base_text_units(
     strategy: ChunkStrategyType,
     prepend_metadata: bool = False,
     chunk_size_includes_metadata: bool = False,
+    num_threads: int = 4,
 ) -> pd.DataFrame:
     """All the steps to transform base text_units."""
 
@@ -85,11 +87,11 @@ def create_base_text_units(
     aggregated.rename(columns={"text_with_ids": "texts"}, inplace=True)
 
 
-    def chunker(row: dict[str, Any]) -> Any:
+    def metadata_for(row: dict[str, Any]) -> tuple[str, int]:
         line_delimiter = ".\n"
         metadata_str = ""
         metadata_tokens = 0
-   
+
         if prepend_metadata and "metadata" in row:
             metadata = row["metadata"]
             if isinstance(metadata, str):
@@ -107,18 +109,29 @@ def create_base_text_units(
                     message = "Metadata tokens exceeds the maximum tokens per chunk. Please increase the tokens per chunk."
                     raise ValueError(message)
 
-        # 使用 chunk_text 函数对 text_with_ids 列进行分块处理
-        chunked = chunk_text(
-            pd.DataFrame([row]).reset_index(drop=True),
+        return metadata_str, metadata_tokens
+
+    row_metadata = [metadata_for(row) for _, row in aggregated.iterrows()]
+    metadata_tokens = pd.Series(
+        [tokens for _, tokens in row_metadata], index=aggregated.index
+    )
+
+    # 元数据占用的 token 数相同的行合并为一次 chunk_text 调用以批量编码
+    chunks = pd.Series(index=aggregated.index, dtype=object)
+    for tokens, rows in aggregated.groupby(metadata_tokens, sort=False):
+        chunks[rows.index] = chunk_text(
+            rows,
             column="texts",
-            size=size - metadata_tokens,
+            size=size - tokens,
             overlap=overlap,
             encoding_model=encoding_model,
             strategy=strategy,
             callbacks=callbacks,
-        )[0]
+            num_threads=num_threads,
+        )
 
-        if prepend_metadata:
+    if prepend_metadata:
+        for chunked, (metadata_str, _) in zip(chunks, row_metadata, strict=True):
             for index, chunk in enumerate(chunked):
                 if isinstance(chunk, str):
                     chunked[index] = metadata_str + chunk
@@ -127,10 +140,7 @@ def create_base_text_units(
                         (chunk[0], metadata_str + chunk[1], chunk[2]) if chunk else None
                     )
 
-        row["chunks"] = chunked
-        return row
-
-    aggregated = aggregated.apply(lambda row: chunker(row), axis=1)
+    aggregated["chunks"] = chunks
 
     aggregated = cast("pd.DataFrame", aggregated[[*group_by_columns, "chunks"]])
     aggregated = aggregated.explode("chunks")
@@ -55,6 +55,8 @@ async def extract_graph_nlp(
         normalize_edge_weights=extraction_config.normalize_edge_weights,
         num_threads=extraction_config.concurrent_requests,
         cache=cache,
+        async_mode=extraction_config.async_mode,
+        text_analyzer_config=text_analyzer_config,
     )
 
     # add in any other columns required by downstream workflows
@@ -8,18 +8,31 @@ from typing import ClassVar
 from graphrag.config.enums import IndexingMethod
 from graphrag.config.models.graph_rag_config import GraphRagConfig
 from graphrag.index.typing.pipeline import Pipeline
-from graphrag.index.typing.workflow import WorkflowFunction
+from graphrag.index.typing.workflow import WorkflowFunction, WorkflowTables
 
 
 class PipelineFactory:
     """A factory class for workflow pipelines."""
 
     workflows: ClassVar[dict[str, WorkflowFunction]] = {}
+    tables: ClassVar[dict[str, WorkflowTables]] = {}
 
     @classmethod
-    def register(cls, name: str, workflow: WorkflowFunction):
-        """Register a custom workflow function."""
+    def register(
+        cls,
+        name: str,
+        workflow: WorkflowFunction,
+        tables: WorkflowTables | None = None,
+    ):
+        """Register a custom workflow function.
+
+        Without tables the workflow runs on its own, after every workflow before it.
+        """
         cls.workflows[name] = workflow
+        if tables is not None:
+            cls.tables[name] = tables
+        else:
+            cls.tables.pop(name, None)
 
     @classmethod
     def register_all(cls, workflows: dict[str, WorkflowFunction]):
@@ -27,13 +40,21 @@ class PipelineFactory:
         for name, workflow in workflows.items():
             cls.register(name, workflow)
 
+    @classmethod
+    def register_tables(cls, tables: dict[str, WorkflowTables]):
+        """Declare the tables read and written by registered workflows."""
+        cls.tables.update(tables)
+
     @classmethod
     def create_pipeline(
         cls, config: GraphRagConfig, method: IndexingMethod = IndexingMethod.Standard
     ) -> Pipeline:
         """Create a pipeline generator."""
         workflows = _get_workflows_list(config, method)
-        return Pipeline([(name, cls.workflows[name]) for name in workflows])
+        return Pipeline(
+            [(name, cls.workflows[name]) for name in workflows],
+            {name: cls.tables[name] for name in workflows if name in cls.tables},
+        )
 
 
 def _get_workflows_list(
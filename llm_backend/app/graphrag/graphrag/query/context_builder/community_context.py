@@ -12,7 +12,7 @@ import tiktoken
 
 from graphrag.data_model.community_report import CommunityReport
 from graphrag.data_model.entity import Entity
-from graphrag.query.llm.text_utils import num_tokens
+from graphrag.query.llm.text_utils import num_tokens_cached
 
 log = logging.getLogger(__name__)
 
@@ -125,7 +125,7 @@ def build_community_context(
         batch_text = (
             f"-----{context_name}-----" + "\n" + column_delimiter.join(header) + "\n"
         )
-        batch_tokens = num_tokens(batch_text, token_encoder)
+        batch_tokens = num_tokens_cached(batch_text, token_encoder)
         batch_records = []
 
     def _cut_batch() -> None:
@@ -152,7 +152,7 @@ def build_community_context(
 
     for report in selected_reports:
         new_context_text, new_context = _report_context_text(report, attributes)
-        new_tokens = num_tokens(new_context_text, token_encoder)
+        new_tokens = num_tokens_cached(new_context_text, token_encoder)
 
         if batch_tokens + new_tokens > max_tokens:
             # add the current batch to the context data and start a new batch if we are in multi-batch mode
@@ -0,0 +1,80 @@
+# Copyright (c) 2024 Microsoft Corporation.
+# Licensed under the MIT License
+
+"""Adjacency index over the entity/relationship graph used by local context builders."""
+
+from collections import defaultdict
+
+from graphrag.data_model.entity import Entity
+from graphrag.data_model.relationship import Relationship
+
+
+class GraphIndex:
+    """Precomputed adjacency lookups, built once per loaded index.
+
+    Maps each entity title to the positions of its incident relationships and
+    of the entities carrying that title, so that relationship selection for a
+    set of entities scans only their neighborhood instead of the full graph.
+    Results preserve the collection order of the original list-scanning
+    helpers, so stable sorts applied afterwards produce identical output.
+    """
+
+    def __init__(
+        self,
+        entities: list[Entity] | None = None,
+        relationships: list[Relationship] | None = None,
+    ):
+        self.entities = list(entities or [])
+        self.relationships = list(relationships or [])
+
+        incident: dict[str, list[int]] = defaultdict(list)
+        for position, relationship in enumerate(self.relationships):
+            incident[relationship.source].append(position)
+            if relationship.target != relationship.source:
+                incident[relationship.target].append(position)
+        self._incident = dict(incident)
+
+        entity_positions: dict[str, list[int]] = defaultdict(list)
+        for position, entity in enumerate(self.entities):
+            entity_positions[entity.title].append(position)
+        self._entity_positions = dict(entity_positions)
+
+    def _incident_positions(self, entity_names: set[str]) -> list[int]:
+        positions: set[int] = set()
+        for name in entity_names:
+            positions.update(self._incident.get(name, ()))
+        return sorted(positions)
+
+    def incident_relationships(self, entity_names: set[str]) -> list[Relationship]:
+        """Relationships with at least one endpoint in entity_names, in collection order."""
+        return [self.relationships[p] for p in self._incident_positions(entity_names)]
+
+    def in_network_relationships(self, entity_names: set[str]) -> list[Relationship]:
+        """Relationships with both endpoints in entity_names, in collection order."""
+        return [
+            rel
+            for rel in self.incident_relationships(entity_names)
+            if rel.source in entity_names and rel.target in entity_names
+        ]
+
+    def out_network_relationships(self, entity_names: set[str]) -> list[Relationship]:
+        """Relationships leaving entity_names: outgoing ones first, then incoming ones."""
+        incident = self.incident_relationships(entity_names)
+        source_relationships = [
+            rel
+            for rel in incident
+            if rel.source in entity_names and rel.target not in entity_names
+        ]
+        target_relationships = [
+            rel
+            for rel in incident
+            if rel.target in entity_names and rel.source not in entity_names
+        ]
+        return source_relationships + target_relationships
+
+    def entities_by_titles(self, titles: set[str]) -> list[Entity]:
+        """Entities whose title is in titles, in collection order."""
+        positions: list[int] = []
+        for title in titles:
+            positions.extend(self._entity_positions.get(title, ()))
+        return [self.entities[p] for p in sorted(positions)]
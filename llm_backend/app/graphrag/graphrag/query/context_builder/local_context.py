@@ -12,6 +12,7 @@ import tiktoken
 from graphrag.data_model.covariate import Covariate
 from graphrag.data_model.entity import Entity
 from graphrag.data_model.relationship import Relationship
+from graphrag.query.context_builder.graph_index import GraphIndex
 from graphrag.query.input.retrieval.covariates import (
     get_candidate_covariates,
     to_covariate_dataframe,
@@ -24,7 +25,7 @@ from graphrag.query.input.retrieval.relationships import (
     get_out_network_relationships,
     to_relationship_dataframe,
 )
-from graphrag.query.llm.text_utils import num_tokens
+from graphrag.query.llm.text_utils import num_tokens_cached
 
 
 def build_entity_context(
@@ -52,7 +53,7 @@ def build_entity_context(
     )
     header.extend(attribute_cols)
     current_context_text += column_delimiter.join(header) + "\n"
-    current_tokens = num_tokens(current_context_text, token_encoder)
+    current_tokens = num_tokens_cached(current_context_text, token_encoder)
 
     all_context_records = [header]
     for entity in selected_entities:
@@ -71,7 +72,7 @@ def build_entity_context(
             )
             new_context.append(field_value)
         new_context_text = column_delimiter.join(new_context) + "\n"
-        new_tokens = num_tokens(new_context_text, token_encoder)
+        new_tokens = num_tokens_cached(new_context_text, token_encoder)
         if current_tokens + new_tokens > max_tokens:
             break
         current_context_text += new_context_text
@@ -113,7 +114,7 @@ def build_covariates_context(
     attribute_cols = list(attributes.keys()) if len(covariates) > 0 else []
     header.extend(attribute_cols)
     current_context_text += column_delimiter.join(header) + "\n"
-    current_tokens = num_tokens(current_context_text, token_encoder)
+    current_tokens = num_tokens_cached(current_context_text, token_encoder)
 
     all_context_records = [header]
     for entity in selected_entities:
@@ -135,7 +136,7 @@ def build_covariates_context(
             new_context.append(field_value)
 
         new_context_text = column_delimiter.join(new_context) + "\n"
-        new_tokens = num_tokens(new_context_text, token_encoder)
+        new_tokens = num_tokens_cached(new_context_text, token_encoder)
         if current_tokens + new_tokens > max_tokens:
             break
         current_context_text += new_context_text
@@ -162,6 +163,7 @@ def build_relationship_context(
     relationship_ranking_attribute: str = "rank",
     column_delimiter: str = "|",
     context_name: str = "Relationships",
+    graph_index: GraphIndex | None = None,
 ) -> tuple[str, pd.DataFrame]:
     """Prepare relationship data tables as context data for system prompt."""
     selected_relationships = _filter_relationships(
@@ -169,6 +171,7 @@ def build_relationship_context(
         relationships=relationships,
         top_k_relationships=top_k_relationships,
         relationship_ranking_attribute=relationship_ranking_attribute,
+        graph_index=graph_index,
     )
 
     if len(selected_entities) == 0 or len(selected_relationships) == 0:
@@ -188,7 +191,7 @@ def build_relationship_context(
     header.extend(attribute_cols)
 
     current_context_text += column_delimiter.join(header) + "\n"
-    current_tokens = num_tokens(current_context_text, token_encoder)
+    current_tokens = num_tokens_cached(current_context_text, token_encoder)
 
     all_context_records = [header]
     for rel in selected_relationships:
@@ -208,7 +211,7 @@ def build_relationship_context(
             )
             new_context.append(field_value)
         new_context_text = column_delimiter.join(new_context) + "\n"
-        new_tokens = num_tokens(new_context_text, token_encoder)
+        new_tokens = num_tokens_cached(new_context_text, token_encoder)
         if current_tokens + new_tokens > max_tokens:
             break
         current_context_text += new_context_text
@@ -230,13 +233,19 @@ def _filter_relationships(
     relationships: list[Relationship],
     top_k_relationships: int = 10,
     relationship_ranking_attribute: str = "rank",
+    graph_index: GraphIndex | None = None,
 ) -> list[Relationship]:
-    """Filter and sort relationships based on a set of selected entities and a ranking attribute."""
+    """Filter and sort relationships based on a set of selected entities and a ranking attribute.
+
+    With a graph_index built over the same relationships, only the neighborhood
+    of the selected entities is scanned.
+    """
     # First priority: in-network relationships (i.e. relationships between selected entities)
     in_network_relationships = get_in_network_relationships(
         selected_entities=selected_entities,
         relationships=relationships,
         ranking_attribute=relationship_ranking_attribute,
+        graph_index=graph_index,
     )
 
     # Second priority -  out-of-network relationships
@@ -245,39 +254,25 @@ def _filter_relationships(
         selected_entities=selected_entities,
         relationships=relationships,
         ranking_attribute=relationship_ranking_attribute,
+        graph_index=graph_index,
     )
     if len(out_network_relationships) <= 1:
         return in_network_relationships + out_network_relationships
 
     # within out-of-network relationships, prioritize mutual relationships
     # (i.e. relationships with out-network entities that are shared with multiple selected entities)
-    selected_entity_names = [entity.title for entity in selected_entities]
-    out_network_source_names = [
-        relationship.source
-        for relationship in out_network_relationships
-        if relationship.source not in selected_entity_names
-    ]
-    out_network_target_names = [
-        relationship.target
-        for relationship in out_network_relationships
-        if relationship.target not in selected_entity_names
-    ]
-    out_network_entity_names = list(
-        set(out_network_source_names + out_network_target_names)
-    )
-    out_network_entity_links = defaultdict(int)
-    for entity_name in out_network_entity_names:
-        targets = [
-            relationship.target
-            for relationship in out_network_relationships
-            if relationship.source == entity_name
-        ]
-        sources = [
-            relationship.source
-            for relationship in out_network_relationships
-            if relationship.target == entity_name
-        ]
-        out_network_entity_links[entity_name] = len(set(targets + sources))
+    # every out-network relationship has exactly one endpoint outside the selection,
+    # so a single pass collects the distinct selected entities each outside entity links to
+    selected_entity_names = {entity.title for entity in selected_entities}
+    linked_entities: defaultdict[str, set[str]] = defaultdict(set)
+    for relationship in out_network_relationships:
+        if relationship.source not in selected_entity_names:
+            linked_entities[relationship.source].add(relationship.target)
+        else:
+            linked_entities[relationship.target].add(relationship.source)
+    out_network_entity_links = {
+        entity_name: len(linked) for entity_name, linked in linked_entities.items()
+    }
 
     # sort out-network relationships by number of links and rank_attributes
     for rel in out_network_relationships:
@@ -321,19 +316,23 @@ def get_candidate_context(
     include_entity_rank: bool = True,
     entity_rank_description: str = "number of relationships",
     include_relationship_weight: bool = False,
+    graph_index: GraphIndex | None = None,
 ) -> dict[str, pd.DataFrame]:
     """Prepare entity, relationship, and covariate data tables as context data for system prompt."""
     candidate_context = {}
     candidate_relationships = get_candidate_relationships(
         selected_entities=selected_entities,
         relationships=relationships,
+        graph_index=graph_index,
     )
     candidate_context["relationships"] = to_relationship_dataframe(
         relationships=candidate_relationships,
         include_relationship_weight=include_relationship_weight,
     )
     candidate_entities = get_entities_from_relationships(
-        relationships=candidate_relationships, entities=entities
+        relationships=candidate_relationships,
+        entities=entities,
+        graph_index=graph_index,
     )
     candidate_context["entities"] = to_entity_dataframe(
         entities=candidate_entities,
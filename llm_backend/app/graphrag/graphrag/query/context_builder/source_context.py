@@ -11,7 +11,7 @@ import tiktoken
 
 from graphrag.data_model.relationship import Relationship
 from graphrag.data_model.text_unit import TextUnit
-from graphrag.query.llm.text_utils import num_tokens
+from graphrag.query.llm.text_utils import num_tokens_cached
 
 """
 Contain util functions to build text unit context for the search's system prompt
@@ -47,7 +47,7 @@ def build_text_unit_context(
     header.extend(attribute_cols)
 
     current_context_text += column_delimiter.join(header) + "\n"
-    current_tokens = num_tokens(current_context_text, token_encoder)
+    current_tokens = num_tokens_cached(current_context_text, token_encoder)
     all_context_records = [header]
 
     for unit in text_units:
@@ -60,7 +60,7 @@ def build_text_unit_context(
             ],
         ]
         new_context_text = column_delimiter.join(new_context) + "\n"
-        new_tokens = num_tokens(new_context_text, token_encoder)
+        new_tokens = num_tokens_cached(new_context_text, token_encoder)
 
         if current_tokens + new_tokens > max_tokens:
             break
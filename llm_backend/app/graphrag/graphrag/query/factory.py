@@ -3,6 +3,8 @@
 
 """Query Factory methods to support CLI."""
 
+from pathlib import Path
+
 import tiktoken
 
 from graphrag.callbacks.query_callbacks import QueryCallbacks
@@ -14,7 +16,9 @@ from graphrag.data_model.entity import Entity
 from graphrag.data_model.relationship import Relationship
 from graphrag.data_model.text_unit import TextUnit
 from graphrag.language_model.manager import ModelManager
+from graphrag.language_model.protocol.base import EmbeddingModel
 from graphrag.query.context_builder.entity_extraction import EntityVectorStoreKey
+from graphrag.query.llm.embedding_cache import CachedEmbeddingModel
 from graphrag.query.structured_search.basic_search.basic_context import (
     BasicSearchContext,
 )
@@ -26,6 +30,9 @@ from graphrag.query.structured_search.drift_search.search import DRIFTSearch
 from graphrag.query.structured_search.global_search.community_context import (
     GlobalCommunityContext,
 )
+from graphrag.query.structured_search.global_search.map_cache import (
+    MapResponseCache,
+)
 from graphrag.query.structured_search.global_search.search import GlobalSearch
 from graphrag.query.structured_search.local_search.mixed_context import (
     LocalSearchMixedContext,
@@ -33,6 +40,47 @@ from graphrag.query.structured_search.local_search.mixed_context import (
 from graphrag.query.structured_search.local_search.search import LocalSearch
 from graphrag.vector_stores.base import BaseVectorStore
 
+_query_embedding_models: dict[tuple[str, int, Path | None], CachedEmbeddingModel] = {}
+
+
+def _with_query_embedding_cache(
+    config: GraphRagConfig,
+    name: str,
+    embedding_model: EmbeddingModel,
+    namespace: str,
+) -> EmbeddingModel:
+    """Wrap a query embedding model in the configured embedding cache.
+
+    The wrapper is kept per model name and cache settings, so engines rebuilt
+    for a new index snapshot keep their cached query vectors (they do not
+    depend on the index), while a changed size or path gets a new wrapper.
+    """
+    cache_config = config.cache
+    if (
+        cache_config.query_embedding_max_entries <= 0
+        and not cache_config.query_embedding_path
+    ):
+        return embedding_model
+    disk_path = (
+        Path(config.root_dir) / cache_config.query_embedding_path
+        if cache_config.query_embedding_path
+        else None
+    )
+    key = (name, cache_config.query_embedding_max_entries, disk_path)
+    cached = _query_embedding_models.get(key)
+    if cached is None or cached.model is not embedding_model:
+        cached = CachedEmbeddingModel(
+            embedding_model,
+            max_entries=cache_config.query_embedding_max_entries,
+            disk_path=disk_path,
+            namespace=namespace,
+        )
+        # wrappers for the old settings of this model are not handed out again
+        for stale in [k for k in _query_embedding_models if k[0] == name]:
+            _query_embedding_models.pop(stale).close()
+        _query_embedding_models[key] = cached
+    return cached
+
 
 def get_local_search_engine(
     config: GraphRagConfig,
@@ -67,10 +115,15 @@ def get_local_search_engine(
         embedding_settings.max_retries = (
             len(reports) + len(entities) + len(relationships)
         )
-    embedding_model = ModelManager().get_or_create_embedding_model(
-        name="local_search_embedding",
-        model_type=embedding_settings.type,
-        config=embedding_settings,
+    embedding_model = _with_query_embedding_cache(
+        config,
+        "local_search_embedding",
+        ModelManager().get_or_create_embedding_model(
+            name="local_search_embedding",
+            model_type=embedding_settings.type,
+            config=embedding_settings,
+        ),
+        namespace=embedding_settings.model,
     )
 
     token_encoder = tiktoken.get_encoding(model_settings.encoding_model)
@@ -205,6 +258,11 @@ def get_global_search_engine(
             "context_name": "Reports",
         },
         concurrent_coroutines=gs_config.concurrency,
+        map_cache=MapResponseCache(gs_config.map_cache_size)
+        if gs_config.map_cache_size > 0
+        else None,
+        streaming_reduce=gs_config.streaming_reduce,
+        early_exit_score=gs_config.early_exit_score,
         response_type=response_type,
         callbacks=callbacks,
     )
@@ -248,10 +306,15 @@ def get_drift_search_engine(
             len(reports) + len(entities) + len(relationships)
         )
 
-    embedding_model = ModelManager().get_or_create_embedding_model(
-        name="drift_search_embedding",
-        model_type=embedding_model_settings.type,
-        config=embedding_model_settings,
+    embedding_model = _with_query_embedding_cache(
+        config,
+        "drift_search_embedding",
+        ModelManager().get_or_create_embedding_model(
+            name="drift_search_embedding",
+            model_type=embedding_model_settings.type,
+            config=embedding_model_settings,
+        ),
+        namespace=embedding_model_settings.model,
     )
     token_encoder = tiktoken.get_encoding(chat_model_settings.encoding_model)
 
@@ -302,10 +365,15 @@ def get_basic_search_engine(
     if embedding_model_settings.max_retries == -1:
         embedding_model_settings.max_retries = len(text_units)
 
-    embedding_model = ModelManager().get_or_create_embedding_model(
-        name="basic_search_embedding",
-        model_type=embedding_model_settings.type,
-        config=embedding_model_settings,
+    embedding_model = _with_query_embedding_cache(
+        config,
+        "basic_search_embedding",
+        ModelManager().get_or_create_embedding_model(
+            name="basic_search_embedding",
+            model_type=embedding_model_settings.type,
+            config=embedding_model_settings,
+        ),
+        namespace=embedding_model_settings.model,
     )
 
     token_encoder = tiktoken.get_encoding(chat_model_settings.encoding_model)
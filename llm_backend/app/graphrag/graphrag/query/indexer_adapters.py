@@ -32,6 +32,75 @@ from graphrag.vector_stores.base import BaseVectorStore
 
 log = logging.getLogger(__name__)
 
+# Columns of each index output table read by the adapters below (plus the
+# human_readable_id used to re-number multi-index searches). Loading only these
+# skips large columns the query engines never touch, such as the documents'
+# raw text, report findings/full_content_json and entity layout coordinates.
+QUERY_TABLE_COLUMNS: dict[str, list[str]] = {
+    "entities": [
+        "id",
+        "human_readable_id",
+        "title",
+        "type",
+        "description",
+        "degree",
+        "text_unit_ids",
+        "description_embedding",
+    ],
+    "communities": [
+        "id",
+        "human_readable_id",
+        "community",
+        "level",
+        "parent",
+        "children",
+        "title",
+        "entity_ids",
+    ],
+    "community_reports": [
+        "id",
+        "human_readable_id",
+        "community",
+        "level",
+        "title",
+        "summary",
+        "full_content",
+        "rank",
+        "full_content_embedding",
+    ],
+    "text_units": [
+        "id",
+        "human_readable_id",
+        "text",
+        "n_tokens",
+        "entity_ids",
+        "relationship_ids",
+        "document_ids",
+    ],
+    "relationships": [
+        "id",
+        "human_readable_id",
+        "source",
+        "target",
+        "description",
+        "weight",
+        "combined_degree",
+        "text_unit_ids",
+    ],
+    "covariates": [
+        "id",
+        "human_readable_id",
+        "subject_id",
+        "type",
+        "object_id",
+        "status",
+        "start_date",
+        "end_date",
+        "description",
+        "text_unit_ids",
+    ],
+}
+
 
 def read_indexer_text_units(final_text_units: pd.DataFrame) -> list[TextUnit]:
     """Read in the Text Units from the raw indexing outputs."""
@@ -9,14 +9,28 @@ import pandas as pd
 
 from graphrag.data_model.entity import Entity
 from graphrag.data_model.relationship import Relationship
+from graphrag.query.context_builder.graph_index import GraphIndex
 
 
 def get_in_network_relationships(
     selected_entities: list[Entity],
     relationships: list[Relationship],
     ranking_attribute: str = "rank",
+    graph_index: GraphIndex | None = None,
 ) -> list[Relationship]:
-    """Get all directed relationships between selected entities, sorted by ranking_attribute."""
+    """Get all directed relationships between selected entities, sorted by ranking_attribute.
+
+    If graph_index (built over the same relationships) is given, only the
+    neighborhood of the selected entities is scanned.
+    """
+    if graph_index is not None:
+        selected_relationships = graph_index.in_network_relationships({
+            entity.title for entity in selected_entities
+        })
+        if len(selected_relationships) <= 1:
+            return selected_relationships
+        return sort_relationships_by_rank(selected_relationships, ranking_attribute)
+
     selected_entity_names = [entity.title for entity in selected_entities]
     selected_relationships = [
         relationship
@@ -35,8 +49,15 @@ def get_out_network_relationships(
     selected_entities: list[Entity],
     relationships: list[Relationship],
     ranking_attribute: str = "rank",
+    graph_index: GraphIndex | None = None,
 ) -> list[Relationship]:
     """Get relationships from selected entities to other entities that are not within the selected entities, sorted by ranking_attribute."""
+    if graph_index is not None:
+        selected_relationships = graph_index.out_network_relationships({
+            entity.title for entity in selected_entities
+        })
+        return sort_relationships_by_rank(selected_relationships, ranking_attribute)
+
     selected_entity_names = [entity.title for entity in selected_entities]
     source_relationships = [
         relationship
@@ -57,8 +78,13 @@ def get_out_network_relationships(
 def get_candidate_relationships(
     selected_entities: list[Entity],
     relationships: list[Relationship],
+    graph_index: GraphIndex | None = None,
 ) -> list[Relationship]:
     """Get all relationships that are associated with the selected entities."""
+    if graph_index is not None:
+        return graph_index.incident_relationships({
+            entity.title for entity in selected_entities
+        })
     selected_entity_names = [entity.title for entity in selected_entities]
     return [
         relationship
@@ -69,9 +95,16 @@ def get_candidate_relationships(
 
 
 def get_entities_from_relationships(
-    relationships: list[Relationship], entities: list[Entity]
+    relationships: list[Relationship],
+    entities: list[Entity],
+    graph_index: GraphIndex | None = None,
 ) -> list[Entity]:
     """Get all entities that are associated with the selected relationships."""
+    if graph_index is not None:
+        return graph_index.entities_by_titles(
+            {relationship.source for relationship in relationships}
+            | {relationship.target for relationship in relationships}
+        )
     selected_entity_names = [relationship.source for relationship in relationships] + [
         relationship.target for relationship in relationships
     ]
@@ -0,0 +1,180 @@
+# Copyright (c) 2024 Microsoft Corporation.
+# Licensed under the MIT License
+
+"""Query embedding cache in front of an EmbeddingModel."""
+
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import threading
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from graphrag.language_model.protocol.base import EmbeddingModel
+
+
+class CachedEmbeddingModel:
+    """EmbeddingModel wrapper memoizing vectors in an LRU with an optional SQLite tier.
+
+    Local, DRIFT and basic search embed every query (and DRIFT every follow-up
+    query) before the vector store lookup. Identical texts are served from memory,
+    then from the on-disk tier when disk_path is set, and only the remaining
+    texts reach the wrapped model; the batch methods send all of those in a
+    single call. Keys are digests of (namespace, text), so the namespace should
+    name the embedding model whose vectors are stored. Extra keyword arguments
+    are forwarded to the model on a miss but are not part of the key.
+    """
+
+    def __init__(
+        self,
+        model: EmbeddingModel,
+        max_entries: int = 1024,
+        disk_path: str | Path | None = None,
+        namespace: str = "",
+    ):
+        self.model = model
+        self.max_entries = max_entries
+        self.namespace = namespace
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._vectors: OrderedDict[bytes, list[float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: sqlite3.Connection | None = None
+        if disk_path is not None:
+            Path(disk_path).parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(disk_path), check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings"
+                " (key BLOB PRIMARY KEY, vector BLOB)"
+            )
+            self._db.commit()
+
+    def _key(self, text: str) -> bytes:
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(self.namespace.encode("utf-8"))
+        digest.update(b"\x00")
+        digest.update(text.encode("utf-8"))
+        return digest.digest()
+
+    def _lookup(self, keys: list[bytes]) -> dict[bytes, list[float]]:
+        found: dict[bytes, list[float]] = {}
+        with self._lock:
+            for key in keys:
+                vector = self._vectors.get(key)
+                if vector is not None:
+                    self._vectors.move_to_end(key)
+                    found[key] = vector
+            self.hits += len(found)
+            missing = [key for key in keys if key not in found]
+            if self._db is not None and missing:
+                placeholders = ",".join("?" * len(missing))
+                query = (
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})"  # noqa: S608
+                )
+                rows = self._db.execute(query, missing).fetchall()
+                for key, blob in rows:
+                    vector = array("d", blob).tolist()
+                    found[key] = vector
+                    self._remember(key, vector)
+                self.disk_hits += len(rows)
+        return found
+
+    def _remember(self, key: bytes, vector: list[float]) -> None:
+        if self.max_entries <= 0:
+            return
+        self._vectors[key] = vector
+        self._vectors.move_to_end(key)
+        while len(self._vectors) > self.max_entries:
+            self._vectors.popitem(last=False)
+
+    def _store(self, vectors: dict[bytes, list[float]]) -> None:
+        with self._lock:
+            self.misses += len(vectors)
+            for key, vector in vectors.items():
+                self._remember(key, vector)
+            if self._db is not None:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                    [
+                        (key, array("d", vector).tobytes())
+                        for key, vector in vectors.items()
+                    ],
+                )
+                self._db.commit()
+
+    def _plan(self, text_list: list[str]) -> tuple[list[bytes], dict, list[str]]:
+        """Return the keys of text_list, the cached vectors and the missing texts."""
+        keys = [self._key(text) for text in text_list]
+        found = self._lookup(list(dict.fromkeys(keys)))
+        missing = [
+            text
+            for text, key in dict(zip(text_list, keys, strict=True)).items()
+            if key not in found
+        ]
+        return keys, found, missing
+
+    def _merge(
+        self,
+        keys: list[bytes],
+        found: dict[bytes, list[float]],
+        missing: list[str],
+        embeddings: list[list[float]],
+    ) -> list[list[float]]:
+        computed = {
+            self._key(text): list(vector)
+            for text, vector in zip(missing, embeddings, strict=True)
+        }
+        if computed:
+            self._store(computed)
+        found.update(computed)
+        return [list(found[key]) for key in keys]
+
+    def embed_batch(self, text_list: list[str], **kwargs: Any) -> list[list[float]]:
+        """Embed text_list, sending only the uncached texts to the model in one call."""
+        keys, found, missing = self._plan(text_list)
+        embeddings = self.model.embed_batch(missing, **kwargs) if missing else []
+        return self._merge(keys, found, missing, embeddings)
+
+    async def aembed_batch(
+        self, text_list: list[str], **kwargs: Any
+    ) -> list[list[float]]:
+        """Embed text_list, sending only the uncached texts to the model in one call."""
+        keys, found, missing = self._plan(text_list)
+        embeddings = await self.model.aembed_batch(missing, **kwargs) if missing else []
+        return self._merge(keys, found, missing, embeddings)
+
+    def embed(self, text: str, **kwargs: Any) -> list[float]:
+        """Embed a single text through the cache."""
+        keys, found, missing = self._plan([text])
+        embeddings = [self.model.embed(text, **kwargs)] if missing else []
+        return self._merge(keys, found, missing, embeddings)[0]
+
+    async def aembed(self, text: str, **kwargs: Any) -> list[float]:
+        """Embed a single text through the cache."""
+        keys, found, missing = self._plan([text])
+        embeddings = [await self.model.aembed(text, **kwargs)] if missing else []
+        return self._merge(keys, found, missing, embeddings)[0]
+
+    def clear(self) -> None:
+        """Drop the in-memory vectors and reset the counters; the disk tier is kept."""
+        with self._lock:
+            self._vectors.clear()
+            self.hits = 0
+            self.disk_hits = 0
+            self.misses = 0
+
+    def close(self) -> None:
+        """Close the on-disk tier."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def __len__(self) -> int:
+        """Return the number of vectors held in memory."""
+        return len(self._vectors)
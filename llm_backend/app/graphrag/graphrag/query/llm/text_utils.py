@@ -3,9 +3,12 @@
 
 """Text Utilities for LLM."""
 
+import hashlib
 import json
 import logging
 import re
+import threading
+from collections import OrderedDict
 from collections.abc import Iterator
 from itertools import islice
 
@@ -24,6 +27,82 @@ def num_tokens(text: str, token_encoder: tiktoken.Encoding | None = None) -> int
     return len(token_encoder.encode(text))  # type: ignore
 
 
+class TokenCountCache:
+    """Bounded LRU memo of token counts keyed by (encoding name, text digest).
+
+    Context builders format the same community reports, text units, entities and
+    relationships into identical rows query after query; the memo lets the token
+    budget loops reuse those counts instead of re-running the BPE encoder. Keys
+    are digests of the exact row text, so a row rendered differently (other
+    delimiter, extra attribute columns) is counted afresh.
+    """
+
+    def __init__(self, max_entries: int = 50_000):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._counts: OrderedDict[tuple[str, bytes], int] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def count(self, text: str, token_encoder: tiktoken.Encoding | None = None) -> int:
+        """Return the number of tokens in text, encoding it only on a cache miss."""
+        if token_encoder is None:
+            token_encoder = tiktoken.get_encoding(defs.ENCODING_MODEL)
+        key = (
+            token_encoder.name,
+            hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest(),
+        )
+        with self._lock:
+            count = self._counts.get(key)
+            if count is not None:
+                self._counts.move_to_end(key)
+                self.hits += 1
+                return count
+        count = len(token_encoder.encode(text))  # type: ignore
+        with self._lock:
+            self.misses += 1
+            if self.max_entries > 0:
+                self._counts[key] = count
+                while len(self._counts) > self.max_entries:
+                    self._counts.popitem(last=False)
+        return count
+
+    def clear(self) -> None:
+        """Drop all memoized counts and reset the hit/miss counters."""
+        with self._lock:
+            self._counts.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        """Return the number of cached token counts."""
+        return len(self._counts)
+
+
+token_count_cache = TokenCountCache()
+
+
+def num_tokens_cached(text: str, token_encoder: tiktoken.Encoding | None = None) -> int:
+    """Return the number of tokens in text, memoized in the shared token count cache."""
+    return token_count_cache.count(text, token_encoder)
+
+
+def num_tokens_by_line(
+    text: str, token_encoder: tiktoken.Encoding | None = None
+) -> int:
+    """Return the token count of a context table as the sum of its cached line counts.
+
+    Used to re-measure context text that grows one row at a time without
+    re-encoding the rows already counted. Tokens are not merged across line
+    breaks, so the result can differ slightly from num_tokens(text) (typically
+    by a token per run of blank lines).
+    """
+    return sum(
+        token_count_cache.count(line, token_encoder)
+        for line in text.splitlines(keepends=True)
+    )
+
+
 def batched(iterable: Iterator, n: int):
     """
     Batch data into tuples of length n. The last batch may be shorter.
@@ -15,6 +15,7 @@ from graphrag.callbacks.query_callbacks import QueryCallbacks
 from graphrag.language_model.protocol.base import ChatModel
 from graphrag.query.context_builder.conversation_history import ConversationHistory
 from graphrag.query.context_builder.entity_extraction import EntityVectorStoreKey
+from graphrag.query.llm.embedding_cache import CachedEmbeddingModel
 from graphrag.query.llm.text_utils import num_tokens
 from graphrag.query.structured_search.base import BaseSearch, SearchResult
 from graphrag.query.structured_search.drift_search.action import DriftAction
@@ -163,12 +164,27 @@ class DRIFTSearch(BaseSearch[DRIFTSearchContextBuilder]):
         -------
         list[DriftAction]: The results from executing the search actions asynchronously.
         """
+        await self._embed_action_queries(actions)
         tasks = [
             action.search(search_engine=search_engine, global_query=global_query)
             for action in actions
         ]
         return await tqdm_asyncio.gather(*tasks, leave=False)
 
+    async def _embed_action_queries(self, actions: list[DriftAction]) -> None:
+        """Embed the follow-up queries of a step in a single batch call.
+
+        The local searches map each query to entities with a synchronous embed()
+        call; warming the embedding cache first turns those N round trips into
+        one aembed_batch request. Without a cache there is nothing to warm.
+        """
+        text_embedder = self.context_builder.text_embedder
+        if not isinstance(text_embedder, CachedEmbeddingModel):
+            return
+        queries = [action.query for action in actions if not action.is_complete]
+        if queries:
+            await text_embedder.aembed_batch(queries)
+
     async def search(
         self,
         query: str,
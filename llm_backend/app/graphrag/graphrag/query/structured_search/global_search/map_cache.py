@@ -0,0 +1,97 @@
+# Copyright (c) 2024 Microsoft Corporation.
+# Licensed under the MIT License
+
+"""Cache of global search map-phase answers."""
+
+import hashlib
+import json
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Any
+
+_WHITESPACE = re.compile(r"\s+")
+_TRAILING_PUNCTUATION = " \t\n?!.,;:。？！，；：、…"  # noqa: RUF001
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a query so that trivially different phrasings share map answers.
+
+    Applies NFKC (full-width to half-width), case folding, whitespace collapsing
+    and strips trailing punctuation, so "What is X?" and "what  is x" map to the
+    same key while any change in wording does not.
+    """
+    query = unicodedata.normalize("NFKC", query).casefold()
+    query = _WHITESPACE.sub(" ", query).strip()
+    return query.rstrip(_TRAILING_PUNCTUATION)
+
+
+class MapResponseCache:
+    """Bounded LRU cache of parsed map responses.
+
+    Entries are keyed by a digest of the rendered map prompt (system prompt plus
+    the community report batch), the normalized query and the model parameters.
+    The chat model itself is not part of the key, so a cache must not be shared
+    between search engines backed by different models. A rebuilt index produces
+    different batch text and therefore different keys, so stale answers are never
+    served after a re-index; they age out of the LRU instead.
+    """
+
+    def __init__(self, max_entries: int = 2048):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[bytes, list[dict[str, Any]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(
+        search_prompt: str,
+        query: str,
+        model_parameters: dict[str, Any] | None = None,
+    ) -> bytes:
+        """Return the cache key for one map call."""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(search_prompt.encode("utf-8"))
+        digest.update(b"\x00")
+        digest.update(normalize_query(query).encode("utf-8"))
+        digest.update(b"\x00")
+        digest.update(
+            json.dumps(model_parameters or {}, sort_keys=True, default=str).encode(
+                "utf-8"
+            )
+        )
+        return digest.digest()
+
+    def get(self, key: bytes) -> list[dict[str, Any]] | None:
+        """Return a copy of the cached key points for key, or None on a miss."""
+        with self._lock:
+            points = self._entries.get(key)
+            if points is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return [dict(point) for point in points]
+
+    def set(self, key: bytes, points: list[dict[str, Any]]) -> None:
+        """Store the parsed key points of a map call."""
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = [dict(point) for point in points]
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached answers and reset the hit/miss counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        """Return the number of cached batch answers."""
+        return len(self._entries)
@@ -30,8 +30,15 @@ from graphrag.query.context_builder.builders import GlobalContextBuilder
 from graphrag.query.context_builder.conversation_history import (
     ConversationHistory,
 )
-from graphrag.query.llm.text_utils import num_tokens, try_parse_json_object
+from graphrag.query.llm.text_utils import (
+    num_tokens,
+    num_tokens_cached,
+    try_parse_json_object,
+)
 from graphrag.query.structured_search.base import BaseSearch, SearchResult
+from graphrag.query.structured_search.global_search.map_cache import (
+    MapResponseCache,
+)
 
 DEFAULT_MAP_LLM_PARAMS = {
     "max_tokens": 1000,
@@ -75,6 +82,9 @@ class GlobalSearch(BaseSearch[GlobalContextBuilder]):
         reduce_llm_params: dict[str, Any] = DEFAULT_REDUCE_LLM_PARAMS,
         context_builder_params: dict[str, Any] | None = None,
         concurrent_coroutines: int = 32,
+        map_cache: MapResponseCache | None = None,
+        streaming_reduce: bool = False,
+        early_exit_score: int = 80,
     ):
         super().__init__(
             model=model,
@@ -101,6 +111,9 @@ class GlobalSearch(BaseSearch[GlobalContextBuilder]):
             self.map_llm_params.pop("response_format", None)
 
         self.semaphore = asyncio.Semaphore(concurrent_coroutines)
+        self.map_cache = map_cache
+        self.streaming_reduce = streaming_reduce
+        self.early_exit_score = early_exit_score
 
     async def stream_search(
         self,
@@ -116,12 +129,10 @@ class GlobalSearch(BaseSearch[GlobalContextBuilder]):
         for callback in self.callbacks:
             callback.on_map_response_start(context_result.context_chunks)  # type: ignore
 
-        map_responses = await asyncio.gather(*[
-            self._map_response_single_batch(
-                context_data=data, query=query, **self.map_llm_params
-            )
-            for data in context_result.context_chunks
-        ])
+        map_responses = await self._map_responses(
+            context_chunks=context_result.context_chunks,  # type: ignore
+            query=query,
+        )
 
         for callback in self.callbacks:
             callback.on_map_response_end(map_responses)  # type: ignore
@@ -164,12 +175,10 @@ class GlobalSearch(BaseSearch[GlobalContextBuilder]):
         for callback in self.callbacks:
             callback.on_map_response_start(context_result.context_chunks)  # type: ignore
 
-        map_responses = await asyncio.gather(*[
-            self._map_response_single_batch(
-                context_data=data, query=query, **self.map_llm_params
-            )
-            for data in context_result.context_chunks
-        ])
+        map_responses = await self._map_responses(
+            context_chunks=context_result.context_chunks,  # type: ignore
+            query=query,
+        )
 
         for callback in self.callbacks:
             callback.on_map_response_end(map_responses)
@@ -205,6 +214,84 @@ class GlobalSearch(BaseSearch[GlobalContextBuilder]):
             output_tokens_categories=output_tokens,
         )
 
+    async def _map_responses(
+        self,
+        context_chunks: list[str],
+        query: str,
+    ) -> list[SearchResult]:
+        """Run the map step over all batches, in batch order.
+
+        In streaming reduce mode, key points are accumulated into the reduce
+        budget as each batch completes, and the batches still in flight are
+        dropped once the points scoring at least early_exit_score alone exceed
+        max_data_tokens. Reduce keeps only the highest-scored points that fit that
+        budget, so the remaining batches could only displace points by scoring
+        above early_exit_score themselves; the mode trades that for latency.
+        """
+        if not self.streaming_reduce:
+            return await asyncio.gather(*[
+                self._map_response_single_batch(
+                    context_data=data, query=query, **self.map_llm_params
+                )
+                for data in context_chunks
+            ])
+
+        tasks = [
+            asyncio.create_task(
+                self._map_response_single_batch(
+                    context_data=data, query=query, **self.map_llm_params
+                )
+            )
+            for data in context_chunks
+        ]
+        batch_index = {task: index for index, task in enumerate(tasks)}
+        map_responses: list[SearchResult | None] = [None] * len(tasks)
+        high_score_tokens = 0
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    index = batch_index[task]
+                    response = map_responses[index] = task.result()
+                    # count the points exactly as the reduce step will render
+                    # them, so their token counts are cache hits there
+                    for point in self._collect_key_points([response]):
+                        if point["score"] >= self.early_exit_score:
+                            high_score_tokens += num_tokens_cached(
+                                self._format_key_point(point, analyst=index),
+                                self.token_encoder,
+                            )
+                if pending and high_score_tokens > self.max_data_tokens:
+                    log.info(
+                        "Global search early exit: %d high-score tokens exceed the reduce budget, dropping %d of %d map batches",
+                        high_score_tokens,
+                        len(pending),
+                        len(tasks),
+                    )
+                    break
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        return [
+            response
+            if response is not None
+            else SearchResult(
+                response=[],
+                context_data=data,
+                context_text=data,
+                completion_time=0,
+                llm_calls=0,
+                prompt_tokens=0,
+                output_tokens=0,
+            )
+            for response, data in zip(map_responses, context_chunks, strict=True)
+        ]
+
     async def _map_response_single_batch(
         self,
         context_data: str,
@@ -216,6 +303,20 @@ class GlobalSearch(BaseSearch[GlobalContextBuilder]):
         search_prompt = ""
         try:
             search_prompt = self.map_system_prompt.format(context_data=context_data)
+            cache_key = None
+            if self.map_cache is not None:
+                cache_key = self.map_cache.key(search_prompt, query, llm_kwargs)
+                cached_response = self.map_cache.get(cache_key)
+                if cached_response is not None:
+                    return SearchResult(
+                        response=cached_response,
+                        context_data=context_data,
+                        context_text=context_data,
+                        completion_time=time.time() - start_time,
+                        llm_calls=0,
+                        prompt_tokens=0,
+                        output_tokens=0,
+                    )
             search_messages = [
                 {"role": "system", "content": search_prompt},
             ]
@@ -231,6 +332,13 @@ class GlobalSearch(BaseSearch[GlobalContextBuilder]):
             try:
                 # parse search response json
                 processed_response = self._parse_search_response(search_response)
+                # placeholder points from an error reply or unparsable JSON are not
+                # worth replaying, so only answers with a real point are cached
+                if cache_key is not None and any(
+                    point.get("answer") and point.get("score", 0) > 0
+                    for point in processed_response
+                ):
+                    self.map_cache.set(cache_key, processed_response)  # type: ignore
             except ValueError:
                 log.warning(
                     "Warning: Error parsing search response json - skipping this batch"
@@ -289,6 +397,53 @@ class GlobalSearch(BaseSearch[GlobalContextBuilder]):
             if "description" in element and "score" in element
         ]
 
+    @staticmethod
+    def _collect_key_points(
+        map_responses: list[SearchResult],
+    ) -> list[dict[str, Any]]:
+        """Collect the key points of all map responses, tagged with their batch index."""
+        key_points = []
+        for index, response in enumerate(map_responses):
+            if not isinstance(response.response, list):
+                continue
+            for element in response.response:
+                if not isinstance(element, dict):
+                    continue
+                if "answer" not in element or "score" not in element:
+                    continue
+                key_points.append({
+                    "analyst": index,
+                    "answer": element["answer"],
+                    "score": element["score"],
+                })
+        return key_points
+
+    @staticmethod
+    def _format_key_point(point: dict[str, Any], analyst: int | None = None) -> str:
+        """Render a key point as it appears in the reduce context."""
+        if analyst is None:
+            analyst = point["analyst"]
+        return "\n".join([
+            f"----Analyst {analyst + 1}----",
+            f"Importance Score: {point['score']}",
+            point["answer"],
+        ])
+
+    def _build_reduce_data(self, sorted_key_points: list[dict[str, Any]]) -> str:
+        """Pack the highest-scored key points into the reduce token budget."""
+        data = []
+        total_tokens = 0
+        for point in sorted_key_points:
+            formatted_response_text = self._format_key_point(point)
+            point_tokens = num_tokens_cached(
+                formatted_response_text, self.token_encoder
+            )
+            if total_tokens + point_tokens > self.max_data_tokens:
+                break
+            data.append(formatted_response_text)
+            total_tokens += point_tokens
+        return "\n\n".join(data)
+
     async def _reduce_response(
         self,
         map_responses: list[SearchResult],
@@ -300,26 +455,10 @@ class GlobalSearch(BaseSearch[GlobalContextBuilder]):
         search_prompt = ""
         start_time = time.time()
         try:
-            # collect all key points into a single list to prepare for sorting
-            key_points = []
-            for index, response in enumerate(map_responses):
-                if not isinstance(response.response, list):
-                    continue
-                for element in response.response:
-                    if not isinstance(element, dict):
-                        continue
-                    if "answer" not in element or "score" not in element:
-                        continue
-                    key_points.append({
-                        "analyst": index,
-                        "answer": element["answer"],
-                        "score": element["score"],
-                    })
-
             # filter response with score = 0 and rank responses by descending order of score
             filtered_key_points = [
                 point
-                for point in key_points
+                for point in self._collect_key_points(map_responses)
                 if point["score"] > 0  # type: ignore
             ]
 
@@ -344,27 +483,7 @@ class GlobalSearch(BaseSearch[GlobalContextBuilder]):
                 reverse=True,  # type: ignore
             )
 
-            data = []
-            total_tokens = 0
-            for point in filtered_key_points:
-                formatted_response_data = []
-                formatted_response_data.append(
-                    f"----Analyst {point['analyst'] + 1}----"
-                )
-                formatted_response_data.append(
-                    f"Importance Score: {point['score']}"  # type: ignore
-                )
-                formatted_response_data.append(point["answer"])  # type: ignore
-                formatted_response_text = "\n".join(formatted_response_data)
-                if (
-                    total_tokens
-                    + num_tokens(formatted_response_text, self.token_encoder)
-                    > self.max_data_tokens
-                ):
-                    break
-                data.append(formatted_response_text)
-                total_tokens += num_tokens(formatted_response_text, self.token_encoder)
-            text_data = "\n\n".join(data)
+            text_data = self._build_reduce_data(filtered_key_points)
 
             search_prompt = self.reduce_system_prompt.format(
                 report_data=text_data, response_type=self.response_type
@@ -413,26 +532,10 @@ class GlobalSearch(BaseSearch[GlobalContextBuilder]):
         query: str,
         **llm_kwargs,
     ) -> AsyncGenerator[str, None]:
-        # collect all key points into a single list to prepare for sorting
-        key_points = []
-        for index, response in enumerate(map_responses):
-            if not isinstance(response.response, list):
-                continue
-            for element in response.response:
-                if not isinstance(element, dict):
-                    continue
-                if "answer" not in element or "score" not in element:
-                    continue
-                key_points.append({
-                    "analyst": index,
-                    "answer": element["answer"],
-                    "score": element["score"],
-                })
-
         # filter response with score = 0 and rank responses by descending order of score
         filtered_key_points = [
             point
-            for point in key_points
+            for point in self._collect_key_points(map_responses)
             if point["score"] > 0  # type: ignore
         ]
 
@@ -450,23 +553,7 @@ class GlobalSearch(BaseSearch[GlobalContextBuilder]):
             reverse=True,  # type: ignore
         )
 
-        data = []
-        total_tokens = 0
-        for point in filtered_key_points:
-            formatted_response_data = [
-                f"----Analyst {point['analyst'] + 1}----",
-                f"Importance Score: {point['score']}",
-                point["answer"],
-            ]
-            formatted_response_text = "\n".join(formatted_response_data)
-            if (
-                total_tokens + num_tokens(formatted_response_text, self.token_encoder)
-                > self.max_data_tokens
-            ):
-                break
-            data.append(formatted_response_text)
-            total_tokens += num_tokens(formatted_response_text, self.token_encoder)
-        text_data = "\n\n".join(data)
+        text_data = self._build_reduce_data(filtered_key_points)
 
         search_prompt = self.reduce_system_prompt.format(
             report_data=text_data, response_type=self.response_type
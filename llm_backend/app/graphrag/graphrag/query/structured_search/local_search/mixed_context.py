@@ -26,6 +26,7 @@ from graphrag.query.context_builder.entity_extraction import (
     EntityVectorStoreKey,
     map_query_to_entities,
 )
+from graphrag.query.context_builder.graph_index import GraphIndex
 from graphrag.query.context_builder.local_context import (
     build_covariates_context,
     build_entity_context,
@@ -40,7 +41,7 @@ from graphrag.query.input.retrieval.community_reports import (
     get_candidate_communities,
 )
 from graphrag.query.input.retrieval.text_units import get_candidate_text_units
-from graphrag.query.llm.text_utils import num_tokens
+from graphrag.query.llm.text_utils import num_tokens, num_tokens_by_line
 from graphrag.query.structured_search.base import LocalContextBuilder
 from graphrag.vector_stores.base import BaseVectorStore
 
@@ -78,6 +79,10 @@ class LocalSearchMixedContext(LocalContextBuilder):
         self.relationships = {
             relationship.id: relationship for relationship in relationships
         }
+        self.graph_index = GraphIndex(
+            entities=list(self.entities.values()),
+            relationships=list(self.relationships.values()),
+        )
         self.covariates = covariates
         self.entity_text_embeddings = entity_text_embeddings
         self.text_embedder = text_embedder
@@ -318,15 +323,12 @@ class LocalSearchMixedContext(LocalContextBuilder):
         text_unit_ids_set = set()
 
         unit_info_list = []
-        relationship_values = list(self.relationships.values())
 
         for index, entity in enumerate(selected_entities):
             # get matching relationships
-            entity_relationships = [
-                rel
-                for rel in relationship_values
-                if rel.source == entity.title or rel.target == entity.title
-            ]
+            entity_relationships = self.graph_index.incident_relationships({
+                entity.title
+            })
 
             for text_id in entity.text_unit_ids or []:
                 if text_id not in text_unit_ids_set and text_id in self.text_units:
@@ -397,13 +399,15 @@ class LocalSearchMixedContext(LocalContextBuilder):
             rank_description=rank_description,
             context_name="Entities",
         )
-        entity_tokens = num_tokens(entity_context, self.token_encoder)
+        entity_tokens = num_tokens_by_line(entity_context, self.token_encoder)
 
         # build relationship-covariate context
         added_entities = []
         final_context = []
         final_context_data = {}
 
+        relationships = self.graph_index.relationships
+
         # gradually add entities and associated metadata to the context until we reach limit
         for entity in selected_entities:
             current_context = []
@@ -416,7 +420,7 @@ class LocalSearchMixedContext(LocalContextBuilder):
                 relationship_context_data,
             ) = build_relationship_context(
                 selected_entities=added_entities,
-                relationships=list(self.relationships.values()),
+                relationships=relationships,
                 token_encoder=self.token_encoder,
                 max_tokens=max_tokens,
                 column_delimiter=column_delimiter,
@@ -424,10 +428,13 @@ class LocalSearchMixedContext(LocalContextBuilder):
                 include_relationship_weight=include_relationship_weight,
                 relationship_ranking_attribute=relationship_ranking_attribute,
                 context_name="Relationships",
+                graph_index=self.graph_index,
             )
             current_context.append(relationship_context)
             current_context_data["relationships"] = relationship_context_data
-            total_tokens = entity_tokens + num_tokens(
+            # the relationship/covariate tables grow one entity at a time; counting
+            # them line by line only encodes the rows that are new this iteration
+            total_tokens = entity_tokens + num_tokens_by_line(
                 relationship_context, self.token_encoder
             )
 
@@ -441,7 +448,9 @@ class LocalSearchMixedContext(LocalContextBuilder):
                     column_delimiter=column_delimiter,
                     context_name=covariate,
                 )
-                total_tokens += num_tokens(covariate_context, self.token_encoder)
+                total_tokens += num_tokens_by_line(
+                    covariate_context, self.token_encoder
+                )
                 current_context.append(covariate_context)
                 current_context_data[covariate.lower()] = covariate_context_data
 
@@ -461,12 +470,13 @@ class LocalSearchMixedContext(LocalContextBuilder):
             # and add a tag to indicate which records were included in the context window
             candidate_context_data = get_candidate_context(
                 selected_entities=selected_entities,
-                entities=list(self.entities.values()),
-                relationships=list(self.relationships.values()),
+                entities=self.graph_index.entities,
+                relationships=self.graph_index.relationships,
                 covariates=self.covariates,
                 include_entity_rank=include_entity_rank,
                 entity_rank_description=rank_description,
                 include_relationship_weight=include_relationship_weight,
+                graph_index=self.graph_index,
             )
             for key in candidate_context_data:
                 candidate_df = candidate_context_data[key]
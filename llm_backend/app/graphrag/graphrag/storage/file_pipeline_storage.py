@@ -3,6 +3,7 @@
 
 """A module containing 'FileStorage' and 'FilePipelineStorage' models."""
 
+import asyncio
 import logging
 import os
 import re
@@ -11,9 +12,10 @@ from collections.abc import Iterator
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, cast
+from uuid import uuid4
 
 import aiofiles
-from aiofiles.os import remove
+from aiofiles.os import remove, replace
 from aiofiles.ospath import exists
 
 from graphrag.logger.base import ProgressLogger
@@ -117,12 +119,37 @@ class FilePipelineStorage(PipelineStorage):
         is_bytes = isinstance(value, bytes)
         write_type = "wb" if is_bytes else "w"
         encoding = None if is_bytes else encoding or self._encoding
-        async with aiofiles.open(
-            join_path(self._root_dir, key),
-            cast("Any", write_type),
-            encoding=encoding,
-        ) as f:
-            await f.write(value)
+        file_path = join_path(self._root_dir, key)
+        # write a new file and rename it over the old one rather than truncating
+        # it in place, so hard links made by copy() keep the previous content
+        tmp_path = file_path.with_name(f".{file_path.name}.{uuid4().hex}.tmp")
+        try:
+            async with aiofiles.open(
+                tmp_path,
+                cast("Any", write_type),
+                encoding=encoding,
+            ) as f:
+                await f.write(value)
+            await replace(tmp_path, file_path)
+        finally:
+            if await exists(tmp_path):
+                await remove(tmp_path)
+
+    async def copy(
+        self, key: str, target: PipelineStorage, target_key: str | None = None
+    ) -> None:
+        """Copy key to target, hard-linking the file when both are local directories.
+
+        A hard link makes the copy free regardless of the file size. When the
+        target is on another device, or the file system has no hard links, the
+        file is copied with shutil.copyfile, which lets the kernel copy the data.
+        """
+        source = self.local_path(key)
+        destination = target.file_path(target_key or key)
+        if source is None or destination is None:
+            await super().copy(key, target, target_key)
+            return
+        await asyncio.to_thread(_link_or_copy, source, destination)
 
     async def has(self, key: str) -> bool:
         """Has method definition."""
@@ -147,6 +174,15 @@ class FilePipelineStorage(PipelineStorage):
             return self
         return FilePipelineStorage(str(Path(self._root_dir) / Path(name)))
 
+    def file_path(self, key: str) -> Path | None:
+        """Return the path a file for the given key is written to."""
+        return join_path(self._root_dir, key)
+
+    def local_path(self, key: str) -> Path | None:
+        """Return the path of the file for the given key, if it exists."""
+        file_path = join_path(self._root_dir, key)
+        return file_path if file_path.is_file() else None
+
     def keys(self) -> list[str]:
         """Return the keys in the storage."""
         return [item.name for item in Path(self._root_dir).iterdir() if item.is_file()]
@@ -166,6 +202,15 @@ def join_path(file_path: str, file_name: str) -> Path:
     return Path(file_path) / Path(file_name).parent / Path(file_name).name
 
 
+def _link_or_copy(source: Path, destination: Path) -> None:
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    destination.unlink(missing_ok=True)
+    try:
+        os.link(source, destination)
+    except OSError:
+        shutil.copyfile(source, destination)
+
+
 def create_file_storage(**kwargs: Any) -> PipelineStorage:
     """Create a file based storage."""
     base_dir = kwargs["base_dir"]
@@ -8,6 +8,8 @@ from typing import TYPE_CHECKING, Any
 from graphrag.storage.file_pipeline_storage import FilePipelineStorage
 
 if TYPE_CHECKING:
+    from pathlib import Path
+
     from graphrag.storage.pipeline_storage import PipelineStorage
 
 
@@ -76,3 +78,11 @@ class MemoryPipelineStorage(FilePipelineStorage):
     def keys(self) -> list[str]:
         """Return the keys in the storage."""
         return list(self._storage.keys())
+
+    def file_path(self, key: str) -> "Path | None":
+        """Return None, values are held in memory rather than in files."""
+        return None
+
+    def local_path(self, key: str) -> "Path | None":
+        """Return None, values are held in memory rather than in files."""
+        return None
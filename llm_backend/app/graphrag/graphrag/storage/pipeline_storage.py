@@ -7,6 +7,7 @@ import re
 from abc import ABCMeta, abstractmethod
 from collections.abc import Iterator
 from datetime import datetime
+from pathlib import Path
 from typing import Any
 
 from graphrag.logger.base import ProgressLogger
@@ -94,6 +95,34 @@ class PipelineStorage(metaclass=ABCMeta):
             - output - The creation date for the given key.
         """
 
+    async def copy(
+        self, key: str, target: "PipelineStorage", target_key: str | None = None
+    ) -> None:
+        """Copy the value of key to target_key (default: key) in target.
+
+        The value is copied as bytes, without decoding it. Storages that can
+        copy more cheaply (e.g. by linking files) override this.
+        """
+        await target.set(target_key or key, await self.get(key, as_bytes=True))
+
+    def file_path(self, key: str) -> Path | None:
+        """Return the local file path a value for the given key is written to.
+
+        Only storages that write plain files to the local file system return a
+        path, which copy() of such a storage links or copies the file to; all
+        others return None.
+        """
+        return None
+
+    def local_path(self, key: str) -> Path | None:
+        """Return the local file path of the given key, if the storage has one.
+
+        Storages backed by the local file system return the path so readers can
+        memory-map the file instead of loading it through get(); all others
+        return None.
+        """
+        return None
+
 
 def get_timestamp_formatted_with_local_tz(timestamp: datetime) -> str:
     """Get the formatted timestamp with the local time zone."""
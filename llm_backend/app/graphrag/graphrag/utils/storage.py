@@ -3,25 +3,74 @@
 
 """Storage functions for the GraphRAG run module."""
 
+import json
 import logging
-from io import BytesIO
+from pathlib import Path
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 
 from graphrag.storage.pipeline_storage import PipelineStorage
 
 log = logging.getLogger(__name__)
 
 
-async def load_table_from_storage(name: str, storage: PipelineStorage) -> pd.DataFrame:
-    """Load a parquet from the storage instance."""
+def _arrow_list_dtype(arrow_type: pa.DataType) -> pd.ArrowDtype | None:
+    if (
+        pa.types.is_list(arrow_type)
+        or pa.types.is_large_list(arrow_type)
+        or pa.types.is_fixed_size_list(arrow_type)
+    ):
+        return pd.ArrowDtype(arrow_type)
+    return None
+
+
+def read_parquet_table(
+    source: str | Path | bytes,
+    columns: list[str] | None = None,
+    arrow_lists: bool = False,
+) -> pd.DataFrame:
+    """Read a parquet file into a dataframe, decoding only the requested columns.
+
+    A path is memory-mapped instead of being read into Python bytes first.
+    Requested columns missing from the file are skipped, so callers can ask for
+    optional columns. With arrow_lists, list columns (id lists, embeddings) stay
+    Arrow-backed (pd.ArrowDtype) instead of becoming one numpy array per row;
+    values are only materialized when accessed.
+    """
+    memory_map = not isinstance(source, bytes)
+    if isinstance(source, bytes):
+        source = pa.BufferReader(source)
+    with pq.ParquetFile(source, memory_map=memory_map) as f:
+        if columns is not None:
+            available = set(f.schema_arrow.names)
+            columns = [column for column in columns if column in available]
+        table = f.read(columns=columns, use_pandas_metadata=True)
+    return table.to_pandas(types_mapper=_arrow_list_dtype if arrow_lists else None)
+
+
+async def load_table_from_storage(
+    name: str,
+    storage: PipelineStorage,
+    columns: list[str] | None = None,
+    arrow_lists: bool = False,
+) -> pd.DataFrame:
+    """Load a parquet from the storage instance.
+
+    Storages backed by local files are read in place (memory-mapped); see
+    read_parquet_table for columns and arrow_lists.
+    """
     filename = f"{name}.parquet"
     if not await storage.has(filename):
         msg = f"Could not find {filename} in storage!"
         raise ValueError(msg)
     try:
         log.info("reading table from storage: %s", filename)
-        return pd.read_parquet(BytesIO(await storage.get(filename, as_bytes=True)))
+        source = storage.local_path(filename) or await storage.get(
+            filename, as_bytes=True
+        )
+        return read_parquet_table(source, columns=columns, arrow_lists=arrow_lists)
     except Exception:
         log.exception("error loading table from storage: %s", filename)
         raise
@@ -34,6 +83,60 @@ async def write_table_to_storage(
     await storage.set(f"{name}.parquet", table.to_parquet())
 
 
+async def append_table_to_storage(
+    table: pd.DataFrame,
+    name: str,
+    previous_storage: PipelineStorage,
+    storage: PipelineStorage,
+) -> bool:
+    """Write the table stored in previous_storage with the rows of table appended.
+
+    The previous row groups are carried over as Arrow data and the new rows are
+    written after them as extra row groups, so the existing rows are never
+    converted to pandas. Returns False, without writing anything, when table
+    does not fit the stored schema; callers then merge the tables themselves.
+    """
+    filename = f"{name}.parquet"
+    source = previous_storage.local_path(filename) or await previous_storage.get(
+        filename, as_bytes=True
+    )
+    memory_map = not isinstance(source, bytes)
+    if isinstance(source, bytes):
+        source = pa.BufferReader(source)
+    sink = pa.BufferOutputStream()
+    with pq.ParquetFile(source, memory_map=memory_map) as f:
+        schema = f.schema_arrow
+        if list(table.columns) != schema.names:
+            log.info("columns of %s changed, not appending to it", filename)
+            return False
+        try:
+            delta = pa.Table.from_pandas(table, preserve_index=False).cast(schema)
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError, pa.ArrowTypeError):
+            log.info("types of %s changed, not appending to it", filename)
+            return False
+        schema = _with_range_index(schema, f.metadata.num_rows + delta.num_rows)
+        with pq.ParquetWriter(sink, schema) as writer:
+            for i in range(f.num_row_groups):
+                writer.write_table(f.read_row_group(i))
+            writer.write_table(delta)
+    await storage.set(filename, sink.getvalue().to_pybytes())
+    return True
+
+
+def _with_range_index(schema: pa.Schema, num_rows: int) -> pa.Schema:
+    """Return schema with its pandas RangeIndex (if any) extended to num_rows."""
+    metadata = schema.pandas_metadata
+    if metadata is None:
+        return schema
+    for index in metadata["index_columns"]:
+        if isinstance(index, dict) and index.get("kind") == "range":
+            index["start"], index["stop"], index["step"] = 0, num_rows, 1
+    return schema.with_metadata({
+        **schema.metadata,
+        b"pandas": json.dumps(metadata).encode("utf-8"),
+    })
+
+
 async def delete_table_from_storage(name: str, storage: PipelineStorage) -> None:
     """Delete a table to storage."""
     await storage.delete(f"{name}.parquet")
@@ -70,12 +70,24 @@ class BaseVectorStore(ABC):
     ) -> list[VectorStoreSearchResult]:
         """Perform ANN search by vector."""
 
+    def similarity_search_by_vectors(
+        self, query_embeddings: list[list[float]], k: int = 10, **kwargs: Any
+    ) -> list[list[VectorStoreSearchResult]]:
+        """Perform ANN search for several vectors, one result list per vector."""
+        return [
+            self.similarity_search_by_vector(query_embedding, k, **kwargs)
+            for query_embedding in query_embeddings
+        ]
+
     @abstractmethod
     def similarity_search_by_text(
         self, text: str, text_embedder: TextEmbedder, k: int = 10, **kwargs: Any
     ) -> list[VectorStoreSearchResult]:
         """Perform ANN search by text."""
 
+    def create_index(self) -> None:  # noqa: B027
+        """Build an ANN index over the loaded documents, if the store supports one."""
+
     @abstractmethod
     def filter_by_id(self, include_ids: list[str] | list[int]) -> Any:
         """Build a query filter to filter documents by id."""
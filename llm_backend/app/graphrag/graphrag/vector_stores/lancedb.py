@@ -4,13 +4,17 @@
 """The LanceDB vector storage implementation package."""
 
 import json  # noqa: I001
+import math
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
+import numpy as np
 import pyarrow as pa
 
 from graphrag.data_model.types import TextEmbedder
 
 from graphrag.vector_stores.base import (
+    DEFAULT_VECTOR_SIZE,
     BaseVectorStore,
     VectorStoreDocument,
     VectorStoreSearchResult,
@@ -18,11 +22,46 @@ from graphrag.vector_stores.base import (
 import lancedb
 
 
+# IVF k-means and PQ codebook training need at least this many rows
+MIN_INDEX_ROWS = 256
+# threads used by similarity_search_by_vectors
+MAX_SEARCH_THREADS = 8
+
+
+def _schema(vector_size: int) -> pa.Schema:
+    return pa.schema([
+        pa.field("id", pa.string()),
+        pa.field("text", pa.string()),
+        pa.field("vector", pa.list_(pa.float32(), vector_size)),
+        pa.field("attributes", pa.string()),
+    ])
+
+
+def _default_num_sub_vectors(vector_size: int) -> int:
+    """Use 16-dimensional PQ sub-vectors when the vector size allows it."""
+    for sub_vector_size in (16, 8, 4, 2):
+        if vector_size % sub_vector_size == 0:
+            return vector_size // sub_vector_size
+    return vector_size
+
+
 class LanceDBVectorStore(BaseVectorStore):
-    """LanceDB vector storage implementation."""
+    """LanceDB vector storage implementation.
+
+    Vectors are stored as float32 fixed-size lists so they can be indexed. When
+    index_type is configured ("IVF_PQ", "IVF_HNSW_SQ" or "IVF_HNSW_PQ"),
+    create_index builds that index after loading and queries honour the
+    nprobes, refine_factor and ef settings; otherwise every search is a flat scan.
+    """
 
     def __init__(self, **kwargs: Any) -> None:
         super().__init__(**kwargs)
+        self.index_type: str | None = kwargs.get("index_type")
+        self.index_num_partitions: int | None = kwargs.get("index_num_partitions")
+        self.index_num_sub_vectors: int | None = kwargs.get("index_num_sub_vectors")
+        self.nprobes: int | None = kwargs.get("nprobes")
+        self.refine_factor: int | None = kwargs.get("refine_factor")
+        self.ef: int | None = kwargs.get("ef")
 
     def connect(self, **kwargs: Any) -> Any:
         """Connect to the vector storage."""
@@ -39,45 +78,66 @@ class LanceDBVectorStore(BaseVectorStore):
         self, documents: list[VectorStoreDocument], overwrite: bool = True
     ) -> None:
         """Load documents into vector storage."""
-        data = [
-            {
-                "id": document.id,
-                "text": document.text,
-                "vector": document.vector,
-                "attributes": json.dumps(document.attributes),
-            }
-            for document in documents
-            if document.vector is not None
-        ]
-
-        if len(data) == 0:
-            data = None
-
-        schema = pa.schema([
-            pa.field("id", pa.string()),
-            pa.field("text", pa.string()),
-            pa.field("vector", pa.list_(pa.float64())),
-            pa.field("attributes", pa.string()),
-        ])
-        # NOTE: If modifying the next section of code, ensure that the schema remains the same.
-        #       The pyarrow format of the 'vector' field may change if the order of operations is changed
-        #       and will break vector search.
-        if overwrite:
-            if data:
-                self.document_collection = self.db_connection.create_table(
-                    self.collection_name, data=data, mode="overwrite"
-                )
-            else:
-                self.document_collection = self.db_connection.create_table(
-                    self.collection_name, schema=schema, mode="overwrite"
-                )
-        else:
-            # add data to existing table
+        documents = [document for document in documents if document.vector is not None]
+        vector_size = (
+            len(documents[0].vector) if documents else DEFAULT_VECTOR_SIZE  # type: ignore
+        )
+        if not overwrite:
+            # add data to an existing table, keeping whatever vector type it has
             self.document_collection = self.db_connection.open_table(
                 self.collection_name
             )
-            if data:
-                self.document_collection.add(data)
+            vector_type = self.document_collection.schema.field("vector").type
+            if pa.types.is_fixed_size_list(vector_type):
+                vector_size = vector_type.list_size
+
+        schema = _schema(vector_size)
+        # NOTE: the vector column must stay a float32 fixed-size list, both to halve
+        #       the scan bandwidth of float64 and because LanceDB can only index and
+        #       vector-search fixed-size lists.
+        vectors = np.asarray(
+            [document.vector for document in documents], dtype=np.float32
+        ).reshape(-1)
+        data = pa.Table.from_arrays(
+            [
+                pa.array([document.id for document in documents], pa.string()),
+                pa.array([document.text for document in documents], pa.string()),
+                pa.FixedSizeListArray.from_arrays(vectors, vector_size),
+                pa.array(
+                    [json.dumps(document.attributes) for document in documents],
+                    pa.string(),
+                ),
+            ],
+            schema=schema,
+        )
+        if overwrite:
+            self.document_collection = self.db_connection.create_table(
+                self.collection_name, data=data, schema=schema, mode="overwrite"
+            )
+        elif data.num_rows:
+            self.document_collection.add(data)
+
+    def create_index(self) -> None:
+        """Build the configured ANN index over the vector column.
+
+        Tables smaller than MIN_INDEX_ROWS keep using the flat scan, which is
+        exact and fast enough at that size.
+        """
+        if not self.index_type or self.document_collection is None:
+            return
+        num_rows = self.document_collection.count_rows()
+        if num_rows < MIN_INDEX_ROWS:
+            return
+        vector_size = self.document_collection.schema.field("vector").type.list_size
+        self.document_collection.create_index(
+            vector_column_name="vector",
+            index_type=self.index_type,
+            num_partitions=self.index_num_partitions
+            or max(1, round(math.sqrt(num_rows))),
+            num_sub_vectors=self.index_num_sub_vectors
+            or _default_num_sub_vectors(vector_size),
+            replace=True,
+        )
 
     def filter_by_id(self, include_ids: list[str] | list[int]) -> Any:
         """Build a query filter to filter documents by id."""
@@ -97,23 +157,19 @@ class LanceDBVectorStore(BaseVectorStore):
         self, query_embedding: list[float], k: int = 10, **kwargs: Any
     ) -> list[VectorStoreSearchResult]:
         """Perform a vector-based similarity search."""
+        query = self.document_collection.search(
+            query=np.asarray(query_embedding, dtype=np.float32),
+            vector_column_name="vector",
+        )
+        if self.nprobes:
+            query = query.nprobes(self.nprobes)
+        if self.refine_factor:
+            query = query.refine_factor(self.refine_factor)
+        if self.ef:
+            query = query.ef(self.ef)
         if self.query_filter:
-            docs = (
-                self.document_collection.search(
-                    query=query_embedding, vector_column_name="vector"
-                )
-                .where(self.query_filter, prefilter=True)
-                .limit(k)
-                .to_list()
-            )
-        else:
-            docs = (
-                self.document_collection.search(
-                    query=query_embedding, vector_column_name="vector"
-                )
-                .limit(k)
-                .to_list()
-            )
+            query = query.where(self.query_filter, prefilter=True)
+        docs = query.limit(k).to_list()
         return [
             VectorStoreSearchResult(
                 document=VectorStoreDocument(
@@ -127,6 +183,28 @@ class LanceDBVectorStore(BaseVectorStore):
             for doc in docs
         ]
 
+    def similarity_search_by_vectors(
+        self, query_embeddings: list[list[float]], k: int = 10, **kwargs: Any
+    ) -> list[list[VectorStoreSearchResult]]:
+        """Perform vector-based similarity searches for several vectors at once.
+
+        LanceDB has no multi-vector query, so the searches run on a thread pool;
+        the scans themselves release the GIL.
+        """
+        if len(query_embeddings) <= 1:
+            return super().similarity_search_by_vectors(query_embeddings, k, **kwargs)
+        with ThreadPoolExecutor(
+            max_workers=min(MAX_SEARCH_THREADS, len(query_embeddings))
+        ) as executor:
+            return list(
+                executor.map(
+                    lambda query_embedding: self.similarity_search_by_vector(
+                        query_embedding, k, **kwargs
+                    ),
+                    query_embeddings,
+                )
+            )
+
     def similarity_search_by_text(
         self, text: str, text_embedder: TextEmbedder, k: int = 10, **kwargs: Any
     ) -> list[VectorStoreSearchResult]:
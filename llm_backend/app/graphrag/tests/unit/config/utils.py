@@ -208,6 +208,7 @@ def assert_chunking_configs(actual: ChunkingConfig, expected: ChunkingConfig) ->
     assert actual.encoding_model == expected.encoding_model
     assert actual.prepend_metadata == expected.prepend_metadata
     assert actual.chunk_size_includes_metadata == expected.chunk_size_includes_metadata
+    assert actual.num_threads == expected.num_threads
 
 
 def assert_snapshots_configs(
@@ -0,0 +1,55 @@
+# Copyright (c) 2024 Microsoft Corporation.
+# Licensed under the MIT License
+
+import math
+
+import pandas as pd
+
+from graphrag.index.operations.build_noun_graph.build_noun_graph import (
+    _extract_edges,
+)
+
+
+def _nodes() -> pd.DataFrame:
+    return pd.DataFrame({
+        "title": ["river", "bridge", "city", "harbor"],
+        "frequency": [3, 2, 2, 1],
+        "text_unit_ids": [["t2", "t1", "t3"], ["t1", "t3"], ["t2", "t1"], []],
+    })
+
+
+def test_edges_are_counted_per_text_unit():
+    edges = _extract_edges(_nodes(), normalize_edge_weights=False)
+
+    expected = pd.DataFrame({
+        "source": ["bridge", "bridge", "city"],
+        "target": ["city", "river", "river"],
+        "weight": [1, 2, 2],
+        "text_unit_ids": [["t1"], ["t1", "t3"], ["t1", "t2"]],
+    })
+    pd.testing.assert_frame_equal(edges, expected)
+
+
+def test_pmi_edge_weights():
+    edges = _extract_edges(_nodes(), normalize_edge_weights=True)
+
+    def pmi(weight, source_freq, target_freq):
+        return math.log2((weight / 5) / ((source_freq / 8) * (target_freq / 8)))
+
+    assert list(edges.columns) == ["source", "target", "weight", "text_unit_ids"]
+    assert edges["weight"].tolist() == [
+        pmi(1, 2, 2),
+        pmi(2, 2, 3),
+        pmi(2, 2, 3),
+    ]
+
+
+def test_no_shared_text_units():
+    nodes = pd.DataFrame({
+        "title": ["a", "b"],
+        "frequency": [1, 1],
+        "text_unit_ids": [["t1"], ["t2"]],
+    })
+    edges = _extract_edges(nodes, normalize_edge_weights=False)
+    assert edges.empty
+    assert list(edges.columns) == ["source", "target", "weight", "text_unit_ids"]
@@ -178,3 +178,32 @@ def test_chunk_text(mock_progress_ticker, mock_run_strategy, mock_load_strategy)
     mock_run_strategy.assert_called_with(
         mock_load_strategy(), "The Shining", ANY, mock_progress_ticker()
     )
+
+
+@mock.patch("graphrag.index.operations.chunk_text.strategies.run_tokens_batched")
+def test_chunk_text_tokens_batches_all_rows(mock_run_tokens_batched):
+    input_data = pd.DataFrame({
+        "texts": [
+            "The Shining",
+            [("doc1", "Carrie"), ("doc2", "Misery")],
+        ]
+    })
+    mock_run_tokens_batched.return_value = [
+        [TextChunk(text_chunk="The Shining", source_doc_indices=[0], n_tokens=3)],
+        [
+            TextChunk(text_chunk="Carrie", source_doc_indices=[0], n_tokens=2),
+            TextChunk(text_chunk="rieMisery", source_doc_indices=[0, 1], n_tokens=3),
+        ],
+    ]
+
+    chunked = chunk_text(
+        input_data, "texts", 3, 1, "model", ChunkStrategyType.tokens, Mock()
+    )
+
+    mock_run_tokens_batched.assert_called_once_with(
+        [["The Shining"], ["Carrie", "Misery"]], ANY, ANY
+    )
+    assert chunked.tolist() == [
+        ["The Shining"],
+        [(["doc1"], "Carrie", 2), (["doc1", "doc2"], "rieMisery", 3)],
+    ]
@@ -9,6 +9,7 @@ from graphrag.index.operations.chunk_text.strategies import (
     get_encoding_fn,
     run_sentences,
     run_tokens,
+    run_tokens_batched,
 )
 from graphrag.index.operations.chunk_text.typing import TextChunk
 
@@ -90,6 +91,34 @@ class TestRunTokens:
         assert "123" in chunks[0].text_chunk
 
 
+@patch("tiktoken.get_encoding")
+def test_run_tokens_batched_matches_run_tokens(mock_get_encoding):
+    mock_encoder = Mock()
+    mock_encoder.encode.side_effect = lambda x: list(x.encode())
+    mock_encoder.encode_batch.side_effect = lambda texts, num_threads: [
+        list(text.encode()) for text in texts
+    ]
+    mock_encoder.decode.side_effect = lambda x: bytes(x).decode()
+    mock_get_encoding.return_value = mock_encoder
+
+    inputs = [
+        ["Marley was dead: to begin with.", "There is no doubt whatever about that."],
+        ["Scrooge signed it."],
+    ]
+    config = ChunkingConfig(
+        size=8, overlap=2, encoding_model="fake-encoding", num_threads=2
+    )
+    tick = Mock()
+
+    batched = run_tokens_batched(inputs, config, tick)
+
+    assert batched == [list(run_tokens(texts, config, Mock())) for texts in inputs]
+    mock_encoder.encode_batch.assert_called_once_with(
+        [text for texts in inputs for text in texts], num_threads=2
+    )
+    tick.assert_called_once_with(3)
+
+
 @patch("tiktoken.get_encoding")
 def test_get_encoding_fn_encode(mock_get_encoding):
     # Create a mock encoding object with encode and decode methods
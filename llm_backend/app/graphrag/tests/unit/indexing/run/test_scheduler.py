@@ -0,0 +1,175 @@
+# Copyright (c) 2024 Microsoft Corporation.
+# Licensed under the MIT License
+
+import asyncio
+
+import pytest
+
+from graphrag.index.run.checkpoint import PipelineCheckpoint
+from graphrag.index.run.scheduler import critical_path, run_workflows
+from graphrag.index.typing.pipeline import Pipeline
+from graphrag.index.typing.workflow import WorkflowTables
+from graphrag.storage.memory_pipeline_storage import MemoryPipelineStorage
+
+TABLES = {
+    "create_base_text_units": WorkflowTables(["documents"], ["text_units"]),
+    "create_final_documents": WorkflowTables(
+        ["documents", "text_units"], ["documents"]
+    ),
+    "extract_graph": WorkflowTables(["text_units"], ["entities", "relationships"]),
+    "finalize_graph": WorkflowTables(
+        ["entities", "relationships"], ["entities", "relationships"]
+    ),
+    "extract_covariates": WorkflowTables(["text_units"], ["covariates"]),
+    "create_communities": WorkflowTables(
+        ["entities", "relationships"], ["communities"]
+    ),
+    "create_final_text_units": WorkflowTables(
+        ["text_units", "entities", "relationships", "covariates"], ["text_units"]
+    ),
+}
+
+
+def _pipeline(tables=TABLES) -> Pipeline:
+    return Pipeline([(name, None) for name in TABLES], tables)  # type: ignore
+
+
+def test_dependencies_follow_table_hazards():
+    dependencies = _pipeline().dependencies()
+
+    assert dependencies["create_base_text_units"] == set()
+    assert dependencies["create_final_documents"] == {"create_base_text_units"}
+    assert dependencies["extract_graph"] == {"create_base_text_units"}
+    assert dependencies["extract_covariates"] == {"create_base_text_units"}
+    assert dependencies["create_communities"] == {"finalize_graph"}
+    # overwriting text_units waits for everything that read the old table
+    assert dependencies["create_final_text_units"] == {
+        "create_base_text_units",
+        "create_final_documents",
+        "extract_graph",
+        "finalize_graph",
+        "extract_covariates",
+    }
+
+
+def test_undeclared_workflow_is_a_barrier():
+    tables = {k: v for k, v in TABLES.items() if k != "extract_graph"}
+    dependencies = _pipeline(tables).dependencies()
+
+    assert dependencies["extract_graph"] == {
+        "create_base_text_units",
+        "create_final_documents",
+    }
+    assert "extract_graph" in dependencies["extract_covariates"]
+
+
+async def test_run_workflows_overlaps_independent_workflows():
+    pipeline = _pipeline()
+    running: set[str] = set()
+    overlaps: list[set[str]] = []
+
+    async def run(name):
+        running.add(name)
+        overlaps.append(set(running))
+        await asyncio.sleep(0.01)
+        running.discard(name)
+        return name.upper()
+
+    results = [
+        item
+        async for item in run_workflows(pipeline.names(), pipeline.dependencies(), run)
+    ]
+
+    names = [name for name, _, _ in results]
+    assert names[0] == "create_base_text_units"
+    assert names[-1] == "create_final_text_units"
+    assert all(result == name.upper() for name, result, _ in results)
+    assert {"extract_graph", "extract_covariates", "create_final_documents"} in overlaps
+
+
+async def test_run_workflows_stops_after_failure():
+    pipeline = _pipeline()
+    started: list[str] = []
+
+    async def run(name):
+        started.append(name)
+        if name == "extract_graph":
+            msg = "llm unavailable"
+            raise ValueError(msg)
+        await asyncio.sleep(0.01)
+
+    results = [
+        item
+        async for item in run_workflows(pipeline.names(), pipeline.dependencies(), run)
+    ]
+
+    name, _, error = results[-1]
+    assert name == "extract_graph"
+    assert isinstance(error, ValueError)
+    # already running workflows finish, nothing depending on the failure starts
+    assert "extract_covariates" in [name for name, _, error in results if not error]
+    assert "finalize_graph" not in started
+
+
+def test_critical_path():
+    pipeline = _pipeline()
+    timings = {
+        "create_base_text_units": {"overall": 1.0},
+        "create_final_documents": {"overall": 0.5},
+        "extract_graph": {"overall": 10.0},
+        "finalize_graph": {"overall": 1.0},
+        "extract_covariates": {"overall": 8.0},
+        "create_communities": {"overall": 2.0},
+        "create_final_text_units": {"overall": 0.5},
+    }
+
+    path, runtime = critical_path(pipeline.names(), pipeline.dependencies(), timings)
+
+    assert path == [
+        "create_base_text_units",
+        "extract_graph",
+        "finalize_graph",
+        "create_communities",
+    ]
+    assert runtime == pytest.approx(14.0)
+
+
+async def test_checkpoint_resumes_after_completed_workflows():
+    pipeline = _pipeline()
+    storage = MemoryPipelineStorage()
+    checkpoint = await PipelineCheckpoint.load(storage, "run-1")
+    for name in ["create_base_text_units", "create_final_documents", "extract_graph"]:
+        for table in TABLES[name].outputs:
+            await storage.set(f"{table}.parquet", f"{name} {table}".encode())
+        await checkpoint.mark_complete(name, TABLES[name].outputs)
+
+    resumed = await PipelineCheckpoint.load(storage, "run-1")
+    assert await resumed.resume(pipeline) == {
+        "create_base_text_units",
+        "create_final_documents",
+        "extract_graph",
+    }
+
+    # a table changed after it was written: its writer and dependents rerun
+    await storage.set("entities.parquet", b"partially rewritten")
+    assert await resumed.resume(pipeline) == {
+        "create_base_text_units",
+        "create_final_documents",
+    }
+
+    other_input = await PipelineCheckpoint.load(storage, "run-2")
+    assert await other_input.resume(pipeline) == set()
+
+
+async def test_cleared_checkpoint_resumes_nothing():
+    pipeline = _pipeline()
+    storage = MemoryPipelineStorage()
+    checkpoint = await PipelineCheckpoint.load(storage, "run-1")
+    for name in TABLES:
+        await checkpoint.mark_complete(name, [])
+
+    await checkpoint.clear()
+
+    assert not await storage.has("checkpoint.json")
+    resumed = await PipelineCheckpoint.load(storage, "run-1")
+    assert await resumed.resume(pipeline) == set()
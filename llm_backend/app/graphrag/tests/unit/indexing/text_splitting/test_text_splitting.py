@@ -11,6 +11,7 @@ from graphrag.index.text_splitting.text_splitting import (
     NoopTextSplitter,
     Tokenizer,
     TokenTextSplitter,
+    split_multiple_encoded_texts_on_tokens,
     split_multiple_texts_on_tokens,
     split_single_text_on_tokens,
 )
@@ -202,3 +203,35 @@ def test_split_single_text_on_tokens_no_overlap():
 
     result = split_single_text_on_tokens(text=text, tokenizer=tokenizer)
     assert result == expected_splits
+
+
+def test_split_multiple_encoded_texts_on_tokens():
+    texts = ["first text", "", "second", "a third text"]
+    mocked_tokenizer = MockTokenizer()
+    tokenizer = Tokenizer(
+        chunk_overlap=2,
+        tokens_per_chunk=8,
+        decode=mocked_tokenizer.decode,
+        encode=mocked_tokenizer.encode,
+    )
+
+    chunks = split_multiple_encoded_texts_on_tokens(
+        [mocked_tokenizer.encode(text) for text in texts], tokenizer
+    )
+
+    assert [chunk.text_chunk for chunk in chunks] == [
+        "first te",
+        "textseco",
+        "conda th",
+        "third te",
+        "text",
+    ]
+    assert [chunk.source_doc_indices for chunk in chunks] == [
+        [0],
+        [0, 2],
+        [2, 3],
+        [3],
+        [3],
+    ]
+    assert [chunk.n_tokens for chunk in chunks] == [8, 8, 8, 8, 4]
+    assert chunks == split_multiple_texts_on_tokens(texts, tokenizer, tick=None)
@@ -0,0 +1,50 @@
+# Copyright (c) 2024 Microsoft Corporation.
+# Licensed under the MIT License
+
+import pandas as pd
+import pytest
+
+from graphrag.config.enums import AsyncType
+from graphrag.index.utils.derive_from_rows import (
+    ParallelizationError,
+    derive_from_rows,
+)
+
+_offset = 0
+
+
+def _init_offset(offset: int) -> None:
+    global _offset
+    _offset = offset
+
+
+def _add_offset(row: pd.Series) -> int:
+    return row["value"] + _offset
+
+
+def _fail_on_odd(row: pd.Series) -> int:
+    if row["value"] % 2:
+        msg = f"odd value {row['value']}"
+        raise ValueError(msg)
+    return row["value"]
+
+
+async def test_process_mode_keeps_row_order():
+    input = pd.DataFrame({"value": range(100)})
+    result = await derive_from_rows(
+        input,
+        _add_offset,
+        num_threads=2,
+        async_type=AsyncType.Process,
+        process_initializer=_init_offset,
+        process_initargs=(1000,),
+    )
+    assert result == [value + 1000 for value in range(100)]
+
+
+async def test_process_mode_reports_errors():
+    input = pd.DataFrame({"value": range(10)})
+    with pytest.raises(ParallelizationError, match="5 Errors"):
+        await derive_from_rows(
+            input, _fail_on_odd, num_threads=2, async_type=AsyncType.Process
+        )
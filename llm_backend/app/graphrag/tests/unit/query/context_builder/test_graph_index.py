@@ -0,0 +1,123 @@
+# Copyright (c) 2024 Microsoft Corporation.
+# Licensed under the MIT License
+
+import random
+
+from graphrag.data_model.entity import Entity
+from graphrag.data_model.relationship import Relationship
+from graphrag.query.context_builder.graph_index import GraphIndex
+from graphrag.query.context_builder.local_context import (
+    _filter_relationships,
+    get_candidate_context,
+)
+from graphrag.query.input.retrieval.relationships import (
+    get_candidate_relationships,
+    get_in_network_relationships,
+    get_out_network_relationships,
+)
+
+
+def _random_graph(
+    seed: int, n_entities: int = 60, n_relationships: int = 240
+) -> tuple[list[Entity], list[Relationship]]:
+    rng = random.Random(seed)
+    entities = [
+        Entity(
+            id=f"e{i}",
+            short_id=str(i),
+            title=f"E{i}",
+            rank=rng.choice([None, 0, 1, 2, 3, 5, 8]),
+        )
+        for i in range(n_entities)
+    ]
+    relationships = []
+    for i in range(n_relationships):
+        source = rng.choice(entities).title
+        target = rng.choice(entities).title
+        relationships.append(
+            Relationship(
+                id=f"r{i}",
+                short_id=str(i),
+                source=source,
+                target=target,
+                weight=rng.choice([0.5, 1.0, 2.0]),
+                rank=rng.choice([1, 2, 3, 4]),
+            )
+        )
+    return entities, relationships
+
+
+def _ids(items) -> list[str]:
+    return [item.id for item in items]
+
+
+def test_retrieval_matches_full_scan():
+    for seed in range(20):
+        entities, relationships = _random_graph(seed)
+        index = GraphIndex(entities, relationships)
+        rng = random.Random(seed)
+        selected = rng.sample(entities, rng.randint(1, 8))
+        for attribute in ["rank", "weight"]:
+            assert _ids(
+                get_in_network_relationships(selected, relationships, attribute)
+            ) == _ids(
+                get_in_network_relationships(
+                    selected, relationships, attribute, graph_index=index
+                )
+            )
+            assert _ids(
+                get_out_network_relationships(selected, relationships, attribute)
+            ) == _ids(
+                get_out_network_relationships(
+                    selected, relationships, attribute, graph_index=index
+                )
+            )
+        assert _ids(get_candidate_relationships(selected, relationships)) == _ids(
+            get_candidate_relationships(selected, relationships, graph_index=index)
+        )
+
+
+def test_filter_relationships_matches_full_scan():
+    for seed in range(20):
+        entities, relationships = _random_graph(seed)
+        index = GraphIndex(entities, relationships)
+        rng = random.Random(seed)
+        selected = rng.sample(entities, rng.randint(1, 8))
+        for attribute in ["rank", "weight"]:
+            # links are written onto the shared relationship objects, so capture
+            # them before the second call overwrites them
+            expected = _filter_relationships(selected, relationships, 3, attribute)
+            expected_links = [
+                (r.id, (r.attributes or {}).get("links")) for r in expected
+            ]
+            actual = _filter_relationships(
+                selected, relationships, 3, attribute, graph_index=index
+            )
+            actual_links = [(r.id, (r.attributes or {}).get("links")) for r in actual]
+            assert _ids(expected) == _ids(actual)
+            assert expected_links == actual_links
+
+
+def test_candidate_context_matches_full_scan():
+    entities, relationships = _random_graph(7)
+    index = GraphIndex(entities, relationships)
+    selected = entities[:5]
+    expected = get_candidate_context(selected, entities, relationships, {})
+    actual = get_candidate_context(
+        selected, entities, relationships, {}, graph_index=index
+    )
+    for key in ["relationships", "entities"]:
+        assert expected[key].equals(actual[key])
+
+
+def test_incident_relationships_include_self_loops_once():
+    entities = [Entity(id=f"e{i}", short_id=str(i), title=f"E{i}") for i in range(3)]
+    relationships = [
+        Relationship(id="r0", short_id="0", source="E0", target="E1"),
+        Relationship(id="r1", short_id="1", source="E1", target="E2"),
+        Relationship(id="r2", short_id="2", source="E1", target="E1"),
+    ]
+    index = GraphIndex(entities, relationships)
+    assert _ids(index.incident_relationships({"E1"})) == ["r0", "r1", "r2"]
+    assert _ids(index.incident_relationships({"E2"})) == ["r1"]
+    assert index.incident_relationships({"missing"}) == []
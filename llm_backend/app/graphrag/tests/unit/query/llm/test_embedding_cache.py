@@ -0,0 +1,124 @@
+# Copyright (c) 2024 Microsoft Corporation.
+# Licensed under the MIT License
+
+from types import SimpleNamespace
+
+from graphrag.query.llm.embedding_cache import CachedEmbeddingModel
+from graphrag.query.structured_search.drift_search.action import DriftAction
+from graphrag.query.structured_search.drift_search.search import DRIFTSearch
+
+
+class RecordingEmbedder:
+    """Deterministic fake embedding model that records every request."""
+
+    def __init__(self):
+        self.calls: list[list[str]] = []
+
+    @staticmethod
+    def vector(text: str) -> list[float]:
+        return [float(len(text)), float(sum(map(ord, text)) % 97), 0.5]
+
+    def embed(self, text, **kwargs):
+        self.calls.append([text])
+        return self.vector(text)
+
+    async def aembed(self, text, **kwargs):
+        return self.embed(text)
+
+    def embed_batch(self, text_list, **kwargs):
+        self.calls.append(list(text_list))
+        return [self.vector(text) for text in text_list]
+
+    async def aembed_batch(self, text_list, **kwargs):
+        return self.embed_batch(text_list)
+
+
+def test_repeated_queries_hit_memory():
+    model = RecordingEmbedder()
+    cache = CachedEmbeddingModel(model)
+    first = cache.embed("hotels near the lake")
+    assert cache.embed("hotels near the lake") == first
+    assert first == model.vector("hotels near the lake")
+    assert model.calls == [["hotels near the lake"]]
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+async def test_batch_sends_only_unique_misses_in_one_call():
+    model = RecordingEmbedder()
+    cache = CachedEmbeddingModel(model)
+    cache.embed("a")
+    vectors = await cache.aembed_batch(["a", "b", "c", "b"])
+    assert model.calls == [["a"], ["b", "c"]]
+    assert vectors == [model.vector(t) for t in ["a", "b", "c", "b"]]
+    assert await cache.aembed_batch(["c", "a"]) == [
+        model.vector("c"),
+        model.vector("a"),
+    ]
+    assert len(model.calls) == 2
+
+
+def test_lru_eviction():
+    model = RecordingEmbedder()
+    cache = CachedEmbeddingModel(model, max_entries=2)
+    cache.embed_batch(["a", "b"])
+    cache.embed("a")
+    cache.embed("c")
+    assert len(cache) == 2
+    cache.embed("b")
+    assert model.calls[-1] == ["b"]
+
+
+def test_disk_tier_survives_restart(tmp_path):
+    path = tmp_path / "embeddings" / "queries.sqlite"
+    model = RecordingEmbedder()
+    cache = CachedEmbeddingModel(model, disk_path=path, namespace="model-a")
+    vector = cache.embed("where to eat")
+    cache.close()
+
+    restarted = CachedEmbeddingModel(model, disk_path=path, namespace="model-a")
+    assert restarted.embed("where to eat") == vector
+    assert restarted.disk_hits == 1
+    assert len(model.calls) == 1
+
+    other_model = CachedEmbeddingModel(model, disk_path=path, namespace="model-b")
+    other_model.embed("where to eat")
+    assert len(model.calls) == 2
+
+
+class StepOnlyDRIFTSearch(DRIFTSearch):
+    """DRIFTSearch with just the context builder a search step needs."""
+
+    def __init__(self, text_embedder):
+        self.context_builder = SimpleNamespace(text_embedder=text_embedder)  # type: ignore
+
+    async def step(self, search_engine, actions):
+        return await self._search_step("global", search_engine, actions)
+
+
+class EmbeddingLocalSearch:
+    """Stands in for LocalSearch, which embeds each query synchronously."""
+
+    def __init__(self, text_embedder):
+        self.text_embedder = text_embedder
+
+    async def search(self, drift_query, query):
+        self.text_embedder.embed(query)
+        return SimpleNamespace(
+            response='{"response": "ok", "score": 1}',
+            context_data={},
+            prompt_tokens=0,
+            output_tokens=0,
+        )
+
+
+async def test_drift_step_embeds_follow_ups_in_one_batch():
+    model = RecordingEmbedder()
+    cache = CachedEmbeddingModel(model)
+    done = DriftAction("already answered", answer="yes")
+    actions = [DriftAction("q1"), DriftAction("q2"), done]
+
+    await StepOnlyDRIFTSearch(cache).step(EmbeddingLocalSearch(cache), actions)
+
+    # the local searches' synchronous embed() calls were cache hits
+    assert model.calls == [["q1", "q2"]]
+    assert (cache.hits, cache.misses) == (2, 2)
@@ -0,0 +1,85 @@
+# Copyright (c) 2024 Microsoft Corporation.
+# Licensed under the MIT License
+
+from graphrag.data_model.text_unit import TextUnit
+from graphrag.query.context_builder.source_context import build_text_unit_context
+from graphrag.query.llm.text_utils import (
+    TokenCountCache,
+    num_tokens_by_line,
+    token_count_cache,
+)
+
+
+class CountingEncoder:
+    """Whitespace 'tokenizer' that records how often it is asked to encode."""
+
+    def __init__(self, name: str = "whitespace"):
+        self.name = name
+        self.calls = 0
+
+    def encode(self, text: str) -> list[str]:
+        self.calls += 1
+        return text.split()
+
+
+def test_cache_hits_skip_encoding():
+    cache = TokenCountCache()
+    encoder = CountingEncoder()
+    assert cache.count("a b c", encoder) == 3
+    assert cache.count("a b c", encoder) == 3
+    assert encoder.calls == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_cache_keyed_by_encoder_name():
+    cache = TokenCountCache()
+    first, second = CountingEncoder("one"), CountingEncoder("two")
+    cache.count("a b", first)
+    cache.count("a b", second)
+    assert (first.calls, second.calls) == (1, 1)
+
+
+def test_cache_is_bounded_lru():
+    cache = TokenCountCache(max_entries=2)
+    encoder = CountingEncoder()
+    cache.count("a", encoder)
+    cache.count("b", encoder)
+    cache.count("a", encoder)  # refresh "a" so "b" is evicted next
+    cache.count("c", encoder)
+    assert len(cache) == 2
+    cache.count("a", encoder)
+    assert encoder.calls == 3
+    cache.count("b", encoder)
+    assert encoder.calls == 4
+
+
+def test_disabled_cache_always_encodes():
+    cache = TokenCountCache(max_entries=0)
+    encoder = CountingEncoder()
+    cache.count("a", encoder)
+    cache.count("a", encoder)
+    assert encoder.calls == 2
+    assert len(cache) == 0
+
+
+def test_num_tokens_by_line_reuses_rows():
+    token_count_cache.clear()
+    encoder = CountingEncoder("by-line")
+    table = "-----Rows-----\nid|text\n1|a b\n"
+    assert num_tokens_by_line(table, encoder) == 4
+    calls = encoder.calls
+    assert num_tokens_by_line(table + "2|c d e\n", encoder) == 7
+    assert encoder.calls == calls + 1
+
+
+def test_text_unit_context_counts_each_row_once():
+    token_count_cache.clear()
+    encoder = CountingEncoder("text-units")
+    units = [
+        TextUnit(id=f"t{i}", short_id=str(i), text=f"unit {i} text") for i in range(5)
+    ]
+    first = build_text_unit_context(units, encoder, shuffle_data=False)
+    calls = encoder.calls
+    second = build_text_unit_context(units, encoder, shuffle_data=False)
+    assert encoder.calls == calls
+    assert first[0] == second[0]
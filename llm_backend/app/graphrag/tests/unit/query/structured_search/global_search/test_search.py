@@ -0,0 +1,199 @@
+# Copyright (c) 2024 Microsoft Corporation.
+# Licensed under the MIT License
+
+import asyncio
+import json
+import time
+
+from graphrag.language_model.response.base import (
+    BaseModelOutput,
+    BaseModelResponse,
+)
+from graphrag.query.context_builder.builders import (
+    ContextBuilderResult,
+    GlobalContextBuilder,
+)
+from graphrag.query.structured_search.global_search.map_cache import (
+    MapResponseCache,
+    normalize_query,
+)
+from graphrag.query.structured_search.global_search.search import GlobalSearch
+
+
+class WhitespaceEncoder:
+    name = "whitespace"
+
+    def encode(self, text: str) -> list[str]:
+        return text.split()
+
+
+class StaticContextBuilder(GlobalContextBuilder):
+    def __init__(self, chunks: list[str]):
+        self.chunks = chunks
+
+    async def build_context(self, query, conversation_history=None, **kwargs):
+        return ContextBuilderResult(context_chunks=self.chunks, context_records={})
+
+
+class FakeChatModel:
+    """Answers each map batch with a canned point list after a per-batch delay."""
+
+    def __init__(self, answers: dict[str, tuple[float, list[dict]]]):
+        self.answers = answers
+        self.map_calls: list[str] = []
+        self.reduce_prompts: list[str] = []
+
+    async def achat(self, prompt, history=None, **kwargs):
+        context = history[0]["content"]
+        batch = next(name for name in self.answers if name in context)
+        self.map_calls.append(batch)
+        delay, points = self.answers[batch]
+        await asyncio.sleep(delay)
+        return BaseModelResponse(
+            output=BaseModelOutput(content=json.dumps({"points": points}))
+        )
+
+    async def achat_stream(self, prompt, history=None, **kwargs):
+        self.reduce_prompts.append(history[0]["content"])
+        yield "final answer"
+
+
+def _search(model, chunks, **kwargs) -> GlobalSearch:
+    return GlobalSearch(
+        model=model,  # type: ignore
+        context_builder=StaticContextBuilder(chunks),
+        token_encoder=WhitespaceEncoder(),  # type: ignore
+        map_system_prompt="{context_data}",
+        reduce_system_prompt="{report_data}|{response_type}",
+        map_llm_params={"max_tokens": 100, "temperature": 0.0},
+        **kwargs,
+    )
+
+
+def _points(description: str, score: int) -> list[dict]:
+    return [{"description": description, "score": score}]
+
+
+def test_normalize_query():
+    assert normalize_query("  What is  GraphRAG? ") == "what is graphrag"
+    assert normalize_query("ＧｒａｐｈＲＡＧ 是什么？") == "graphrag 是什么"  # noqa: RUF001
+    assert normalize_query("what is graphrag") != normalize_query("what was graphrag")
+
+
+def test_map_cache_key_covers_batch_query_and_params():
+    params = {"temperature": 0, "max_tokens": 1}
+    key = MapResponseCache.key("batch-a", "q?", params)
+    assert key == MapResponseCache.key(
+        "batch-a", "Q", {"max_tokens": 1, "temperature": 0}
+    )
+    assert key != MapResponseCache.key("batch-b", "q", params)
+    assert key != MapResponseCache.key("batch-a", "q2", params)
+    assert key != MapResponseCache.key("batch-a", "q", {**params, "temperature": 1})
+
+
+def test_map_cache_evicts_least_recently_used():
+    cache = MapResponseCache(max_entries=2)
+    cache.set(b"a", [{"answer": "a", "score": 1}])
+    cache.set(b"b", [{"answer": "b", "score": 1}])
+    assert cache.get(b"a") is not None
+    cache.set(b"c", [{"answer": "c", "score": 1}])
+    assert cache.get(b"b") is None
+    assert len(cache) == 2
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+async def test_repeated_query_reuses_map_answers():
+    model = FakeChatModel({
+        "batch-a": (0, _points("alpha", 60)),
+        "batch-b": (0, _points("beta", 40)),
+    })
+    search = _search(model, ["batch-a", "batch-b"], map_cache=MapResponseCache())
+
+    first = await search.search("What is alpha?")
+    second = await search.search("what is alpha")
+
+    assert sorted(model.map_calls) == ["batch-a", "batch-b"]
+    assert first.llm_calls_categories["map"] == 2
+    assert second.llm_calls_categories["map"] == 0
+    assert second.reduce_context_text == first.reduce_context_text
+    assert [r.response for r in second.map_responses] == [
+        r.response for r in first.map_responses
+    ]
+
+    await search.search("What is beta?")
+    assert len(model.map_calls) == 4
+
+
+async def test_failed_map_answer_is_not_cached():
+    class FlakyChatModel:
+        def __init__(self):
+            self.replies = [
+                "I'm sorry, upstream timeout",
+                json.dumps({"points": _points("alpha", 60)}),
+            ]
+            self.map_calls = 0
+
+        async def achat(self, prompt, history=None, **kwargs):
+            self.map_calls += 1
+            return BaseModelResponse(
+                output=BaseModelOutput(content=self.replies.pop(0))
+            )
+
+        async def achat_stream(self, prompt, history=None, **kwargs):
+            yield "final answer"
+
+    model = FlakyChatModel()
+    cache = MapResponseCache()
+    search = _search(model, ["batch-a"], map_cache=cache)
+
+    first = await search.search("What is alpha?")
+    second = await search.search("What is alpha?")
+
+    assert first.map_responses[0].response == [{"answer": "", "score": 0}]
+    assert second.llm_calls_categories["map"] == 1
+    assert second.map_responses[0].response == [{"answer": "alpha", "score": 60}]
+    assert model.map_calls == 2
+    assert len(cache) == 1
+
+
+async def test_streaming_reduce_matches_full_map_without_early_exit():
+    answers = {
+        "batch-a": (0.02, _points("alpha one", 30)),
+        "batch-b": (0, _points("beta one two", 90)),
+        "batch-c": (0.01, _points("gamma", 0)),
+    }
+    full = await _search(FakeChatModel(answers), list(answers)).search("q")
+    streamed = await _search(
+        FakeChatModel(answers), list(answers), streaming_reduce=True
+    ).search("q")
+
+    assert streamed.reduce_context_text == full.reduce_context_text
+    assert streamed.llm_calls_categories == full.llm_calls_categories
+
+
+async def test_streaming_reduce_drops_slow_batches_once_budget_is_full():
+    long_answer = " ".join(["word"] * 20)
+    model = FakeChatModel({
+        "batch-a": (10, _points("slow", 95)),
+        "batch-b": (0, _points(long_answer, 90) + _points(long_answer, 85)),
+        "batch-c": (10, _points("slow too", 20)),
+    })
+    search = _search(
+        model,
+        ["batch-a", "batch-b", "batch-c"],
+        streaming_reduce=True,
+        early_exit_score=80,
+        max_data_tokens=40,
+    )
+
+    start = time.perf_counter()
+    result = await search.search("q")
+
+    assert time.perf_counter() - start < 5
+    assert result.llm_calls_categories["map"] == 1
+    responses = [r.response for r in result.map_responses]
+    assert responses[0] == []
+    assert responses[2] == []
+    # analyst numbering still follows the batch order
+    assert "----Analyst 2----" in model.reduce_prompts[0]
+    assert result.response == "final answer"
@@ -0,0 +1,136 @@
+# Copyright (c) 2024 Microsoft Corporation.
+# Licensed under the MIT License
+
+import pandas as pd
+import pytest
+
+from graphrag.query.indexer_adapters import read_indexer_text_units
+from graphrag.storage.file_pipeline_storage import FilePipelineStorage
+from graphrag.storage.memory_pipeline_storage import MemoryPipelineStorage
+from graphrag.utils.storage import (
+    append_table_to_storage,
+    load_table_from_storage,
+    write_table_to_storage,
+)
+
+
+def _text_units() -> pd.DataFrame:
+    return pd.DataFrame({
+        "id": ["t1", "t2"],
+        "text": ["first chunk", "second chunk"],
+        "n_tokens": [2, 2],
+        "entity_ids": [["e1", "e2"], []],
+        "relationship_ids": [["r1"], None],
+        "document_ids": [["d1"], ["d1"]],
+        "embedding": [[0.1, 0.2], [0.3, 0.4]],
+    })
+
+
+async def test_file_storage_is_memory_mapped(tmp_path, monkeypatch):
+    storage = FilePipelineStorage(root_dir=str(tmp_path))
+    await write_table_to_storage(_text_units(), "text_units", storage)
+
+    assert storage.local_path("text_units.parquet") == tmp_path / "text_units.parquet"
+    assert storage.local_path("missing.parquet") is None
+    # the in-memory storage subclasses the file storage but must not read from disk
+    monkeypatch.chdir(tmp_path)
+    memory = MemoryPipelineStorage()
+    assert memory.local_path("text_units.parquet") is None
+    assert memory.file_path("text_units.parquet") is None
+
+    table = await load_table_from_storage("text_units", storage)
+    pd.testing.assert_frame_equal(
+        table, pd.read_parquet(tmp_path / "text_units.parquet")
+    )
+
+
+async def test_column_projection_skips_missing_columns(tmp_path):
+    storage = FilePipelineStorage(root_dir=str(tmp_path))
+    await write_table_to_storage(_text_units(), "text_units", storage)
+
+    table = await load_table_from_storage(
+        "text_units", storage, columns=["id", "text", "not_there"]
+    )
+    assert list(table.columns) == ["id", "text"]
+
+
+async def test_arrow_lists_match_numpy_lists():
+    storage = MemoryPipelineStorage()
+    await write_table_to_storage(_text_units(), "text_units", storage)
+
+    plain = await load_table_from_storage("text_units", storage)
+    arrow = await load_table_from_storage("text_units", storage, arrow_lists=True)
+
+    assert isinstance(arrow["entity_ids"].dtype, pd.ArrowDtype)
+    assert isinstance(arrow["embedding"].dtype, pd.ArrowDtype)
+    assert arrow["text"].dtype == plain["text"].dtype
+    assert read_indexer_text_units(arrow) == read_indexer_text_units(plain)
+
+
+async def test_copy_hard_links_files(tmp_path):
+    storage = FilePipelineStorage(root_dir=str(tmp_path / "output"))
+    snapshot = storage.child("previous")
+    await write_table_to_storage(_text_units(), "text_units", storage)
+
+    await storage.copy("text_units.parquet", snapshot)
+    original = tmp_path / "output" / "text_units.parquet"
+    copied = tmp_path / "output" / "previous" / "text_units.parquet"
+    assert copied.stat().st_ino == original.stat().st_ino
+
+    # writing the table again replaces the file instead of changing the snapshot
+    await write_table_to_storage(_text_units().iloc[:1], "text_units", storage)
+    assert copied.stat().st_ino != original.stat().st_ino
+    assert len(await load_table_from_storage("text_units", snapshot)) == 2
+    assert len(await load_table_from_storage("text_units", storage)) == 1
+
+
+async def test_copy_between_file_and_memory(tmp_path):
+    storage = FilePipelineStorage(root_dir=str(tmp_path))
+    memory = MemoryPipelineStorage()
+    await write_table_to_storage(_text_units(), "text_units", storage)
+
+    await storage.copy("text_units.parquet", memory)
+    await memory.copy("text_units.parquet", storage, "copied.parquet")
+    assert (
+        await memory.get("text_units.parquet", as_bytes=True)
+        == (tmp_path / "copied.parquet").read_bytes()
+        == (tmp_path / "text_units.parquet").read_bytes()
+    )
+
+
+async def test_failed_set_keeps_old_file_and_no_temp_file(tmp_path):
+    storage = FilePipelineStorage(root_dir=str(tmp_path))
+    await storage.set("context.json", "{}")
+
+    with pytest.raises(TypeError):
+        await storage.set("context.json", 42)
+
+    assert await storage.get("context.json") == "{}"
+    assert [path.name for path in tmp_path.iterdir()] == ["context.json"]
+
+
+async def test_append_table_keeps_old_rows():
+    previous = MemoryPipelineStorage()
+    output = MemoryPipelineStorage()
+    await write_table_to_storage(_text_units(), "text_units", previous)
+    delta = _text_units().assign(id=["t3", "t4"], embedding=[[0.5, 0.6], None])
+
+    assert await append_table_to_storage(delta, "text_units", previous, output)
+    table = await load_table_from_storage("text_units", output)
+    expected = pd.concat([_text_units(), delta], ignore_index=True)
+    assert table["id"].tolist() == ["t1", "t2", "t3", "t4"]
+    assert table.index.equals(expected.index)
+    assert table["embedding"].iloc[2].tolist() == [0.5, 0.6]
+    assert table["embedding"].iloc[3] is None
+
+
+async def test_append_table_refuses_other_schema():
+    previous = MemoryPipelineStorage()
+    output = MemoryPipelineStorage()
+    await write_table_to_storage(_text_units(), "text_units", previous)
+
+    reordered = _text_units()[["text", "id", *_text_units().columns[2:]]]
+    assert not await append_table_to_storage(reordered, "text_units", previous, output)
+    retyped = _text_units().assign(n_tokens=["two", "two"])
+    assert not await append_table_to_storage(retyped, "text_units", previous, output)
+    assert not await output.has("text_units.parquet")
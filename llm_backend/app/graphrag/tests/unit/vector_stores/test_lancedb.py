@@ -0,0 +1,60 @@
+# Copyright (c) 2024 Microsoft Corporation.
+# Licensed under the MIT License
+
+import numpy as np
+import pyarrow as pa
+
+from graphrag.vector_stores.base import VectorStoreDocument
+from graphrag.vector_stores.lancedb import LanceDBVectorStore
+
+
+def _documents(vectors: np.ndarray, offset: int = 0) -> list[VectorStoreDocument]:
+    return [
+        VectorStoreDocument(
+            id=str(offset + i), text=f"doc {offset + i}", vector=vector.tolist()
+        )
+        for i, vector in enumerate(vectors)
+    ]
+
+
+def _store(tmp_path, **kwargs) -> LanceDBVectorStore:
+    store = LanceDBVectorStore(collection_name="entities", **kwargs)
+    store.connect(db_uri=str(tmp_path / "lancedb"))
+    return store
+
+
+def test_vectors_are_float32_fixed_size_lists(tmp_path):
+    vectors = np.random.default_rng(0).random((20, 8), dtype=np.float32)
+    store = _store(tmp_path)
+    store.load_documents(_documents(vectors[:10]))
+    store.load_documents(_documents(vectors[10:], offset=10), overwrite=False)
+
+    assert store.document_collection.schema.field("vector").type == pa.list_(
+        pa.float32(), 8
+    )
+    assert store.document_collection.count_rows() == 20
+    # without an index, create_index is a no-op and the search is exact
+    store.create_index()
+    results = store.similarity_search_by_vector(vectors[13].tolist(), k=1)
+    assert results[0].document.id == "13"
+    assert results[0].document.attributes == {}
+
+    store.load_documents([])
+    assert store.document_collection.count_rows() == 0
+
+
+def test_indexed_batch_search(tmp_path):
+    vectors = np.random.default_rng(1).random((600, 16), dtype=np.float32)
+    store = _store(tmp_path, index_type="IVF_PQ", nprobes=32, refine_factor=10)
+    store.load_documents(_documents(vectors))
+    store.create_index()
+    store.filter_by_id([])
+
+    queries = [vectors[i].tolist() for i in (0, 250, 599)]
+    batched = store.similarity_search_by_vectors(queries, k=5)
+    assert [results[0].document.id for results in batched] == ["0", "250", "599"]
+    assert batched[1] == store.similarity_search_by_vector(queries[1], k=5)
+
+    store.filter_by_id(["1", "2"])
+    (filtered,) = store.similarity_search_by_vectors(queries[:1], k=5)
+    assert {result.document.id for result in filtered} == {"1", "2"}
@@ -56,6 +56,7 @@ class InputState(TypedDict):
     question: str
     data: List[Dict[str, Any]]
     history: Annotated[List[HistoryRecord], update_history]
+    user_id: Optional[int]
 
 
 class OverallState(TypedDict):
@@ -68,6 +69,7 @@ class OverallState(TypedDict):
     summary: str
     steps: Annotated[List[str], add]
     history: Annotated[List[HistoryRecord], update_history]
+    user_id: Optional[int]
 
 
 class OutputState(TypedDict):
@@ -105,6 +107,7 @@ class ToolSelectionInputState(TypedDict):
     question: str
     parent_task: str
     context: Any
+    user_id: Optional[int]
 
 
 class ToolSelectionOutputState(TypedDict):
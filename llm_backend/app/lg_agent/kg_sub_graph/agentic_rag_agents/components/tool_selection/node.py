@@ -114,6 +114,7 @@ def create_tool_selection_node(
                             "task": state.get("question", ""),
                             "query_name": tool_name,
                             "query_parameters": tool_args,
+                            "user_id": state.get("user_id"),
                             "steps": ["tool_selection"],
                         },
                     )
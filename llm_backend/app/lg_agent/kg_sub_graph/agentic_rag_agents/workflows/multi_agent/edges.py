@@ -66,6 +66,7 @@ def map_reduce_planner_to_tool_selection(state: OverallState) -> List[Send]:
             {
                 "question": task.question,
                 "parent_task": task.parent_task,
+                "user_id": state.get("user_id"),
             },
         )
         for task in state.get("tasks", list[Any]())
@@ -449,7 +449,8 @@ async def create_research_plan(
     input_state = {
         "question": last_message,
         "data": [],
-        "history": []
+        "history": [],
+        "user_id": state.user_id,
     }
     
     # 执行工作流
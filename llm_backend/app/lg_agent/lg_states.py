@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field
 from dataclasses import dataclass, field
-from typing import Annotated, Literal, TypedDict, List
+from typing import Annotated, Literal, TypedDict, List, Optional
 from langchain_core.messages import AnyMessage
 from langgraph.graph import add_messages
 
@@ -59,6 +59,9 @@ class InputState:
         A new list of messages with the messages from `right` merged into `left`.
         If a message in `right` has the same ID as a message in `left`, the
         message from `right` will replace the message from `left`."""
+
+    user_id: Optional[int] = None
+    """The user asking, passed down to the GraphRAG tool so it queries that user's own index."""
     
 
 # @dataclass(kw_only=True)： 强制要求数据类中的所有字段必须以关键字参数的形式提供。即不能以位置参数的方式传递。
@@ -11,6 +11,7 @@ from app.lg_agent.lg_states import AgentState, InputState
 from app.lg_agent.utils import new_uuid
 from app.lg_agent.lg_builder import graph
 from langgraph.types import Command
+import argparse
 import asyncio
 import time
 import builtins
@@ -18,8 +19,8 @@ import builtins
 thread = {"configurable": {"thread_id": new_uuid()}}
 
 
-async def process_query(query):
-    inputState = InputState(messages=query)
+async def process_query(query, user_id=None):
+    inputState = InputState(messages=query, user_id=user_id)
 
     async for c, metadata in graph.astream(input=inputState, stream_mode="messages", config=thread):
         # if c.additional_kwargs.get("tool_calls"):
@@ -44,15 +45,17 @@ async def process_query(query):
                         print(c.content, end="", flush=True)
 
 
-async def main():
+async def main(user_id=None):
     input = builtins.input
     while True:
         query = input("> ")
         if query.strip().lower() == "q":
             print("Exiting...")
             break
-        await process_query(query)
+        await process_query(query, user_id=user_id)
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description="知识库智能体命令行")
+    parser.add_argument("--user-id", type=int, default=None, help="以该用户身份提问，GraphRAG 工具查询其上传文件建立的索引")
+    asyncio.run(main(parser.parse_args().user_id))
@@ -0,0 +1,41 @@
+"""知识库智能体（``app.lg_agent.lg_builder.graph``）的流式问答
+
+问题连同提问用户的 ``user_id`` 一起作为图的输入，``user_id`` 沿图状态传到 GraphRAG 工具节点，
+由它查询该用户上传文件建立的索引（没有时回退到默认索引）。
+"""
+
+import json
+from typing import Any, AsyncGenerator, Optional
+
+from app.core.logger import get_logger
+
+logger = get_logger(service="agent_service")
+
+
+def _default_graph():
+    # 延迟导入：智能体图依赖 langgraph 和完整的工具链
+    from app.lg_agent.lg_builder import graph
+
+    return graph
+
+
+async def stream_agent_answer(
+    query: str,
+    user_id: Optional[int],
+    thread_id: str,
+    graph: Any = None,
+) -> AsyncGenerator[str, None]:
+    """以 SSE 行流式返回智能体的回答，研究计划等中间步骤的输出不发送"""
+    graph = graph or _default_graph()
+    config = {"configurable": {"thread_id": thread_id}}
+    try:
+        async for chunk, metadata in graph.astream(
+            input={"messages": query, "user_id": user_id},
+            stream_mode="messages",
+            config=config,
+        ):
+            if chunk.content and "research_plan" not in metadata.get("tags", []):
+                yield f"data: {json.dumps({'content': chunk.content}, ensure_ascii=False)}\n\n"
+    except Exception as e:
+        logger.error(f"Agent error for user {user_id}: {str(e)}", exc_info=True)
+        yield f"data: {json.dumps({'error': str(e)}, ensure_ascii=False)}\n\n"
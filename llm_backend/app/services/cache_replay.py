@@ -0,0 +1,128 @@
+"""语义缓存命中后的回放方式
+
+- ``instant``:  整段响应一次性发送
+- ``paced``:    按目标 tokens/秒 控制发送速度（按绝对时间表发送，不会因每块的调度误差累积变慢）
+- ``original``: 按写入缓存时记录的原始分块边界连续发送，前端的渲染节奏与未命中时一致
+
+另外记录命中 / 未命中两类请求的首字节时间 (TTFB) 与总发送时间，供 ``/health/cache`` 输出。
+"""
+
+import asyncio
+import time
+from collections import deque
+from enum import Enum
+from typing import AsyncGenerator, Deque, Dict, List, Optional
+
+# 没有原始分块边界时，paced 模式按固定字符数切块
+FALLBACK_CHUNK_CHARS = 4
+
+
+class ReplayMode(str, Enum):
+    INSTANT = "instant"
+    PACED = "paced"
+    ORIGINAL = "original"
+
+
+def chunk_offsets(chunks: List[str]) -> List[int]:
+    """把流式分块转换为各块在完整响应中的结束位置"""
+    offsets, position = [], 0
+    for chunk in chunks:
+        position += len(chunk)
+        offsets.append(position)
+    return offsets
+
+
+def split_by_offsets(text: str, offsets: Optional[List[int]]) -> Optional[List[str]]:
+    """按结束位置还原分块；边界与文本不一致时返回 None 以便回退"""
+    if not offsets or offsets[-1] != len(text):
+        return None
+    chunks, start = [], 0
+    for end in offsets:
+        if end < start:
+            return None
+        chunks.append(text[start:end])
+        start = end
+    return chunks
+
+
+def estimate_tokens(text: str) -> int:
+    """粗略估算 token 数：中日韩字符按 1 个 token，其余字符按 4 个字符 1 个 token"""
+    cjk = sum(1 for ch in text if "⺀" <= ch <= "鿿" or "가" <= ch <= "힯")
+    other = len(text) - cjk
+    return max(1, cjk + (other + 3) // 4)
+
+
+async def replay_cached_response(
+    response: str,
+    offsets: Optional[List[int]] = None,
+    mode: ReplayMode = ReplayMode.ORIGINAL,
+    tokens_per_second: float = 200.0,
+) -> AsyncGenerator[str, None]:
+    """按回放方式依次产出缓存响应的文本块；paced 模式下 tokens_per_second <= 0 视为不限速，按 instant 发送"""
+    mode = ReplayMode(mode)
+    if mode == ReplayMode.PACED and tokens_per_second <= 0:
+        mode = ReplayMode.INSTANT
+    if mode == ReplayMode.INSTANT or not response:
+        if response:
+            yield response
+        return
+
+    chunks = split_by_offsets(response, offsets)
+    if mode == ReplayMode.ORIGINAL:
+        # 没有记录分块边界（旧缓存）时退化为一次性发送
+        for chunk in chunks or [response]:
+            yield chunk
+        return
+
+    if chunks is None:
+        chunks = [
+            response[i:i + FALLBACK_CHUNK_CHARS]
+            for i in range(0, len(response), FALLBACK_CHUNK_CHARS)
+        ]
+    start = time.perf_counter()
+    tokens_sent = 0
+    for chunk in chunks:
+        # 第 n 个 token 的计划发送时间为 start + n / tokens_per_second，只在超前时等待
+        delay = start + tokens_sent / tokens_per_second - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        yield chunk
+        tokens_sent += estimate_tokens(chunk)
+
+
+class DeliveryTimings:
+    """按缓存命中 / 未命中分别统计首字节时间和总发送时间（保留最近 ``window`` 个样本）"""
+
+    def __init__(self, window: int = 1000):
+        self.window = window
+        self._ttfb: Dict[str, Deque[float]] = {}
+        self._total: Dict[str, Deque[float]] = {}
+        self._counts: Dict[str, int] = {}
+
+    def record(self, outcome: str, ttfb: Optional[float], total: float):
+        self._counts[outcome] = self._counts.get(outcome, 0) + 1
+        if ttfb is not None:
+            self._ttfb.setdefault(outcome, deque(maxlen=self.window)).append(ttfb)
+        self._total.setdefault(outcome, deque(maxlen=self.window)).append(total)
+
+    @staticmethod
+    def _percentiles(samples) -> Dict[str, float]:
+        if not samples:
+            return {}
+        ordered = sorted(samples)
+        pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))]  # noqa: E731
+        return {"p50": pick(0.50), "p95": pick(0.95), "max": ordered[-1]}
+
+    def snapshot(self) -> Dict[str, dict]:
+        return {
+            outcome: {
+                "count": count,
+                "ttfb_seconds": self._percentiles(self._ttfb.get(outcome)),
+                "total_seconds": self._percentiles(self._total.get(outcome)),
+            }
+            for outcome, count in self._counts.items()
+        }
+
+
+# 进程级共享的发送耗时统计
+delivery_timings = DeliveryTimings()
@@ -6,9 +6,10 @@ from app.core.logger import get_logger
 from app.core.database import AsyncSessionLocal
 from app.models.conversation import Conversation, DialogueType
 from app.models.message import Message
-from app.services.redis_semantic_cache import RedisSemanticCache
+from app.core.loop_monitor import stall_monitor
+from app.services.cache_replay import chunk_offsets, delivery_timings, replay_cached_response
+from app.services.redis_semantic_cache import CachedEntry, semantic_cache_registry
 import time
-import asyncio
 
 logger = get_logger(service="deepseek")
 
@@ -22,15 +23,16 @@ class DeepseekService:
         
         # 优先使用配置中的 DEEPSEEK_MODEL，其次使用传入的 model
         self.model = settings.DEEPSEEK_MODEL or model 
-        self.cache = RedisSemanticCache(prefix="deepseek")
 
     # 流式返回缓存的响应
-    async def _stream_cached_response(self, response: str, delay: float = 0.05) -> AsyncGenerator[str, None]:
-        """模拟流式返回缓存的响应"""
-        # 每次返回4个字符
-        chunks = [response[i:i + 4] for i in range(0, len(response), 4)]
-        for chunk in chunks:
-            await asyncio.sleep(delay)  # 50ms延迟
+    async def _stream_cached_response(self, entry: CachedEntry) -> AsyncGenerator[str, None]:
+        """按配置的回放方式返回缓存的响应"""
+        async for chunk in replay_cached_response(
+            entry.response,
+            entry.chunk_offsets,
+            mode=settings.REDIS_CACHE_REPLAY_MODE,
+            tokens_per_second=settings.REDIS_CACHE_REPLAY_TOKENS_PER_SECOND,
+        ):
             yield f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n"
 
     # 流式生成回复
@@ -42,27 +44,34 @@ class DeepseekService:
         on_complete: Optional[Callable[[int, int, List[Dict], str], None]] = None
     ) -> AsyncGenerator[str, None]:
         """流式生成回复"""
+        start_time = time.perf_counter()
+        first_chunk_at = last_chunk_at = None
+        outcome = "error"
         try:
-            # 为每个用户创建独立的缓存实例
-            cache = RedisSemanticCache(prefix="deepseek", user_id=user_id)
+            # 从进程级注册表获取该用户的缓存视图，实例和索引在请求之间复用
+            cache = semantic_cache_registry.get(prefix="deepseek", user_id=user_id)
             
-            start_time = time.time()
-            
-            # 检查缓存
-            cached_response = await cache.lookup(messages)
-            if cached_response:
-                response_time = time.time() - start_time
-                logger.info(f"Cache hit! Response time: {response_time:.4f} seconds")
+            # 检查缓存，同时记录缓存操作期间事件循环被阻塞的时长
+            async with stall_monitor.measure() as lookup_stall:
+                cached_entry = await cache.lookup_entry(messages)
+            if cached_entry:
+                outcome = "hit"
+                logger.info(
+                    f"Cache hit! Lookup time: {time.perf_counter() - start_time:.4f} seconds, "
+                    f"cache loop stall: {lookup_stall.stall_seconds * 1000:.2f}ms"
+                )
                 
-                # 模拟流式返回，因为速率太快了
-                async for chunk in self._stream_cached_response(cached_response):
+                async for chunk in self._stream_cached_response(cached_entry):
+                    last_chunk_at = time.perf_counter()
+                    first_chunk_at = first_chunk_at or last_chunk_at
                     yield chunk
                 
                 if on_complete and user_id is not None and conversation_id is not None:
-                    await on_complete(user_id, conversation_id, messages, cached_response)
+                    await on_complete(user_id, conversation_id, messages, cached_entry.response)
                 return
 
             # 缓存未命中,调用API
+            outcome = "miss"
             full_response = []
             response = await self.client.chat.completions.create(
                 model=self.model,
@@ -72,20 +81,27 @@ class DeepseekService:
 
             async for chunk in response:
                 if chunk.choices and chunk.choices[0].delta.content:
-                    # 使用 ensure_ascii=False 来保持中文字符
-                    content = json.dumps(chunk.choices[0].delta.content, ensure_ascii=False)
-
-                    full_response.append(content)
-                    yield f"data: {content}\n\n"
+                    delta = chunk.choices[0].delta.content
+                    # 缓存与回调保存原始文本，SSE 中使用 ensure_ascii=False 来保持中文字符
+                    full_response.append(delta)
+                    last_chunk_at = time.perf_counter()
+                    first_chunk_at = first_chunk_at or last_chunk_at
+                    yield f"data: {json.dumps(delta, ensure_ascii=False)}\n\n"
             
             # 完整响应
             complete_response = "".join(full_response)
             
-            # 更新缓存
-            await cache.update(messages, complete_response)
+            # 更新缓存，同时记录原始分块边界供命中时回放
+            async with stall_monitor.measure() as update_stall:
+                await cache.update(
+                    messages, complete_response, chunk_offsets=chunk_offsets(full_response)
+                )
             
-            response_time = time.time() - start_time
-            logger.info(f"Cache miss. Response time: {response_time:.4f} seconds")
+            cache_stall = lookup_stall.stall_seconds + update_stall.stall_seconds
+            logger.info(
+                f"Cache miss. Response time: {time.perf_counter() - start_time:.4f} seconds, "
+                f"cache loop stall: {cache_stall * 1000:.2f}ms"
+            )
             
             # 如果有回调，执行回调 
             if on_complete and user_id is not None and conversation_id is not None:
@@ -95,6 +111,15 @@ class DeepseekService:
             logger.error(f"Error in generate_stream: {str(e)}", exc_info=True)
             error_msg = json.dumps(f"生成回复时出错: {str(e)}", ensure_ascii=False)
             yield f"data: {error_msg}\n\n"
+        finally:
+            # 首字节时间与总发送时间（到最后一块发出为止，不含缓存写入和回调）按命中 / 未命中分别统计
+            total = (last_chunk_at or time.perf_counter()) - start_time
+            ttfb = first_chunk_at - start_time if first_chunk_at is not None else None
+            delivery_timings.record(outcome, ttfb, total)
+            logger.info(
+                f"Delivery ({outcome}): ttfb="
+                f"{ttfb * 1000 if ttfb is not None else float('nan'):.1f}ms, total={total * 1000:.1f}ms"
+            )
 
     async def generate(self, messages: List[Dict]) -> str:
         """非流式生成回复"""
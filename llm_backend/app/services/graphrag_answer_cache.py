@@ -0,0 +1,167 @@
+"""GraphRAG 端到端答案缓存
+
+售后场景里同一个问题会被反复询问，每次都要重新付出 local / global / DRIFT 检索和
+LLM 生成的全部开销。``GraphRAGAnswerCache`` 缓存最终答案及其上下文记录（引用来源），
+命中时直接返回：
+
+- 精确层：键为 (规范化后的问题, 查询类型, 社区级别, response_type, 索引版本)，
+  规范化与全局检索的 map 缓存一致（NFKC、大小写、空白和结尾标点）
+- 语义层（可选）：同一 (查询类型, 社区级别, response_type, 索引版本) 范围内，
+  问题向量与已缓存问题的余弦相似度不低于阈值时视为命中
+- 失效：索引版本是键的一部分，新快照发布（``build_index`` 或增量更新完成后
+  查询引擎切换快照）时，引擎调用 ``invalidate`` 清除其它版本的全部条目
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from app.core.logger import get_logger
+from app.graphrag.graphrag.query.structured_search.global_search.map_cache import normalize_query
+from app.services.semantic_cache_index import LocalVectorIndex
+
+logger = get_logger(service="graphrag_answer_cache")
+
+# (查询类型, 社区级别, response_type, 索引版本)
+Scope = Tuple[str, int, str, str]
+
+
+@dataclass
+class CachedAnswer:
+    """一条缓存的答案，context 保留查询时的上下文记录，命中后仍可给出引用"""
+
+    response: str
+    context: Dict[str, Any]
+    index_version: str
+    hits: int = 0
+
+
+@dataclass
+class CacheProbe:
+    """一次查找的结果；未命中时交给 ``store`` 写入，复用查找时算过的问题向量"""
+
+    scope: Scope
+    query: str
+    answer: Optional[CachedAnswer] = None
+    tier: Optional[str] = None  # exact / semantic
+    similarity: float = 0.0
+    vector: Optional[List[float]] = None
+
+
+class GraphRAGAnswerCache:
+    """进程内 LRU 答案缓存，带可选的语义相似度层"""
+
+    def __init__(
+        self,
+        max_entries: int = 512,
+        semantic_threshold: Optional[float] = None,
+        embed: Optional[Callable[[str], Awaitable[List[float]]]] = None,
+    ):
+        self.max_entries = max_entries
+        # 未设置阈值或没有向量化函数时只使用精确层
+        self.semantic_threshold = semantic_threshold if embed is not None else None
+        self.embed = embed
+        self._answers: "OrderedDict[Tuple[Scope, str], CachedAnswer]" = OrderedDict()
+        self._indexes: Dict[Scope, LocalVectorIndex] = {}
+        self.hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._answers)
+
+    async def _embed(self, text: str) -> Optional[List[float]]:
+        try:
+            return await self.embed(text)
+        except Exception as e:
+            # 向量化服务不可用时退化为只用精确层
+            logger.warning(f"GraphRAG 答案缓存向量化失败，跳过语义层: {e}")
+            return None
+
+    async def lookup(
+        self, query: str, query_type: str, community_level: int, response_type: str, index_version: str
+    ) -> CacheProbe:
+        scope = (query_type, community_level, response_type, index_version)
+        probe = CacheProbe(scope=scope, query=normalize_query(query))
+        key = (scope, probe.query)
+        answer = self._answers.get(key)
+        if answer is not None:
+            self._answers.move_to_end(key)
+            probe.answer, probe.tier, probe.similarity = answer, "exact", 1.0
+        elif self.semantic_threshold is not None:
+            probe.vector = await self._embed(probe.query)
+            index = self._indexes.get(scope)
+            found = index.search(probe.vector) if index is not None and probe.vector else None
+            if found is not None and found[1] >= self.semantic_threshold:
+                answer = self._answers.get((scope, found[0]))
+                if answer is not None:
+                    self._answers.move_to_end((scope, found[0]))
+                    probe.answer, probe.tier, probe.similarity = answer, "semantic", found[1]
+
+        if probe.answer is None:
+            self.misses += 1
+        else:
+            probe.answer.hits += 1
+            self.hits += 1
+            if probe.tier == "semantic":
+                self.semantic_hits += 1
+        return probe
+
+    def store(self, probe: CacheProbe, response: str, context: Dict[str, Any]):
+        if self.max_entries <= 0 or not response:
+            return
+        key = (probe.scope, probe.query)
+        self._answers[key] = CachedAnswer(response=response, context=context, index_version=probe.scope[3])
+        self._answers.move_to_end(key)
+        if probe.vector:
+            self._indexes.setdefault(probe.scope, LocalVectorIndex()).add(probe.query, probe.vector)
+        while len(self._answers) > self.max_entries:
+            (scope, query), _ = self._answers.popitem(last=False)
+            self._forget(scope, query)
+
+    def _forget(self, scope: Scope, query: str):
+        index = self._indexes.get(scope)
+        if index is not None:
+            index.remove(query)
+            if not len(index):
+                del self._indexes[scope]
+
+    def invalidate(self, keep_version: Optional[str] = None) -> int:
+        """清除 keep_version 以外所有索引版本的条目，返回清除的条数"""
+        stale = [key for key in self._answers if key[0][3] != keep_version]
+        for key in stale:
+            del self._answers[key]
+        for scope in [scope for scope in self._indexes if scope[3] != keep_version]:
+            del self._indexes[scope]
+        if stale:
+            self.invalidations += 1
+        return len(stale)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._answers),
+            "hits": self.hits,
+            "semantic_hits": self.semantic_hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "semantic": self.semantic_threshold is not None,
+        }
+
+
+def answer_cache_from_settings() -> Optional[GraphRAGAnswerCache]:
+    """按配置创建答案缓存；GRAPHRAG_ANSWER_CACHE_SIZE 为 0 时不缓存"""
+    from app.core.config import settings
+
+    if settings.GRAPHRAG_ANSWER_CACHE_SIZE <= 0:
+        return None
+    embed = None
+    if settings.GRAPHRAG_ANSWER_CACHE_SEMANTIC_THRESHOLD > 0:
+        from app.services.ollama_embedding_client import get_embedding_client
+
+        embed = get_embedding_client().embed
+    return GraphRAGAnswerCache(
+        max_entries=settings.GRAPHRAG_ANSWER_CACHE_SIZE,
+        semantic_threshold=settings.GRAPHRAG_ANSWER_CACHE_SEMANTIC_THRESHOLD or None,
+        embed=embed,
+    )
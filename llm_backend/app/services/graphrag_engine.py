@@ -0,0 +1,520 @@
+"""进程级常驻的 GraphRAG 查询引擎
+
+原来 ``graphrag_query`` 节点每次调用都新建 ``GraphRAGAPI``：重新读取全部 parquet，
+``api.local_search`` 等再重跑一遍 ``read_indexer_*`` 适配器、重新连接 LanceDB、
+重新创建检索引擎，一次图查询在检索和 LLM 之外还要付出数秒的加载开销。
+
+``GraphRAGQueryEngine`` 把这些工作移到启动阶段：
+
+- 快照 (``GraphRAGSnapshot``)：一次索引输出对应的配置、parquet 表、
+  ``Entity`` / ``Relationship`` / ``TextUnit`` 等对象模型、向量库连接和检索引擎，
+  构建完成后只读
+- 版本：输出目录中 parquet 文件与 ``stats.json`` 的 (文件名, mtime, 大小) 指纹
+- 热切换：后台任务定期检查指纹，新的索引输出写完（指纹连续两次不变）后构建新快照，
+  完成后一次性替换引用；进行中的查询继续使用旧快照，不会读到半新半旧的数据
+- 查询：复用快照中的检索引擎，只为本次查询浅拷贝一份并绑定回调，
+  因此每次查询只剩检索和 LLM 的耗时
+
+引擎可以带一个 ``GraphRAGAnswerCache``：相同（或语义相近）的问题在同一索引版本上
+直接返回缓存的答案和上下文，快照切换时清除旧版本的答案。
+
+多个引擎（例如 ``graphrag_registry`` 中每个用户一个）可以通过 ``SharedQueryResources``
+共用同一份基础配置和提示词；模型客户端由 ``ModelManager`` 按名称进程级复用，
+token 编码器由 tiktoken 缓存，本身就是共享的。
+"""
+
+import asyncio
+import copy
+import hashlib
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+from app.core.logger import get_logger
+from app.graphrag.graphrag.callbacks.noop_query_callbacks import NoopQueryCallbacks
+from app.graphrag.graphrag.config.embeddings import (
+    community_full_content_embedding,
+    entity_description_embedding,
+    text_unit_text_embedding,
+)
+from app.graphrag.graphrag.config.load_config import load_config
+from app.graphrag.graphrag.query.factory import (
+    get_basic_search_engine,
+    get_drift_search_engine,
+    get_global_search_engine,
+    get_local_search_engine,
+)
+from app.graphrag.graphrag.query.indexer_adapters import (
+    QUERY_TABLE_COLUMNS,
+    read_indexer_communities,
+    read_indexer_covariates,
+    read_indexer_entities,
+    read_indexer_relationships,
+    read_indexer_report_embeddings,
+    read_indexer_reports,
+    read_indexer_text_units,
+)
+from app.graphrag.graphrag.storage.file_pipeline_storage import FilePipelineStorage
+from app.graphrag.graphrag.utils.api import get_embedding_store, load_search_prompt
+from app.graphrag.graphrag.utils.storage import load_table_from_storage
+from app.graphrag.graphrag.vector_stores.factory import VectorStoreType
+from app.services.graphrag_answer_cache import GraphRAGAnswerCache, answer_cache_from_settings
+
+logger = get_logger(service="graphrag_engine")
+
+QUERY_TYPES = ("local", "global", "drift", "basic")
+REQUIRED_TABLES = ("entities", "text_units", "communities", "community_reports", "relationships")
+OPTIONAL_TABLES = ("covariates",)
+# 参与版本指纹的文件：索引流水线最后写入 stats.json，因此它的变化代表一次完整输出
+_FINGERPRINT_SUFFIXES = (".parquet",)
+_FINGERPRINT_FILES = ("stats.json",)
+
+
+def index_fingerprint(output_dir: Path) -> str:
+    """根据输出目录中 parquet 与 stats.json 的 (文件名, mtime, 大小) 计算版本号"""
+    entries = []
+    try:
+        with os.scandir(output_dir) as it:
+            for entry in it:
+                if not entry.is_file():
+                    continue
+                if entry.name.endswith(_FINGERPRINT_SUFFIXES) or entry.name in _FINGERPRINT_FILES:
+                    st = entry.stat()
+                    entries.append(f"{entry.name}:{st.st_mtime_ns}:{st.st_size}")
+    except FileNotFoundError:
+        return ""
+    if not entries:
+        return ""
+    return hashlib.sha1("|".join(sorted(entries)).encode("utf-8")).hexdigest()[:16]
+
+
+class SharedQueryResources:
+    """多个查询引擎共享的只读资源：项目基础配置和检索提示词，各只从磁盘读取一次"""
+
+    def __init__(self, project_directory: Path):
+        self.project_directory = Path(project_directory)
+        self._config = None
+        self._config_lock = asyncio.Lock()
+        self._prompts: Dict[tuple, Optional[str]] = {}
+
+    async def config(self):
+        if self._config is None:
+            async with self._config_lock:
+                if self._config is None:
+                    self._config = await asyncio.to_thread(load_config, self.project_directory, None, None)
+        return self._config
+
+    def prompt(self, root_dir: str, prompt: Optional[str]) -> Optional[str]:
+        key = (root_dir, prompt)
+        if key not in self._prompts:
+            self._prompts[key] = load_search_prompt(root_dir, prompt)
+        return self._prompts[key]
+
+
+def table_memory_bytes(tables: Dict[str, Optional[pd.DataFrame]]) -> int:
+    """估算快照中各表占用的内存（不含由表转换出的对象模型）"""
+    return int(sum(t.memory_usage(index=True, deep=True).sum() for t in tables.values() if t is not None))
+
+
+@dataclass
+class GraphRAGSnapshot:
+    """一次索引输出对应的只读查询状态"""
+
+    version: str
+    output_dir: Path
+    config: Any
+    tables: Dict[str, Optional[pd.DataFrame]]
+    engines: Dict[str, Any] = field(default_factory=dict)
+    loaded_at: float = field(default_factory=time.time)
+    load_seconds: float = 0.0
+    memory_bytes: int = 0
+
+
+class GraphRAGQueryEngine:
+    """常驻的 GraphRAG 查询引擎，持有当前快照并在索引更新时原子替换"""
+
+    def __init__(
+        self,
+        project_dir: str,
+        data_dir_name: str,
+        query_type: str = "local",
+        response_type: str = "text",
+        community_level: int = 2,
+        dynamic_community_selection: bool = False,
+        reload_interval: float = 30.0,
+        output_dir: Optional[Path] = None,
+        shared: Optional[SharedQueryResources] = None,
+        answer_cache: Optional[GraphRAGAnswerCache] = None,
+    ):
+        self.project_directory = Path(project_dir) / data_dir_name
+        # 指定 output_dir 时查询该目录下的索引（例如某个用户的索引），而不是配置中的输出目录
+        self.output_dir = Path(output_dir) if output_dir is not None else None
+        self.shared = shared
+        self.answer_cache = answer_cache
+        self.query_type = query_type.lower()
+        self.response_type = response_type
+        self.community_level = community_level
+        self.dynamic_community_selection = dynamic_community_selection
+        self.reload_interval = reload_interval
+
+        self._snapshot: Optional[GraphRAGSnapshot] = None
+        self._build_lock = asyncio.Lock()
+        self._watcher: Optional[asyncio.Task] = None
+        self.swaps = 0
+        self.queries = 0
+        self.last_error: Optional[str] = None
+
+    @property
+    def snapshot(self) -> Optional[GraphRAGSnapshot]:
+        return self._snapshot
+
+    # ------------------------------------------------------------------
+    # 快照加载与热切换
+    # ------------------------------------------------------------------
+
+    async def load(self) -> GraphRAGSnapshot:
+        """返回当前快照，尚未加载时先加载（并发调用只加载一次）"""
+        snapshot = self._snapshot
+        if snapshot is not None:
+            return snapshot
+        async with self._build_lock:
+            if self._snapshot is None:
+                self._swap(await self._build_snapshot())
+            return self._snapshot
+
+    async def reload(self, force: bool = False) -> bool:
+        """索引输出有更新时构建新快照并替换，返回是否发生了切换"""
+        async with self._build_lock:
+            current = self._snapshot
+            if not force and current is not None:
+                if index_fingerprint(current.output_dir) == current.version:
+                    return False
+            snapshot = await self._build_snapshot()
+            if not force and current is not None and snapshot.version == current.version:
+                return False
+            self._swap(snapshot)
+            return True
+
+    def _swap(self, snapshot: GraphRAGSnapshot):
+        previous = self._snapshot
+        # 单次引用赋值即为原子切换：已取得旧快照的查询不受影响
+        self._snapshot = snapshot
+        self.last_error = None
+        if self.answer_cache is not None:
+            # 新快照发布后，旧版本索引上的答案全部失效
+            self.answer_cache.invalidate(keep_version=snapshot.version)
+        if previous is not None:
+            self.swaps += 1
+            logger.info(f"GraphRAG 索引已切换: {previous.version} -> {snapshot.version}")
+        else:
+            logger.info(f"GraphRAG 索引已加载: {snapshot.version} ({snapshot.load_seconds:.2f}s)")
+
+    async def _load_config(self):
+        if self.shared is None:
+            config = await asyncio.to_thread(load_config, self.project_directory, None, None)
+        else:
+            config = await self.shared.config()
+        if self.output_dir is None:
+            return config
+        # 共享的基础配置只读，这里复制一份再指向本引擎的输出目录；
+        # 输出目录中有自己的 LanceDB 时向量检索也使用它
+        config = config.model_copy(deep=True)
+        config.output.base_dir = str(self.output_dir)
+        lancedb_dir = self.output_dir / "lancedb"
+        if lancedb_dir.is_dir():
+            for store in config.vector_store.values():
+                if store.type == VectorStoreType.LanceDB.value:
+                    store.db_uri = str(lancedb_dir)
+        return config
+
+    def _prompt(self, config, prompt: Optional[str]) -> Optional[str]:
+        if self.shared is None:
+            return load_search_prompt(config.root_dir, prompt)
+        return self.shared.prompt(config.root_dir, prompt)
+
+    def _resolve_output_dir(self, config) -> Path:
+        output_dir = Path(config.output.base_dir)
+        if not output_dir.is_absolute():
+            output_dir = self.project_directory / output_dir
+        return output_dir
+
+    @staticmethod
+    async def _load_table(name: str, storage: FilePipelineStorage) -> pd.DataFrame:
+        # 只解码查询适配器用到的列（内存映射读取），列表列保持为 Arrow 缓冲区，访问时才转换
+        return await load_table_from_storage(
+            name,
+            storage,
+            columns=QUERY_TABLE_COLUMNS.get(name),
+            arrow_lists=True,
+        )
+
+    async def _build_snapshot(self) -> GraphRAGSnapshot:
+        start = time.perf_counter()
+        config = await self._load_config()
+        output_dir = self._resolve_output_dir(config)
+        version = index_fingerprint(output_dir)
+        storage = FilePipelineStorage(root_dir=str(output_dir))
+
+        tables: Dict[str, Optional[pd.DataFrame]] = {}
+        try:
+            for name in REQUIRED_TABLES:
+                tables[name] = await self._load_table(name, storage)
+        except Exception as e:
+            raise Exception(f"加载GraphRAG数据文件时出错: {str(e)}")
+        for name in OPTIONAL_TABLES:
+            # 协变量数据可能不存在
+            try:
+                tables[name] = await self._load_table(name, storage)
+            except Exception:
+                tables[name] = None
+
+        snapshot = GraphRAGSnapshot(
+            version=version,
+            output_dir=output_dir,
+            config=config,
+            tables=tables,
+            memory_bytes=table_memory_bytes(tables),
+        )
+        # 对象模型转换、向量库连接都是同步操作，放到线程中避免阻塞事件循环
+        await asyncio.to_thread(self._engine_for, snapshot, self.query_type)
+        snapshot.load_seconds = time.perf_counter() - start
+        return snapshot
+
+    # ------------------------------------------------------------------
+    # 检索引擎
+    # ------------------------------------------------------------------
+
+    def _engine_for(self, snapshot: GraphRAGSnapshot, query_type: str):
+        """取快照中对应查询类型的检索引擎，非默认类型首次使用时构建"""
+        engine = snapshot.engines.get(query_type)
+        if engine is None:
+            engine = self._build_engine(snapshot, query_type)
+            snapshot.engines[query_type] = engine
+        return engine
+
+    def _vector_store(self, config, embedding_name: str):
+        vector_store_args = {index: store.model_dump() for index, store in config.vector_store.items()}
+        return get_embedding_store(config_args=vector_store_args, embedding_name=embedding_name)
+
+    def _build_engine(self, snapshot: GraphRAGSnapshot, query_type: str):
+        config = snapshot.config
+        tables = snapshot.tables
+        level = self.community_level
+
+        if query_type == "local":
+            covariates = tables.get("covariates")
+            return get_local_search_engine(
+                config=config,
+                reports=read_indexer_reports(tables["community_reports"], tables["communities"], level),
+                text_units=read_indexer_text_units(tables["text_units"]),
+                entities=read_indexer_entities(tables["entities"], tables["communities"], level),
+                relationships=read_indexer_relationships(tables["relationships"]),
+                covariates={"claims": read_indexer_covariates(covariates) if covariates is not None else []},
+                description_embedding_store=self._vector_store(config, entity_description_embedding),
+                response_type=self.response_type,
+                system_prompt=self._prompt(config, config.local_search.prompt),
+            )
+
+        if query_type == "global":
+            return get_global_search_engine(
+                config,
+                reports=read_indexer_reports(
+                    tables["community_reports"],
+                    tables["communities"],
+                    community_level=level,
+                    dynamic_community_selection=self.dynamic_community_selection,
+                ),
+                entities=read_indexer_entities(tables["entities"], tables["communities"], community_level=level),
+                communities=read_indexer_communities(tables["communities"], tables["community_reports"]),
+                response_type=self.response_type,
+                dynamic_community_selection=self.dynamic_community_selection,
+                map_system_prompt=self._prompt(config, config.global_search.map_prompt),
+                reduce_system_prompt=self._prompt(config, config.global_search.reduce_prompt),
+                general_knowledge_inclusion_prompt=self._prompt(config, config.global_search.knowledge_prompt),
+            )
+
+        if query_type == "drift":
+            reports = read_indexer_reports(tables["community_reports"], tables["communities"], level)
+            read_indexer_report_embeddings(reports, self._vector_store(config, community_full_content_embedding))
+            return get_drift_search_engine(
+                config=config,
+                reports=reports,
+                text_units=read_indexer_text_units(tables["text_units"]),
+                entities=read_indexer_entities(tables["entities"], tables["communities"], level),
+                relationships=read_indexer_relationships(tables["relationships"]),
+                description_embedding_store=self._vector_store(config, entity_description_embedding),
+                local_system_prompt=self._prompt(config, config.drift_search.prompt),
+                reduce_system_prompt=self._prompt(config, config.drift_search.reduce_prompt),
+                response_type=self.response_type,
+            )
+
+        if query_type == "basic":
+            return get_basic_search_engine(
+                config=config,
+                text_units=read_indexer_text_units(tables["text_units"]),
+                text_unit_embeddings=self._vector_store(config, text_unit_text_embedding),
+                system_prompt=self._prompt(config, config.basic_search.prompt),
+            )
+
+        raise ValueError(f"不支持的查询类型: {query_type}")
+
+    @staticmethod
+    def bind_callbacks(engine, callbacks: List[Any]):
+        """为单次查询浅拷贝检索引擎并绑定回调
+
+        上下文构建器、模型、向量库连接仍与快照共享；DRIFT 的查询状态是按查询累积的，
+        需要重新创建。检索引擎由 query.factory 以顶层包名 ``graphrag`` 导入的类创建，
+        与本模块经 ``app.graphrag.graphrag`` 导入的同名类不是同一个对象，因此按接口而不是
+        isinstance 识别 DRIFT。
+        """
+        bound = copy.copy(engine)
+        bound.callbacks = callbacks
+        if hasattr(bound, "init_local_search"):
+            bound.query_state = type(bound.query_state)()
+            bound.local_search = bound.init_local_search()
+        return bound
+
+    async def query(self, query: str, query_type: Optional[str] = None) -> Dict[str, Any]:
+        """在当前快照上执行一次 GraphRAG 查询"""
+        snapshot = await self.load()
+        query_type = (query_type or self.query_type).lower()
+        if query_type not in QUERY_TYPES:
+            raise ValueError(f"不支持的查询类型: {query_type}")
+        self.queries += 1
+
+        probe = None
+        if self.answer_cache is not None:
+            probe = await self.answer_cache.lookup(
+                query, query_type, self.community_level, self.response_type, snapshot.version
+            )
+            if probe.answer is not None:
+                return {
+                    "response": probe.answer.response,
+                    "context": dict(probe.answer.context),
+                    "index_version": snapshot.version,
+                    "cached": probe.tier,
+                }
+
+        context_data = {}
+
+        def on_context(context):
+            nonlocal context_data
+            context_data = context
+
+        local_callbacks = NoopQueryCallbacks()
+        local_callbacks.on_context = on_context
+
+        try:
+            engine = snapshot.engines.get(query_type)
+            if engine is None:
+                engine = await asyncio.to_thread(self._engine_for, snapshot, query_type)
+            search_engine = self.bind_callbacks(engine, [local_callbacks])
+            response = ""
+            async for chunk in search_engine.stream_search(query=query):
+                response += chunk
+        except Exception as e:
+            raise Exception(f"执行GraphRAG查询时出错: {str(e)}")
+
+        if probe is not None and self._snapshot is snapshot:
+            self.answer_cache.store(probe, response, context_data)
+        return {"response": response, "context": context_data, "index_version": snapshot.version}
+
+    # ------------------------------------------------------------------
+    # 后台预加载与索引更新检测
+    # ------------------------------------------------------------------
+
+    def start(self):
+        """启动后台任务：先预加载快照，之后按 ``reload_interval`` 检查索引更新"""
+        if self._watcher is None or self._watcher.done():
+            self._watcher = asyncio.create_task(self._watch())
+
+    async def stop(self):
+        if self._watcher is not None:
+            self._watcher.cancel()
+            try:
+                await self._watcher
+            except asyncio.CancelledError:
+                pass
+            self._watcher = None
+
+    async def _watch(self):
+        try:
+            await self.load()
+        except Exception as e:
+            self.last_error = str(e)
+            logger.warning(f"GraphRAG 索引预加载失败，将在首次查询时重试: {e}")
+        if self.reload_interval <= 0:
+            return
+        pending = None
+        while True:
+            await asyncio.sleep(self.reload_interval)
+            try:
+                snapshot = self._snapshot
+                if snapshot is None:
+                    await self.load()
+                    continue
+                # 索引流水线会陆续写入多个文件，指纹连续两次检查不变才视为输出完成
+                fingerprint = index_fingerprint(snapshot.output_dir)
+                if not fingerprint or fingerprint == snapshot.version:
+                    pending = None
+                elif fingerprint != pending:
+                    pending = fingerprint
+                else:
+                    pending = None
+                    await self.reload()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # 新索引加载失败时继续使用当前快照
+                self.last_error = str(e)
+                logger.warning(f"GraphRAG 索引重新加载失败，继续使用当前版本: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        snapshot = self._snapshot
+        return {
+            "loaded": snapshot is not None,
+            "index_version": snapshot.version if snapshot else None,
+            "output_dir": str(snapshot.output_dir) if snapshot else None,
+            "loaded_at": snapshot.loaded_at if snapshot else None,
+            "load_seconds": snapshot.load_seconds if snapshot else None,
+            "memory_mb": round(snapshot.memory_bytes / 2**20, 1) if snapshot else None,
+            "engines": sorted(snapshot.engines) if snapshot else [],
+            "swaps": self.swaps,
+            "queries": self.queries,
+            "answer_cache": self.answer_cache.stats() if self.answer_cache is not None else None,
+            "last_error": self.last_error,
+        }
+
+
+_default_engine: Optional[GraphRAGQueryEngine] = None
+
+
+def get_graphrag_engine() -> GraphRAGQueryEngine:
+    """进程级共享的查询引擎，按配置创建"""
+    global _default_engine
+    if _default_engine is None:
+        from app.core.config import settings
+
+        _default_engine = GraphRAGQueryEngine(
+            project_dir=settings.GRAPHRAG_PROJECT_DIR,
+            data_dir_name=settings.GRAPHRAG_DATA_DIR,
+            query_type=settings.GRAPHRAG_QUERY_TYPE,
+            response_type=settings.GRAPHRAG_RESPONSE_TYPE,
+            community_level=settings.GRAPHRAG_COMMUNITY_LEVEL,
+            dynamic_community_selection=settings.GRAPHRAG_DYNAMIC_COMMUNITY,
+            reload_interval=settings.GRAPHRAG_RELOAD_INTERVAL,
+            answer_cache=answer_cache_from_settings(),
+        )
+    return _default_engine
+
+
+async def close_graphrag_engine():
+    """停止后台检查任务；在应用关闭时调用"""
+    global _default_engine
+    if _default_engine is not None:
+        await _default_engine.stop()
+        _default_engine = None
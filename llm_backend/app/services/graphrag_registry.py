@@ -0,0 +1,185 @@
+"""按用户划分的 GraphRAG 索引注册表
+
+``IndexingService`` 把每个用户上传文件的索引输出写到 ``output/<uuid5(user_id)>``，
+而 ``GraphRAGQueryEngine`` 只查询配置中的一个输出目录。``GraphRAGIndexRegistry``
+为每个有索引的用户维护一个独立的查询引擎：
+
+- 懒加载：用户第一次查询时才读取其索引并构建快照
+- 常驻：按最近使用顺序保留最热的用户索引，超过 ``max_resident`` 个或估算内存超过
+  ``memory_budget_mb`` 时逐出最久未使用的索引（正在进行的查询继续持有原快照）
+- 共享：所有用户引擎共用一份 ``SharedQueryResources``（基础配置、提示词），
+  模型客户端和 token 编码器本身就是进程级共享的
+- 热更新：常驻的用户引擎各自在后台检查索引输出，用户上传新文件后自动切换快照
+- 回退：用户还没有索引时使用全局的默认引擎
+- 答案缓存：每个用户引擎由 ``answer_cache_factory`` 创建自己的答案缓存，随引擎一起逐出
+"""
+
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from app.core.logger import get_logger
+from app.services.graphrag_answer_cache import GraphRAGAnswerCache, answer_cache_from_settings
+from app.services.graphrag_engine import (
+    GraphRAGQueryEngine,
+    SharedQueryResources,
+    get_graphrag_engine,
+    index_fingerprint,
+)
+
+logger = get_logger(service="graphrag_registry")
+
+
+def user_index_uuid(user_id: int) -> str:
+    """用户索引目录名，与 ``IndexingService._prepare_user_directories`` 一致"""
+    return str(uuid.uuid5(uuid.NAMESPACE_DNS, f"user_{user_id}"))
+
+
+class GraphRAGIndexRegistry:
+    """user_id -> 该用户索引的查询引擎，按 LRU 保持常驻"""
+
+    engine_cls = GraphRAGQueryEngine
+
+    def __init__(
+        self,
+        project_dir: str,
+        data_dir_name: str,
+        max_resident: int = 8,
+        memory_budget_mb: float = 2048,
+        fallback: Optional[GraphRAGQueryEngine] = None,
+        answer_cache_factory: Optional[Callable[[], Optional[GraphRAGAnswerCache]]] = None,
+        **engine_kwargs: Any,
+    ):
+        self.project_dir = project_dir
+        self.data_dir_name = data_dir_name
+        self.data_dir = Path(project_dir) / data_dir_name
+        self.max_resident = max_resident
+        self.memory_budget_bytes = memory_budget_mb * 2**20
+        self.fallback = fallback
+        self.answer_cache_factory = answer_cache_factory
+        self.engine_kwargs = engine_kwargs
+        self.shared = SharedQueryResources(self.data_dir)
+
+        self._engines: "OrderedDict[int, GraphRAGQueryEngine]" = OrderedDict()
+        self.loads = 0
+        self.evictions = 0
+        self.fallbacks = 0
+
+    def user_output_dir(self, user_id: int) -> Path:
+        return self.data_dir / "output" / user_index_uuid(user_id)
+
+    def has_index(self, user_id: int) -> bool:
+        return bool(index_fingerprint(self.user_output_dir(user_id)))
+
+    async def engine_for(self, user_id: int) -> Optional[GraphRAGQueryEngine]:
+        """返回用户索引的查询引擎并确保快照已加载；用户没有索引时返回 None"""
+        engine = self._engines.get(user_id)
+        if engine is None:
+            if not self.has_index(user_id):
+                return None
+            engine = self.engine_cls(
+                project_dir=self.project_dir,
+                data_dir_name=self.data_dir_name,
+                output_dir=self.user_output_dir(user_id),
+                shared=self.shared,
+                answer_cache=self.answer_cache_factory() if self.answer_cache_factory else None,
+                **self.engine_kwargs,
+            )
+            # 先登记再加载，同一用户的并发查询共用这一个引擎（快照只构建一次）
+            self._engines[user_id] = engine
+            self.loads += 1
+        self._engines.move_to_end(user_id)
+        try:
+            await engine.load()
+        except Exception:
+            if self._engines.get(user_id) is engine:
+                del self._engines[user_id]
+            raise
+        # 加载期间可能已被逐出，此时只服务本次查询，不再启动后台检查
+        if self._engines.get(user_id) is engine:
+            engine.start()
+            await self._evict(keep=user_id)
+        return engine
+
+    async def query(self, user_id: Optional[int], query: str, query_type: Optional[str] = None) -> Dict[str, Any]:
+        """在用户自己的索引上查询；没有用户索引时回退到默认引擎"""
+        engine = await self.engine_for(user_id) if user_id is not None else None
+        if engine is None:
+            if self.fallback is None:
+                raise Exception(f"用户 {user_id} 还没有可查询的 GraphRAG 索引")
+            self.fallbacks += 1
+            return await self.fallback.query(query, query_type)
+        return await engine.query(query, query_type)
+
+    def resident_bytes(self) -> int:
+        return sum(e.snapshot.memory_bytes for e in self._engines.values() if e.snapshot is not None)
+
+    async def _evict(self, keep: int):
+        while len(self._engines) > 1 and (
+            len(self._engines) > self.max_resident or self.resident_bytes() > self.memory_budget_bytes
+        ):
+            user_id = next(iter(self._engines))
+            if user_id == keep:
+                break
+            await self.evict(user_id)
+
+    async def evict(self, user_id: int) -> bool:
+        """释放用户索引：停止后台检查并丢弃引用，已取得快照的查询不受影响"""
+        engine = self._engines.pop(user_id, None)
+        if engine is None:
+            return False
+        await engine.stop()
+        self.evictions += 1
+        logger.info(f"GraphRAG 用户索引已逐出: user={user_id} version={engine.snapshot.version if engine.snapshot else None}")
+        return True
+
+    async def close(self):
+        for user_id in list(self._engines):
+            await self.evict(user_id)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "resident": {
+                str(user_id): engine.stats() for user_id, engine in reversed(self._engines.items())
+            },
+            "resident_mb": round(self.resident_bytes() / 2**20, 1),
+            "max_resident": self.max_resident,
+            "memory_budget_mb": round(self.memory_budget_bytes / 2**20, 1),
+            "loads": self.loads,
+            "evictions": self.evictions,
+            "fallbacks": self.fallbacks,
+        }
+
+
+_default_registry: Optional[GraphRAGIndexRegistry] = None
+
+
+def get_graphrag_registry() -> GraphRAGIndexRegistry:
+    """进程级共享的用户索引注册表，按配置创建"""
+    global _default_registry
+    if _default_registry is None:
+        from app.core.config import settings
+
+        _default_registry = GraphRAGIndexRegistry(
+            project_dir=settings.GRAPHRAG_PROJECT_DIR,
+            data_dir_name=settings.GRAPHRAG_DATA_DIR,
+            max_resident=settings.GRAPHRAG_MAX_RESIDENT_INDEXES,
+            memory_budget_mb=settings.GRAPHRAG_INDEX_MEMORY_BUDGET_MB,
+            fallback=get_graphrag_engine(),
+            answer_cache_factory=answer_cache_from_settings,
+            query_type=settings.GRAPHRAG_QUERY_TYPE,
+            response_type=settings.GRAPHRAG_RESPONSE_TYPE,
+            community_level=settings.GRAPHRAG_COMMUNITY_LEVEL,
+            dynamic_community_selection=settings.GRAPHRAG_DYNAMIC_COMMUNITY,
+            reload_interval=settings.GRAPHRAG_RELOAD_INTERVAL,
+        )
+    return _default_registry
+
+
+async def close_graphrag_registry():
+    """停止所有常驻用户索引的后台检查任务；在应用关闭时调用"""
+    global _default_registry
+    if _default_registry is not None:
+        await _default_registry.close()
+        _default_registry = None
@@ -0,0 +1,576 @@
+"""上传文件索引构建的后台任务队列
+
+``/api/upload`` 原来在请求内等待整个 ``api.build_index`` 流水线（分块、LLM 抽取、Leiden、
+社区报告）结束，``process_directory`` 也是逐个文件构建。``IndexingJobQueue`` 把索引构建
+移到后台：
+
+- 持久化：任务记录在 SQLite 中，状态依次为 queued -> running -> succeeded / failed
+- 租约：领取任务的队列（进程号 + 随机后缀）在独立线程中定期续约，构建中同步的 Leiden、
+  pandas 等步骤长时间占住事件循环也不影响续约；只有租约过期的 running 任务（进程崩溃或
+  被杀）才会被重新排队，多个 uvicorn / gunicorn worker 共用同一个数据库时不会重复构建
+  其他进程正在运行的任务；正常关闭时立即归还
+- 工作池：所有进程合计最多 ``max_workers`` 个构建同时运行，每个用户最多 ``max_per_user`` 个，
+  两个上限都在领取任务的写事务中按数据库里的 running 构建计数
+- 合并：同一用户排队中的多个文件在一次构建中完成（用户已有索引时为增量更新）
+- 进度：构建时注册 ``JobProgressCallbacks``（实现 ``WorkflowCallbacks`` 的各个方法），
+  事件按任务记录，可通过 ``events`` 回放并持续订阅，直到任务结束；由其他进程执行的任务
+  收不到事件，改为轮询数据库中的状态和进度
+- 数据库访问是同步的，异步代码中通过 ``asyncio.to_thread`` 调用，不阻塞事件循环
+"""
+
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import deque
+from pathlib import Path
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, List, Optional, Set
+
+from app.core.logger import get_logger
+
+logger = get_logger(service="indexing_jobs")
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+TERMINAL_STATUSES = (SUCCEEDED, FAILED)
+
+# 每个任务在内存中保留的进度事件条数
+MAX_EVENTS_PER_JOB = 500
+# 保留事件的已结束任务数，更早结束的任务只能查询数据库中的最终状态
+MAX_FINISHED_LOGS = 1000
+# running 任务的租约时长（秒），队列每隔三分之一租约续约一次
+DEFAULT_LEASE_SECONDS = 60.0
+
+# runner(user_id, file_infos, callbacks) -> IndexingService.process_files 的返回值
+Runner = Callable[[int, List[Dict[str, Any]], List[Any]], Awaitable[Dict[str, Any]]]
+
+
+class IndexingJobStore:
+    """任务表：SQLite 持久化，单进程内通过锁串行访问，跨进程由 SQLite 的写锁串行"""
+
+    def __init__(self, path: str):
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS indexing_jobs ("
+                " id TEXT PRIMARY KEY,"
+                " user_id INTEGER NOT NULL,"
+                " status TEXT NOT NULL,"
+                " file_info TEXT NOT NULL,"
+                " run_id TEXT,"
+                " progress TEXT,"
+                " result TEXT,"
+                " error TEXT,"
+                " created_at REAL NOT NULL,"
+                " started_at REAL,"
+                " finished_at REAL,"
+                " owner TEXT,"
+                " heartbeat_at REAL)"
+            )
+            # 旧版本创建的表没有租约列
+            columns = {row["name"] for row in self._db.execute("PRAGMA table_info(indexing_jobs)")}
+            for column, kind in (("owner", "TEXT"), ("heartbeat_at", "REAL")):
+                if column not in columns:
+                    self._db.execute(f"ALTER TABLE indexing_jobs ADD COLUMN {column} {kind}")
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS idx_indexing_jobs_status ON indexing_jobs (status, created_at)"
+            )
+            self._db.commit()
+
+    @staticmethod
+    def _to_dict(row: sqlite3.Row) -> Dict[str, Any]:
+        job = dict(row)
+        for field in ("file_info", "progress", "result"):
+            if job[field] is not None:
+                job[field] = json.loads(job[field])
+        return job
+
+    def add(self, user_id: int, file_info: Dict[str, Any]) -> Dict[str, Any]:
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO indexing_jobs (id, user_id, status, file_info, created_at) VALUES (?, ?, ?, ?, ?)",
+                (job_id, user_id, QUEUED, json.dumps(file_info, ensure_ascii=False), time.time()),
+            )
+            self._db.commit()
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._db.execute("SELECT * FROM indexing_jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._to_dict(row) if row is not None else None
+
+    def queued_users(self) -> List[int]:
+        """有排队任务的用户，按最早排队时间排序"""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT user_id, MIN(created_at) AS first FROM indexing_jobs WHERE status = ?"
+                " GROUP BY user_id ORDER BY first",
+                (QUEUED,),
+            ).fetchall()
+        return [row["user_id"] for row in rows]
+
+    def claim(
+        self,
+        user_id: int,
+        limit: int,
+        owner: Optional[str] = None,
+        max_per_user: Optional[int] = None,
+        max_running: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """把该用户最早的 limit 个排队任务标记为 owner 的同一次构建并返回
+
+        在一个写事务中完成：所有进程运行中的构建已达 max_running，或该用户的已达
+        max_per_user 时不领取，多个进程同时领取时每个任务只会被其中一个领到。
+        """
+        run_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                running, user_running = self._db.execute(
+                    "SELECT COUNT(DISTINCT run_id), COUNT(DISTINCT CASE WHEN user_id = ? THEN run_id END)"
+                    " FROM indexing_jobs WHERE status = ?",
+                    (user_id, RUNNING),
+                ).fetchone()
+                ids = []
+                if (max_running is None or running < max_running) and (
+                    max_per_user is None or user_running < max_per_user
+                ):
+                    ids = [
+                        row["id"]
+                        for row in self._db.execute(
+                            "SELECT id FROM indexing_jobs WHERE status = ? AND user_id = ? ORDER BY created_at LIMIT ?",
+                            (QUEUED, user_id, limit),
+                        ).fetchall()
+                    ]
+                self._db.executemany(
+                    "UPDATE indexing_jobs SET status = ?, run_id = ?, started_at = ?, owner = ?, heartbeat_at = ? WHERE id = ?",
+                    [(RUNNING, run_id, now, owner, now, job_id) for job_id in ids],
+                )
+                self._db.commit()
+            except BaseException:
+                self._db.rollback()
+                raise
+        return [self.get(job_id) for job_id in ids]
+
+    def heartbeat(self, owner: str) -> int:
+        """续约 owner 正在运行的任务"""
+        with self._lock:
+            count = self._db.execute(
+                "UPDATE indexing_jobs SET heartbeat_at = ? WHERE status = ? AND owner = ?",
+                (time.time(), RUNNING, owner),
+            ).rowcount
+            self._db.commit()
+        return count
+
+    def set_progress(self, job_ids: List[str], progress: Dict[str, Any]):
+        with self._lock:
+            self._db.executemany(
+                "UPDATE indexing_jobs SET progress = ? WHERE id = ?",
+                [(json.dumps(progress, ensure_ascii=False), job_id) for job_id in job_ids],
+            )
+            self._db.commit()
+
+    def finish(
+        self,
+        job_ids: List[str],
+        status: str,
+        result: Optional[Dict[str, Any]] = None,
+        error: Optional[str] = None,
+        owner: Optional[str] = None,
+    ):
+        """记录任务结果；给出 owner 时跳过租约已过期、被重新排队的任务"""
+        with self._lock:
+            self._db.executemany(
+                "UPDATE indexing_jobs SET status = ?, result = ?, error = ?, finished_at = ? WHERE id = ?"
+                " AND (? IS NULL OR owner = ?)",
+                [
+                    (status, json.dumps(result, ensure_ascii=False, default=str) if result is not None else None, error, time.time(), job_id, owner, owner)
+                    for job_id in job_ids
+                ],
+            )
+            self._db.commit()
+
+    def requeue_expired(self, lease_seconds: float) -> int:
+        """把租约已过期的 running 任务（其进程已退出或卡死）重新排队"""
+        with self._lock:
+            count = self._db.execute(
+                "UPDATE indexing_jobs SET status = ?, run_id = NULL, started_at = NULL, owner = NULL, heartbeat_at = NULL"
+                " WHERE status = ? AND (heartbeat_at IS NULL OR heartbeat_at < ?)",
+                (QUEUED, RUNNING, time.time() - lease_seconds),
+            ).rowcount
+            self._db.commit()
+        return count
+
+    def release(self, owner: str) -> int:
+        """把 owner 的 running 任务立即重新排队（正常关闭时调用）"""
+        with self._lock:
+            count = self._db.execute(
+                "UPDATE indexing_jobs SET status = ?, run_id = NULL, started_at = NULL, owner = NULL, heartbeat_at = NULL"
+                " WHERE status = ? AND owner = ?",
+                (QUEUED, RUNNING, owner),
+            ).rowcount
+            self._db.commit()
+        return count
+
+    def count(self, status: str) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM indexing_jobs WHERE status = ?", (status,)).fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+class JobEventLog:
+    """单个任务的进度事件：保留最近的事件供回放，并推送给正在订阅的客户端"""
+
+    def __init__(self):
+        self.events: Deque[Dict[str, Any]] = deque(maxlen=MAX_EVENTS_PER_JOB)
+        self.subscribers: Set[asyncio.Queue] = set()
+        self.done = False
+
+    def publish(self, event: Dict[str, Any]):
+        self.events.append(event)
+        for queue in self.subscribers:
+            queue.put_nowait(event)
+
+
+class JobProgressCallbacks:
+    """``WorkflowCallbacks`` 实现：把一次构建的流水线事件发布到其包含的全部任务"""
+
+    def __init__(self, queue: "IndexingJobQueue", job_ids: List[str]):
+        self.queue = queue
+        self.job_ids = job_ids
+        self.workflows: List[str] = []
+        self.current: Optional[str] = None
+        self._last_percent = -1.0
+
+    def _emit(self, event_type: str, **data: Any):
+        self.queue._publish(self.job_ids, {"type": event_type, "time": time.time(), **data})
+
+    def _stage(self) -> Dict[str, Any]:
+        done = self.workflows.index(self.current) if self.current in self.workflows else 0
+        return {"workflow": self.current, "workflow_index": done, "workflow_count": len(self.workflows)}
+
+    def pipeline_start(self, names: List[str]) -> None:
+        self.workflows = list(names)
+        self._emit("pipeline_start", workflows=self.workflows)
+
+    def pipeline_end(self, results: List[Any]) -> None:
+        self._emit("pipeline_end")
+
+    def workflow_start(self, name: str, instance: object) -> None:
+        self.current = name
+        self._last_percent = -1.0
+        stage = self._stage()
+        self.queue._in_background(self.queue.store.set_progress, self.job_ids, stage)
+        self._emit("workflow_start", **stage)
+
+    def workflow_end(self, name: str, instance: object) -> None:
+        self._emit("workflow_end", workflow=name)
+
+    def progress(self, progress: Any) -> None:
+        percent = progress.percent
+        # 逐行的进度回调很密集，只在推进至少 1% 时发布
+        if percent is not None and percent < 1 and percent - self._last_percent < 0.01:
+            return
+        self._last_percent = percent if percent is not None else self._last_percent
+        self._emit(
+            "progress",
+            workflow=self.current,
+            percent=percent,
+            description=progress.description,
+            completed_items=progress.completed_items,
+            total_items=progress.total_items,
+        )
+
+    def error(self, message: str, cause: Optional[BaseException] = None, stack: Optional[str] = None, details: Optional[dict] = None) -> None:
+        self._emit("error", message=message, cause=str(cause) if cause else None)
+
+    def warning(self, message: str, details: Optional[dict] = None) -> None:
+        self._emit("warning", message=message)
+
+    def log(self, message: str, details: Optional[dict] = None) -> None:
+        self._emit("log", message=message)
+
+
+async def _default_runner(user_id: int, file_infos: List[Dict[str, Any]], callbacks: List[Any]) -> Dict[str, Any]:
+    # 延迟导入：索引服务依赖完整的 graphrag 索引流水线
+    from app.services.indexing_service import IndexingService
+
+    return await IndexingService().process_files(file_infos, callbacks)
+
+
+class IndexingJobQueue:
+    """索引构建任务队列：提交立即返回任务 ID，后台工作池按并发限制合并执行"""
+
+    def __init__(
+        self,
+        store: IndexingJobStore,
+        runner: Optional[Runner] = None,
+        max_workers: int = 2,
+        max_per_user: int = 1,
+        max_files_per_run: int = 20,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS,
+        poll_interval: float = 1.0,
+    ):
+        self.store = store
+        self.runner = runner or _default_runner
+        self.max_workers = max_workers
+        self.max_per_user = max_per_user
+        self.max_files_per_run = max_files_per_run
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        # 租约持有者：进程号区分 worker，随机后缀避免进程号复用
+        self.owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+        self._running: Dict[str, asyncio.Task] = {}  # run_id -> task
+        self._logs: Dict[str, JobEventLog] = {}
+        self._finished: Deque[str] = deque()
+        self._wakeup = asyncio.Event()
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._lease_keeper: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        self._pending_writes: Set[asyncio.Future] = set()
+        self.runs = 0
+
+    # ------------------------------------------------------------------
+    # 提交与查询
+    # ------------------------------------------------------------------
+
+    async def submit(self, user_id: int, file_info: Dict[str, Any]) -> Dict[str, Any]:
+        job = await asyncio.to_thread(self.store.add, user_id, file_info)
+        self._log(job["id"]).publish({"type": "status", "status": QUEUED, "time": time.time()})
+        self._wakeup.set()
+        return job
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return await asyncio.to_thread(self.store.get, job_id)
+
+    async def events(self, job_id: str) -> AsyncIterator[Dict[str, Any]]:
+        """回放任务已有的事件，然后持续推送新事件，任务结束后停止
+
+        每隔 ``poll_interval`` 秒没有新事件时查询一次数据库：任务由其他进程执行时，
+        本进程只能据此推送状态和进度的变化。
+        """
+        job = await self.get(job_id)
+        if job is None:
+            return
+        log = self._logs.get(job_id)
+        if log is None or job["status"] in TERMINAL_STATUSES and not log.events:
+            # 本进程没有该任务的事件（例如重启前已结束），只给出当前状态
+            yield {"type": "status", "status": job["status"], "progress": job["progress"], "error": job["error"]}
+            if job["status"] in TERMINAL_STATUSES:
+                return
+            log = self._log(job_id)
+        subscriber: asyncio.Queue = asyncio.Queue()
+        log.subscribers.add(subscriber)
+        try:
+            for event in list(log.events):
+                yield event
+            if log.done:
+                return
+            last = (job["status"], job["progress"])
+            while True:
+                try:
+                    event = await asyncio.wait_for(subscriber.get(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    job = await self.get(job_id)
+                    if job is None:
+                        return
+                    if (job["status"], job["progress"]) == last:
+                        continue
+                    last = (job["status"], job["progress"])
+                    event = {"type": "status", "status": job["status"], "progress": job["progress"], "error": job["error"]}
+                yield event
+                if event["type"] == "status" and event["status"] in TERMINAL_STATUSES:
+                    return
+        finally:
+            log.subscribers.discard(subscriber)
+
+    def _log(self, job_id: str) -> JobEventLog:
+        log = self._logs.get(job_id)
+        if log is None:
+            log = self._logs[job_id] = JobEventLog()
+        return log
+
+    def _publish(self, job_ids: List[str], event: Dict[str, Any]):
+        for job_id in job_ids:
+            self._log(job_id).publish(event)
+
+    def _in_background(self, fn: Callable[..., Any], *args: Any):
+        """在线程中执行同步的数据库写入（供同步的 WorkflowCallbacks 使用）"""
+        future = asyncio.ensure_future(asyncio.to_thread(fn, *args))
+        self._pending_writes.add(future)
+        future.add_done_callback(self._pending_writes.discard)
+
+    # ------------------------------------------------------------------
+    # 调度
+    # ------------------------------------------------------------------
+
+    def start(self):
+        """启动调度任务和续约线程"""
+        if self._dispatcher is None or self._dispatcher.done():
+            self._wakeup.set()
+            self._dispatcher = asyncio.create_task(self._dispatch())
+            self._stopping = threading.Event()
+            self._lease_keeper = threading.Thread(
+                target=self._keep_leases,
+                args=(self._stopping, asyncio.get_running_loop()),
+                name=f"indexing-lease-{self.owner}",
+                daemon=True,
+            )
+            self._lease_keeper.start()
+
+    async def stop(self):
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+            try:
+                await self._dispatcher
+            except asyncio.CancelledError:
+                pass
+        if self._lease_keeper is not None:
+            self._stopping.set()
+            await asyncio.to_thread(self._lease_keeper.join)
+        self._dispatcher = self._lease_keeper = None
+        # 正在运行的构建被取消，其任务立即归还队列，由下次启动或其他进程重新执行
+        for task in list(self._running.values()):
+            task.cancel()
+        await asyncio.gather(*self._running.values(), return_exceptions=True)
+        released = await asyncio.to_thread(self.store.release, self.owner)
+        if released:
+            logger.info(f"归还 {released} 个未完成的索引任务")
+
+    async def join(self):
+        """等待数据库中的任务全部结束，包括其他进程正在运行的（测试和批处理脚本使用）"""
+        while (
+            self._running
+            or await asyncio.to_thread(self.store.count, QUEUED)
+            or await asyncio.to_thread(self.store.count, RUNNING)
+        ):
+            self._wakeup.set()
+            await asyncio.sleep(0.01)
+
+    async def _dispatch(self):
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            try:
+                await self._schedule()
+            except Exception as e:
+                logger.error(f"索引任务调度失败: {e}", exc_info=True)
+
+    def _keep_leases(self, stopping: threading.Event, loop: asyncio.AbstractEventLoop):
+        """续约线程：续约本队列正在运行的任务，并接手其他进程留下的租约过期任务
+
+        不依赖事件循环，构建阻塞事件循环超过租约时长时租约也不会过期。
+        """
+        while True:
+            try:
+                self.store.heartbeat(self.owner)
+                requeued = self.store.requeue_expired(self.lease_seconds)
+                if requeued:
+                    logger.info(f"重新排队 {requeued} 个租约过期的索引任务")
+                    loop.call_soon_threadsafe(self._wakeup.set)
+            except Exception as e:
+                logger.error(f"索引任务续约失败: {e}", exc_info=True)
+            if stopping.wait(self.lease_seconds / 3):
+                return
+
+    async def _schedule(self):
+        for user_id in await asyncio.to_thread(self.store.queued_users):
+            if len(self._running) >= self.max_workers:
+                return
+            jobs = await asyncio.to_thread(
+                self.store.claim, user_id, self.max_files_per_run, self.owner, self.max_per_user, self.max_workers
+            )
+            if not jobs:
+                continue
+            run_id = jobs[0]["run_id"]
+            self._running[run_id] = asyncio.create_task(self._run(run_id, user_id, jobs))
+
+    async def _run(self, run_id: str, user_id: int, jobs: List[Dict[str, Any]]):
+        job_ids = [job["id"] for job in jobs]
+        self.runs += 1
+        self._publish(job_ids, {"type": "status", "status": RUNNING, "run_id": run_id, "files": len(jobs), "time": time.time()})
+        logger.info(f"开始索引构建: user={user_id} run={run_id} files={len(jobs)}")
+        try:
+            result = await self.runner(user_id, [job["file_info"] for job in jobs], [JobProgressCallbacks(self, job_ids)])
+            if result.get("status") == "success":
+                status, error = SUCCEEDED, None
+            else:
+                status, error = FAILED, result.get("error") or json.dumps(
+                    [r.get("errors") for r in result.get("results", [])], ensure_ascii=False, default=str
+                )
+        except asyncio.CancelledError:
+            self._running.pop(run_id, None)
+            raise
+        except Exception as e:
+            logger.error(f"索引构建失败: user={user_id} run={run_id}: {e}", exc_info=True)
+            result, status, error = None, FAILED, str(e)
+        try:
+            # 先写入结果再释放名额，调度时该用户的构建已不再是 running
+            await asyncio.gather(*self._pending_writes, return_exceptions=True)
+            await asyncio.to_thread(self.store.finish, job_ids, status, result, error, self.owner)
+        finally:
+            self._running.pop(run_id, None)
+            self._wakeup.set()
+        self._publish(job_ids, {"type": "status", "status": status, "error": error, "time": time.time()})
+        for job_id in job_ids:
+            self._logs[job_id].done = True
+            self._finished.append(job_id)
+        while len(self._finished) > MAX_FINISHED_LOGS:
+            self._logs.pop(self._finished.popleft(), None)
+        logger.info(f"索引构建结束: user={user_id} run={run_id} status={status}")
+
+    async def stats(self) -> Dict[str, Any]:
+        counts = await asyncio.to_thread(lambda: {status: self.store.count(status) for status in (QUEUED, RUNNING, SUCCEEDED, FAILED)})
+        return {
+            "queued": counts[QUEUED],
+            "running": counts[RUNNING],
+            "succeeded": counts[SUCCEEDED],
+            "failed": counts[FAILED],
+            "active_runs": len(self._running),
+            "runs": self.runs,
+            "max_workers": self.max_workers,
+            "max_per_user": self.max_per_user,
+        }
+
+
+_default_queue: Optional[IndexingJobQueue] = None
+
+
+def get_indexing_queue() -> IndexingJobQueue:
+    """进程级共享的索引任务队列，按配置创建"""
+    global _default_queue
+    if _default_queue is None:
+        from app.core.config import settings
+
+        _default_queue = IndexingJobQueue(
+            IndexingJobStore(settings.INDEXING_JOB_DB),
+            max_workers=settings.INDEXING_MAX_WORKERS,
+            max_per_user=settings.INDEXING_MAX_JOBS_PER_USER,
+            max_files_per_run=settings.INDEXING_MAX_FILES_PER_RUN,
+            lease_seconds=settings.INDEXING_JOB_LEASE_SECONDS,
+        )
+    return _default_queue
+
+
+async def close_indexing_queue():
+    """停止调度和正在运行的构建；在应用关闭时调用"""
+    global _default_queue
+    if _default_queue is not None:
+        await _default_queue.stop()
+        _default_queue.store.close()
+        _default_queue = None
@@ -1,8 +1,9 @@
 import os
+import re
 import asyncio
 import logging
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 import mimetypes
 import shutil
 import uuid
@@ -28,6 +29,11 @@ class IndexingService:
 
         # 默认配置文件
         self.default_config = 'settings.yaml'
+        # 按文件类型选择配置文件
+        self.config_mapping = {
+            'text/csv': 'settings_csv.yaml',
+            'application/pdf': 'settings_pdf.yaml',
+        }
         
     # 获取文件类型
     def _get_file_type(self, file_path: str) -> str:
@@ -40,13 +46,6 @@ class IndexingService:
         """根据文件类型获取对应的配置文件"""
         return self.config_mapping.get(file_type, self.default_config)
     
-    # 检查文件是否已经建立索引
-    def _check_existing_index(self, file_path: str, output_dir: str) -> bool:
-        """检查文件是否已经建立索引"""
-        file_name = Path(file_path).stem
-        index_path = os.path.join(output_dir, f"{file_name}_index")
-        return os.path.exists(index_path)
-    
     # 为用户准备输入和输出目录
     def _prepare_user_directories(self, user_id: int) -> tuple:
         """为用户准备输入和输出目录"""
@@ -75,121 +74,145 @@ class IndexingService:
         
         return dest_path
     
+    # 用户输出目录中是否已经有索引
+    def _has_user_index(self, output_dir: str) -> bool:
+        """用户输出目录中已有索引时，新文件以增量更新的方式合入"""
+        return os.path.exists(os.path.join(output_dir, "entities.parquet"))
+
     # 处理单个文件的索引构建
-    async def process_file(self, file_info: Dict[str, Any]) -> Dict[str, Any]:
+    async def process_file(self, file_info: Dict[str, Any], callbacks: Optional[List[Any]] = None) -> Dict[str, Any]:
         """处理单个文件的索引构建"""
+        result = await self.process_files([file_info], callbacks)
+        if result['status'] == 'error' and 'results' not in result:
+            return {'file_path': file_info.get('path'), **result}
+        return result['results'][0]
+
+    # 将同一用户的多个文件合并为一次索引构建
+    async def process_files(
+        self, file_infos: List[Dict[str, Any]], callbacks: Optional[List[Any]] = None
+    ) -> Dict[str, Any]:
+        """把同一用户的多个文件合并到一次索引构建中
+
+        文件按所用配置分组，每组只运行一次 ``api.build_index``；用户已有索引时以增量更新方式运行。
+        callbacks 为 ``WorkflowCallbacks``，用于上报流水线进度。
+        """
         try:
-            # 获取文件路径 
-            file_path = file_info['path']
-            file_type = self._get_file_type(file_path)
-            user_id = file_info.get('user_id', 0)  # 获取用户ID，默认为0
-            
-            logger.info(f"开始处理文件: {file_path}, 类型: {file_type}, 用户ID: {user_id}")
-            
+            user_id = file_infos[0].get('user_id', 0)  # 获取用户ID，默认为0
+
             # 准备用户目录
             user_input_dir, user_output_dir = self._prepare_user_directories(user_id)
-            
-            # 复制文件到输入目录
-            input_file_path = self._copy_file_to_input_dir(file_path, user_input_dir)
-            
-            # 获取配置文件
-            config_file = self._get_config_file(file_type)
-            logger.info(f"使用配置文件: {config_file}")
-            
-            # 检查是否需要增量更新
-            is_update = self._check_existing_index(input_file_path, user_output_dir)
-            
-            # 准备配置
-            config_path = os.path.join(self.data_dir, config_file)
-            if not os.path.exists(config_path):
-                logger.warning(f"配置文件不存在: {config_path}，使用默认配置")
-                config_path = os.path.join(self.data_dir, self.default_config)
-            
-            # 设置配置覆盖
-            config_overrides = {
-                'input.base_dir': user_input_dir,
-                'output.base_dir': user_output_dir,
-                # 更新文件匹配模式以匹配文件名
-                'input.file_pattern': f".*{os.path.basename(input_file_path)}$$"
-            }
-            
-            # 加载配置
-            graphrag_config = load_config(
-                Path(self.data_dir),
-                Path(config_path),
-                config_overrides
-            )
-            
-            # 创建进度记录器
-            progress_logger = RichProgressLogger(prefix="graphrag-index")
-            
-            logger.info(f"开始{'增量更新' if is_update else '构建'}索引: {input_file_path}")
-            logger.info(f"输入目录: {user_input_dir}")
-            logger.info(f"输出目录: {user_output_dir}")
-            
-            # 执行索引构建
-            index_result = await api.build_index(
-                config=graphrag_config,
-                method=IndexingMethod.Standard,
-                is_update_run=is_update,
-                memory_profile=False,
-                progress_logger=progress_logger
-            )
-            
-            # 处理结果
-            result_info = {
-                'original_file_path': file_path,
-                'input_file_path': input_file_path,
-                'file_type': file_type,
-                'config_used': config_file,
-                'is_update': is_update,
-                'status': 'success',
-                'user_id': user_id,
-                'input_dir': user_input_dir,
-                'output_dir': user_output_dir
+
+            groups: Dict[str, List[Dict[str, Any]]] = {}
+            for file_info in file_infos:
+                file_path = file_info['path']
+                file_type = self._get_file_type(file_path)
+                logger.info(f"开始处理文件: {file_path}, 类型: {file_type}, 用户ID: {user_id}")
+
+                # 复制文件到输入目录
+                input_file_path = self._copy_file_to_input_dir(file_path, user_input_dir)
+                config_file = self._get_config_file(file_type)
+                groups.setdefault(config_file, []).append({
+                    'original_file_path': file_path,
+                    'input_file_path': input_file_path,
+                    'file_type': file_type,
+                    'config_used': config_file,
+                })
+
+            results = []
+            for config_file, group in groups.items():
+                logger.info(f"使用配置文件: {config_file}")
+
+                # 检查是否需要增量更新
+                is_update = self._has_user_index(user_output_dir)
+
+                # 准备配置
+                config_path = os.path.join(self.data_dir, config_file)
+                if not os.path.exists(config_path):
+                    logger.warning(f"配置文件不存在: {config_path}，使用默认配置")
+                    config_path = os.path.join(self.data_dir, self.default_config)
+
+                # 设置配置覆盖
+                names = "|".join(re.escape(os.path.basename(f['input_file_path'])) for f in group)
+                config_overrides = {
+                    'input.base_dir': user_input_dir,
+                    'output.base_dir': user_output_dir,
+                    # 向量库也按用户隔离，查询时由 graphrag_registry 加载该用户自己的 LanceDB
+                    'vector_store.default_vector_store.db_uri': os.path.join(user_output_dir, 'lancedb'),
+                    # 更新文件匹配模式，只匹配本次合并的文件
+                    'input.file_pattern': f".*({names})$"
+                }
+
+                # 加载配置
+                graphrag_config = load_config(
+                    Path(self.data_dir),
+                    Path(config_path),
+                    config_overrides
+                )
+
+                # 创建进度记录器
+                progress_logger = RichProgressLogger(prefix="graphrag-index")
+
+                logger.info(f"开始{'增量更新' if is_update else '构建'}索引: {len(group)} 个文件")
+                logger.info(f"输入目录: {user_input_dir}")
+                logger.info(f"输出目录: {user_output_dir}")
+
+                # 执行索引构建
+                index_result = await api.build_index(
+                    config=graphrag_config,
+                    method=IndexingMethod.Standard,
+                    is_update_run=is_update,
+                    memory_profile=False,
+                    callbacks=list(callbacks or []),
+                    progress_logger=progress_logger
+                )
+
+                # 处理结果
+                errors = [error for workflow_result in index_result for error in (workflow_result.errors or [])]
+                if errors:
+                    logger.error(f"索引构建失败: {errors}")
+                for file_result in group:
+                    file_result.update({
+                        'is_update': is_update,
+                        'status': 'error' if errors else 'success',
+                        'user_id': user_id,
+                        'input_dir': user_input_dir,
+                        'output_dir': user_output_dir,
+                    })
+                    if errors:
+                        file_result['errors'] = errors
+                    results.append(file_result)
+
+            return {
+                'status': 'error' if any(r['status'] == 'error' for r in results) else 'success',
+                'processed_files': len(results),
+                'results': results,
             }
-            
-            # 检查是否有错误
-            for workflow_result in index_result:
-                if workflow_result.errors:
-                    result_info['status'] = 'error'
-                    result_info['errors'] = workflow_result.errors
-                    logger.error(f"索引构建失败: {workflow_result.errors}")
-            
-            return result_info
-            
+
         except Exception as e:
             logger.error(f"处理文件时发生错误: {str(e)}", exc_info=True)
             return {
-                'file_path': file_path,
                 'status': 'error',
                 'error': str(e)
             }
-    
+
     async def process_directory(self, directory_path: str, user_id: int = 0) -> Dict[str, Any]:
-        """处理整个目录的索引构建"""
+        """处理整个目录的索引构建：目录下的全部文件合并为一次索引构建"""
         try:
-            results = []
+            file_infos = []
             for root, _, files in os.walk(directory_path):
                 for file in files:
-                    file_path = os.path.join(root, file)
-                    file_info = {
-                        'path': file_path,
+                    file_infos.append({
+                        'path': os.path.join(root, file),
                         'original_name': file,
                         'user_id': user_id
-                    }
-                    result = await self.process_file(file_info)
-                    results.append(result)
-            
-            return {
-                'status': 'success',
-                'processed_files': len(results),
-                'results': results
-            }
-            
+                    })
+            if not file_infos:
+                return {'status': 'success', 'processed_files': 0, 'results': []}
+            return await self.process_files(file_infos)
+
         except Exception as e:
             logger.error(f"处理目录时发生错误: {str(e)}", exc_info=True)
             return {
                 'status': 'error',
                 'error': str(e)
-            }
\ No newline at end of file
+            }
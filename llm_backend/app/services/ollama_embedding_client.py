@@ -0,0 +1,179 @@
+"""共享的 Ollama 向量化客户端
+
+- 进程内复用一个 ``aiohttp.ClientSession``（keep-alive 连接池），不再每次调用新建会话
+- 微批处理：``batch_window`` 时间窗口内的并发 ``embed()`` 调用合并为一次 ``/api/embed``
+  请求（``input: [...]``），窗口内相同文本只向量化一次
+- 短期记忆：文本 → 向量在进程内保留 ``memo_ttl`` 秒，语义缓存 ``lookup`` 算出的向量
+  可以直接被随后的 ``update`` 复用
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set, Tuple
+
+import aiohttp
+
+from app.core.logger import get_logger
+
+logger = get_logger(service="ollama_embedding")
+
+
+class OllamaEmbeddingClient:
+    """带连接复用、微批处理和短期记忆的 Ollama 向量化客户端"""
+
+    def __init__(
+        self,
+        base_url: str,
+        model: str,
+        batch_window: float = 0.005,  # 合并并发请求的时间窗口(秒)
+        max_batch_size: int = 32,  # 单次请求最多合并的文本数，达到即立即发送
+        memo_ttl: float = 300.0,  # 文本向量在进程内的保留时间(秒)
+        memo_max_size: int = 4096,
+        max_connections: int = 20,
+        timeout: float = 30.0,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.model = model
+        self.batch_window = batch_window
+        self.max_batch_size = max_batch_size
+        self.memo_ttl = memo_ttl
+        self.memo_max_size = memo_max_size
+        self.max_connections = max_connections
+        self.timeout = timeout
+
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._memo: "OrderedDict[str, Tuple[float, List[float]]]" = OrderedDict()
+        self._pending: Dict[str, asyncio.Future] = {}  # 当前批次中等待向量化的文本
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._flush_tasks: Set[asyncio.Task] = set()  # 持有进行中的批次任务，避免被垃圾回收
+
+        # 统计信息
+        self.requests = 0  # 实际发出的 HTTP 请求数
+        self.texts_embedded = 0  # 实际送去向量化的文本数
+        self.memo_hits = 0
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_connections, keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+        return self._session
+
+    def _memo_get(self, text: str) -> Optional[List[float]]:
+        item = self._memo.get(text)
+        if item is None:
+            return None
+        expires_at, vector = item
+        if expires_at < time.monotonic():
+            del self._memo[text]
+            return None
+        self._memo.move_to_end(text)
+        return vector
+
+    def _memo_put(self, text: str, vector: List[float]):
+        self._memo[text] = (time.monotonic() + self.memo_ttl, vector)
+        self._memo.move_to_end(text)
+        while len(self._memo) > self.memo_max_size:
+            self._memo.popitem(last=False)
+
+    async def embed(self, text: str) -> List[float]:
+        """获取单条文本的向量，并发调用会被合并到同一批请求中"""
+        vector = self._memo_get(text)
+        if vector is not None:
+            self.memo_hits += 1
+            return vector
+
+        future = self._pending.get(text)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._pending[text] = future
+            if len(self._pending) >= self.max_batch_size:
+                self._schedule_flush(immediate=True)
+            elif self._flush_handle is None:
+                self._schedule_flush()
+        # shield: 单个调用方被取消时不影响同一批次的其他调用方
+        return await asyncio.shield(future)
+
+    def _schedule_flush(self, immediate: bool = False):
+        loop = asyncio.get_running_loop()
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if immediate:
+            self._start_flush()
+        else:
+            self._flush_handle = loop.call_later(self.batch_window, self._start_flush)
+
+    def _start_flush(self):
+        self._flush_handle = None
+        batch, self._pending = self._pending, {}
+        if batch:
+            task = asyncio.get_running_loop().create_task(self._flush(batch))
+            self._flush_tasks.add(task)
+            task.add_done_callback(self._flush_tasks.discard)
+
+    async def _flush(self, batch: Dict[str, asyncio.Future]):
+        texts = list(batch)
+        try:
+            vectors = await self._post_embed(texts)
+            if len(vectors) != len(texts):
+                raise ValueError(f"Expected {len(texts)} embeddings, got {len(vectors)}")
+        except Exception as e:
+            logger.error(f"Error getting Ollama embedding: {str(e)}", exc_info=True)
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+                    # 调用方可能都已取消，标记异常已读取，避免 "exception was never retrieved"
+                    future.exception()
+            return
+
+        for text, vector in zip(texts, vectors):
+            self._memo_put(text, vector)
+            future = batch[text]
+            if not future.done():
+                future.set_result(vector)
+
+    async def _post_embed(self, texts: List[str]) -> List[List[float]]:
+        """调用 Ollama /api/embed，一次请求向量化多条文本"""
+        self.requests += 1
+        self.texts_embedded += len(texts)
+        session = self._get_session()
+        async with session.post(
+            f"{self.base_url}/api/embed",
+            json={"model": self.model, "input": texts},
+        ) as response:
+            response.raise_for_status()
+            result = await response.json()
+            # Ollama embed API 返回格式为 {"embeddings": [[...], ...]}，顺序与 input 一致
+            return result["embeddings"]
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
+# 进程级共享的客户端，按模型区分
+_clients: Dict[str, OllamaEmbeddingClient] = {}
+
+
+def get_embedding_client(model: str = None) -> OllamaEmbeddingClient:
+    """获取指定模型的共享向量化客户端"""
+    from app.core.config import settings
+
+    model = model or settings.OLLAMA_EMBEDDING_MODEL
+    client = _clients.get(model)
+    if client is None:
+        client = OllamaEmbeddingClient(base_url=settings.OLLAMA_BASE_URL, model=model)
+        _clients[model] = client
+    return client
+
+
+async def close_embedding_clients():
+    """关闭所有共享客户端的连接池，在应用关闭时调用"""
+    for client in _clients.values():
+        await client.close()
+    _clients.clear()
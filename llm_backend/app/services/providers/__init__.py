@@ -16,10 +16,26 @@ from app.services.providers.call_policy import (
 )
 from app.services.providers.amap_provider import AmapMapProvider, AmapSearchProvider
 from app.services.providers.factory import build_registry
+from app.services.providers.health import (
+    CircuitState,
+    ProviderHealthTracker,
+    get_health_tracker,
+)
 from app.services.providers.mock_providers import MockMapProvider, MockSearchProvider
 from app.services.providers.orchestrator import OrchestratorResult, ProviderOrchestrator
 from app.services.providers.registry import ProviderRegistry
+from app.services.providers.response_cache import (
+    CachedMapProvider,
+    CachedSearchProvider,
+    ProviderResponseCache,
+    get_response_cache,
+)
 from app.services.providers.serp_providers import SerpApiMapProvider, SerpApiSearchProvider
+from app.services.providers.transport import (
+    ProviderTransportManager,
+    close_transport_manager,
+    get_transport_manager,
+)
 
 __all__ = [
     "ProviderCallContext",
@@ -44,4 +60,14 @@ __all__ = [
     "AmapSearchProvider",
     "AmapMapProvider",
     "build_registry",
+    "ProviderTransportManager",
+    "get_transport_manager",
+    "close_transport_manager",
+    "ProviderResponseCache",
+    "CachedSearchProvider",
+    "CachedMapProvider",
+    "get_response_cache",
+    "CircuitState",
+    "ProviderHealthTracker",
+    "get_health_tracker",
 ]
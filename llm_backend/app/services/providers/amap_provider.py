@@ -15,8 +15,6 @@ from __future__ import annotations
 import logging
 from typing import Any
 
-import httpx
-
 from app.services.providers.base import (
     MapProvider,
     ProviderCallContext,
@@ -24,6 +22,7 @@ from app.services.providers.base import (
     ProviderResponse,
     SearchProvider,
 )
+from app.services.providers.transport import ProviderTransportManager, get_transport_manager
 
 logger = logging.getLogger(__name__)
 
@@ -100,9 +99,16 @@ def _parse_poi(poi: dict[str, Any], source: str) -> ProviderCandidate:
 class AmapSearchProvider(SearchProvider):
     """POI keyword search via 高德 /v3/place/text."""
 
-    def __init__(self, api_key: str, *, timeout: float = 10.0) -> None:
+    def __init__(
+        self,
+        api_key: str,
+        *,
+        timeout: float = 10.0,
+        transport: ProviderTransportManager | None = None,
+    ) -> None:
         self._key = api_key
         self._timeout = timeout
+        self._transport = transport or get_transport_manager()
 
     @property
     def name(self) -> str:
@@ -132,10 +138,9 @@ class AmapSearchProvider(SearchProvider):
             params["city"] = city
             params["citylimit"] = "true"
 
-        async with httpx.AsyncClient(timeout=self._timeout) as client:
-            resp = await client.get(f"{_BASE}/text", params=params)
-            resp.raise_for_status()
-            data = resp.json()
+        resp = await self._transport.get(f"{_BASE}/text", params=params, timeout=self._timeout)
+        resp.raise_for_status()
+        data = resp.json()
 
         if data.get("status") != "1":
             logger.warning("Amap search error: %s", data.get("info", "unknown"))
@@ -167,9 +172,16 @@ class AmapMapProvider(MapProvider):
     lookup table.
     """
 
-    def __init__(self, api_key: str, *, timeout: float = 10.0) -> None:
+    def __init__(
+        self,
+        api_key: str,
+        *,
+        timeout: float = 10.0,
+        transport: ProviderTransportManager | None = None,
+    ) -> None:
         self._key = api_key
         self._timeout = timeout
+        self._transport = transport or get_transport_manager()
 
     @property
     def name(self) -> str:
@@ -196,10 +208,9 @@ class AmapMapProvider(MapProvider):
             "output": "json",
         }
 
-        async with httpx.AsyncClient(timeout=self._timeout) as client:
-            resp = await client.get(f"{_BASE}/text", params=params)
-            resp.raise_for_status()
-            data = resp.json()
+        resp = await self._transport.get(f"{_BASE}/text", params=params, timeout=self._timeout)
+        resp.raise_for_status()
+        data = resp.json()
 
         if data.get("status") != "1":
             logger.warning("Amap map error: %s", data.get("info", "unknown"))
@@ -22,6 +22,14 @@ class ProviderCallPolicy:
     max_calls_per_request: int = 6
     timeout_seconds: float = 10.0
 
+    # Concurrent fan-out: launch every planned call at once under one
+    # overall deadline instead of awaiting providers one after another.
+    concurrent: bool = False
+    request_deadline_seconds: float | None = None  # None → timeout_seconds
+    # Hedging: stop waiting once this many providers returned usable
+    # (non-degraded, non-empty) responses; 0 waits for every call.
+    hedge_min_good: int = 0
+
     provider_priority: list[ProviderType] = field(
         default_factory=lambda: [
             ProviderType.SEARCH,
@@ -41,6 +49,12 @@ class ProviderCallPolicy:
     top_k_search: int = 10
     top_k_map: int = 20
 
+    @property
+    def effective_deadline(self) -> float:
+        if self.request_deadline_seconds is None:
+            return self.timeout_seconds
+        return self.request_deadline_seconds
+
     def is_enabled(self, pt: ProviderType) -> bool:
         return {
             ProviderType.SEARCH: self.search_enabled,
@@ -25,6 +25,13 @@ from app.services.providers.serp_providers import (
     SerpApiMapProvider,
     SerpApiSearchProvider,
 )
+from app.services.providers.response_cache import (
+    CachedMapProvider,
+    CachedSearchProvider,
+    ProviderResponseCache,
+    get_response_cache,
+)
+from app.services.providers.transport import ProviderTransportManager, get_transport_manager
 
 logger = logging.getLogger(__name__)
 
@@ -44,24 +51,43 @@ def _get_key(setting_name: str, env_name: str) -> str | None:
     return key.strip()
 
 
-def build_registry(*, include_mock_fallback: bool = True) -> ProviderRegistry:
+def build_registry(
+    *,
+    include_mock_fallback: bool = True,
+    transport: ProviderTransportManager | None = None,
+    cache_responses: bool = True,
+    response_cache: ProviderResponseCache | None = None,
+) -> ProviderRegistry:
     """Build a ``ProviderRegistry`` with the best available providers.
 
+    HTTP providers share ``transport`` (the process-wide pooled
+    transport by default) so connections are reused across requests.
+    With ``cache_responses`` they are also wrapped in the shared
+    ``ProviderResponseCache``; mock providers are never cached.
+
     Returns a registry ready to be passed to ``ProviderOrchestrator``.
     """
     registry = ProviderRegistry()
+    transport = transport or get_transport_manager()
+    cache = (response_cache or get_response_cache()) if cache_responses else None
+
+    def _search(provider):
+        return CachedSearchProvider(provider, cache) if cache else provider
+
+    def _map(provider):
+        return CachedMapProvider(provider, cache) if cache else provider
 
     amap_key = _get_key("AMAP_API_KEY", "AMAP_API_KEY")
     if amap_key:
         logger.info("Amap key detected — registering 高德 search & map providers (priority 1)")
-        registry.register_search(AmapSearchProvider(amap_key))
-        registry.register_map(AmapMapProvider(amap_key))
+        registry.register_search(_search(AmapSearchProvider(amap_key, transport=transport)))
+        registry.register_map(_map(AmapMapProvider(amap_key, transport=transport)))
 
     serpapi_key = _get_key("SERPAPI_KEY", "SERPAPI_KEY")
     if serpapi_key:
         logger.info("SerpAPI key detected — registering search & map providers (priority 2)")
-        registry.register_search(SerpApiSearchProvider(serpapi_key))
-        registry.register_map(SerpApiMapProvider(serpapi_key))
+        registry.register_search(_search(SerpApiSearchProvider(serpapi_key, transport=transport)))
+        registry.register_map(_map(SerpApiMapProvider(serpapi_key, transport=transport)))
 
     if not amap_key and not serpapi_key:
         logger.warning(
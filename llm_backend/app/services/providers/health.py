@@ -0,0 +1,215 @@
+"""Per-provider health tracking: circuit breaker and adaptive timeouts.
+
+Without it every request keeps paying the full
+``ProviderCallPolicy.timeout_seconds`` against a provider that is down.
+``ProviderHealthTracker`` keeps, per provider name:
+
+- a rolling window of call outcomes (error rate)
+- an EWMA of latency and a window of successful latencies (p95)
+- a circuit: *closed* → *open* once the error rate crosses the threshold
+  → *half_open* after ``open_seconds``, admitting one probe call whose
+  outcome closes or re-opens the circuit
+
+``ProviderOrchestrator`` skips providers whose circuit is open and uses
+``timeout_for`` (p95 × multiplier, clamped to the policy timeout)
+instead of the fixed policy timeout.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+@dataclass(slots=True)
+class ProviderHealth:
+    """Rolling health statistics for one provider."""
+
+    outcomes: deque[bool]
+    latencies: deque[float]
+    state: CircuitState = CircuitState.CLOSED
+    opened_at: float = 0.0
+    probe_in_flight: bool = False
+    ewma_latency: float | None = None
+    calls: int = 0
+    failures: int = 0
+    short_circuited: int = 0
+    last_error: str | None = None
+    transitions: list[tuple[float, str]] = field(default_factory=list)
+
+    @property
+    def error_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return sum(1 for ok in self.outcomes if not ok) / len(self.outcomes)
+
+    def p95(self) -> float | None:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, math.ceil(0.95 * len(ordered)) - 1)]
+
+
+class ProviderHealthTracker:
+    """Circuit breaker + latency tracker shared by orchestrator instances."""
+
+    def __init__(
+        self,
+        *,
+        window: int = 20,
+        min_calls: int = 5,
+        error_rate_threshold: float = 0.5,
+        open_seconds: float = 30.0,
+        ewma_alpha: float = 0.2,
+        latency_window: int = 100,
+        min_latency_samples: int = 10,
+        timeout_multiplier: float = 2.0,
+        min_timeout: float = 1.0,
+    ) -> None:
+        self.window = window
+        self.min_calls = min_calls
+        self.error_rate_threshold = error_rate_threshold
+        self.open_seconds = open_seconds
+        self.ewma_alpha = ewma_alpha
+        self.latency_window = latency_window
+        self.min_latency_samples = min_latency_samples
+        self.timeout_multiplier = timeout_multiplier
+        self.min_timeout = min_timeout
+        self._providers: dict[str, ProviderHealth] = {}
+
+    def _get(self, name: str) -> ProviderHealth:
+        health = self._providers.get(name)
+        if health is None:
+            health = ProviderHealth(
+                outcomes=deque(maxlen=self.window),
+                latencies=deque(maxlen=self.latency_window),
+            )
+            self._providers[name] = health
+        return health
+
+    def _transition(self, name: str, health: ProviderHealth, state: CircuitState) -> None:
+        if health.state == state:
+            return
+        logger.warning("Provider %s circuit %s → %s", name, health.state.value, state.value)
+        health.state = state
+        health.transitions.append((time.time(), state.value))
+        del health.transitions[:-10]
+        if state == CircuitState.OPEN:
+            health.opened_at = time.monotonic()
+
+    # ------------------------------------------------------------------
+    # Circuit
+    # ------------------------------------------------------------------
+
+    def allow(self, name: str) -> bool:
+        """Whether a call to ``name`` may go out now.
+
+        In *half_open* exactly one probe is admitted until it reports back.
+        """
+        health = self._get(name)
+        if health.state == CircuitState.OPEN:
+            if time.monotonic() - health.opened_at < self.open_seconds:
+                health.short_circuited += 1
+                return False
+            self._transition(name, health, CircuitState.HALF_OPEN)
+        if health.state == CircuitState.HALF_OPEN:
+            if health.probe_in_flight:
+                health.short_circuited += 1
+                return False
+            health.probe_in_flight = True
+        return True
+
+    def record_success(self, name: str, latency: float) -> None:
+        health = self._get(name)
+        health.calls += 1
+        health.outcomes.append(True)
+        health.latencies.append(latency)
+        if health.ewma_latency is None:
+            health.ewma_latency = latency
+        else:
+            health.ewma_latency += self.ewma_alpha * (latency - health.ewma_latency)
+        if health.state == CircuitState.HALF_OPEN:
+            health.probe_in_flight = False
+            health.outcomes.clear()
+            self._transition(name, health, CircuitState.CLOSED)
+
+    def record_failure(self, name: str, error: str) -> None:
+        health = self._get(name)
+        health.calls += 1
+        health.failures += 1
+        health.last_error = error
+        health.outcomes.append(False)
+        if health.state == CircuitState.HALF_OPEN:
+            health.probe_in_flight = False
+            self._transition(name, health, CircuitState.OPEN)
+        elif (
+            health.state == CircuitState.CLOSED
+            and len(health.outcomes) >= self.min_calls
+            and health.error_rate >= self.error_rate_threshold
+        ):
+            self._transition(name, health, CircuitState.OPEN)
+
+    def release(self, name: str) -> None:
+        """Free the half-open probe slot without recording an outcome.
+
+        Used for calls cancelled by the caller and for responses served
+        from the response cache, which say nothing about upstream health.
+        """
+        self._get(name).probe_in_flight = False
+
+    # ------------------------------------------------------------------
+    # Adaptive timeout
+    # ------------------------------------------------------------------
+
+    def timeout_for(self, name: str, ceiling: float) -> float:
+        """p95 latency × multiplier, within [min_timeout, ceiling].
+
+        Falls back to ``ceiling`` until enough successful samples exist.
+        """
+        health = self._providers.get(name)
+        if health is None or len(health.latencies) < self.min_latency_samples:
+            return ceiling
+        return max(self.min_timeout, min(ceiling, health.p95() * self.timeout_multiplier))
+
+    def snapshot(self, ceiling: float | None = None) -> dict[str, dict[str, Any]]:
+        out: dict[str, dict[str, Any]] = {}
+        for name, health in self._providers.items():
+            entry: dict[str, Any] = {
+                "state": health.state.value,
+                "error_rate": round(health.error_rate, 4),
+                "ewma_latency_seconds": health.ewma_latency,
+                "p95_latency_seconds": health.p95(),
+                "calls": health.calls,
+                "failures": health.failures,
+                "short_circuited": health.short_circuited,
+                "last_error": health.last_error,
+                "transitions": [{"at": at, "state": state} for at, state in health.transitions],
+            }
+            if ceiling is not None:
+                entry["timeout_seconds"] = self.timeout_for(name, ceiling)
+            out[name] = entry
+        return out
+
+
+_default_tracker: ProviderHealthTracker | None = None
+
+
+def get_health_tracker() -> ProviderHealthTracker:
+    """Process-wide tracker so health survives across orchestrator instances."""
+    global _default_tracker
+    if _default_tracker is None:
+        _default_tracker = ProviderHealthTracker()
+    return _default_tracker
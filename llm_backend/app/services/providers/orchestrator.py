@@ -2,18 +2,19 @@ from __future__ import annotations
 
 import asyncio
 import logging
+from collections.abc import Awaitable, Callable
 from dataclasses import dataclass, field
+from functools import partial
 
 from app.services.providers.base import (
-    MapProvider,
     ProviderCallContext,
     ProviderCandidate,
     ProviderError,
     ProviderErrorCode,
     ProviderResponse,
-    SearchProvider,
 )
 from app.services.providers.call_policy import ProviderCallPolicy, ProviderType
+from app.services.providers.health import ProviderHealthTracker
 from app.services.providers.registry import ProviderRegistry
 
 logger = logging.getLogger(__name__)
@@ -30,6 +31,15 @@ class OrchestratorResult:
     calls_made: int = 0
 
 
+@dataclass(slots=True)
+class _PlannedCall:
+    """One provider call admitted by the call budget, in priority order."""
+
+    provider_name: str
+    provider_type: ProviderType
+    invoke: Callable[[], Awaitable[ProviderResponse]]
+
+
 class ProviderOrchestrator:
     """Executes provider calls respecting call budget and timeouts.
 
@@ -37,15 +47,25 @@ class ProviderOrchestrator:
     records a ``ProviderError``, marks the result as *degraded*,
     and appends a human-readable assumption string so downstream
     nodes can surface it in ``validation.assumptions``.
+
+    With ``policy.concurrent`` all admitted calls run at once under a
+    single request deadline; responses are still merged in registration
+    order so deduplication keeps the higher-priority occurrence.
+
+    With a ``ProviderHealthTracker`` providers whose circuit is open are
+    skipped without consuming the call budget, and each call's timeout
+    follows the provider's observed p95 latency.
     """
 
     def __init__(
         self,
         registry: ProviderRegistry,
         policy: ProviderCallPolicy | None = None,
+        health: ProviderHealthTracker | None = None,
     ) -> None:
         self._registry = registry
         self._policy = policy or ProviderCallPolicy()
+        self._health = health
 
     async def recall(
         self,
@@ -57,25 +77,14 @@ class ProviderOrchestrator:
     ) -> OrchestratorResult:
         """Run search + map recall within the call budget."""
         result = OrchestratorResult()
+        calls = self._plan_calls(query, city, keywords, context, result)
+        result.calls_made = len(calls)
 
-        if self._policy.is_enabled(ProviderType.SEARCH):
-            for sp in self._registry.search_providers:
-                if result.calls_made >= self._policy.max_calls_per_request:
-                    result.assumptions.append(
-                        "已达到单次请求调用上限，部分搜索源未调用。"
-                    )
-                    break
-                await self._call_search(sp, query, context, result)
-
-        if self._policy.is_enabled(ProviderType.MAP):
-            kw = keywords or [query]
-            for mp in self._registry.map_providers:
-                if result.calls_made >= self._policy.max_calls_per_request:
-                    result.assumptions.append(
-                        "已达到单次请求调用上限，部分地图源未调用。"
-                    )
-                    break
-                await self._call_map(mp, city, kw, context, result)
+        if self._policy.concurrent:
+            await self._run_concurrent(calls, result)
+        else:
+            for call in calls:
+                await self._run_one(call, result)
 
         if not result.candidates:
             result.degraded = True
@@ -90,53 +99,152 @@ class ProviderOrchestrator:
     # Internal helpers
     # ------------------------------------------------------------------
 
-    async def _call_search(
+    def _plan_calls(
         self,
-        provider: SearchProvider,
         query: str,
+        city: str,
+        keywords: list[str] | None,
         context: ProviderCallContext | None,
         result: OrchestratorResult,
-    ) -> None:
-        result.calls_made += 1
+    ) -> list[_PlannedCall]:
+        """Admit provider calls in registration order until the budget is spent."""
+        calls: list[_PlannedCall] = []
+
+        if self._policy.is_enabled(ProviderType.SEARCH):
+            for sp in self._registry.search_providers:
+                if len(calls) >= self._policy.max_calls_per_request:
+                    result.assumptions.append(
+                        "已达到单次请求调用上限，部分搜索源未调用。"
+                    )
+                    break
+                if not self._admit(sp.name, result):
+                    continue
+                calls.append(_PlannedCall(
+                    sp.name,
+                    ProviderType.SEARCH,
+                    partial(sp.search, query=query, top_k=self._policy.top_k_search, context=context),
+                ))
+
+        if self._policy.is_enabled(ProviderType.MAP):
+            kw = keywords or [query]
+            for mp in self._registry.map_providers:
+                if len(calls) >= self._policy.max_calls_per_request:
+                    result.assumptions.append(
+                        "已达到单次请求调用上限，部分地图源未调用。"
+                    )
+                    break
+                if not self._admit(mp.name, result):
+                    continue
+                calls.append(_PlannedCall(
+                    mp.name,
+                    ProviderType.MAP,
+                    partial(mp.nearby_poi, city=city, keywords=kw, top_k=self._policy.top_k_map, context=context),
+                ))
+
+        return calls
+
+    def _admit(self, provider_name: str, result: OrchestratorResult) -> bool:
+        """Skip providers whose circuit is open, without waiting on them."""
+        if self._health is None or self._health.allow(provider_name):
+            return True
+        self._record_failure(result, provider_name, ProviderErrorCode.UNAVAILABLE, "熔断中，跳过调用")
+        return False
+
+    def _timeout_for(self, provider_name: str) -> float:
+        if self._health is None:
+            return self._policy.timeout_seconds
+        return self._health.timeout_for(provider_name, self._policy.timeout_seconds)
+
+    async def _invoke(self, call: _PlannedCall) -> ProviderResponse:
+        loop = asyncio.get_running_loop()
+        start = loop.time()
         try:
-            resp = await asyncio.wait_for(
-                provider.search(
-                    query=query,
-                    top_k=self._policy.top_k_search,
-                    context=context,
-                ),
-                timeout=self._policy.timeout_seconds,
-            )
-            self._merge_response(resp, result, provider.name)
-        except asyncio.TimeoutError:
-            self._record_failure(result, provider.name, ProviderErrorCode.TIMEOUT, "搜索服务超时")
+            resp = await asyncio.wait_for(call.invoke(), timeout=self._timeout_for(call.provider_name))
+        except asyncio.CancelledError:
+            if self._health is not None:
+                self._health.release(call.provider_name)
+            raise
+        except Exception as exc:
+            if self._health is not None:
+                self._health.record_failure(call.provider_name, f"{type(exc).__name__}: {exc}")
+            raise
+        if self._health is not None:
+            if resp.meta.get("cache_hit"):
+                self._health.release(call.provider_name)
+            elif resp.degraded:
+                # e.g. Amap over quota answers HTTP 200 with status != "1"
+                self._health.record_failure(call.provider_name, "degraded response")
+            else:
+                self._health.record_success(call.provider_name, loop.time() - start)
+        return resp
+
+    async def _run_one(self, call: _PlannedCall, result: OrchestratorResult) -> None:
+        try:
+            resp = await self._invoke(call)
         except Exception as exc:  # noqa: BLE001
-            self._record_failure(result, provider.name, ProviderErrorCode.UNKNOWN, str(exc))
+            self._apply_outcome(call, exc, result)
+        else:
+            self._apply_outcome(call, resp, result)
+
+    async def _run_concurrent(self, calls: list[_PlannedCall], result: OrchestratorResult) -> None:
+        """Fan out all calls under one deadline and merge in priority order."""
+        if not calls:
+            return
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self._policy.effective_deadline
+        tasks = [asyncio.ensure_future(self._invoke(call)) for call in calls]
+        pending = set(tasks)
+        good = 0
+        try:
+            while pending:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                done, pending = await asyncio.wait(
+                    pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+                )
+                good += sum(1 for t in done if self._is_good(t))
+                if self._policy.hedge_min_good and good >= self._policy.hedge_min_good:
+                    break
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        hedged = bool(self._policy.hedge_min_good) and good >= self._policy.hedge_min_good
+        for call, task in zip(calls, tasks):
+            if task.cancelled():
+                if hedged:
+                    logger.info("Provider %s cancelled: enough responses already", call.provider_name)
+                else:
+                    if self._health is not None:
+                        self._health.record_failure(call.provider_name, "request deadline exceeded")
+                    self._apply_outcome(call, asyncio.TimeoutError(), result)
+            else:
+                self._apply_outcome(call, task.exception() or task.result(), result)
 
-    async def _call_map(
+    @staticmethod
+    def _is_good(task: asyncio.Future) -> bool:
+        if task.cancelled() or task.exception() is not None:
+            return False
+        resp = task.result()
+        return bool(resp.candidates) and not resp.degraded
+
+    def _apply_outcome(
         self,
-        provider: MapProvider,
-        city: str,
-        keywords: list[str],
-        context: ProviderCallContext | None,
+        call: _PlannedCall,
+        outcome: ProviderResponse | BaseException,
         result: OrchestratorResult,
     ) -> None:
-        result.calls_made += 1
-        try:
-            resp = await asyncio.wait_for(
-                provider.nearby_poi(
-                    city=city,
-                    keywords=keywords,
-                    top_k=self._policy.top_k_map,
-                    context=context,
-                ),
-                timeout=self._policy.timeout_seconds,
-            )
-            self._merge_response(resp, result, provider.name)
-        except asyncio.TimeoutError:
-            self._record_failure(result, provider.name, ProviderErrorCode.TIMEOUT, "地图服务超时")
-        except Exception as exc:  # noqa: BLE001
-            self._record_failure(result, provider.name, ProviderErrorCode.UNKNOWN, str(exc))
+        if isinstance(outcome, asyncio.TimeoutError):
+            message = "搜索服务超时" if call.provider_type == ProviderType.SEARCH else "地图服务超时"
+            self._record_failure(result, call.provider_name, ProviderErrorCode.TIMEOUT, message)
+        elif isinstance(outcome, BaseException):
+            self._record_failure(result, call.provider_name, ProviderErrorCode.UNKNOWN, str(outcome))
+        else:
+            self._merge_response(outcome, result, call.provider_name)
 
     @staticmethod
     def _merge_response(
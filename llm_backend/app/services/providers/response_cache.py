@@ -0,0 +1,356 @@
+"""Provider response cache: LRU + optional Redis, SWR and single-flight.
+
+Popular recalls ("成都 美食") used to hit Amap / SerpAPI once per user
+and burn through the free-tier quota.  ``CachedSearchProvider`` and
+``CachedMapProvider`` wrap a concrete provider and route calls through a
+shared ``ProviderResponseCache``:
+
+- key: normalized (provider, operation, query/city, keywords, top_k)
+- tiers: in-process LRU first, then Redis when a client is configured
+- per-provider TTL; after it expires the entry is served *stale* for
+  ``stale_ttl`` more seconds while one background refresh runs
+- single-flight: concurrent misses on one key share a single upstream
+  call, and a caller timing out does not cancel the shared fetch
+- degraded or error-carrying responses are never cached
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass
+from hashlib import sha1
+from typing import Any
+
+from app.services.providers.base import (
+    MapProvider,
+    ProviderCallContext,
+    ProviderCandidate,
+    ProviderResponse,
+    SearchProvider,
+)
+
+logger = logging.getLogger(__name__)
+
+_REDIS_PREFIX = "provider_cache"
+
+
+@dataclass(slots=True)
+class _Entry:
+    response: ProviderResponse
+    fetched_at: float  # wall clock, shared with the Redis tier
+    ttl: float
+
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+
+@dataclass(slots=True)
+class ProviderCacheStats:
+    """Per-provider cache counters."""
+
+    hits: int = 0
+    stale_hits: int = 0
+    redis_hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+    refreshes: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        served = self.hits + self.stale_hits + self.misses + self.coalesced
+        return (self.hits + self.stale_hits + self.coalesced) / served if served else 0.0
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.strip().lower().split())
+
+
+def make_cache_key(
+    provider: str,
+    operation: str,
+    subject: str,
+    keywords: list[str] | None,
+    top_k: int,
+) -> str:
+    """Normalized cache key; keyword order and case do not matter."""
+    kw = sorted({_normalize(k) for k in keywords or [] if k.strip()})
+    raw = json.dumps([provider, operation, _normalize(subject), kw, top_k], ensure_ascii=False)
+    return f"{provider}:{sha1(raw.encode('utf-8')).hexdigest()}"
+
+
+def _dump(response: ProviderResponse) -> str:
+    return json.dumps(
+        {
+            "candidates": [asdict(c) for c in response.candidates],
+            "meta": response.meta,
+        },
+        ensure_ascii=False,
+    )
+
+
+def _load(payload: str | bytes) -> ProviderResponse:
+    data = json.loads(payload)
+    return ProviderResponse(
+        candidates=[ProviderCandidate(**c) for c in data["candidates"]],
+        meta=data.get("meta", {}),
+    )
+
+
+def _served_from_cache(response: ProviderResponse) -> ProviderResponse:
+    """Copy flagged with ``meta["cache_hit"]`` so callers can tell it apart
+    from an upstream call (e.g. to keep it out of latency statistics)."""
+    return ProviderResponse(
+        candidates=list(response.candidates),
+        meta={**response.meta, "cache_hit": True},
+    )
+
+
+class ProviderResponseCache:
+    """Two-tier provider response cache shared by all wrapped providers."""
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = 2048,
+        default_ttl: float = 1800.0,
+        stale_ttl: float = 3600.0,
+        ttl_by_provider: dict[str, float] | None = None,
+        redis_client: Any = None,
+    ) -> None:
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.stale_ttl = stale_ttl
+        self.ttl_by_provider = dict(ttl_by_provider or {})
+        self._redis = redis_client
+        self._lru: OrderedDict[str, _Entry] = OrderedDict()
+        self._inflight: dict[str, asyncio.Task] = {}
+        self._stats: dict[str, ProviderCacheStats] = {}
+
+    def ttl_for(self, provider: str) -> float:
+        return self.ttl_by_provider.get(provider, self.default_ttl)
+
+    def _stat(self, provider: str) -> ProviderCacheStats:
+        return self._stats.setdefault(provider, ProviderCacheStats())
+
+    async def get_or_fetch(
+        self,
+        provider: str,
+        key: str,
+        fetch: Callable[[], Awaitable[ProviderResponse]],
+    ) -> ProviderResponse:
+        stats = self._stat(provider)
+        entry = self._lru_get(key)
+        if entry is None and self._redis is not None:
+            entry = await self._redis_get(key)
+            if entry is not None:
+                stats.redis_hits += 1
+                self._lru_put(key, entry)
+
+        if entry is not None:
+            age = entry.age()
+            if age < entry.ttl:
+                stats.hits += 1
+                return _served_from_cache(entry.response)
+            if age < entry.ttl + self.stale_ttl:
+                stats.stale_hits += 1
+                if key not in self._inflight:
+                    stats.refreshes += 1
+                    self._start_fetch(provider, key, fetch)
+                return _served_from_cache(entry.response)
+
+        task = self._inflight.get(key)
+        if task is None:
+            stats.misses += 1
+            task = self._start_fetch(provider, key, fetch)
+        else:
+            stats.coalesced += 1
+        # shield: a caller hitting its own timeout must not cancel the shared fetch
+        return await asyncio.shield(task)
+
+    def _start_fetch(
+        self,
+        provider: str,
+        key: str,
+        fetch: Callable[[], Awaitable[ProviderResponse]],
+    ) -> asyncio.Task:
+        task = asyncio.ensure_future(self._fetch_and_store(provider, key, fetch))
+        self._inflight[key] = task
+        task.add_done_callback(lambda t: self._on_fetch_done(key, t))
+        return task
+
+    def _on_fetch_done(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # retrieve the exception so background refresh failures are not logged as unhandled
+        if not task.cancelled() and task.exception() is not None:
+            logger.debug("Provider fetch for %s failed: %s", key, task.exception())
+
+    async def _fetch_and_store(
+        self,
+        provider: str,
+        key: str,
+        fetch: Callable[[], Awaitable[ProviderResponse]],
+    ) -> ProviderResponse:
+        response = await fetch()
+        if response.degraded or response.errors:
+            return response
+        entry = _Entry(response=response, fetched_at=time.time(), ttl=self.ttl_for(provider))
+        self._lru_put(key, entry)
+        if self._redis is not None:
+            await self._redis_put(key, entry)
+        return response
+
+    # ------------------------------------------------------------------
+    # Tiers
+    # ------------------------------------------------------------------
+
+    def _lru_get(self, key: str) -> _Entry | None:
+        entry = self._lru.get(key)
+        if entry is None:
+            return None
+        if entry.age() >= entry.ttl + self.stale_ttl:
+            del self._lru[key]
+            return None
+        self._lru.move_to_end(key)
+        return entry
+
+    def _lru_put(self, key: str, entry: _Entry) -> None:
+        self._lru[key] = entry
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+
+    async def _redis_get(self, key: str) -> _Entry | None:
+        try:
+            raw = await self._redis.hgetall(f"{_REDIS_PREFIX}:{key}")
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("Provider cache redis read failed: %s", exc)
+            return None
+        if not raw:
+            return None
+        raw = {k.decode() if isinstance(k, bytes) else k: v for k, v in raw.items()}
+        try:
+            return _Entry(
+                response=_load(raw["response"]),
+                fetched_at=float(raw["fetched_at"]),
+                ttl=float(raw["ttl"]),
+            )
+        except (KeyError, ValueError, TypeError) as exc:
+            logger.warning("Provider cache redis entry %s unreadable: %s", key, exc)
+            return None
+
+    async def _redis_put(self, key: str, entry: _Entry) -> None:
+        redis_key = f"{_REDIS_PREFIX}:{key}"
+        try:
+            async with self._redis.pipeline(transaction=True) as pipe:
+                pipe.hset(redis_key, mapping={
+                    "response": _dump(entry.response),
+                    "fetched_at": entry.fetched_at,
+                    "ttl": entry.ttl,
+                })
+                pipe.expire(redis_key, int(entry.ttl + self.stale_ttl))
+                await pipe.execute()
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("Provider cache redis write failed: %s", exc)
+
+    # ------------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------------
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        out: dict[str, dict[str, Any]] = {}
+        for provider, stats in self._stats.items():
+            entry = asdict(stats)
+            entry["hit_ratio"] = round(stats.hit_ratio, 4)
+            out[provider] = entry
+        return out
+
+    def clear(self) -> None:
+        self._lru.clear()
+
+
+class CachedSearchProvider(SearchProvider):
+    """``SearchProvider`` decorator that serves responses from a cache."""
+
+    def __init__(self, inner: SearchProvider, cache: ProviderResponseCache) -> None:
+        self.inner = inner
+        self._cache = cache
+
+    @property
+    def name(self) -> str:
+        return self.inner.name
+
+    async def search(
+        self,
+        *,
+        query: str,
+        top_k: int = 10,
+        context: ProviderCallContext | None = None,
+    ) -> ProviderResponse:
+        key = make_cache_key(self.name, "search", query, None, top_k)
+        return await self._cache.get_or_fetch(
+            self.name,
+            key,
+            lambda: self.inner.search(query=query, top_k=top_k, context=context),
+        )
+
+
+class CachedMapProvider(MapProvider):
+    """``MapProvider`` decorator that serves responses from a cache."""
+
+    def __init__(self, inner: MapProvider, cache: ProviderResponseCache) -> None:
+        self.inner = inner
+        self._cache = cache
+
+    @property
+    def name(self) -> str:
+        return self.inner.name
+
+    async def nearby_poi(
+        self,
+        *,
+        city: str,
+        keywords: list[str],
+        top_k: int = 20,
+        context: ProviderCallContext | None = None,
+    ) -> ProviderResponse:
+        key = make_cache_key(self.name, "nearby_poi", city, keywords, top_k)
+        return await self._cache.get_or_fetch(
+            self.name,
+            key,
+            lambda: self.inner.nearby_poi(city=city, keywords=keywords, top_k=top_k, context=context),
+        )
+
+
+_default_cache: ProviderResponseCache | None = None
+
+
+def get_response_cache() -> ProviderResponseCache:
+    """Process-wide cache shared by every registry built in this process."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ProviderResponseCache(**_cache_settings())
+    return _default_cache
+
+
+def _cache_settings() -> dict[str, Any]:
+    try:
+        from app.core.config import settings
+    except Exception:
+        return {}
+    kwargs: dict[str, Any] = {
+        "max_entries": settings.PROVIDER_CACHE_MAX_ENTRIES,
+        "default_ttl": settings.PROVIDER_CACHE_TTL,
+        "stale_ttl": settings.PROVIDER_CACHE_STALE_TTL,
+        "ttl_by_provider": settings.PROVIDER_CACHE_TTLS,
+    }
+    if settings.PROVIDER_CACHE_REDIS:
+        from app.core.redis_client import get_redis
+
+        kwargs["redis_client"] = get_redis()
+    return kwargs
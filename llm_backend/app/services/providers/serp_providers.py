@@ -14,8 +14,6 @@ import logging
 from hashlib import md5
 from typing import Any
 
-import httpx
-
 from app.services.providers.base import (
     MapProvider,
     ProviderCallContext,
@@ -25,6 +23,7 @@ from app.services.providers.base import (
     ProviderResponse,
     SearchProvider,
 )
+from app.services.providers.transport import ProviderTransportManager, get_transport_manager
 
 logger = logging.getLogger(__name__)
 
@@ -44,9 +43,16 @@ class SerpApiSearchProvider(SearchProvider):
     as ``ProviderCandidate`` objects.
     """
 
-    def __init__(self, api_key: str, *, timeout: float = 12.0) -> None:
+    def __init__(
+        self,
+        api_key: str,
+        *,
+        timeout: float = 12.0,
+        transport: ProviderTransportManager | None = None,
+    ) -> None:
         self._api_key = api_key
         self._timeout = timeout
+        self._transport = transport or get_transport_manager()
 
     @property
     def name(self) -> str:
@@ -68,10 +74,9 @@ class SerpApiSearchProvider(SearchProvider):
             "gl": "cn",
         }
 
-        async with httpx.AsyncClient(timeout=self._timeout) as client:
-            resp = await client.get(_SERPAPI_BASE, params=params)
-            resp.raise_for_status()
-            data = resp.json()
+        resp = await self._transport.get(_SERPAPI_BASE, params=params, timeout=self._timeout)
+        resp.raise_for_status()
+        data = resp.json()
 
         candidates: list[ProviderCandidate] = []
 
@@ -121,9 +126,16 @@ class SerpApiMapProvider(MapProvider):
     ratings, addresses, and coordinates.
     """
 
-    def __init__(self, api_key: str, *, timeout: float = 12.0) -> None:
+    def __init__(
+        self,
+        api_key: str,
+        *,
+        timeout: float = 12.0,
+        transport: ProviderTransportManager | None = None,
+    ) -> None:
         self._api_key = api_key
         self._timeout = timeout
+        self._transport = transport or get_transport_manager()
 
     @property
     def name(self) -> str:
@@ -146,10 +158,9 @@ class SerpApiMapProvider(MapProvider):
             "ll": "",  # let Google infer from city name
         }
 
-        async with httpx.AsyncClient(timeout=self._timeout) as client:
-            resp = await client.get(_SERPAPI_BASE, params=params)
-            resp.raise_for_status()
-            data = resp.json()
+        resp = await self._transport.get(_SERPAPI_BASE, params=params, timeout=self._timeout)
+        resp.raise_for_status()
+        data = resp.json()
 
         candidates: list[ProviderCandidate] = []
 
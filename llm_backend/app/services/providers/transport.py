@@ -0,0 +1,177 @@
+"""Shared HTTP transport for external providers.
+
+Providers used to open a fresh ``httpx.AsyncClient`` per call, paying a
+TCP + TLS handshake to restapi.amap.com / serpapi.com every time.  The
+``ProviderTransportManager`` keeps one long-lived client per host with
+bounded connection pools and keep-alive (HTTP/2 when ``h2`` is
+installed), records per-host request statistics and is closed once on
+application shutdown.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import asdict, dataclass
+from typing import Any
+from urllib.parse import urlsplit
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+try:  # HTTP/2 needs the optional ``h2`` package (``httpx[http2]``)
+    import h2  # noqa: F401
+
+    _HTTP2_AVAILABLE = True
+except ImportError:  # pragma: no cover - depends on environment
+    _HTTP2_AVAILABLE = False
+
+
+@dataclass(slots=True)
+class HostStats:
+    """Request counters for one upstream host."""
+
+    requests: int = 0
+    errors: int = 0
+    in_flight: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+    last_status: int | None = None
+
+    @property
+    def avg_seconds(self) -> float:
+        return self.total_seconds / self.requests if self.requests else 0.0
+
+
+class ProviderTransportManager:
+    """Owns one pooled ``httpx.AsyncClient`` per upstream host."""
+
+    def __init__(
+        self,
+        *,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry: float = 30.0,
+        http2: bool = True,
+        default_timeout: float = 10.0,
+    ) -> None:
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self._http2 = http2 and _HTTP2_AVAILABLE
+        if http2 and not _HTTP2_AVAILABLE:
+            logger.info("h2 not installed — provider transport falls back to HTTP/1.1 keep-alive")
+        self._default_timeout = default_timeout
+        self._clients: dict[str, httpx.AsyncClient] = {}
+        self._stats: dict[str, HostStats] = {}
+
+    def client_for(self, url: str) -> httpx.AsyncClient:
+        """Return the shared client for ``url``'s host, creating it on first use."""
+        host = urlsplit(url).netloc
+        client = self._clients.get(host)
+        if client is None or client.is_closed:
+            client = self._new_client()
+            self._clients[host] = client
+        return client
+
+    def _new_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            limits=self._limits,
+            http2=self._http2,
+            timeout=self._default_timeout,
+        )
+
+    async def get(
+        self,
+        url: str,
+        *,
+        params: dict[str, Any] | None = None,
+        timeout: float | None = None,
+    ) -> httpx.Response:
+        """GET ``url`` over the host's pooled client and record stats."""
+        client = self.client_for(url)
+        stats = self._stats.setdefault(urlsplit(url).netloc, HostStats())
+        stats.requests += 1
+        stats.in_flight += 1
+        start = time.perf_counter()
+        try:
+            resp = await client.get(
+                url,
+                params=params,
+                timeout=self._default_timeout if timeout is None else timeout,
+            )
+            stats.last_status = resp.status_code
+            if resp.is_error:
+                stats.errors += 1
+            return resp
+        except BaseException:
+            stats.errors += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            stats.in_flight -= 1
+            stats.total_seconds += elapsed
+            stats.max_seconds = max(stats.max_seconds, elapsed)
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """Per-host request counters plus current pool occupancy."""
+        out: dict[str, dict[str, Any]] = {}
+        for host, stats in self._stats.items():
+            entry = asdict(stats)
+            entry["avg_seconds"] = stats.avg_seconds
+            client = self._clients.get(host)
+            entry.update(self._pool_stats(client))
+            out[host] = entry
+        return out
+
+    @staticmethod
+    def _pool_stats(client: httpx.AsyncClient | None) -> dict[str, Any]:
+        # httpx does not expose pool state publicly; read the httpcore pool
+        # best-effort so a library upgrade only loses these fields.
+        if client is None or client.is_closed:
+            return {"open_connections": 0, "idle_connections": 0}
+        pool = getattr(getattr(client, "_transport", None), "_pool", None)
+        connections = list(getattr(pool, "connections", []) or [])
+        return {
+            "open_connections": len(connections),
+            "idle_connections": sum(1 for c in connections if c.is_idle()),
+        }
+
+    async def aclose(self) -> None:
+        for client in self._clients.values():
+            await client.aclose()
+        self._clients.clear()
+
+
+_default_manager: ProviderTransportManager | None = None
+
+
+def get_transport_manager() -> ProviderTransportManager:
+    """Process-wide manager shared by every registry built in this process."""
+    global _default_manager
+    if _default_manager is None:
+        _default_manager = ProviderTransportManager(**_transport_settings())
+    return _default_manager
+
+
+def _transport_settings() -> dict[str, Any]:
+    try:
+        from app.core.config import settings
+    except Exception:
+        return {}
+    return {
+        "max_connections": settings.PROVIDER_HTTP_MAX_CONNECTIONS,
+        "max_keepalive_connections": settings.PROVIDER_HTTP_MAX_KEEPALIVE,
+        "keepalive_expiry": settings.PROVIDER_HTTP_KEEPALIVE_EXPIRY,
+    }
+
+
+async def close_transport_manager() -> None:
+    """Close the shared manager's clients; called on application shutdown."""
+    global _default_manager
+    if _default_manager is not None:
+        await _default_manager.aclose()
+        _default_manager = None
@@ -13,14 +13,22 @@ total_score = Σ (weight_i × score_i)
 
 All per-dimension scores are preserved in ``ScoredCandidate.breakdown``
 for downstream explainability and debugging.
+
+``RankingScorer.rank`` scores the whole pool at once (``score_batch``):
+candidate fields are gathered into NumPy columns in one pass, the five
+dimensions are computed as array operations and top-K is selected with
+``argpartition``.  Results are identical to scoring with ``score_one``.
 """
 
 from __future__ import annotations
 
+import re
 from dataclasses import dataclass, field
 from math import log1p
 from typing import Any
 
+import numpy as np
+
 from app.services.providers.base import ProviderCandidate
 
 
@@ -58,6 +66,9 @@ DEFAULT_WEIGHTS = RankingWeights()
 _EVIDENCE_FIELDS = ("url", "address", "rating", "website", "photos", "tel")
 _MAX_RATING = 5.0
 _LOG_POP_CAP = log1p(50000)
+_DIMENSIONS = ("preference_match", "budget_fit", "rating", "popularity", "evidence_quality")
+_EMPTY_EVIDENCE = (None, "", [], 0, 0.0)
+_TAG_SEP = "\x1f"  # ASCII unit separator, never part of a tag or preference
 
 
 @dataclass(slots=True)
@@ -124,6 +135,70 @@ def _evidence_score(candidate: ProviderCandidate) -> float:
     return present / len(_EVIDENCE_FIELDS)
 
 
+def _occurrence_mask(records: list[str], needle: str) -> np.ndarray:
+    """Which records contain ``needle``, using one search over their concatenation.
+
+    Records are joined with ``_TAG_SEP`` (which never occurs in a needle), so
+    a match cannot span two records; match offsets are mapped back to record
+    indices with ``searchsorted``.
+    """
+    lengths = np.fromiter((len(r) + 1 for r in records), dtype=np.int64, count=len(records))
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    text = _TAG_SEP.join(records)
+    positions = [m.start() for m in re.finditer(re.escape(needle), text)]
+    mask = np.zeros(len(records), dtype=bool)
+    if positions:
+        mask[np.searchsorted(starts, positions, side="right") - 1] = True
+    return mask
+
+
+def _preference_column(candidates: list[ProviderCandidate], preferences: list[str]) -> np.ndarray:
+    """Vectorized ``_preference_score``: one substring search per preference.
+
+    Each candidate's tags are wrapped as ``SEP tag SEP tag SEP`` so an exact
+    tag match becomes a substring search for ``SEP pref SEP``.
+    """
+    n = len(candidates)
+    if not preferences:
+        return np.full(n, 0.5)
+    tag_records = [_TAG_SEP + _TAG_SEP.join(t.lower() for t in c.tags) + _TAG_SEP for c in candidates]
+    body_records = [(c.snippet + c.title).lower() for c in candidates]
+    hits = np.zeros(n, dtype=np.int64)
+    for pref in preferences:
+        p = pref.lower()
+        if not p:
+            hits += 1  # "" is a substring of every snippet
+            continue
+        hits += _occurrence_mask(tag_records, _TAG_SEP + p + _TAG_SEP) | _occurrence_mask(body_records, p)
+    return hits / len(preferences)
+
+
+def _numeric_columns(candidates: list[ProviderCandidate]) -> tuple[np.ndarray, ...]:
+    """Gather cost, rating, reviews and evidence-field presence column by column.
+
+    Values that the per-candidate functions treat as "missing" are stored
+    as NaN so the vectorized code can fall back to the same neutral scores.
+    """
+    n = len(candidates)
+    extras = [c.extra for c in candidates]
+    nan = float("nan")
+
+    def column(values) -> np.ndarray:
+        return np.fromiter((float(v) if v and v > 0 else nan for v in values), dtype=float, count=n)
+
+    cost = column(e.get("cost_estimate", 0.0) for e in extras)
+    rating = column(
+        e.get("rating", 0.0) or c.score * _MAX_RATING for e, c in zip(extras, candidates)
+    )
+    reviews = column(e.get("reviews_count", 0) or e.get("reviews", 0) for e in extras)
+    evidence = np.zeros(n, dtype=np.int64)
+    for f in _EVIDENCE_FIELDS:
+        evidence += np.fromiter(
+            (e.get(f) not in _EMPTY_EVIDENCE for e in extras), dtype=bool, count=n
+        )
+    return cost, rating, reviews, evidence
+
+
 class RankingScorer:
     """Stateless, configurable scorer for ranking recalled candidates.
 
@@ -169,6 +244,49 @@ class RankingScorer:
             breakdown={k: round(v, 4) for k, v in breakdown.items()},
         )
 
+    def score_batch(
+        self,
+        candidates: list[ProviderCandidate],
+        *,
+        preferences: list[str] | None = None,
+        daily_budget: float | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Score all candidates at once.
+
+        Returns ``(totals, breakdown)``: unrounded total scores of shape
+        ``(n,)`` and per-dimension scores of shape ``(n, 5)`` in
+        ``_DIMENSIONS`` order, computed with the same float operations as
+        ``score_one``.
+        """
+        w = self._weights.normalized()
+        cost, rating, reviews, evidence = _numeric_columns(candidates)
+
+        if daily_budget is None or daily_budget <= 0:
+            budget_fit = np.full(len(candidates), 0.5)
+        else:
+            fit = np.clip(1.0 - np.abs(cost - daily_budget) / daily_budget, 0.0, 1.0)
+            budget_fit = np.where(np.isnan(cost), 0.5, fit)
+
+        with np.errstate(invalid="ignore"):
+            rating_score = np.where(np.isnan(rating), 0.3, np.minimum(rating / _MAX_RATING, 1.0))
+            popularity = np.where(
+                np.isnan(reviews), 0.2, np.minimum(np.log1p(reviews) / _LOG_POP_CAP, 1.0)
+            )
+
+        breakdown = np.column_stack([
+            _preference_column(candidates, preferences or []),
+            budget_fit,
+            rating_score,
+            popularity,
+            evidence / len(_EVIDENCE_FIELDS),
+        ]) if candidates else np.empty((0, len(_DIMENSIONS)))
+
+        # accumulate in dimension order, like ``sum()`` in ``score_one``
+        totals = np.zeros(len(candidates))
+        for j, dim in enumerate(_DIMENSIONS):
+            totals = totals + w[dim] * breakdown[:, j]
+        return totals, breakdown
+
     def rank(
         self,
         candidates: list[ProviderCandidate],
@@ -192,13 +310,41 @@ class RankingScorer:
         if budget is not None and days and days > 0:
             daily_budget = budget / days
 
-        scored = [
-            self.score_one(c, preferences=preferences, daily_budget=daily_budget)
-            for c in candidates
+        totals, breakdown = self.score_batch(
+            candidates, preferences=preferences, daily_budget=daily_budget
+        )
+        order, rounded = self._top_k(totals, top_k)
+
+        rows = breakdown[order].tolist()
+        return [
+            ScoredCandidate(
+                candidate=candidates[i],
+                total_score=total,
+                breakdown={dim: round(v, 4) for dim, v in zip(_DIMENSIONS, row)},
+            )
+            for i, total, row in zip(order.tolist(), rounded, rows)
         ]
 
-        scored.sort(key=lambda s: s.total_score, reverse=True)
-        return scored[:top_k]
+    @staticmethod
+    def _top_k(totals: np.ndarray, top_k: int) -> tuple[np.ndarray, list[float]]:
+        """Top-K indices by rounded total (descending, ties in input order).
+
+        Same result as rounding every score like ``score_one``, stable
+        sorting and slicing ``[:top_k]``.  ``argpartition`` finds the K best
+        raw totals; since rounding is monotonic, only candidates within one
+        rounding step of the K-th best can still tie into the result, so
+        only those are rounded and sorted.
+        """
+        n = len(totals)
+        if 0 < top_k < n:
+            part = np.argpartition(-totals, top_k - 1)[:top_k]
+            floor = round(float(totals[part].min()), 4)
+            pool = np.flatnonzero(totals >= floor - 1e-4)
+        else:
+            pool = np.arange(n)
+        rounded = np.array([round(t, 4) for t in totals[pool].tolist()])
+        ranking = np.lexsort((pool, -rounded))[:top_k]
+        return pool[ranking], rounded[ranking].tolist()
 
     def rank_from_qp(
         self,
@@ -22,6 +22,7 @@ from typing import Any
 from app.services.providers.base import ProviderCallContext, ProviderCandidate
 from app.services.providers.call_policy import ProviderCallPolicy
 from app.services.providers.factory import build_registry
+from app.services.providers.health import get_health_tracker
 from app.services.providers.orchestrator import OrchestratorResult, ProviderOrchestrator
 
 logger = logging.getLogger(__name__)
@@ -54,7 +55,10 @@ class RecallService:
         registry = build_registry(include_mock_fallback=include_mock_fallback)
         self._orchestrator = ProviderOrchestrator(
             registry=registry,
-            policy=policy or ProviderCallPolicy(),
+            # 线上召回默认并发调用各数据源，总耗时受单个请求截止时间约束
+            policy=policy or ProviderCallPolicy(concurrent=True),
+            # 进程级共享的熔断与延迟统计，跳过故障数据源并按 p95 延迟设置超时
+            health=get_health_tracker(),
         )
 
     async def recall_from_qp(
@@ -1,19 +1,51 @@
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
 from typing import Dict, List, Optional
-import redis
+import redis.asyncio as aioredis
 import hashlib
-import numpy as np
+import inspect
 import json
 import time
-import aiohttp
 from app.core.config import settings
 from app.core.logger import get_logger
+from app.core.redis_client import get_redis
+from app.services.ollama_embedding_client import get_embedding_client
+from app.services.semantic_cache_index import (
+    SCOPE_FIELD,
+    VECTOR_FIELD,
+    LocalVectorIndex,
+    RediSearchVectorIndex,
+    pack_vector,
+    unpack_vector,
+)
 import asyncio
 from datetime import datetime
 
 logger = get_logger(service="redis_cache")
 
+# 所有写入过缓存的前缀集合，供清理任务遍历，避免 KEYS/SCAN 全库
+PREFIX_SET_KEY = "semantic_cache:prefixes"
+# 多进程部署时，同一清理周期内只允许一个进程执行清理
+JANITOR_LOCK_KEY = "semantic_cache:janitor:lock"
+# 元数据 HASH 中记录原始流式分块边界的字段
+CHUNKS_FIELD = "chunks"
+
+
+@dataclass
+class CachedEntry:
+    """一次缓存命中的结果"""
+    response: str
+    chunk_offsets: Optional[List[int]] = None  # 各分块在 response 中的结束位置，旧缓存没有该字段
+    similarity: float = 0.0
+
+
 class RedisSemanticCache:
-    """基于语义的 Redis 缓存实现"""
+    """基于语义的 Redis 缓存实现
+
+    每个条目除 vec/resp/meta 三个键外，还以最后访问时间为分值记录在 ``{prefix}:lru``
+    有序集合中，过期和超量淘汰都由 ``SemanticCacheRegistry`` 的清理任务按分值完成。
+    请通过 ``semantic_cache_registry.get()`` 获取实例，而不是每个请求新建。
+    """
     
     def __init__(
         self,
@@ -22,36 +54,69 @@ class RedisSemanticCache:
         score_threshold: float = None,
         prefix: str = "cache",
         user_id: Optional[int] = None,  # 添加用户ID
-        max_cache_size: int = 1000,  # 每个用户最大缓存条数
-        cleanup_interval: int = 3600  # 清理间隔(秒)
+        vector_backend: str = None,  # auto / redisearch / local
     ):
-        self.redis = redis.from_url(redis_url or settings.REDIS_URL)
+        # 默认复用进程级共享连接池，只有显式传入 redis_url 时才单独建连接
+        self.redis = aioredis.from_url(redis_url) if redis_url else get_redis()
         self.model_name = model_name or settings.OLLAMA_EMBEDDING_MODEL
         self.score_threshold = score_threshold or settings.REDIS_CACHE_THRESHOLD
+        self.namespace = prefix
         self.prefix = f"{prefix}:{user_id}" if user_id else prefix
-        self.max_cache_size = max_cache_size
-        self.cleanup_interval = cleanup_interval
-        
-        # 启动自动清理任务
-        asyncio.create_task(self._auto_cleanup())
+        # 向量 HASH 放在命名空间的 vec 前缀下，RediSearch 索引只覆盖这一前缀
+        self.vector_prefix = f"{prefix}:vec:{user_id}" if user_id else f"{prefix}:vec"
+        self.lru_key = f"{self.prefix}:lru"
+        self.vector_backend = (vector_backend or settings.REDIS_CACHE_VECTOR_BACKEND).lower()
+        self.index = None  # 首次使用时按后端可用性创建，进程内索引随实例一起保留
         
+    async def _get_index(self):
+        """选择向量索引后端：RediSearch 可用时优先，否则回退到进程内索引"""
+        if self.index is not None:
+            return self.index
+        if self.vector_backend in ("auto", "redisearch") and await RediSearchVectorIndex.is_available(self.redis):
+            self.index = RediSearchVectorIndex(
+                self.redis,
+                namespace=self.namespace,
+                scope=self.prefix,
+                algorithm=settings.REDIS_CACHE_VECTOR_ALGORITHM,
+            )
+            return self.index
+        if self.vector_backend == "redisearch":
+            logger.warning("RediSearch module not available, falling back to local vector index")
+        index = LocalVectorIndex()
+        await self._load_local_index(index)
+        self.index = index
+        return self.index
+
+    async def _load_local_index(self, index: LocalVectorIndex):
+        """首次使用时从 LRU 有序集合读取条目ID，批量加载当前前缀下的全部向量"""
+        hash_ids = [member.decode('utf-8') for member in await self.redis.zrange(self.lru_key, 0, -1)]
+        keys = [f"{self.vector_prefix}:{hash_id}" for hash_id in hash_ids]
+        if keys:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for key in keys:
+                    pipe.hget(key, VECTOR_FIELD)
+                # 旧版本的 JSON 字符串向量会返回 WRONGTYPE，直接跳过等待过期即可
+                blobs = await pipe.execute(raise_on_error=False)
+            for hash_id, blob in zip(hash_ids, blobs):
+                if isinstance(blob, bytes):
+                    index.add(hash_id, unpack_vector(blob))
+        index.loaded = True
+        logger.info(f"Loaded {len(index)} vectors into local index for prefix {self.prefix}")
+
+    @staticmethod
+    async def _call_index(method, *args):
+        """进程内索引是同步方法，RediSearch 索引是协程，这里统一调用"""
+        result = method(*args)
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+
     async def _get_ollama_embedding(self, text: str) -> List[float]:
-        """使用Ollama生成文本向量"""
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    f"{settings.OLLAMA_BASE_URL}/api/embed",
-                    json={
-                        "model": self.model_name,
-                        "input": text  # 使用 input 而不是 prompt
-                    }
-                ) as response:
-                    result = await response.json()
-                    # Ollama embed API 返回格式为 {"embeddings": [[...], ...]}
-                    return result["embeddings"][0]  # 返回第一个向量
-        except Exception as e:
-            logger.error(f"Error getting Ollama embedding: {str(e)}", exc_info=True)
-            raise
+        """使用Ollama生成文本向量
+
+        通过共享客户端调用：复用连接池、合并并发请求，且 lookup 算过的向量会被 update 直接复用
+        """
+        return await get_embedding_client(self.model_name).embed(text)
 
     async def _get_embedding(self, text: str) -> List[float]:
         """获取文本向量"""
@@ -65,20 +130,21 @@ class RedisSemanticCache:
             logger.error(f"Error in get_embedding: {str(e)}", exc_info=True)
             raise
         
+    def _get_message_hash(self, message: str) -> str:
+        """生成消息的哈希ID"""
+        return hashlib.md5(message.encode()).hexdigest()
+
     def _get_vector_key(self, message: str) -> str:
         """生成向量存储的键名"""
-        message_hash = hashlib.md5(message.encode()).hexdigest()
-        return f"{self.prefix}:vec:{message_hash}"
+        return f"{self.vector_prefix}:{self._get_message_hash(message)}"
         
     def _get_response_key(self, message: str) -> str:
         """生成响应存储的键名"""
-        message_hash = hashlib.md5(message.encode()).hexdigest()
-        return f"{self.prefix}:resp:{message_hash}"
+        return f"{self.prefix}:resp:{self._get_message_hash(message)}"
         
     def _get_metadata_key(self, message: str) -> str:
         """生成元数据存储的键名"""
-        message_hash = hashlib.md5(message.encode()).hexdigest()
-        return f"{self.prefix}:meta:{message_hash}"
+        return f"{self.prefix}:meta:{self._get_message_hash(message)}"
 
     def _get_last_user_message(self, messages: List[Dict]) -> str:
         """获取最后一条用户消息"""
@@ -87,70 +153,54 @@ class RedisSemanticCache:
                 return msg["content"]
         return ""
 
-    async def _auto_cleanup(self):
-        """自动清理过期和超量的缓存"""
-        while True:
-            try:
-                # 获取当前用户的所有缓存键
-                pattern = f"{self.prefix}:meta:*"
-                all_keys = [key.decode('utf-8') for key in self.redis.keys(pattern)]  # 解码key
-                
-                if len(all_keys) > self.max_cache_size:
-                    # 按访问时间排序
-                    cache_items = []
-                    for key in all_keys:
-                        metadata = json.loads(self.redis.get(key.encode('utf-8')).decode('utf-8'))  # 编码key再获取
-                        cache_items.append((key, metadata.get("last_access", 0)))
-                    
-                    # 按最后访问时间排序
-                    cache_items.sort(key=lambda x: x[1])
-                    
-                    # 删除最旧的条目直到达到限制
-                    items_to_remove = len(all_keys) - self.max_cache_size
-                    for key, _ in cache_items[:items_to_remove]:
-                        hash_id = key.split(":")[-1]
-                        await self._remove_cache_item(hash_id)
-                        
-                logger.info(f"Cache cleanup completed for prefix {self.prefix}")
-                
-            except Exception as e:
-                logger.error(f"Error in cache cleanup: {str(e)}", exc_info=True)
-                
-            await asyncio.sleep(self.cleanup_interval)
-
-    async def _remove_cache_item(self, hash_id: str):
-        """删除一个缓存项的所有相关键"""
+    async def _remove_cache_items(self, hash_ids: List[str]):
+        """删除若干缓存项的所有相关键及其 LRU 记录"""
+        if not hash_ids:
+            return
         try:
             # 所有key都需要编码
-            self.redis.delete(
-                f"{self.prefix}:vec:{hash_id}".encode('utf-8'),
-                f"{self.prefix}:resp:{hash_id}".encode('utf-8'),
-                f"{self.prefix}:meta:{hash_id}".encode('utf-8')
-            )
+            keys = []
+            for hash_id in hash_ids:
+                keys.extend([
+                    f"{self.vector_prefix}:{hash_id}".encode('utf-8'),
+                    f"{self.prefix}:resp:{hash_id}".encode('utf-8'),
+                    f"{self.prefix}:meta:{hash_id}".encode('utf-8'),
+                ])
+            async with self.redis.pipeline(transaction=True) as pipe:
+                pipe.delete(*keys)
+                pipe.zrem(self.lru_key, *hash_ids)
+                await pipe.execute()
+            self._forget(hash_ids)
         except Exception as e:
             logger.error(f"Error removing cache item: {str(e)}", exc_info=True)
 
-    async def _update_metadata(self, message: str):
-        """更新缓存项的元数据"""
+    def _forget(self, hash_ids: List[str]):
+        """从进程内索引移除条目；RediSearch 索引随 HASH 删除自动更新"""
+        if isinstance(self.index, LocalVectorIndex):
+            for hash_id in hash_ids:
+                self.index.remove(hash_id)
+
+    async def _update_metadata(self, hash_id: str):
+        """更新命中缓存项的元数据，MULTI 中一次往返完成访问时间、计数和 LRU 分值的更新"""
         try:
-            meta_key = self._get_metadata_key(message)
-            # 从Redis读取的是bytes,需要解码
-            current_meta = self.redis.get(meta_key)
-            if current_meta:
-                current_meta = json.loads(current_meta.decode('utf-8'))
-            else:
-                current_meta = {"access_count": 0}
-                
-            metadata = {
-                "last_access": datetime.now().timestamp(),
-                "access_count": current_meta["access_count"] + 1
-            }
-            self.redis.set(meta_key, json.dumps(metadata), ex=settings.REDIS_CACHE_EXPIRE)
+            meta_key = f"{self.prefix}:meta:{hash_id}"
+            now = datetime.now().timestamp()
+            async with self.redis.pipeline(transaction=True) as pipe:
+                pipe.hset(meta_key, "last_access", now)
+                pipe.hincrby(meta_key, "access_count", 1)
+                pipe.expire(meta_key, settings.REDIS_CACHE_EXPIRE)
+                pipe.zadd(self.lru_key, {hash_id: now})
+                await pipe.execute()
         except Exception as e:
             logger.error(f"Error updating metadata: {str(e)}", exc_info=True)
 
     async def lookup(self, messages: List[Dict]) -> Optional[str]:
         """查找缓存的响应"""
+        entry = await self.lookup_entry(messages)
+        return entry.response if entry else None
+
+    async def lookup_entry(self, messages: List[Dict]) -> Optional["CachedEntry"]:
+        """查找缓存的响应，同时返回写入时记录的流式分块边界"""
         try:
             # 获取最后一条用户消息
             user_message = self._get_last_user_message(messages)
@@ -160,34 +210,35 @@ class RedisSemanticCache:
             # 获取用户消息的向量
             current_vector = await self._get_embedding(user_message)
             
-            # 获取当前用户的所有缓存向量
-            pattern = f"{self.prefix}:vec:*"
-            all_vectors = [key.decode('utf-8') for key in self.redis.keys(pattern)]  # 解码key 并获取所有缓存向量
-            max_similarity = 0
-            most_similar_key = None
-            # 计算当前用户消息与所有缓存向量的相似度
-            for vec_key in all_vectors:
-                cached_vector = json.loads(self.redis.get(vec_key.encode('utf-8')).decode('utf-8'))  # 编码key再获取 并获取缓存向量
-                similarity = np.dot(current_vector, cached_vector) / (
-                    np.linalg.norm(current_vector) * np.linalg.norm(cached_vector)
-                )
-                
-                # 如果相似度大于最大相似度，则更新最大相似度
-                if similarity > max_similarity:
-                    max_similarity = similarity
-                    most_similar_key = vec_key
+            # 通过向量索引查找最相似的一条缓存，而不是逐条扫描
+            index = await self._get_index()
+            match = await self._call_index(index.search, current_vector)
+            if not match:
+                return None
+            hash_id, max_similarity = match
             
             # 如果相似度大于阈值，则返回缓存响应
-            if max_similarity >= self.score_threshold and most_similar_key:
-                hash_id = most_similar_key.split(":")[-1]
+            if max_similarity >= self.score_threshold:
                 resp_key = f"{self.prefix}:resp:{hash_id}"
-                cached_response = self.redis.get(resp_key.encode('utf-8'))  # 编码key
+                meta_key = f"{self.prefix}:meta:{hash_id}"
+                # 响应与分块边界一次往返取回
+                async with self.redis.pipeline(transaction=False) as pipe:
+                    pipe.get(resp_key.encode('utf-8'))  # 编码key
+                    pipe.hget(meta_key, CHUNKS_FIELD)
+                    cached_response, raw_chunks = await pipe.execute()
                 
                 if cached_response:
                     # 更新访问元数据
-                    await self._update_metadata(user_message)
+                    await self._update_metadata(hash_id)
                     logger.info(f"Cache hit with similarity: {max_similarity:.4f}")
-                    return cached_response.decode('utf-8')
+                    return CachedEntry(
+                        response=cached_response.decode('utf-8'),
+                        chunk_offsets=json.loads(raw_chunks) if raw_chunks else None,
+                        similarity=float(max_similarity),
+                    )
+
+                # 响应已过期，同步移除索引中的向量和 LRU 记录
+                await self._remove_cache_items([hash_id])
                     
             return None
             
@@ -195,8 +246,14 @@ class RedisSemanticCache:
             logger.error(f"Error in lookup: {str(e)}", exc_info=True)
             return None
 
-    async def update(self, messages: List[Dict], response: str, expire: int = None):
-        """更新缓存"""
+    async def update(
+        self,
+        messages: List[Dict],
+        response: str,
+        expire: int = None,
+        chunk_offsets: Optional[List[int]] = None,
+    ):
+        """更新缓存，``chunk_offsets`` 为原始流式分块的结束位置，命中时用于按原节奏回放"""
         try:
             user_message = self._get_last_user_message(messages)
             if not user_message:
@@ -204,24 +261,187 @@ class RedisSemanticCache:
 
             vector = await self._get_embedding(user_message)
             
+            hash_id = self._get_message_hash(user_message)
             vec_key = self._get_vector_key(user_message)
             resp_key = self._get_response_key(user_message)
             meta_key = self._get_metadata_key(user_message)
             
             expire = expire or settings.REDIS_CACHE_EXPIRE
             
-            # 存储向量、响应和元数据 - 确保存储为字符串
-            self.redis.set(vec_key, json.dumps(vector), ex=expire)
-            self.redis.set(resp_key, response.encode('utf-8'), ex=expire)  # 编码为bytes
+            now = datetime.now().timestamp()
             
-            metadata = {
-                "created_at": datetime.now().timestamp(),
-                "last_access": datetime.now().timestamp(),
-                "access_count": 1
-            }
-            self.redis.set(meta_key, json.dumps(metadata), ex=expire)
+            # 向量以 float32 二进制存入 HASH 供 RediSearch 建索引，元数据也用 HASH 便于原子更新；
+            # vec/resp/meta 三组写入放在同一个 MULTI 中，一次往返完成
+            async with self.redis.pipeline(transaction=True) as pipe:
+                pipe.hset(vec_key, mapping={
+                    VECTOR_FIELD: pack_vector(vector),
+                    SCOPE_FIELD: self.prefix,
+                })
+                pipe.expire(vec_key, expire)
+                pipe.set(resp_key, response.encode('utf-8'), ex=expire)  # 编码为bytes
+                pipe.delete(meta_key)  # 清理旧版本的 JSON 字符串元数据
+                meta = {
+                    "created_at": now,
+                    "last_access": now,
+                    "access_count": 1
+                }
+                if chunk_offsets:
+                    meta[CHUNKS_FIELD] = json.dumps(chunk_offsets)
+                pipe.hset(meta_key, mapping=meta)
+                pipe.expire(meta_key, expire)
+                pipe.zadd(self.lru_key, {hash_id: now})
+                pipe.sadd(PREFIX_SET_KEY, self.prefix)
+                await pipe.execute()
+            
+            index = await self._get_index()
+            await self._call_index(index.add, hash_id, vector)
             
             logger.info(f"Cache updated for message: {user_message[:50]}...")
             
         except Exception as e:
-            logger.error(f"Error in update: {str(e)}", exc_info=True) 
\ No newline at end of file
+            logger.error(f"Error in update: {str(e)}", exc_info=True) 
+
+
+@dataclass
+class JanitorMetrics:
+    """清理任务的运行计数"""
+    runs: int = 0
+    skipped_runs: int = 0  # 其他进程持有清理锁而跳过的次数
+    evictions: int = 0  # 超出每用户上限被淘汰的条目数
+    expirations: int = 0  # 超过有效期被清理的条目数
+    prefixes_scanned: int = 0
+    last_scan_seconds: float = 0.0
+    max_scan_seconds: float = 0.0
+    total_scan_seconds: float = 0.0
+    last_run_at: float = 0.0
+    errors: int = 0
+
+
+class SemanticCacheRegistry:
+    """进程级语义缓存注册表
+
+    - ``get()`` 按 (命名空间, 用户) 返回复用的缓存实例，进程内索引不会随请求重建
+    - 整个进程只运行一个清理任务：按 ``{prefix}:lru`` 有序集合的分值清理过期条目，
+      并按最后访问时间淘汰超出每用户上限的条目，每个条目的淘汰代价为 O(log n)
+    """
+
+    def __init__(
+        self,
+        max_entries_per_prefix: int = None,
+        cleanup_interval: int = None,
+        max_resident_views: int = 10000,
+    ):
+        self.max_entries_per_prefix = max_entries_per_prefix or settings.REDIS_CACHE_MAX_ENTRIES
+        self.cleanup_interval = cleanup_interval or settings.REDIS_CACHE_CLEANUP_INTERVAL
+        self.max_resident_views = max_resident_views
+        self.metrics = JanitorMetrics()
+        self._views: "OrderedDict[str, RedisSemanticCache]" = OrderedDict()
+        self._janitor_task: Optional[asyncio.Task] = None
+
+    def get(self, prefix: str = "cache", user_id: Optional[int] = None) -> RedisSemanticCache:
+        """获取某个用户的缓存视图，首次调用时顺带启动清理任务"""
+        key = f"{prefix}:{user_id}" if user_id else prefix
+        view = self._views.get(key)
+        if view is None:
+            view = RedisSemanticCache(prefix=prefix, user_id=user_id)
+            self._views[key] = view
+            # 超出驻留上限时丢弃最久未用的视图，其进程内索引在下次使用时重新加载
+            while len(self._views) > self.max_resident_views:
+                self._views.popitem(last=False)
+        else:
+            self._views.move_to_end(key)
+        self.start_janitor()
+        return view
+
+    def start_janitor(self):
+        """在当前事件循环中启动清理任务（幂等）"""
+        if self._janitor_task is None or self._janitor_task.done():
+            self._janitor_task = asyncio.get_running_loop().create_task(self._janitor_loop())
+
+    async def stop_janitor(self):
+        if self._janitor_task is not None:
+            self._janitor_task.cancel()
+            try:
+                await self._janitor_task
+            except asyncio.CancelledError:
+                pass
+            self._janitor_task = None
+
+    async def _janitor_loop(self):
+        while True:
+            await self.run_janitor_once()
+            await asyncio.sleep(self.cleanup_interval)
+
+    async def run_janitor_once(self, redis_client: aioredis.Redis = None):
+        """执行一轮清理：过期条目按分值区间删除，超量条目按分值从低到高淘汰"""
+        redis_client = redis_client or get_redis()
+        try:
+            # 锁的有效期略短于清理间隔，保证每个周期都有进程能拿到锁
+            acquired = await redis_client.set(
+                JANITOR_LOCK_KEY, "1", nx=True, ex=max(1, int(self.cleanup_interval * 0.9))
+            )
+            if not acquired:
+                self.metrics.skipped_runs += 1
+                return
+
+            start = time.perf_counter()
+            prefixes = [p.decode('utf-8') for p in await redis_client.smembers(PREFIX_SET_KEY)]
+            for prefix in prefixes:
+                await self._clean_prefix(redis_client, prefix)
+
+            elapsed = time.perf_counter() - start
+            self.metrics.runs += 1
+            self.metrics.prefixes_scanned += len(prefixes)
+            self.metrics.last_scan_seconds = elapsed
+            self.metrics.max_scan_seconds = max(self.metrics.max_scan_seconds, elapsed)
+            self.metrics.total_scan_seconds += elapsed
+            self.metrics.last_run_at = datetime.now().timestamp()
+            logger.info(f"Cache cleanup completed for {len(prefixes)} prefixes in {elapsed:.4f}s")
+        except Exception as e:
+            self.metrics.errors += 1
+            logger.error(f"Error in cache cleanup: {str(e)}", exc_info=True)
+
+    async def _clean_prefix(self, redis_client: aioredis.Redis, prefix: str):
+        lru_key = f"{prefix}:lru"
+        expired_before = datetime.now().timestamp() - settings.REDIS_CACHE_EXPIRE
+        async with redis_client.pipeline(transaction=False) as pipe:
+            pipe.zrangebyscore(lru_key, "-inf", expired_before)
+            pipe.zcard(lru_key)
+            expired, total = await pipe.execute()
+
+        overflow = total - len(expired) - self.max_entries_per_prefix
+        evicted = []
+        if overflow > 0:
+            evicted = await redis_client.zrange(lru_key, len(expired), len(expired) + overflow - 1)
+
+        expired = [m.decode('utf-8') for m in expired]
+        evicted = [m.decode('utf-8') for m in evicted]
+        if expired or evicted:
+            view = self._views.get(prefix) or self._view_for_scope(prefix)
+            await view._remove_cache_items(expired + evicted)
+            self.metrics.expirations += len(expired)
+            self.metrics.evictions += len(evicted)
+
+        if total - len(expired) - len(evicted) <= 0:
+            await redis_client.srem(PREFIX_SET_KEY, prefix)
+
+    @staticmethod
+    def _view_for_scope(prefix: str) -> RedisSemanticCache:
+        """由前缀集合中的 ``{namespace}:{user_id}`` 还原缓存视图，向量键依赖二者分开传入"""
+        namespace, _, user_id = prefix.rpartition(":")
+        if namespace and user_id.isdigit():
+            return RedisSemanticCache(prefix=namespace, user_id=int(user_id))
+        return RedisSemanticCache(prefix=prefix)
+
+    def snapshot(self) -> dict:
+        """清理任务指标，供健康检查接口输出"""
+        return {
+            **asdict(self.metrics),
+            "resident_views": len(self._views),
+            "max_entries_per_prefix": self.max_entries_per_prefix,
+            "cleanup_interval": self.cleanup_interval,
+        }
+
+
+# 进程级共享的缓存注册表
+semantic_cache_registry = SemanticCacheRegistry()
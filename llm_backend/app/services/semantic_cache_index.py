@@ -0,0 +1,205 @@
+"""语义缓存的向量索引后端
+
+``RedisSemanticCache`` 通过本模块做 top-1 近邻查找，避免 KEYS + 逐条 GET 的全量扫描：
+
+- ``RediSearchVectorIndex``：Redis Stack (RediSearch) 的 HNSW / FLAT 向量索引，查找在 Redis 服务端完成
+- ``LocalVectorIndex``：进程内回退方案，归一化的 float32 矩阵 + 一次矩阵点积取 top-1
+
+向量统一以 float32 二进制 (``pack_vector``) 存入 Redis HASH 的 ``vec`` 字段，
+不再使用 JSON 列表。
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.core.logger import get_logger
+
+logger = get_logger(service="semantic_cache_index")
+
+VECTOR_FIELD = "vec"
+SCOPE_FIELD = "scope"
+
+# RediSearch TAG 查询中需要转义的字符
+_TAG_SPECIAL_CHARS = set(",.<>{}[]\"':;!@#$%^&*()-+=~|/\\ ")
+
+
+def pack_vector(vector: Sequence[float]) -> bytes:
+    """将向量打包为 float32 二进制"""
+    return np.asarray(vector, dtype=np.float32).tobytes()
+
+
+def unpack_vector(blob: bytes) -> np.ndarray:
+    """将 float32 二进制还原为向量"""
+    return np.frombuffer(blob, dtype=np.float32)
+
+
+def _normalize(vector: Sequence[float]) -> Optional[np.ndarray]:
+    """L2 归一化，零向量返回 None"""
+    arr = np.asarray(vector, dtype=np.float32).reshape(-1)
+    norm = float(np.linalg.norm(arr))
+    if norm == 0.0:
+        return None
+    return arr / norm
+
+
+def escape_tag(value: str) -> str:
+    """转义 RediSearch TAG 值中的特殊字符"""
+    return "".join(f"\\{ch}" if ch in _TAG_SPECIAL_CHARS else ch for ch in value)
+
+
+class LocalVectorIndex:
+    """进程内向量索引：归一化 float32 矩阵 + top-1 点积
+
+    删除时把最后一行移到被删除的位置，矩阵始终保持紧凑；
+    容量不足时按倍数扩容，摊还后插入为 O(1)。
+    """
+
+    def __init__(self, dim: Optional[int] = None, initial_capacity: int = 64):
+        self.dim = dim
+        self._capacity = max(1, initial_capacity)
+        self._matrix: Optional[np.ndarray] = None
+        self._ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self.loaded = False  # 是否已从 Redis 完成初次加载
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._rows
+
+    def _ensure_matrix(self, dim: int):
+        if self._matrix is None:
+            self.dim = dim
+            self._matrix = np.zeros((self._capacity, dim), dtype=np.float32)
+        elif len(self._ids) >= self._matrix.shape[0]:
+            grown = np.zeros((self._matrix.shape[0] * 2, self.dim), dtype=np.float32)
+            grown[: len(self._ids)] = self._matrix[: len(self._ids)]
+            self._matrix = grown
+
+    def add(self, item_id: str, vector: Sequence[float]):
+        """添加或覆盖一个向量"""
+        normalized = _normalize(vector)
+        if normalized is None:
+            return
+        if self.dim is not None and normalized.shape[0] != self.dim:
+            logger.warning(
+                f"Vector dim {normalized.shape[0]} does not match index dim {self.dim}, skipped"
+            )
+            return
+
+        row = self._rows.get(item_id)
+        if row is None:
+            self._ensure_matrix(normalized.shape[0])
+            row = len(self._ids)
+            self._ids.append(item_id)
+            self._rows[item_id] = row
+        self._matrix[row] = normalized
+
+    def remove(self, item_id: str):
+        """删除一个向量，把最后一行换到空位"""
+        row = self._rows.pop(item_id, None)
+        if row is None:
+            return
+        last = len(self._ids) - 1
+        if row != last:
+            last_id = self._ids[last]
+            self._matrix[row] = self._matrix[last]
+            self._ids[row] = last_id
+            self._rows[last_id] = row
+        self._ids.pop()
+
+    def search(self, vector: Sequence[float]) -> Optional[Tuple[str, float]]:
+        """返回 (id, 余弦相似度) 最高的一项"""
+        if not self._ids:
+            return None
+        query = _normalize(vector)
+        if query is None or query.shape[0] != self.dim:
+            return None
+        scores = self._matrix[: len(self._ids)] @ query
+        best = int(np.argmax(scores))
+        return self._ids[best], float(scores[best])
+
+
+class RediSearchVectorIndex:
+    """基于 RediSearch 的向量索引（异步客户端）
+
+    一个命名空间（如 ``deepseek``）只建一个索引，只覆盖该命名空间下所有用户的
+    ``{namespace}:vec:*`` 向量 HASH（meta 等其它 HASH 不进索引）；查询时通过
+    ``scope`` TAG 过滤到当前用户。
+    """
+
+    def __init__(
+        self,
+        redis_client,
+        namespace: str,
+        scope: str,
+        algorithm: str = "HNSW",
+    ):
+        self.redis = redis_client
+        self.namespace = namespace
+        self.scope = scope
+        self.algorithm = algorithm.upper()
+        self.index_name = f"idx:{namespace}:vectors"
+        self._created = False
+
+    @staticmethod
+    async def is_available(redis_client) -> bool:
+        """检测 Redis 是否加载了 RediSearch 模块"""
+        try:
+            await redis_client.execute_command("FT._LIST")
+            return True
+        except Exception:
+            return False
+
+    async def _ensure_index(self, dim: int):
+        if self._created:
+            return
+        try:
+            await self.redis.execute_command("FT.INFO", self.index_name)
+        except Exception:
+            # 旧版本的索引按 ``{namespace}:`` 前缀建立，会把 meta HASH 也收进来，删掉索引（保留数据）
+            try:
+                await self.redis.execute_command("FT.DROPINDEX", f"idx:{self.namespace}:vec")
+            except Exception:
+                pass
+            await self.redis.execute_command(
+                "FT.CREATE", self.index_name,
+                "ON", "HASH",
+                "PREFIX", "1", f"{self.namespace}:vec:",
+                "SCHEMA",
+                SCOPE_FIELD, "TAG", "SEPARATOR", "|",
+                VECTOR_FIELD, "VECTOR", self.algorithm, "6",
+                "TYPE", "FLOAT32",
+                "DIM", str(dim),
+                "DISTANCE_METRIC", "COSINE",
+            )
+            logger.info(f"Created RediSearch index {self.index_name} ({self.algorithm}, dim={dim})")
+        self._created = True
+
+    async def add(self, item_id: str, vector: Sequence[float]):
+        """HASH 写入后由 RediSearch 自动建索引，这里只需确保索引存在"""
+        await self._ensure_index(len(vector))
+
+    async def remove(self, item_id: str):
+        """删除 HASH 后 RediSearch 自动移除索引项"""
+
+    async def search(self, vector: Sequence[float]) -> Optional[Tuple[str, float]]:
+        """KNN 1 查询，返回 (id, 余弦相似度)"""
+        await self._ensure_index(len(vector))
+        query = f"(@{SCOPE_FIELD}:{{{escape_tag(self.scope)}}})=>[KNN 1 @{VECTOR_FIELD} $q AS dist]"
+        result = await self.redis.execute_command(
+            "FT.SEARCH", self.index_name, query,
+            "PARAMS", "2", "q", pack_vector(vector),
+            "SORTBY", "dist",
+            "RETURN", "1", "dist",
+            "LIMIT", "0", "1",
+            "DIALECT", "2",
+        )
+        if not result or result[0] == 0:
+            return None
+        key = result[1].decode("utf-8") if isinstance(result[1], bytes) else result[1]
+        fields = result[2]
+        distance = float(fields[fields.index(b"dist") + 1] if b"dist" in fields else fields[1])
+        return key.split(":")[-1], 1.0 - distance
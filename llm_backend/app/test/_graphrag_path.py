@@ -0,0 +1,14 @@
+"""基准测试脚本的导入路径设置
+
+在 ``graphrag`` / ``app`` 的导入之前 ``import _graphrag_path``，脚本即可在 llm_backend
+目录下直接运行：把 llm_backend 加入 ``sys.path`` 以导入 ``app.*``；项目内置的 graphrag
+包内部以顶层包名 ``graphrag`` 相互导入，因此同时加入 app/graphrag。
+"""
+
+import sys
+from pathlib import Path
+
+_APP_DIR = Path(__file__).resolve().parents[1]
+
+sys.path.insert(0, str(_APP_DIR.parent))
+sys.path.insert(0, str(_APP_DIR / "graphrag"))
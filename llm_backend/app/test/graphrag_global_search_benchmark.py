@@ -0,0 +1,187 @@
+"""GraphRAG 全局检索 map 缓存 / 流式 reduce 基准测试
+
+在项目自带的索引输出（默认 app/graphrag/data/output）上按 factory 的参数构建全局检索的社区报告批次，
+用模拟的 LLM（每次调用按对数正态分布随机延迟，为每个批次返回固定的要点和分数）跑一组查询，
+统计每次查询的端到端延迟 p50 / p95 和 LLM 调用次数：
+
+1. baseline:  旧实现，asyncio.gather 等全部 map 批次结束后再 reduce
+2. map-cache: 开启 MapResponseCache，查询集中包含重复 / 仅大小写、标点不同的问题
+3. streaming: 在 map-cache 基础上开启 streaming_reduce，高分要点填满 reduce 预算后丢弃剩余 map 调用
+
+模拟 LLM 不产生真实开销，测得的是调度本身带来的差异；真实环境的收益取决于模型延迟和重复提问的比例。
+需要能加载 tiktoken 编码（首次使用会下载）。
+
+用法（在 llm_backend 目录下执行）:
+    python app/test/graphrag_global_search_benchmark.py
+    python app/test/graphrag_global_search_benchmark.py --queries 100 --distinct 20 --latency-ms 800
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import tiktoken
+
+import _graphrag_path  # noqa: F401
+
+from graphrag.language_model.response.base import (
+    BaseModelOutput,
+    BaseModelResponse,
+)
+from graphrag.query.indexer_adapters import (
+    read_indexer_communities,
+    read_indexer_entities,
+    read_indexer_reports,
+)
+from graphrag.query.structured_search.global_search.community_context import (
+    GlobalCommunityContext,
+)
+from graphrag.query.structured_search.global_search.map_cache import MapResponseCache
+from graphrag.query.structured_search.global_search.search import GlobalSearch
+
+DEFAULT_OUTPUT = Path(__file__).resolve().parents[1] / "graphrag" / "data" / "output"
+
+# 与 factory.get_global_search_engine 相同的上下文参数
+CONTEXT_BUILDER_PARAMS = {
+    "use_community_summary": False,
+    "shuffle_data": True,
+    "include_community_rank": True,
+    "min_community_rank": 0,
+    "community_rank_name": "rank",
+    "include_community_weight": True,
+    "community_weight_name": "occurrence weight",
+    "normalize_community_weight": True,
+    "context_name": "Reports",
+}
+
+
+class SimulatedChatModel:
+    """按批次内容确定性地给出要点和分数，延迟服从对数正态分布"""
+
+    def __init__(self, latency_ms, seed):
+        self.latency = latency_ms / 1000
+        self.rng = random.Random(seed)
+        self.calls = 0
+
+    async def achat(self, prompt, history=None, **kwargs):
+        self.calls += 1
+        digest = hashlib.blake2b((history[0]["content"] + prompt).encode("utf-8")).digest()
+        points = [
+            {"description": f"point {digest[i]} " + "detail " * (20 + digest[i] % 60), "score": digest[i] % 101}
+            for i in range(1 + digest[0] % 4)
+        ]
+        await asyncio.sleep(self.rng.lognormvariate(np.log(self.latency), 0.5))
+        return BaseModelResponse(output=BaseModelOutput(content=json.dumps({"points": points})))
+
+    async def achat_stream(self, prompt, history=None, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        yield "answer"
+
+
+def load_reports(output_dir, community_level):
+    tables = {
+        name: pd.read_parquet(output_dir / f"{name}.parquet")
+        for name in ["entities", "communities", "community_reports"]
+    }
+    entities = read_indexer_entities(tables["entities"], tables["communities"], community_level)
+    reports = read_indexer_reports(tables["community_reports"], tables["communities"], community_level)
+    communities = read_indexer_communities(tables["communities"], tables["community_reports"])
+    return entities, reports, communities
+
+
+def make_queries(count, distinct, seed):
+    rng = random.Random(seed)
+    topics = [f"What are the main themes around topic {i}?" for i in range(distinct)]
+    queries = []
+    for _ in range(count):
+        query = rng.choice(topics)
+        # 模拟同一问题的不同写法：大小写、空白和结尾标点
+        if rng.random() < 0.5:
+            query = query.lower().rstrip("?")
+        queries.append(query)
+    return queries
+
+
+async def run_mode(name, args, context_builder, encoder, queries, **search_kwargs):
+    model = SimulatedChatModel(args.latency_ms, args.seed)
+    search = GlobalSearch(
+        model=model,
+        context_builder=context_builder,
+        token_encoder=encoder,
+        max_data_tokens=args.data_max_tokens,
+        map_llm_params={"max_tokens": 1000, "temperature": 0.0},
+        context_builder_params={**CONTEXT_BUILDER_PARAMS, "max_tokens": args.max_tokens},
+        concurrent_coroutines=args.concurrency,
+        **search_kwargs,
+    )
+    latencies, calls = [], []
+    for query in queries:
+        before = model.calls
+        start = time.perf_counter()
+        await search.search(query)
+        latencies.append(time.perf_counter() - start)
+        calls.append(model.calls - before)
+    ms = np.asarray(latencies) * 1000
+    print(
+        f"{name:<10} p50={np.percentile(ms, 50):9.1f} ms p95={np.percentile(ms, 95):9.1f} ms "
+        f"llm_calls/query={np.mean(calls):6.2f}"
+    )
+
+
+async def run(args):
+    encoder = tiktoken.get_encoding(args.encoding)
+    entities, reports, communities = load_reports(args.output_dir, args.community_level)
+    context_builder = GlobalCommunityContext(
+        community_reports=reports,
+        communities=communities,
+        entities=entities,
+        token_encoder=encoder,
+    )
+    queries = make_queries(args.queries, args.distinct, args.seed)
+    print(
+        f"index={args.output_dir} reports={len(reports)} queries={len(queries)} "
+        f"distinct={args.distinct} latency={args.latency_ms} ms"
+    )
+
+    await run_mode("baseline", args, context_builder, encoder, queries)
+    await run_mode(
+        "map-cache", args, context_builder, encoder, queries, map_cache=MapResponseCache()
+    )
+    await run_mode(
+        "streaming",
+        args,
+        context_builder,
+        encoder,
+        queries,
+        map_cache=MapResponseCache(),
+        streaming_reduce=True,
+        early_exit_score=args.early_exit_score,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GraphRAG global search map cache benchmark")
+    parser.add_argument("--output-dir", type=Path, default=DEFAULT_OUTPUT)
+    parser.add_argument("--community-level", type=int, default=2)
+    parser.add_argument("--encoding", default="cl100k_base")
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--distinct", type=int, default=10, help="查询集中不同问题的个数")
+    parser.add_argument("--latency-ms", type=float, default=500)
+    parser.add_argument("--max-tokens", type=int, default=12000, help="每个 map 批次的上下文 token 数")
+    parser.add_argument("--data-max-tokens", type=int, default=12000, help="reduce 上下文 token 预算")
+    parser.add_argument("--early-exit-score", type=int, default=80)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+"""GraphRAG 增量更新（硬链接快照 + 只追加增量行）基准测试
+
+在临时目录中生成一份合成的旧索引输出（文档、带 1536 维向量的文本单元、社区、社区报告），
+再按不同的增量规模生成新文档对应的增量表，分别计时增量更新中与旧索引规模相关的两步：
+先把旧输出快照到 previous 目录，再把增量合并进输出目录的文档、文本单元、社区和社区报告表。
+实体和关系需要与旧数据做实体消解，两种模式都要整表合并，不在本测试范围内。
+
+1. full-merge: 旧实现，快照时逐表 load_table_from_storage + write_table_to_storage，
+               合并时读入整张旧表、pd.concat 后整表重新写出
+2. delta-only: storage.copy 硬链接快照文件，合并时只读旧表的 human_readable_id / community 列，
+               增量行以新行组的形式追加到旧表之后，旧行不经过 pandas
+
+用法（在 llm_backend 目录下执行）:
+    python app/test/graphrag_incremental_update_benchmark.py
+    python app/test/graphrag_incremental_update_benchmark.py --text-units 50000 --deltas 10 100 1000
+"""
+
+import argparse
+import asyncio
+import re
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import _graphrag_path  # noqa: F401
+
+from graphrag.data_model.schemas import (
+    COMMUNITIES_FINAL_COLUMNS,
+    COMMUNITY_REPORTS_FINAL_COLUMNS,
+)
+from graphrag.index.update.communities import (
+    _update_and_merge_communities,
+    _update_and_merge_community_reports,
+)
+from graphrag.index.update.incremental_index import (
+    _concat_dataframes,
+    _update_and_merge_text_units,
+    _update_communities,
+    _update_community_reports,
+    _update_text_units,
+)
+from graphrag.storage.file_pipeline_storage import FilePipelineStorage
+from graphrag.utils.storage import (
+    load_table_from_storage,
+    write_table_to_storage,
+)
+
+TABLES = ["documents", "text_units", "communities", "community_reports"]
+
+
+def generate_tables(n_text_units, dim, seed, prefix=""):
+    rng = np.random.default_rng(seed)
+    n_documents = max(n_text_units // 20, 1)
+    n_communities = max(n_text_units // 40, 1)
+    words = np.array("graph index community report entity relation travel city route hotel".split())
+
+    def ids(name, n):
+        return [f"{prefix}{name}{i}" for i in range(n)]
+
+    def texts(n_rows, n_words):
+        return [" ".join(rng.choice(words, n_words)) for _ in range(n_rows)]
+
+    text_unit_ids = ids("t", n_text_units)
+    communities = pd.DataFrame({
+        "id": ids("c", n_communities),
+        "human_readable_id": np.arange(n_communities),
+        "community": np.arange(n_communities),
+        "level": 0,
+        "parent": -1,
+        "children": [[] for _ in range(n_communities)],
+        "title": [f"Community {i}" for i in range(n_communities)],
+        "entity_ids": [ids("e", 20) for _ in range(n_communities)],
+        "relationship_ids": [ids("r", 40) for _ in range(n_communities)],
+        "text_unit_ids": [text_unit_ids[i::n_communities] for i in range(n_communities)],
+        "period": "2025-01-01",
+        "size": 20,
+    })
+    reports = texts(n_communities, 1500)
+    community_reports = pd.DataFrame({
+        "id": ids("cr", n_communities),
+        "human_readable_id": np.arange(n_communities),
+        "community": np.arange(n_communities),
+        "level": 0,
+        "parent": -1,
+        "children": [[] for _ in range(n_communities)],
+        "title": ids("Report ", n_communities),
+        "summary": texts(n_communities, 80),
+        "full_content": reports,
+        "rank": rng.random(n_communities) * 10,
+        "rating_explanation": texts(n_communities, 30),
+        "findings": [[{"summary": "s", "explanation": r[:2000]}] * 5 for r in reports],
+        "full_content_json": [f'{{"content": "{r}"}}' for r in reports],
+        "period": "2025-01-01",
+        "size": 20,
+    })
+    return {
+        "documents": pd.DataFrame({
+            "id": ids("d", n_documents),
+            "human_readable_id": np.arange(n_documents),
+            "title": ids("doc", n_documents),
+            "text": texts(n_documents, 2000),
+            "text_unit_ids": [text_unit_ids[i::n_documents] for i in range(n_documents)],
+            "creation_date": "2025-01-01",
+            "metadata": None,
+        }),
+        "text_units": pd.DataFrame({
+            "id": text_unit_ids,
+            "human_readable_id": np.arange(n_text_units),
+            "text": texts(n_text_units, 900),
+            "n_tokens": 1200,
+            "document_ids": [[f"{prefix}d{i % n_documents}"] for i in range(n_text_units)],
+            "entity_ids": [ids("e", 8) for _ in range(n_text_units)],
+            "relationship_ids": [ids("r", 16) for _ in range(n_text_units)],
+            "covariate_ids": [[] for _ in range(n_text_units)],
+            "text_embedding": list(rng.random((n_text_units, dim), dtype=np.float32)),
+        }),
+        "communities": communities.loc[:, COMMUNITIES_FINAL_COLUMNS],
+        "community_reports": community_reports.loc[:, COMMUNITY_REPORTS_FINAL_COLUMNS],
+    }
+
+
+async def update_full_merge(output, delta):
+    previous = output.child("previous")
+    for file in output.find(re.compile(r"\.parquet$")):
+        base_name = file[0].replace(".parquet", "")
+        table = await load_table_from_storage(base_name, output)
+        await write_table_to_storage(table, base_name, previous)
+
+    for name in ["documents"]:
+        old_df = await load_table_from_storage(name, previous)
+        delta_df = await load_table_from_storage(name, delta)
+        initial_id = old_df["human_readable_id"].max() + 1
+        delta_df["human_readable_id"] = np.arange(initial_id, initial_id + len(delta_df))
+        await write_table_to_storage(
+            pd.concat([old_df, delta_df], ignore_index=True, copy=False), name, output
+        )
+    text_units = _update_and_merge_text_units(
+        await load_table_from_storage("text_units", previous),
+        await load_table_from_storage("text_units", delta),
+        {},
+    )
+    await write_table_to_storage(text_units, "text_units", output)
+    communities, mapping = _update_and_merge_communities(
+        await load_table_from_storage("communities", previous),
+        await load_table_from_storage("communities", delta),
+    )
+    await write_table_to_storage(communities, "communities", output)
+    reports = _update_and_merge_community_reports(
+        await load_table_from_storage("community_reports", previous),
+        await load_table_from_storage("community_reports", delta),
+        mapping,
+    )
+    await write_table_to_storage(reports, "community_reports", output)
+
+
+async def update_delta_only(output, delta):
+    previous = output.child("previous")
+    for file in output.find(re.compile(r"\.parquet$")):
+        await output.copy(file[0], previous)
+
+    await _concat_dataframes("documents", previous, delta, output)
+    await _update_text_units(previous, delta, output, {})
+    mapping = await _update_communities(previous, delta, output)
+    await _update_community_reports(previous, delta, output, mapping)
+
+
+async def run_once(mode, old_tables, delta_tables, work_dir):
+    output = FilePipelineStorage(root_dir=str(work_dir / "output"))
+    delta = FilePipelineStorage(root_dir=str(work_dir / "delta"))
+    for name in TABLES:
+        await write_table_to_storage(old_tables[name], name, output)
+        await write_table_to_storage(delta_tables[name], name, delta)
+
+    update = update_full_merge if mode == "full-merge" else update_delta_only
+    start = time.perf_counter()
+    await update(output, delta)
+    seconds = time.perf_counter() - start
+
+    rows = {
+        name: len(await load_table_from_storage(name, output, columns=["id"]))
+        for name in TABLES
+    }
+    return seconds, rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GraphRAG incremental update benchmark")
+    parser.add_argument("--text-units", type=int, default=20000, help="旧索引的文本单元数")
+    parser.add_argument("--deltas", type=int, nargs="+", default=[10, 100, 1000, 5000], help="增量文本单元数")
+    parser.add_argument("--dim", type=int, default=1536)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    old_tables = generate_tables(args.text_units, args.dim, args.seed)
+    print(f"previous index rows={ {name: len(t) for name, t in old_tables.items()} }")
+    for n_delta in args.deltas:
+        delta_tables = generate_tables(n_delta, args.dim, args.seed + 1, prefix="new-")
+        for mode in ["full-merge", "delta-only"]:
+            timings = []
+            for _ in range(args.repeat):
+                with tempfile.TemporaryDirectory() as tmp:
+                    seconds, rows = asyncio.run(
+                        run_once(mode, old_tables, delta_tables, Path(tmp))
+                    )
+                timings.append(seconds * 1000)
+            print(
+                f"delta={n_delta:<6} {mode:<10} update p50={np.percentile(timings, 50):9.1f} ms "
+                f"p95={np.percentile(timings, 95):9.1f} ms rows={rows}"
+            )
+
+
+if __name__ == "__main__":
+    main()
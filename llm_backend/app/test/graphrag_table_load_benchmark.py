@@ -0,0 +1,214 @@
+"""GraphRAG 索引表加载（列裁剪 + 内存映射）基准测试
+
+在临时目录中按给定规模生成一份合成索引输出（文本单元带长文本和 1536 维向量列，社区报告带
+full_content_json / findings 等大字段），然后在独立子进程中分别加载查询所需的 5 张表，
+报告加载耗时和加载后子进程常驻内存的增长：
+
+1. bytes-io: 旧实现，整个文件读成 Python bytes 后 BytesIO + pd.read_parquet 解码全部列
+2. projected: load_table_from_storage(columns=QUERY_TABLE_COLUMNS, arrow_lists=True)，
+              直接内存映射文件、只解码查询适配器用到的列，列表列保留为 Arrow 缓冲区
+
+用法（在 llm_backend 目录下执行）:
+    python app/test/graphrag_table_load_benchmark.py
+    python app/test/graphrag_table_load_benchmark.py --text-units 50000 --repeat 5
+"""
+
+import argparse
+import asyncio
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from io import BytesIO
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import _graphrag_path  # noqa: F401
+
+from graphrag.query.indexer_adapters import QUERY_TABLE_COLUMNS
+from graphrag.storage.file_pipeline_storage import FilePipelineStorage
+from graphrag.utils.storage import load_table_from_storage
+
+TABLES = ["entities", "communities", "community_reports", "text_units", "relationships"]
+
+
+def generate_index(output_dir, n_text_units, dim, seed):
+    rng = np.random.default_rng(seed)
+    n_entities = n_text_units // 2
+    n_relationships = n_text_units * 2
+    n_communities = max(n_entities // 20, 1)
+
+    def ids(prefix, n):
+        return [f"{prefix}{i}" for i in range(n)]
+
+    def id_lists(prefix, n_rows, n_pool, k):
+        return [[f"{prefix}{j}" for j in rng.integers(0, n_pool, k)] for _ in range(n_rows)]
+
+    def vectors(n_rows):
+        return list(rng.random((n_rows, dim), dtype=np.float32))
+
+    words = np.array("graph index community report entity relation travel city route hotel".split())
+
+    def texts(n_rows, n_words):
+        return [" ".join(rng.choice(words, n_words)) for _ in range(n_rows)]
+
+    tables = {
+        "text_units": pd.DataFrame({
+            "id": ids("t", n_text_units),
+            "human_readable_id": np.arange(n_text_units),
+            "text": texts(n_text_units, 900),
+            "n_tokens": 1200,
+            "document_ids": id_lists("d", n_text_units, 100, 1),
+            "entity_ids": id_lists("e", n_text_units, n_entities, 8),
+            "relationship_ids": id_lists("r", n_text_units, n_relationships, 16),
+            "covariate_ids": [[] for _ in range(n_text_units)],
+            "text_embedding": vectors(n_text_units),
+        }),
+        "entities": pd.DataFrame({
+            "id": ids("e", n_entities),
+            "human_readable_id": np.arange(n_entities),
+            "title": ids("E", n_entities),
+            "type": "PLACE",
+            "description": texts(n_entities, 60),
+            "text_unit_ids": id_lists("t", n_entities, n_text_units, 4),
+            "frequency": 4,
+            "degree": rng.integers(1, 50, n_entities),
+            "x": rng.random(n_entities),
+            "y": rng.random(n_entities),
+            "description_embedding": vectors(n_entities),
+        }),
+        "relationships": pd.DataFrame({
+            "id": ids("r", n_relationships),
+            "human_readable_id": np.arange(n_relationships),
+            "source": [f"E{i}" for i in rng.integers(0, n_entities, n_relationships)],
+            "target": [f"E{i}" for i in rng.integers(0, n_entities, n_relationships)],
+            "weight": rng.random(n_relationships),
+            "combined_degree": rng.integers(1, 100, n_relationships),
+            "text_unit_ids": id_lists("t", n_relationships, n_text_units, 2),
+            "description": texts(n_relationships, 30),
+        }),
+        "communities": pd.DataFrame({
+            "id": ids("c", n_communities),
+            "human_readable_id": np.arange(n_communities),
+            "community": np.arange(n_communities),
+            "level": 0,
+            "parent": -1,
+            "children": [[] for _ in range(n_communities)],
+            "title": ids("Community ", n_communities),
+            "entity_ids": [ids("e", n_entities)[i::n_communities] for i in range(n_communities)],
+            "relationship_ids": id_lists("r", n_communities, n_relationships, 40),
+            "text_unit_ids": id_lists("t", n_communities, n_text_units, 20),
+            "period": "2025-01-01",
+            "size": 20,
+        }),
+    }
+    reports = texts(n_communities, 1500)
+    tables["community_reports"] = pd.DataFrame({
+        "id": ids("cr", n_communities),
+        "human_readable_id": np.arange(n_communities),
+        "community": np.arange(n_communities),
+        "level": 0,
+        "parent": -1,
+        "children": [[] for _ in range(n_communities)],
+        "title": ids("Report ", n_communities),
+        "summary": texts(n_communities, 80),
+        "full_content": reports,
+        "rank": rng.random(n_communities) * 10,
+        "rating_explanation": texts(n_communities, 30),
+        "findings": [[{"summary": "s", "explanation": r[:2000]}] * 5 for r in reports],
+        "full_content_json": [json.dumps({"content": r}) for r in reports],
+        "period": "2025-01-01",
+        "size": 20,
+    })
+    for name, table in tables.items():
+        table.to_parquet(output_dir / f"{name}.parquet")
+    return {name: len(table) for name, table in tables.items()}
+
+
+async def load_bytes_io(output_dir):
+    storage = FilePipelineStorage(root_dir=str(output_dir))
+    return {
+        name: pd.read_parquet(BytesIO(await storage.get(f"{name}.parquet", as_bytes=True)))
+        for name in TABLES
+    }
+
+
+async def load_projected(output_dir):
+    storage = FilePipelineStorage(root_dir=str(output_dir))
+    return {
+        name: await load_table_from_storage(
+            name, storage, columns=QUERY_TABLE_COLUMNS[name], arrow_lists=True
+        )
+        for name in TABLES
+    }
+
+
+def current_rss_mb():
+    # 仅支持 Linux：/proc/self/statm 第二列为常驻页数
+    with open("/proc/self/statm") as f:
+        resident_pages = int(f.read().split()[1])
+    return resident_pages * resource.getpagesize() / 2**20
+
+
+def child(mode, output_dir):
+    loader = load_bytes_io if mode == "bytes-io" else load_projected
+    # 减去导入依赖后的基线，只统计加载后常驻的表数据
+    baseline_mb = current_rss_mb()
+    start = time.perf_counter()
+    tables = asyncio.run(loader(Path(output_dir)))
+    seconds = time.perf_counter() - start
+    rss_mb = current_rss_mb() - baseline_mb
+    columns = sum(len(t.columns) for t in tables.values())
+    print(json.dumps({"seconds": seconds, "rss_mb": rss_mb, "columns": columns}))
+
+
+def run_child(mode, output_dir):
+    out = subprocess.run(
+        [sys.executable, __file__, "--child", mode, "--output-dir", str(output_dir)],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GraphRAG index table load benchmark")
+    parser.add_argument("--text-units", type=int, default=20000)
+    parser.add_argument("--dim", type=int, default=1536)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output-dir", type=Path, help="使用已有索引输出目录，不生成合成数据")
+    parser.add_argument("--child", choices=["bytes-io", "projected"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, args.output_dir)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        output_dir = args.output_dir
+        if output_dir is None:
+            output_dir = Path(tmp)
+            sizes = generate_index(output_dir, args.text_units, args.dim, args.seed)
+            print(f"synthetic index rows={sizes}")
+        disk_mb = sum((output_dir / f"{name}.parquet").stat().st_size for name in TABLES) / 2**20
+        print(f"index={output_dir} parquet size={disk_mb:.1f} MB")
+
+        for mode in ["bytes-io", "projected"]:
+            runs = [run_child(mode, output_dir) for _ in range(args.repeat)]
+            seconds = np.asarray([r["seconds"] for r in runs]) * 1000
+            print(
+                f"{mode:<10} load p50={np.percentile(seconds, 50):9.1f} ms "
+                f"p95={np.percentile(seconds, 95):9.1f} ms "
+                f"resident growth={max(r['rss_mb'] for r in runs):8.1f} MB "
+                f"columns={runs[0]['columns']}"
+            )
+
+
+if __name__ == "__main__":
+    main()
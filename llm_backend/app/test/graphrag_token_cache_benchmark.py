@@ -0,0 +1,147 @@
+"""GraphRAG 上下文构建 token 计数缓存基准测试
+
+在项目自带的索引输出（默认 app/graphrag/data/output）上，分别测量不调用 LLM 和向量检索时，
+一次 local / global 查询构建上下文所消耗的 CPU 时间：
+
+1. cold: 每次查询前清空 token 计数缓存，等价于旧实现中每行都重新 tiktoken 编码
+2. warm: 缓存常驻，报告 / 文本单元 / 实体 / 关系行的 token 数直接复用
+
+local 查询随机抽取实体代替向量检索结果，依次构建社区报告、实体-关系和文本单元三部分上下文；
+global 查询按 map 阶段的方式把全部社区报告切分为多个批次。
+需要能加载 tiktoken 编码（首次使用会下载）。
+
+用法（在 llm_backend 目录下执行）:
+    python app/test/graphrag_token_cache_benchmark.py
+    python app/test/graphrag_token_cache_benchmark.py --queries 200 --entities 15
+"""
+
+import argparse
+import random
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import tiktoken
+
+import _graphrag_path  # noqa: F401
+
+from graphrag.query.context_builder.community_context import build_community_context
+from graphrag.query.indexer_adapters import (
+    read_indexer_entities,
+    read_indexer_relationships,
+    read_indexer_reports,
+    read_indexer_text_units,
+)
+from graphrag.query.llm.text_utils import token_count_cache
+from graphrag.query.structured_search.local_search.mixed_context import (
+    LocalSearchMixedContext,
+)
+
+DEFAULT_OUTPUT = Path(__file__).resolve().parents[1] / "graphrag" / "data" / "output"
+
+
+def load_index(output_dir, community_level):
+    tables = {
+        name: pd.read_parquet(output_dir / f"{name}.parquet")
+        for name in ["entities", "communities", "community_reports", "text_units", "relationships"]
+    }
+    entities = read_indexer_entities(tables["entities"], tables["communities"], community_level)
+    reports = read_indexer_reports(tables["community_reports"], tables["communities"], community_level)
+    text_units = read_indexer_text_units(tables["text_units"])
+    relationships = read_indexer_relationships(tables["relationships"])
+    return entities, reports, text_units, relationships
+
+
+def local_search(context, selected, max_tokens):
+    # 与 LocalSearchMixedContext.build_context 相同的比例：社区 25%，文本单元 50%，其余为实体/关系
+    context._build_community_context(selected, max_tokens=int(max_tokens * 0.25))
+    context._build_local_context(
+        selected,
+        max_tokens=int(max_tokens * 0.25),
+        include_entity_rank=True,
+        include_relationship_weight=True,
+    )
+    context._build_text_unit_context(selected, max_tokens=int(max_tokens * 0.5))
+
+
+def global_search(reports, entities, encoder, max_tokens):
+    build_community_context(
+        community_reports=reports,
+        entities=entities,
+        token_encoder=encoder,
+        shuffle_data=True,
+        max_tokens=max_tokens,
+        single_batch=False,
+    )
+
+
+def cpu_ms(fn, queries, cold):
+    samples = []
+    token_count_cache.clear()
+    for i in range(queries):
+        if cold:
+            token_count_cache.clear()
+        start = time.process_time()
+        fn(i)
+        samples.append(time.process_time() - start)
+    ms = np.asarray(samples) * 1000
+    return float(np.mean(ms)), float(np.percentile(ms, 95))
+
+
+def report(name, cold, warm):
+    saved = cold[0] - warm[0]
+    print(
+        f"{name:<6} cold mean={cold[0]:8.3f} ms p95={cold[1]:8.3f} ms | "
+        f"warm mean={warm[0]:8.3f} ms p95={warm[1]:8.3f} ms | "
+        f"CPU saved per search {saved:8.3f} ms ({saved / cold[0]:.0%})"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GraphRAG token count cache benchmark")
+    parser.add_argument("--output-dir", type=Path, default=DEFAULT_OUTPUT)
+    parser.add_argument("--community-level", type=int, default=2)
+    parser.add_argument("--encoding", default="cl100k_base")
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--entities", type=int, default=10, help="每次 local 查询选中的实体数")
+    parser.add_argument("--max-tokens", type=int, default=12000)
+    args = parser.parse_args()
+
+    encoder = tiktoken.get_encoding(args.encoding)
+    entities, reports, text_units, relationships = load_index(args.output_dir, args.community_level)
+    print(
+        f"index={args.output_dir} entities={len(entities)} reports={len(reports)} "
+        f"text_units={len(text_units)} relationships={len(relationships)}"
+    )
+
+    context = LocalSearchMixedContext(
+        entities=entities,
+        entity_text_embeddings=None,
+        text_embedder=None,
+        text_units=text_units,
+        community_reports=reports,
+        relationships=relationships,
+        token_encoder=encoder,
+    )
+    rng = random.Random(42)
+    # 固定每次查询的实体集合，cold / warm 两轮处理完全相同的输入
+    selections = [
+        rng.sample(entities, min(args.entities, len(entities))) for _ in range(args.queries)
+    ]
+
+    def run_local(i):
+        local_search(context, selections[i], args.max_tokens)
+
+    def run_global(_):
+        global_search(reports, entities, encoder, args.max_tokens)
+
+    for name, fn in [("local", run_local), ("global", run_global)]:
+        cold = cpu_ms(fn, args.queries, cold=True)
+        warm = cpu_ms(fn, args.queries, cold=False)
+        report(name, cold, warm)
+    print(f"cache entries={len(token_count_cache)} hits={token_count_cache.hits} misses={token_count_cache.misses}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""RankingScorer 排序基准测试
+
+对比两种排序路径在不同候选数量和偏好数量下的耗时（p50 / p99）：
+
+1. per-candidate: 旧实现，逐个候选调用 score_one，再整体排序
+2. batch:         RankingScorer.rank，NumPy 列向量化计算 + argpartition 取 top-K
+
+两种路径的输出会先做一致性校验，不一致时直接报错。
+
+用法（在 llm_backend 目录下执行）:
+    python app/test/ranking_scorer_benchmark.py
+    python app/test/ranking_scorer_benchmark.py --sizes 200 1000 --preferences 5 --repeat 200
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from app.services.providers.base import ProviderCandidate  # noqa: E402
+from app.services.ranking_scorer import RankingScorer  # noqa: E402
+
+TAGS = ["美食", "文化", "自然", "购物", "夜景", "博物馆", "历史", "亲子", "公园", "古镇"]
+
+
+def make_pool(size, rng):
+    pool = []
+    for i in range(size):
+        extra = {
+            "rating": round(rng.uniform(3.0, 5.0), 1),
+            "cost_estimate": rng.choice([0, rng.uniform(20, 800)]),
+            "reviews_count": rng.randint(0, 100000),
+            "address": "某某路 1 号",
+        }
+        if rng.random() < 0.5:
+            extra["url"] = f"https://example.com/{i}"
+        if rng.random() < 0.3:
+            extra["tel"] = "028-12345678"
+        pool.append(ProviderCandidate(
+            candidate_id=f"c{i}",
+            source="bench",
+            title=f"景点{i} " + rng.choice(TAGS),
+            snippet="、".join(rng.sample(TAGS, 3)) + " 推荐游玩",
+            score=rng.random(),
+            tags=rng.sample(TAGS, rng.randint(1, 4)),
+            extra=extra,
+        ))
+    return pool
+
+
+def rank_per_candidate(scorer, pool, preferences, daily_budget, top_k):
+    scored = [scorer.score_one(c, preferences=preferences, daily_budget=daily_budget) for c in pool]
+    scored.sort(key=lambda s: s.total_score, reverse=True)
+    return scored[:top_k]
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    ms = np.asarray(samples) * 1000
+    return float(np.percentile(ms, 50)), float(np.percentile(ms, 99))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="RankingScorer benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 200, 1000, 5000])
+    parser.add_argument("--preferences", type=int, default=4)
+    parser.add_argument("--top-k", type=int, default=15)
+    parser.add_argument("--repeat", type=int, default=100)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    scorer = RankingScorer()
+    preferences = rng.sample(TAGS, args.preferences)
+    budget, days = 6000, 4
+    daily_budget = budget / days
+
+    for size in args.sizes:
+        pool = make_pool(size, rng)
+
+        expected = rank_per_candidate(scorer, pool, preferences, daily_budget, args.top_k)
+        actual = scorer.rank(pool, preferences=preferences, budget=budget, days=days, top_k=args.top_k)
+        assert [(s.candidate.candidate_id, s.total_score, s.breakdown) for s in actual] == [
+            (s.candidate.candidate_id, s.total_score, s.breakdown) for s in expected
+        ], "batch path output differs from per-candidate path"
+
+        old = timed(lambda: rank_per_candidate(scorer, pool, preferences, daily_budget, args.top_k), args.repeat)
+        new = timed(
+            lambda: scorer.rank(pool, preferences=preferences, budget=budget, days=days, top_k=args.top_k),
+            args.repeat,
+        )
+        print(
+            f"n={size:<6} per-candidate p50={old[0]:8.3f} ms p99={old[1]:8.3f} ms | "
+            f"batch p50={new[0]:8.3f} ms p99={new[1]:8.3f} ms | speedup x{old[0] / new[0]:.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
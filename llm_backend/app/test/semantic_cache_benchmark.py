@@ -0,0 +1,147 @@
+"""语义缓存查找延迟基准测试
+
+对比三种查找方式在每个用户 1k / 10k / 100k 条缓存下的 p50 / p99 延迟：
+
+1. scan:       旧实现，逐条 JSON 解码 + NumPy 余弦相似度（不含 Redis 网络往返，只统计 CPU 部分）
+2. local:      进程内归一化 float32 矩阵 + top-1 点积
+3. redisearch: RediSearch HNSW / FLAT 索引（需要 Redis Stack，传入 --redis-url 时才测试）
+
+用法（在 llm_backend 目录下执行）:
+    python app/test/semantic_cache_benchmark.py
+    python app/test/semantic_cache_benchmark.py --sizes 1000 10000 --redis-url redis://localhost:6379/0
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from app.services.semantic_cache_index import (  # noqa: E402
+    SCOPE_FIELD,
+    VECTOR_FIELD,
+    LocalVectorIndex,
+    RediSearchVectorIndex,
+    pack_vector,
+)
+
+
+def percentile_ms(samples, q):
+    return float(np.percentile(np.asarray(samples) * 1000, q))
+
+
+def bench_scan(vectors, queries):
+    """旧实现：每个缓存向量一次 JSON 解码 + 一次余弦计算"""
+    encoded = [json.dumps(v.tolist()) for v in vectors]
+    samples = []
+    for query in queries:
+        start = time.perf_counter()
+        best, best_key = 0.0, None
+        for i, raw in enumerate(encoded):
+            cached = json.loads(raw)
+            sim = np.dot(query, cached) / (np.linalg.norm(query) * np.linalg.norm(cached))
+            if sim > best:
+                best, best_key = sim, i
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def bench_local(vectors, queries):
+    index = LocalVectorIndex(initial_capacity=len(vectors))
+    for i, vec in enumerate(vectors):
+        index.add(str(i), vec)
+    samples = []
+    for query in queries:
+        start = time.perf_counter()
+        index.search(query)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+async def bench_redisearch(redis_url, vectors, queries, algorithm, size):
+    import redis.asyncio as aioredis
+
+    client = aioredis.from_url(redis_url)
+    if not await RediSearchVectorIndex.is_available(client):
+        print("  redisearch: 当前 Redis 未加载 RediSearch 模块，跳过")
+        return None
+
+    namespace = f"bench{size}"
+    scope = f"{namespace}:1"
+    index = RediSearchVectorIndex(client, namespace=namespace, scope=scope, algorithm=algorithm)
+    try:
+        await client.execute_command("FT.DROPINDEX", index.index_name, "DD")
+    except Exception:
+        pass
+
+    pipe = client.pipeline(transaction=False)
+    for i, vec in enumerate(vectors):
+        pipe.hset(f"{namespace}:vec:1:{i}", mapping={VECTOR_FIELD: pack_vector(vec), SCOPE_FIELD: scope})
+        if i % 1000 == 999:
+            await pipe.execute()
+    await pipe.execute()
+    await index.add("0", vectors[0])
+
+    # 等待后台建索引完成
+    while True:
+        info = await client.execute_command("FT.INFO", index.index_name)
+        info = dict(zip(info[::2], info[1::2]))
+        if float(info.get(b"percent_indexed", 1)) >= 1:
+            break
+        await asyncio.sleep(0.2)
+
+    samples = []
+    for query in queries:
+        start = time.perf_counter()
+        await index.search(query)
+        samples.append(time.perf_counter() - start)
+
+    await client.execute_command("FT.DROPINDEX", index.index_name, "DD")
+    await client.aclose()
+    return samples
+
+
+def report(name, samples):
+    print(
+        f"  {name:<11} p50={percentile_ms(samples, 50):9.3f} ms  "
+        f"p99={percentile_ms(samples, 99):9.3f} ms  (n={len(samples)})"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Semantic cache lookup benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--dim", type=int, default=1024, help="向量维度，bge-m3 为 1024")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--scan-queries", type=int, default=5, help="旧实现较慢，单独控制查询次数")
+    parser.add_argument("--scan-max-size", type=int, default=10000, help="超过该规模不再测试旧实现")
+    parser.add_argument("--redis-url", default=None)
+    parser.add_argument("--algorithm", default="HNSW", choices=["HNSW", "FLAT"])
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    for size in args.sizes:
+        vectors = rng.standard_normal((size, args.dim), dtype=np.float32)
+        queries = rng.standard_normal((args.queries, args.dim), dtype=np.float32)
+        print(f"\n=== {size} entries / user, dim={args.dim} ===")
+
+        if size <= args.scan_max_size:
+            report("scan", bench_scan(vectors, queries[: args.scan_queries]))
+        else:
+            print("  scan        skipped (use --scan-max-size to enable)")
+
+        report("local", bench_local(vectors, queries))
+
+        if args.redis_url:
+            samples = asyncio.run(bench_redisearch(args.redis_url, vectors, queries, args.algorithm, size))
+            if samples:
+                report("redisearch", samples)
+
+
+if __name__ == "__main__":
+    main()
@@ -19,8 +19,21 @@ from pathlib import Path
 
 from app.core.logger import get_logger
 from app.core.middleware import LoggingMiddleware
+from app.core.loop_monitor import stall_monitor
+from app.core.redis_client import close_redis
 from app.api import api_router
 from app.api.chat import router as chat_router
+from app.core.config import settings
+from app.services.cache_replay import delivery_timings
+from app.services.graphrag_engine import close_graphrag_engine, get_graphrag_engine
+from app.services.graphrag_registry import close_graphrag_registry, get_graphrag_registry
+from app.services.indexing_jobs import close_indexing_queue, get_indexing_queue
+from app.services.ollama_embedding_client import close_embedding_clients
+from app.services.providers.call_policy import DEFAULT_POLICY
+from app.services.providers.health import get_health_tracker
+from app.services.providers.response_cache import get_response_cache
+from app.services.providers.transport import close_transport_manager, get_transport_manager
+from app.services.redis_semantic_cache import semantic_cache_registry
 
 
 # logger 变量就被初始化为一个日志记录器实例。
@@ -52,6 +65,63 @@ app.include_router(chat_router)
 async def health_check():
     return {"status": "ok"}
 
+# 语义缓存清理任务指标：淘汰/过期条目数、扫描耗时，以及事件循环阻塞统计
+@app.get("/health/cache")
+async def cache_health():
+    return {
+        "janitor": semantic_cache_registry.snapshot(),
+        "event_loop": {
+            "total_stall_seconds": stall_monitor.total_stall,
+            "max_stall_seconds": stall_monitor.max_stall,
+        },
+        "delivery": delivery_timings.snapshot(),
+    }
+
+# 外部数据源统计：各数据源的熔断状态、错误率、EWMA/p95 延迟和当前超时，
+# 按主机统计的请求数和连接池占用，以及按数据源统计的响应缓存命中率
+@app.get("/health/providers")
+async def providers_health():
+    return {
+        "circuits": get_health_tracker().snapshot(ceiling=DEFAULT_POLICY.timeout_seconds),
+        "transport": get_transport_manager().stats(),
+        "response_cache": get_response_cache().stats(),
+    }
+
+# GraphRAG 常驻查询引擎：当前索引版本、加载耗时、切换次数和查询次数
+@app.get("/health/graphrag")
+async def graphrag_health():
+    return get_graphrag_engine().stats()
+
+# 按用户常驻的 GraphRAG 索引：常驻用户、估算内存、加载 / 逐出次数
+@app.get("/health/graphrag/users")
+async def graphrag_users_health():
+    return get_graphrag_registry().stats()
+
+# 上传文件的索引任务队列：各状态任务数、正在运行的构建数
+@app.get("/health/indexing")
+async def indexing_health():
+    return await get_indexing_queue().stats()
+
+# 应用启动时启动唯一的语义缓存清理任务和索引任务调度，并在后台预加载 GraphRAG 索引
+@app.on_event("startup")
+async def startup():
+    semantic_cache_registry.start_janitor()
+    get_indexing_queue().start()
+    if settings.GRAPHRAG_PRELOAD:
+        get_graphrag_engine().start()
+
+# 应用关闭时停止清理任务，并释放进程级共享的 Redis 连接池、向量化客户端会话和数据源 HTTP 连接
+@app.on_event("shutdown")
+async def shutdown():
+    await semantic_cache_registry.stop_janitor()
+    await stall_monitor.stop()
+    await close_indexing_queue()
+    await close_graphrag_registry()
+    await close_graphrag_engine()
+    await close_embedding_clients()
+    await close_transport_manager()
+    await close_redis()
+
 # 最后挂载静态文件，并确保使用绝对路径
 STATIC_DIR = Path(__file__).parent / "static" / "dist"
 app.mount("/", StaticFiles(directory=str(STATIC_DIR), html=True), name="static")
\ No newline at end of file
@@ -95,7 +95,7 @@ class TestAmapSearchProvider:
 
     def test_search_parses_pois(self):
         sp = AmapSearchProvider("fake-key")
-        with patch("app.services.providers.amap_provider.httpx.AsyncClient") as mock_cls:
+        with patch("app.services.providers.transport.ProviderTransportManager.client_for") as mock_cls:
             mock_cls.return_value = _mock_httpx(FAKE_AMAP_RESPONSE)
             resp = _run(sp.search(query="上海 景点"))
 
@@ -113,7 +113,7 @@ class TestAmapSearchProvider:
 
     def test_search_cost_parsed(self):
         sp = AmapSearchProvider("fake-key")
-        with patch("app.services.providers.amap_provider.httpx.AsyncClient") as mock_cls:
+        with patch("app.services.providers.transport.ProviderTransportManager.client_for") as mock_cls:
             mock_cls.return_value = _mock_httpx(FAKE_AMAP_RESPONSE)
             resp = _run(sp.search(query="上海"))
 
@@ -122,7 +122,7 @@ class TestAmapSearchProvider:
 
     def test_search_tags_from_type(self):
         sp = AmapSearchProvider("fake-key")
-        with patch("app.services.providers.amap_provider.httpx.AsyncClient") as mock_cls:
+        with patch("app.services.providers.transport.ProviderTransportManager.client_for") as mock_cls:
             mock_cls.return_value = _mock_httpx(FAKE_AMAP_RESPONSE)
             resp = _run(sp.search(query="上海"))
 
@@ -131,7 +131,7 @@ class TestAmapSearchProvider:
 
     def test_search_respects_top_k(self):
         sp = AmapSearchProvider("fake-key")
-        with patch("app.services.providers.amap_provider.httpx.AsyncClient") as mock_cls:
+        with patch("app.services.providers.transport.ProviderTransportManager.client_for") as mock_cls:
             mock_cls.return_value = _mock_httpx(FAKE_AMAP_RESPONSE)
             resp = _run(sp.search(query="上海", top_k=2))
 
@@ -139,7 +139,7 @@ class TestAmapSearchProvider:
 
     def test_search_api_error_degrades(self):
         sp = AmapSearchProvider("fake-key")
-        with patch("app.services.providers.amap_provider.httpx.AsyncClient") as mock_cls:
+        with patch("app.services.providers.transport.ProviderTransportManager.client_for") as mock_cls:
             mock_cls.return_value = _mock_httpx(FAKE_ERROR_RESPONSE)
             resp = _run(sp.search(query="上海"))
 
@@ -148,7 +148,7 @@ class TestAmapSearchProvider:
 
     def test_search_empty_results(self):
         sp = AmapSearchProvider("fake-key")
-        with patch("app.services.providers.amap_provider.httpx.AsyncClient") as mock_cls:
+        with patch("app.services.providers.transport.ProviderTransportManager.client_for") as mock_cls:
             mock_cls.return_value = _mock_httpx(FAKE_EMPTY_RESPONSE)
             resp = _run(sp.search(query="不存在的地方"))
 
@@ -166,7 +166,7 @@ class TestAmapMapProvider:
 
     def test_nearby_parses_pois(self):
         mp = AmapMapProvider("fake-key")
-        with patch("app.services.providers.amap_provider.httpx.AsyncClient") as mock_cls:
+        with patch("app.services.providers.transport.ProviderTransportManager.client_for") as mock_cls:
             mock_cls.return_value = _mock_httpx(FAKE_AMAP_RESPONSE)
             resp = _run(mp.nearby_poi(city="上海", keywords=["景点"]))
 
@@ -176,7 +176,7 @@ class TestAmapMapProvider:
 
     def test_nearby_empty_degrades(self):
         mp = AmapMapProvider("fake-key")
-        with patch("app.services.providers.amap_provider.httpx.AsyncClient") as mock_cls:
+        with patch("app.services.providers.transport.ProviderTransportManager.client_for") as mock_cls:
             mock_cls.return_value = _mock_httpx(FAKE_EMPTY_RESPONSE)
             resp = _run(mp.nearby_poi(city="不存在", keywords=[]))
 
@@ -184,7 +184,7 @@ class TestAmapMapProvider:
 
     def test_nearby_api_error_degrades(self):
         mp = AmapMapProvider("fake-key")
-        with patch("app.services.providers.amap_provider.httpx.AsyncClient") as mock_cls:
+        with patch("app.services.providers.transport.ProviderTransportManager.client_for") as mock_cls:
             mock_cls.return_value = _mock_httpx(FAKE_ERROR_RESPONSE)
             resp = _run(mp.nearby_poi(city="上海", keywords=["美食"]))
 
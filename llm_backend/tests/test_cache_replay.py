@@ -0,0 +1,102 @@
+"""Tests for semantic cache hit replay.
+
+Covers:
+- Chunk boundary round-trip (offsets ↔ chunks) and mismatch fallback
+- instant / original / paced replay modes
+- paced mode holding the target tokens/sec without drifting
+- Hit / miss TTFB and total delivery percentiles
+"""
+
+import asyncio
+import time
+
+from app.services.cache_replay import (
+    DeliveryTimings,
+    ReplayMode,
+    chunk_offsets,
+    estimate_tokens,
+    replay_cached_response,
+    split_by_offsets,
+)
+
+
+def _run(coro):
+    return asyncio.get_event_loop().run_until_complete(coro)
+
+
+def _collect(*args, **kwargs):
+    async def go():
+        return [chunk async for chunk in replay_cached_response(*args, **kwargs)]
+
+    return _run(go())
+
+
+class TestChunkOffsets:
+    def test_round_trip(self):
+        chunks = ["成都", "的", "火锅", " is great"]
+        offsets = chunk_offsets(chunks)
+        assert offsets == [2, 3, 5, 14]
+        assert split_by_offsets("".join(chunks), offsets) == chunks
+
+    def test_mismatch_returns_none(self):
+        assert split_by_offsets("abc", [1, 2]) is None
+        assert split_by_offsets("abc", [2, 1, 3]) is None
+        assert split_by_offsets("abc", None) is None
+
+    def test_estimate_tokens(self):
+        assert estimate_tokens("成都火锅") == 4
+        assert estimate_tokens("abcdefgh") == 2
+        assert estimate_tokens("") == 1
+
+
+class TestReplayModes:
+    def test_instant_single_chunk(self):
+        assert _collect("hello world", [5, 11], mode="instant") == ["hello world"]
+
+    def test_original_uses_stored_boundaries(self):
+        assert _collect("hello world", [5, 11], mode=ReplayMode.ORIGINAL) == ["hello", " world"]
+
+    def test_original_without_boundaries_falls_back_to_instant(self):
+        assert _collect("hello world", None, mode="original") == ["hello world"]
+
+    def test_paced_without_boundaries_uses_fixed_chunks(self):
+        chunks = _collect("abcdefghij", None, mode="paced", tokens_per_second=1e6)
+        assert chunks == ["abcd", "efgh", "ij"]
+
+    def test_paced_without_rate_is_instant(self):
+        assert _collect("hello world", [5, 11], mode="paced", tokens_per_second=0) == ["hello world"]
+        assert _collect("hello world", None, mode="paced", tokens_per_second=-1) == ["hello world"]
+
+    def test_empty_response(self):
+        assert _collect("", None, mode="paced") == []
+
+    def test_paced_holds_target_rate(self):
+        # 10 个中文字符 ≈ 10 tokens，100 tokens/s → 最后一块约在 90ms 发出
+        text = "成都美食推荐火锅串串"
+        start = time.perf_counter()
+        chunks = _collect(text, chunk_offsets(list(text)), mode="paced", tokens_per_second=100)
+        elapsed = time.perf_counter() - start
+        assert "".join(chunks) == text
+        assert 0.08 <= elapsed < 0.5
+
+
+class TestDeliveryTimings:
+    def test_split_by_outcome(self):
+        timings = DeliveryTimings()
+        for i in range(10):
+            timings.record("hit", ttfb=0.001 * (i + 1), total=0.01)
+        timings.record("miss", ttfb=None, total=2.0)
+        snapshot = timings.snapshot()
+        assert snapshot["hit"]["count"] == 10
+        assert snapshot["hit"]["ttfb_seconds"]["p50"] == 0.006
+        assert snapshot["hit"]["ttfb_seconds"]["max"] == 0.010
+        assert snapshot["miss"]["ttfb_seconds"] == {}
+        assert snapshot["miss"]["total_seconds"]["p95"] == 2.0
+
+    def test_window_bounds_samples(self):
+        timings = DeliveryTimings(window=3)
+        for total in [9.0, 1.0, 1.0, 1.0]:
+            timings.record("hit", ttfb=0.0, total=total)
+        snapshot = timings.snapshot()["hit"]
+        assert snapshot["count"] == 4
+        assert snapshot["total_seconds"]["max"] == 1.0
@@ -0,0 +1,152 @@
+"""Tests for the end-to-end GraphRAG answer cache.
+
+Covers:
+- Exact hits across casing / whitespace / trailing punctuation variants
+- Keys separating query type, community level and response type
+- Optional semantic tier with an injected embedding function
+- Invalidation when the query engine swaps to a new index snapshot
+- Cached answers keeping their context records
+
+Requires the vendored graphrag package on the import path
+(e.g. ``PYTHONPATH=app/graphrag``); skipped otherwise.
+"""
+
+import asyncio
+import os
+import time
+
+import pytest
+
+pytest.importorskip("graphrag")
+
+from app.services.graphrag_answer_cache import GraphRAGAnswerCache  # noqa: E402
+from app.services.graphrag_engine import (  # noqa: E402
+    GraphRAGQueryEngine,
+    GraphRAGSnapshot,
+    index_fingerprint,
+)
+
+
+def _run(coro):
+    return asyncio.get_event_loop().run_until_complete(coro)
+
+
+class _CountingSearch:
+    def __init__(self, answer: str):
+        self.answer = answer
+        self.callbacks = []
+        # per-query engines are shallow copies, so record into a shared list
+        self.queries = []
+
+    async def stream_search(self, query: str):
+        self.queries.append(query)
+        for callback in self.callbacks:
+            callback.on_context({"sources": [f"source for {query}"]})
+        yield self.answer
+
+
+class _FakeEngine(GraphRAGQueryEngine):
+    def __init__(self, output_dir, answer_cache):
+        super().__init__(
+            project_dir=str(output_dir), data_dir_name=".", reload_interval=0, answer_cache=answer_cache
+        )
+        self.output_dir = output_dir
+        self.searches = []
+
+    async def _build_snapshot(self):
+        version = index_fingerprint(self.output_dir)
+        search = _CountingSearch(f"answer@{version}")
+        self.searches.append(search)
+        return GraphRAGSnapshot(
+            version=version, output_dir=self.output_dir, config=None, tables={}, engines={"local": search}
+        )
+
+
+def _write_index(output_dir, content: bytes):
+    path = output_dir / "entities.parquet"
+    path.write_bytes(content)
+    stamp = time.time() + len(content)
+    os.utime(path, (stamp, stamp))
+
+
+def _lookup(cache, query, query_type="local", level=2, response_type="text", version="v1"):
+    return _run(cache.lookup(query, query_type, level, response_type, version))
+
+
+def test_exact_tier_normalizes_query():
+    cache = GraphRAGAnswerCache()
+    probe = _lookup(cache, "How do I return an item?")
+    assert probe.answer is None
+    cache.store(probe, "answer", {"sources": ["a"]})
+
+    hit = _lookup(cache, "  how do I   RETURN an item ")
+    assert hit.tier == "exact"
+    assert hit.answer.response == "answer"
+    assert hit.answer.context == {"sources": ["a"]}
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_key_includes_search_parameters():
+    cache = GraphRAGAnswerCache()
+    cache.store(_lookup(cache, "q"), "answer", {})
+    assert _lookup(cache, "q", query_type="global").answer is None
+    assert _lookup(cache, "q", level=1).answer is None
+    assert _lookup(cache, "q", response_type="list").answer is None
+    assert _lookup(cache, "q", version="v2").answer is None
+    assert _lookup(cache, "q").answer is not None
+
+
+def test_semantic_tier():
+    vectors = {
+        "refund policy": [1.0, 0.0, 0.0],
+        "what is the refund policy": [0.98, 0.2, 0.0],
+        "opening hours": [0.0, 1.0, 0.0],
+    }
+    calls = []
+
+    async def embed(text):
+        calls.append(text)
+        return vectors[text]
+
+    cache = GraphRAGAnswerCache(semantic_threshold=0.95, embed=embed)
+    cache.store(_lookup(cache, "Refund policy?"), "14 days", {"sources": ["policy"]})
+
+    hit = _lookup(cache, "what is the refund policy")
+    assert hit.tier == "semantic"
+    assert hit.answer.response == "14 days"
+    assert _lookup(cache, "opening hours").answer is None
+    # the semantic index is scoped to the index version too
+    assert _lookup(cache, "what is the refund policy", version="v2").answer is None
+    assert cache.semantic_hits == 1
+    # the vector computed by the miss was reused by store
+    assert calls.count("refund policy") == 1
+
+
+def test_lru_bound():
+    cache = GraphRAGAnswerCache(max_entries=2)
+    for query in ("a", "b", "c"):
+        cache.store(_lookup(cache, query), query, {})
+    assert len(cache) == 2
+    assert _lookup(cache, "a").answer is None
+
+
+def test_engine_serves_cached_answers_until_snapshot_swap(tmp_path):
+    _write_index(tmp_path, b"a")
+    cache = GraphRAGAnswerCache()
+    engine = _FakeEngine(tmp_path, cache)
+
+    first = _run(engine.query("Where is my order?"))
+    second = _run(engine.query("where is my order"))
+    assert second["cached"] == "exact"
+    assert second["response"] == first["response"]
+    assert second["context"] == {"sources": ["source for Where is my order?"]}
+    assert engine.searches[0].queries == ["Where is my order?"]
+
+    _write_index(tmp_path, b"bb")
+    assert _run(engine.reload()) is True
+    assert len(cache) == 0
+    third = _run(engine.query("where is my order"))
+    assert "cached" not in third
+    assert third["index_version"] == index_fingerprint(tmp_path)
+    assert engine.searches[1].queries == ["where is my order"]
+    assert engine.stats()["answer_cache"]["invalidations"] == 1
@@ -0,0 +1,182 @@
+"""Tests for the process-wide GraphRAG query engine.
+
+Covers:
+- Index fingerprint changing with the output files and empty for a missing dir
+- Concurrent first queries sharing one snapshot build
+- reload() swapping only when the index output changed
+- In-flight queries keeping the snapshot they started on
+- Per-query engine copies with their own callbacks and DRIFT query state
+
+Requires the vendored graphrag package on the import path
+(e.g. ``PYTHONPATH=app/graphrag``); skipped otherwise.
+"""
+
+import asyncio
+import os
+import time
+
+import pytest
+
+pytest.importorskip("graphrag")
+
+from app.services.graphrag_engine import (  # noqa: E402
+    GraphRAGQueryEngine,
+    GraphRAGSnapshot,
+    index_fingerprint,
+)
+
+
+def _run(coro):
+    return asyncio.get_event_loop().run_until_complete(coro)
+
+
+class _FakeSearch:
+    def __init__(self, answer: str, gate: asyncio.Event | None = None):
+        self.answer = answer
+        self.gate = gate
+        self.callbacks = []
+
+    async def stream_search(self, query: str):
+        for callback in self.callbacks:
+            callback.on_context({"query": query, "answer": self.answer})
+        if self.gate is not None:
+            await self.gate.wait()
+        yield self.answer
+
+
+class _FakeEngine(GraphRAGQueryEngine):
+    """Builds snapshots from the output dir fingerprint without reading parquet."""
+
+    def __init__(self, output_dir, gate=None):
+        super().__init__(project_dir=str(output_dir), data_dir_name=".", reload_interval=0)
+        self.output_dir = output_dir
+        self.builds = 0
+        self.gate = gate
+
+    async def _build_snapshot(self):
+        self.builds += 1
+        await asyncio.sleep(0)
+        version = index_fingerprint(self.output_dir)
+        return GraphRAGSnapshot(
+            version=version,
+            output_dir=self.output_dir,
+            config=None,
+            tables={},
+            engines={"local": _FakeSearch(f"answer@{version}", self.gate)},
+        )
+
+
+def _write_index(output_dir, content: bytes):
+    path = output_dir / "entities.parquet"
+    path.write_bytes(content)
+    # mtime granularity differs between filesystems; bump it explicitly
+    stamp = time.time() + len(content)
+    os.utime(path, (stamp, stamp))
+
+
+class TestFingerprint:
+    def test_changes_with_output(self, tmp_path):
+        _write_index(tmp_path, b"a")
+        first = index_fingerprint(tmp_path)
+        assert first and first == index_fingerprint(tmp_path)
+        _write_index(tmp_path, b"bb")
+        assert index_fingerprint(tmp_path) != first
+
+    def test_ignores_unrelated_files(self, tmp_path):
+        _write_index(tmp_path, b"a")
+        before = index_fingerprint(tmp_path)
+        (tmp_path / "indexing-engine.log").write_text("log line")
+        assert index_fingerprint(tmp_path) == before
+
+    def test_missing_dir(self, tmp_path):
+        assert index_fingerprint(tmp_path / "missing") == ""
+
+
+class TestSnapshotSwap:
+    def test_concurrent_loads_build_once(self, tmp_path):
+        _write_index(tmp_path, b"a")
+        engine = _FakeEngine(tmp_path)
+
+        async def go():
+            return await asyncio.gather(*(engine.query("q") for _ in range(5)))
+
+        results = _run(go())
+        assert engine.builds == 1
+        assert {r["response"] for r in results} == {f"answer@{index_fingerprint(tmp_path)}"}
+        assert engine.queries == 5
+
+    def test_reload_only_on_change(self, tmp_path):
+        _write_index(tmp_path, b"a")
+        engine = _FakeEngine(tmp_path)
+        _run(engine.load())
+        assert _run(engine.reload()) is False
+        assert engine.builds == 1
+
+        _write_index(tmp_path, b"bb")
+        assert _run(engine.reload()) is True
+        assert engine.snapshot.version == index_fingerprint(tmp_path)
+        assert engine.swaps == 1
+
+    def test_in_flight_query_keeps_old_snapshot(self, tmp_path):
+        _write_index(tmp_path, b"a")
+        old_version = index_fingerprint(tmp_path)
+        gate = asyncio.Event()
+        engine = _FakeEngine(tmp_path, gate=gate)
+        _run(engine.load())
+
+        async def go():
+            pending = asyncio.ensure_future(engine.query("q"))
+            await asyncio.sleep(0.01)
+            _write_index(tmp_path, b"bb")
+            await engine.reload()
+            gate.set()
+            return await pending
+
+        result = _run(go())
+        assert result["index_version"] == old_version
+        assert result["response"] == f"answer@{old_version}"
+        assert engine.snapshot.version != old_version
+
+    def test_context_captured_per_query(self, tmp_path):
+        _write_index(tmp_path, b"a")
+        engine = _FakeEngine(tmp_path)
+
+        async def go():
+            return await asyncio.gather(engine.query("first"), engine.query("second"))
+
+        first, second = _run(go())
+        assert first["context"]["query"] == "first"
+        assert second["context"]["query"] == "second"
+        # the shared engine itself never gets per-query callbacks attached
+        assert engine.snapshot.engines["local"].callbacks == []
+
+    def test_unknown_query_type(self, tmp_path):
+        _write_index(tmp_path, b"a")
+        engine = _FakeEngine(tmp_path)
+        with pytest.raises(ValueError):
+            _run(engine.query("q", query_type="hybrid"))
+
+
+class TestBindCallbacks:
+    def test_drift_gets_fresh_query_state(self):
+        # the class the query factory builds engines from, not the app.graphrag copy
+        from graphrag.query.structured_search.drift_search.search import DRIFTSearch
+        from graphrag.query.structured_search.drift_search.state import QueryState
+
+        from app.graphrag.graphrag.query import factory
+
+        assert DRIFTSearch is factory.DRIFTSearch
+
+        shared = DRIFTSearch.__new__(DRIFTSearch)
+        shared.callbacks = []
+        shared.query_state = QueryState()
+        shared.local_search = "shared"
+        shared.init_local_search = lambda: "rebuilt"
+
+        marker = object()
+        bound = GraphRAGQueryEngine.bind_callbacks(shared, [marker])
+        assert bound is not shared
+        assert bound.callbacks == [marker]
+        assert bound.query_state is not shared.query_state
+        assert bound.local_search == "rebuilt"
+        assert shared.callbacks == []
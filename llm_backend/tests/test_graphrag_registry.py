@@ -0,0 +1,206 @@
+"""Tests for the per-user GraphRAG index registry.
+
+Covers:
+- Lazy per-user loading from output/<uuid5(user_id)> with a shared config
+- LRU eviction by resident count and by estimated memory
+- Falling back to the default engine for users without an index
+- Concurrent first queries of one user sharing one engine
+- The agent's graphrag_query node querying the asking user's index
+- The agent entry point handing the caller's user_id to that node
+
+Requires the vendored graphrag package on the import path
+(e.g. ``PYTHONPATH=app/graphrag``); skipped otherwise.
+"""
+
+import asyncio
+import uuid
+
+import pytest
+
+pytest.importorskip("graphrag")
+
+from app.services.graphrag_engine import (  # noqa: E402
+    GraphRAGQueryEngine,
+    GraphRAGSnapshot,
+    index_fingerprint,
+)
+from app.services.graphrag_registry import (  # noqa: E402
+    GraphRAGIndexRegistry,
+    user_index_uuid,
+)
+
+
+def _run(coro):
+    return asyncio.get_event_loop().run_until_complete(coro)
+
+
+class _FakeSearch:
+    def __init__(self, answer: str):
+        self.answer = answer
+        self.callbacks = []
+
+    async def stream_search(self, query: str):
+        yield self.answer
+
+
+class _FakeEngine(GraphRAGQueryEngine):
+    """Builds snapshots from the engine's output dir without reading parquet."""
+
+    builds = 0
+
+    async def _build_snapshot(self):
+        type(self).builds += 1
+        await asyncio.sleep(0)
+        return GraphRAGSnapshot(
+            version=index_fingerprint(self.output_dir),
+            output_dir=self.output_dir,
+            config=None,
+            tables={},
+            engines={"local": _FakeSearch(f"answer from {self.output_dir.name}")},
+            memory_bytes=self.output_dir.joinpath("entities.parquet").stat().st_size,
+        )
+
+
+class _FakeRegistry(GraphRAGIndexRegistry):
+    engine_cls = _FakeEngine
+
+
+def _write_user_index(data_dir, user_id, size=1):
+    output_dir = data_dir / "output" / user_index_uuid(user_id)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    (output_dir / "entities.parquet").write_bytes(b"x" * size)
+    return output_dir
+
+
+def _registry(tmp_path, **kwargs):
+    _FakeEngine.builds = 0
+    return _FakeRegistry(project_dir=str(tmp_path), data_dir_name="data", reload_interval=0, **kwargs)
+
+
+def test_user_uuid_matches_indexing_service():
+    assert user_index_uuid(7) == str(uuid.uuid5(uuid.NAMESPACE_DNS, "user_7"))
+
+
+def test_queries_use_each_users_index(tmp_path):
+    data_dir = tmp_path / "data"
+    first = _write_user_index(data_dir, 1)
+    second = _write_user_index(data_dir, 2)
+    registry = _registry(tmp_path)
+
+    assert _run(registry.query(1, "q"))["response"] == f"answer from {first.name}"
+    assert _run(registry.query(2, "q"))["response"] == f"answer from {second.name}"
+    _run(registry.query(1, "q"))
+    assert _FakeEngine.builds == 2
+    assert registry.loads == 2
+    # every user engine reads the same shared config and prompts
+    engines = list(registry._engines.values())
+    assert engines[0].shared is engines[1].shared is registry.shared
+    _run(registry.close())
+
+
+def test_lru_eviction_by_count(tmp_path):
+    data_dir = tmp_path / "data"
+    for user_id in (1, 2, 3):
+        _write_user_index(data_dir, user_id)
+    registry = _registry(tmp_path, max_resident=2)
+
+    _run(registry.query(1, "q"))
+    _run(registry.query(2, "q"))
+    _run(registry.query(1, "q"))
+    _run(registry.query(3, "q"))
+    assert list(registry._engines) == [1, 3]
+    assert registry.evictions == 1
+
+    # an evicted user is reloaded lazily
+    _run(registry.query(2, "q"))
+    assert list(registry._engines) == [3, 2]
+    assert _FakeEngine.builds == 4
+    _run(registry.close())
+
+
+def test_lru_eviction_by_memory_budget(tmp_path):
+    data_dir = tmp_path / "data"
+    _write_user_index(data_dir, 1, size=600 * 1024)
+    _write_user_index(data_dir, 2, size=600 * 1024)
+    registry = _registry(tmp_path, memory_budget_mb=1)
+
+    _run(registry.query(1, "q"))
+    _run(registry.query(2, "q"))
+    assert list(registry._engines) == [2]
+    assert registry.stats()["resident_mb"] <= 1
+    _run(registry.close())
+
+
+def test_users_without_index_fall_back(tmp_path):
+    fallback_dir = tmp_path / "default"
+    fallback_dir.mkdir()
+    (fallback_dir / "entities.parquet").write_bytes(b"x")
+    fallback = _FakeEngine(project_dir=str(tmp_path), data_dir_name=".", output_dir=fallback_dir)
+    registry = _registry(tmp_path, fallback=fallback)
+
+    assert _run(registry.query(5, "q"))["response"] == "answer from default"
+    assert _run(registry.query(None, "q"))["response"] == "answer from default"
+    assert registry.fallbacks == 2
+    assert not registry._engines
+
+    without_fallback = _registry(tmp_path)
+    with pytest.raises(Exception):
+        _run(without_fallback.query(5, "q"))
+
+
+def test_concurrent_first_queries_share_one_engine(tmp_path):
+    _write_user_index(tmp_path / "data", 1)
+    registry = _registry(tmp_path)
+
+    async def go():
+        return await asyncio.gather(*(registry.query(1, "q") for _ in range(5)))
+
+    results = _run(go())
+    assert len({r["index_version"] for r in results}) == 1
+    assert _FakeEngine.builds == 1
+    assert registry.loads == 1
+    _run(registry.close())
+
+
+def test_graphrag_query_node_uses_the_users_index(tmp_path, monkeypatch):
+    from app.lg_agent.kg_sub_graph.agentic_rag_agents.components.customer_tools import node
+
+    output_dir = _write_user_index(tmp_path / "data", 3)
+    registry = _registry(tmp_path)
+    monkeypatch.setattr(node, "get_graphrag_registry", lambda: registry)
+    graphrag_query = node.create_graphrag_query_node()
+
+    # the payload tool_selection sends to customer_tools
+    result = _run(graphrag_query({"task": "q", "user_id": 3, "steps": ["tool_selection"]}))
+    assert result["cyphers"][0].records == {"result": f"answer from {output_dir.name}"}
+    assert result["cyphers"][0].errors == []
+    assert registry.loads == 1
+    _run(registry.close())
+
+
+def test_agent_entry_point_queries_the_callers_index(tmp_path, monkeypatch):
+    from types import SimpleNamespace
+
+    from app.lg_agent.kg_sub_graph.agentic_rag_agents.components.customer_tools import node
+    from app.services.agent_service import stream_agent_answer
+
+    output_dir = _write_user_index(tmp_path / "data", 3)
+    registry = _registry(tmp_path)
+    monkeypatch.setattr(node, "get_graphrag_registry", lambda: registry)
+    graphrag_query = node.create_graphrag_query_node()
+
+    class _ToolGraph:
+        """Stands in for the agent graph: routes the question straight to graphrag_query."""
+
+        async def astream(self, input, stream_mode, config):
+            result = await graphrag_query({"task": input["messages"], "user_id": input["user_id"]})
+            answer = result["cyphers"][0].records["result"]
+            yield SimpleNamespace(content=answer), {"tags": []}
+
+    async def go():
+        return [line async for line in stream_agent_answer("q", 3, "thread-1", graph=_ToolGraph())]
+
+    lines = _run(go())
+    assert lines == [f'data: {{"content": "answer from {output_dir.name}"}}\n\n']
+    assert registry.loads == 1
+    _run(registry.close())
@@ -0,0 +1,288 @@
+"""Tests for the background indexing job queue.
+
+Covers:
+- Job lifecycle queued -> running -> succeeded / failed
+- Coalescing several queued files of one user into one run
+- Global and per-user concurrency limits
+- Progress events replayed and streamed from WorkflowCallbacks
+- Running jobs requeued only once their owner's lease expires
+- A second worker process neither re-running nor hanging on another's job
+- Leases renewed while a build blocks the event loop
+- max_workers enforced across worker processes
+"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+from app.services.indexing_jobs import (
+    FAILED,
+    QUEUED,
+    RUNNING,
+    SUCCEEDED,
+    IndexingJobQueue,
+    IndexingJobStore,
+)
+
+
+def _run(coro):
+    return asyncio.get_event_loop().run_until_complete(coro)
+
+
+class _Runner:
+    """Records runs and reports pipeline progress through the callbacks."""
+
+    def __init__(self, fail_users=(), gate: asyncio.Event | None = None):
+        self.runs = []
+        self.active = 0
+        self.max_active = 0
+        self.active_users = []
+        self.fail_users = set(fail_users)
+        self.gate = gate
+
+    async def __call__(self, user_id, file_infos, callbacks):
+        self.runs.append((user_id, [f["path"] for f in file_infos]))
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        assert user_id not in self.active_users
+        self.active_users.append(user_id)
+        try:
+            (progress,) = callbacks
+            progress.pipeline_start(["create_base_text_units", "extract_graph"])
+            progress.workflow_start("create_base_text_units", None)
+            progress.progress(SimpleNamespace(percent=0.5, description="chunks", completed_items=1, total_items=2))
+            if self.gate is not None:
+                await self.gate.wait()
+            await asyncio.sleep(0.01)
+            progress.workflow_end("create_base_text_units", None)
+            progress.pipeline_end([])
+            if user_id in self.fail_users:
+                raise RuntimeError("LLM extraction failed")
+            return {"status": "success", "processed_files": len(file_infos), "results": []}
+        finally:
+            self.active -= 1
+            self.active_users.remove(user_id)
+
+
+def _queue(runner, **kwargs):
+    return IndexingJobQueue(IndexingJobStore(":memory:"), runner=runner, **kwargs)
+
+
+def test_same_user_files_coalesce_into_one_run():
+    runner = _Runner()
+    queue = _queue(runner)
+
+    async def go():
+        jobs = [await queue.submit(1, {"path": f"a{i}.txt"}) for i in range(3)]
+        assert {job["status"] for job in jobs} == {QUEUED}
+        queue.start()
+        await queue.join()
+        await queue.stop()
+        return [await queue.get(job["id"]) for job in jobs]
+
+    jobs = _run(go())
+    assert runner.runs == [(1, ["a0.txt", "a1.txt", "a2.txt"])]
+    assert {job["status"] for job in jobs} == {SUCCEEDED}
+    assert len({job["run_id"] for job in jobs}) == 1
+    assert jobs[0]["progress"]["workflow"] == "create_base_text_units"
+
+
+def test_concurrency_limits():
+    runner = _Runner()
+    queue = _queue(runner, max_workers=2, max_per_user=1, max_files_per_run=1)
+
+    async def go():
+        for user_id in (1, 1, 2, 3):
+            await queue.submit(user_id, {"path": f"u{user_id}.txt"})
+        queue.start()
+        await queue.join()
+        await queue.stop()
+
+    _run(go())
+    assert len(runner.runs) == 4
+    assert runner.max_active == 2
+    assert _run(queue.stats())["succeeded"] == 4
+
+
+def test_failed_run_marks_jobs_failed():
+    queue = _queue(_Runner(fail_users={7}))
+
+    async def go():
+        job = await queue.submit(7, {"path": "bad.txt"})
+        queue.start()
+        await queue.join()
+        await queue.stop()
+        return await queue.get(job["id"])
+
+    job = _run(go())
+    assert job["status"] == FAILED
+    assert "LLM extraction failed" in job["error"]
+
+
+def test_progress_events_stream_until_done():
+    gate = asyncio.Event()
+    queue = _queue(_Runner(gate=gate))
+
+    async def go():
+        job = await queue.submit(1, {"path": "a.txt"})
+        queue.start()
+        await asyncio.sleep(0.05)
+        assert (await queue.get(job["id"]))["status"] == RUNNING
+
+        async def collect():
+            return [event async for event in queue.events(job["id"])]
+
+        listener = asyncio.ensure_future(collect())
+        await asyncio.sleep(0.01)
+        gate.set()
+        events = await listener
+        replay = [event async for event in queue.events(job["id"])]
+        await queue.stop()
+        return events, replay
+
+    events, replay = _run(go())
+    types = [event["type"] for event in events]
+    assert types[:4] == ["status", "status", "pipeline_start", "workflow_start"]
+    assert "progress" in types and "workflow_end" in types
+    assert events[-1] == {**events[-1], "type": "status", "status": SUCCEEDED}
+    # a finished job's events can still be replayed
+    assert replay == events
+
+
+def test_jobs_of_an_expired_lease_are_requeued(tmp_path):
+    path = str(tmp_path / "jobs.db")
+    store = IndexingJobStore(path)
+    job = store.add(1, {"path": "a.txt"})
+    store.claim(1, 10, owner="crashed-worker")
+    assert store.get(job["id"])["status"] == RUNNING
+    store.close()
+
+    runner = _Runner()
+    queue = IndexingJobQueue(IndexingJobStore(path), runner=runner, lease_seconds=0.1)
+
+    async def go():
+        queue.start()
+        await asyncio.sleep(0.05)
+        # the lease of the crashed worker has not expired yet
+        assert runner.runs == []
+        await asyncio.sleep(0.1)
+        await queue.join()
+        await queue.stop()
+        return await queue.get(job["id"])
+
+    assert _run(go())["status"] == SUCCEEDED
+    assert runner.runs == [(1, ["a.txt"])]
+
+
+def test_second_worker_leaves_running_jobs_alone(tmp_path):
+    path = str(tmp_path / "jobs.db")
+    gate = asyncio.Event()
+    first_runner, second_runner = _Runner(gate=gate), _Runner()
+    first = IndexingJobQueue(IndexingJobStore(path), runner=first_runner, lease_seconds=0.15)
+    second = IndexingJobQueue(
+        IndexingJobStore(path), runner=second_runner, lease_seconds=0.15, poll_interval=0.02
+    )
+
+    async def go():
+        job = await first.submit(1, {"path": "a.txt"})
+        first.start()
+        await asyncio.sleep(0.05)
+        # a second worker process starting up while the first one is building
+        second.start()
+        await second.submit(1, {"path": "b.txt"})
+
+        async def collect():
+            return [event async for event in second.events(job["id"])]
+
+        listener = asyncio.ensure_future(collect())
+        # well past the lease: the first worker keeps renewing it
+        await asyncio.sleep(0.4)
+        assert (await second.get(job["id"]))["status"] == RUNNING
+        gate.set()
+        events = await asyncio.wait_for(listener, timeout=2)
+        await first.join()
+        await second.join()
+        await first.stop()
+        await second.stop()
+        return events
+
+    events = _run(go())
+    assert first_runner.runs[0] == (1, ["a.txt"])
+    # user 1's second file waited for the first build, in whichever worker
+    assert sorted(first_runner.runs[1:] + second_runner.runs) == [(1, ["b.txt"])]
+    # the other worker's job is followed by polling the store until it ends
+    assert events[-1]["type"] == "status" and events[-1]["status"] == SUCCEEDED
+
+
+def test_stopped_queue_releases_its_jobs(tmp_path):
+    path = str(tmp_path / "jobs.db")
+    queue = IndexingJobQueue(IndexingJobStore(path), runner=_Runner(gate=asyncio.Event()))
+
+    async def go():
+        job = await queue.submit(1, {"path": "a.txt"})
+        queue.start()
+        await asyncio.sleep(0.05)
+        assert (await queue.get(job["id"]))["status"] == RUNNING
+        await queue.stop()
+        return await queue.get(job["id"])
+
+    assert _run(go())["status"] == QUEUED
+
+
+def test_lease_is_renewed_while_the_build_blocks_the_loop(tmp_path):
+    path = str(tmp_path / "jobs.db")
+    store = IndexingJobStore(path)
+    heartbeats = []
+
+    async def blocking_runner(user_id, file_infos, callbacks):
+        job_id = callbacks[0].job_ids[0]
+        started = store.get(job_id)["heartbeat_at"]
+        # another worker starts up; its lease thread runs while this build holds the loop
+        other.start()
+        # 同步的 Leiden / pandas 步骤：占住事件循环超过两个租约
+        time.sleep(0.3)
+        heartbeats.append(store.get(job_id)["heartbeat_at"] - started)
+        return {"status": "success", "results": []}
+
+    queue = IndexingJobQueue(IndexingJobStore(path), runner=blocking_runner, lease_seconds=0.12)
+    other = IndexingJobQueue(IndexingJobStore(path), runner=_Runner(), lease_seconds=0.12)
+
+    async def go():
+        job = await queue.submit(1, {"path": "a.txt"})
+        queue.start()
+        await queue.join()
+        await queue.stop()
+        await other.stop()
+        return await queue.get(job["id"])
+
+    assert _run(go())["status"] == SUCCEEDED
+    assert heartbeats[0] > 0
+    # the other worker's lease thread saw a live lease and never requeued the job
+    assert other.runs == 0
+
+
+def test_max_workers_is_shared_by_all_workers(tmp_path):
+    path = str(tmp_path / "jobs.db")
+    gate = asyncio.Event()
+    first_runner, second_runner = _Runner(gate=gate), _Runner()
+    first = IndexingJobQueue(IndexingJobStore(path), runner=first_runner, max_workers=1)
+    second = IndexingJobQueue(IndexingJobStore(path), runner=second_runner, max_workers=1)
+
+    async def go():
+        await first.submit(1, {"path": "a.txt"})
+        first.start()
+        await asyncio.sleep(0.05)
+        job = await second.submit(2, {"path": "b.txt"})
+        second.start()
+        await asyncio.sleep(0.1)
+        # the only build slot is taken by the first worker
+        assert (await second.get(job["id"]))["status"] == QUEUED
+        gate.set()
+        await first.join()
+        await second.join()
+        await first.stop()
+        await second.stop()
+        return await second.get(job["id"])
+
+    assert _run(go())["status"] == SUCCEEDED
+    assert sorted(first_runner.runs + second_runner.runs) == [(1, ["a.txt"]), (2, ["b.txt"])]
@@ -0,0 +1,38 @@
+"""Tests for the event-loop stall monitor used to measure cache overhead."""
+
+import asyncio
+import time
+
+from app.core.loop_monitor import EventLoopStallMonitor
+
+
+def _run(coro):
+    return asyncio.get_event_loop().run_until_complete(coro)
+
+
+async def _measure(block):
+    monitor = EventLoopStallMonitor(interval=0.005, threshold=0.002)
+    monitor.ensure_started()
+    await asyncio.sleep(0.02)
+    async with monitor.measure() as sample:
+        await block()
+    await monitor.stop()
+    return sample
+
+
+class TestEventLoopStallMonitor:
+    def test_blocking_call_is_counted(self):
+        async def block():
+            time.sleep(0.05)
+
+        sample = _run(_measure(block))
+        assert sample.stall_seconds >= 0.04
+        assert sample.elapsed_seconds >= 0.05
+
+    def test_awaiting_is_not_counted(self):
+        async def block():
+            await asyncio.sleep(0.05)
+
+        sample = _run(_measure(block))
+        assert sample.stall_seconds < 0.03
+        assert sample.elapsed_seconds >= 0.05
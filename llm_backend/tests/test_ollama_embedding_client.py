@@ -0,0 +1,149 @@
+"""Tests for the shared Ollama embedding client.
+
+Covers:
+- Concurrent embed() calls merged into a single /api/embed request
+- Duplicate texts within a batch embedded once
+- Short-lived memo reuse (lookup → update) and TTL expiry
+- max_batch_size triggering an immediate flush
+- Errors propagated to every waiter of the failed batch
+- In-flight batch tasks referenced until done; failed batches whose
+  callers were all cancelled not reported as unretrieved exceptions
+"""
+
+import asyncio
+import gc
+
+import pytest
+
+from app.services.ollama_embedding_client import OllamaEmbeddingClient
+
+
+def _run(coro):
+    return asyncio.get_event_loop().run_until_complete(coro)
+
+
+class _FakeClient(OllamaEmbeddingClient):
+    def __init__(self, fail: bool = False, **kwargs):
+        super().__init__(base_url="http://ollama", model="bge-m3", **kwargs)
+        self.batches: list[list[str]] = []
+        self._fail = fail
+
+    async def _post_embed(self, texts):
+        self.batches.append(list(texts))
+        await asyncio.sleep(0)
+        if self._fail:
+            raise ConnectionError("ollama down")
+        return [[float(len(t)), 1.0] for t in texts]
+
+
+class TestMicroBatching:
+    def test_concurrent_calls_share_one_request(self):
+        client = _FakeClient()
+
+        async def go():
+            return await asyncio.gather(*(client.embed(t) for t in ["a", "bb", "ccc"]))
+
+        vectors = _run(go())
+        assert vectors == [[1.0, 1.0], [2.0, 1.0], [3.0, 1.0]]
+        assert client.batches == [["a", "bb", "ccc"]]
+
+    def test_duplicate_texts_embedded_once(self):
+        client = _FakeClient()
+
+        async def go():
+            return await asyncio.gather(client.embed("same"), client.embed("same"))
+
+        first, second = _run(go())
+        assert first == second
+        assert client.batches == [["same"]]
+
+    def test_max_batch_size_flushes_immediately(self):
+        client = _FakeClient(max_batch_size=2, batch_window=10.0)
+
+        async def go():
+            return await asyncio.wait_for(
+                asyncio.gather(client.embed("a"), client.embed("b")), timeout=1.0
+            )
+
+        _run(go())
+        assert client.batches == [["a", "b"]]
+
+    def test_error_reaches_all_waiters(self):
+        client = _FakeClient(fail=True)
+
+        async def go():
+            return await asyncio.gather(
+                client.embed("x"), client.embed("y"), return_exceptions=True
+            )
+
+        results = _run(go())
+        assert all(isinstance(r, ConnectionError) for r in results)
+        assert len(client.batches) == 1
+
+    def test_flush_task_held_until_done(self):
+        in_flight = []
+
+        class _Client(_FakeClient):
+            async def _post_embed(self, texts):
+                in_flight.append(len(self._flush_tasks))
+                return await super()._post_embed(texts)
+
+        client = _Client()
+        _run(client.embed("a"))
+        assert in_flight == [1]
+        assert client._flush_tasks == set()
+
+    def test_failed_batch_with_cancelled_callers_is_not_reported(self):
+        client = _FakeClient(fail=True)
+        loop = asyncio.get_event_loop()
+        reported = []
+        previous = loop.get_exception_handler()
+        loop.set_exception_handler(lambda _loop, context: reported.append(context))
+
+        async def go():
+            calls = [asyncio.ensure_future(client.embed(t)) for t in ("x", "y")]
+            await asyncio.sleep(0)
+            for call in calls:
+                call.cancel()
+            await asyncio.gather(*calls, return_exceptions=True)
+            await asyncio.sleep(client.batch_window * 2)
+            while client._flush_tasks:
+                await asyncio.sleep(0.01)
+
+        try:
+            _run(go())
+            gc.collect()
+        finally:
+            loop.set_exception_handler(previous)
+        assert len(client.batches) == 1
+        assert reported == []
+
+
+class TestMemo:
+    def test_second_call_hits_memo(self):
+        client = _FakeClient()
+        first = _run(client.embed("成都 美食"))
+        second = _run(client.embed("成都 美食"))
+        assert first == second
+        assert len(client.batches) == 1
+        assert client.memo_hits == 1
+
+    def test_memo_expires(self):
+        client = _FakeClient(memo_ttl=0.0)
+        _run(client.embed("q"))
+        _run(client.embed("q"))
+        assert len(client.batches) == 2
+
+    def test_memo_bounded(self):
+        client = _FakeClient(memo_max_size=2)
+        for text in ["a", "b", "c"]:
+            _run(client.embed(text))
+        _run(client.embed("a"))
+        assert len(client.batches) == 4
+
+    def test_failed_batch_not_memoized(self):
+        client = _FakeClient(fail=True)
+        with pytest.raises(ConnectionError):
+            _run(client.embed("q"))
+        assert client.memo_hits == 0
+        assert "q" not in client._memo
@@ -0,0 +1,184 @@
+"""Tests for per-provider circuit breaking and adaptive timeouts.
+
+Covers:
+- closed → open on rolling error rate, open → half_open after cool-down
+- half_open admitting a single probe that closes or re-opens the circuit
+- p95-derived timeout clamped to [min_timeout, policy timeout]
+- Orchestrator skipping open circuits without spending the call budget
+- Cache hits kept out of latency statistics
+- Degraded upstream responses counted as failures
+"""
+
+import asyncio
+import time
+
+from app.services.providers.base import (
+    ProviderCandidate,
+    ProviderErrorCode,
+    ProviderResponse,
+    SearchProvider,
+)
+from app.services.providers.call_policy import ProviderCallPolicy
+from app.services.providers.health import CircuitState, ProviderHealthTracker
+from app.services.providers.orchestrator import ProviderOrchestrator
+from app.services.providers.registry import ProviderRegistry
+
+
+def _run(coro):
+    return asyncio.get_event_loop().run_until_complete(coro)
+
+
+def _open_circuit(tracker: ProviderHealthTracker, name: str = "amap_search") -> None:
+    for _ in range(tracker.min_calls):
+        assert tracker.allow(name)
+        tracker.record_failure(name, "ConnectError")
+
+
+class TestCircuit:
+    def test_opens_on_error_rate(self):
+        tracker = ProviderHealthTracker(min_calls=4, error_rate_threshold=0.5)
+        for ok in [True, True, False]:
+            tracker.allow("p")
+            tracker.record_success("p", 0.1) if ok else tracker.record_failure("p", "x")
+        assert tracker.snapshot()["p"]["state"] == "closed"
+        tracker.record_failure("p", "x")
+        assert tracker.snapshot()["p"]["state"] == "open"
+        assert tracker.allow("p") is False
+        assert tracker.snapshot()["p"]["short_circuited"] == 1
+
+    def test_half_open_single_probe_then_close(self):
+        tracker = ProviderHealthTracker(open_seconds=0.0)
+        _open_circuit(tracker)
+        assert tracker.allow("amap_search") is True  # the probe
+        assert tracker.snapshot()["amap_search"]["state"] == CircuitState.HALF_OPEN.value
+        assert tracker.allow("amap_search") is False  # probe still in flight
+        tracker.record_success("amap_search", 0.2)
+        assert tracker.snapshot()["amap_search"]["state"] == "closed"
+        assert tracker.allow("amap_search") is True
+
+    def test_failed_probe_reopens(self):
+        tracker = ProviderHealthTracker(open_seconds=0.05)
+        _open_circuit(tracker)
+        time.sleep(0.06)
+        assert tracker.allow("amap_search") is True
+        tracker.record_failure("amap_search", "timeout")
+        assert tracker.snapshot()["amap_search"]["state"] == "open"
+        assert tracker.allow("amap_search") is False
+
+    def test_released_probe_can_be_retried(self):
+        tracker = ProviderHealthTracker(open_seconds=0.0)
+        _open_circuit(tracker)
+        assert tracker.allow("amap_search") is True
+        tracker.release("amap_search")
+        assert tracker.allow("amap_search") is True
+
+
+class TestAdaptiveTimeout:
+    def test_ceiling_until_enough_samples(self):
+        tracker = ProviderHealthTracker(min_latency_samples=10)
+        for _ in range(9):
+            tracker.record_success("p", 0.2)
+        assert tracker.timeout_for("p", 10.0) == 10.0
+        assert tracker.timeout_for("unknown", 10.0) == 10.0
+
+    def test_p95_times_multiplier_clamped(self):
+        tracker = ProviderHealthTracker(min_latency_samples=5, timeout_multiplier=2.0, min_timeout=0.5)
+        for latency in [1.0] * 19 + [2.0]:
+            tracker.record_success("p", latency)
+        assert tracker.timeout_for("p", 10.0) == 2.0
+        assert tracker.timeout_for("p", 1.5) == 1.5
+        fast = ProviderHealthTracker(min_latency_samples=1, min_timeout=0.5)
+        fast.record_success("p", 0.01)
+        assert fast.timeout_for("p", 10.0) == 0.5
+
+    def test_ewma(self):
+        tracker = ProviderHealthTracker(ewma_alpha=0.5)
+        tracker.record_success("p", 1.0)
+        tracker.record_success("p", 3.0)
+        assert tracker.snapshot()["p"]["ewma_latency_seconds"] == 2.0
+
+
+class _Search(SearchProvider):
+    def __init__(self, name: str, *, fail: bool = False, degraded: bool = False, meta: dict | None = None):
+        self._name = name
+        self._fail = fail
+        self._degraded = degraded
+        self._meta = meta or {}
+        self.calls = 0
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    async def search(self, *, query, top_k=10, context=None):
+        self.calls += 1
+        if self._fail:
+            raise ConnectionError("down")
+        if self._degraded:
+            return ProviderResponse(degraded=True, meta=dict(self._meta))
+        return ProviderResponse(
+            candidates=[ProviderCandidate(candidate_id=f"{self._name}-1", source=self._name, title=query)],
+            meta=dict(self._meta),
+        )
+
+
+def _orchestrator(*providers, tracker, **policy):
+    reg = ProviderRegistry()
+    for p in providers:
+        reg.register_search(p)
+    return ProviderOrchestrator(reg, ProviderCallPolicy(map_enabled=False, **policy), health=tracker)
+
+
+class TestOrchestratorWithHealth:
+    def test_open_circuit_skipped_without_spending_budget(self):
+        tracker = ProviderHealthTracker()
+        _open_circuit(tracker, "amap_search")
+        amap, fallback = _Search("amap_search"), _Search("mock_search")
+        orch = _orchestrator(amap, fallback, tracker=tracker, max_calls_per_request=1)
+        result = _run(orch.recall(query="成都", city="成都"))
+        assert amap.calls == 0
+        assert fallback.calls == 1
+        assert result.calls_made == 1
+        assert [c.source for c in result.candidates] == ["mock_search"]
+        assert any(e.code == ProviderErrorCode.UNAVAILABLE for e in result.errors)
+
+    def test_failures_open_the_circuit(self):
+        tracker = ProviderHealthTracker(min_calls=3)
+        broken = _Search("amap_search", fail=True)
+        orch = _orchestrator(broken, tracker=tracker)
+        for _ in range(5):
+            _run(orch.recall(query="成都", city="成都"))
+        assert broken.calls == 3
+        assert tracker.snapshot()["amap_search"]["state"] == "open"
+
+    def test_cache_hits_not_recorded_as_latency(self):
+        tracker = ProviderHealthTracker()
+        orch = _orchestrator(_Search("amap_search", meta={"cache_hit": True}), tracker=tracker)
+        _run(orch.recall(query="成都", city="成都"))
+        assert tracker.snapshot()["amap_search"]["calls"] == 0
+
+    def test_degraded_responses_count_as_failures(self):
+        tracker = ProviderHealthTracker(min_calls=3)
+        over_quota = _Search("amap_search", degraded=True)
+        orch = _orchestrator(over_quota, tracker=tracker)
+        for _ in range(5):
+            _run(orch.recall(query="成都", city="成都"))
+        snapshot = tracker.snapshot()["amap_search"]
+        assert over_quota.calls == 3
+        assert snapshot["failures"] == 3
+        assert snapshot["state"] == "open"
+
+    def test_adaptive_timeout_applied(self):
+        tracker = ProviderHealthTracker(min_latency_samples=1, min_timeout=0.05, timeout_multiplier=1.0)
+        tracker.record_success("slow", 0.01)
+
+        class _Slow(_Search):
+            async def search(self, *, query, top_k=10, context=None):
+                await asyncio.sleep(1.0)
+                return ProviderResponse()
+
+        orch = _orchestrator(_Slow("slow"), tracker=tracker, timeout_seconds=10.0)
+        start = time.perf_counter()
+        result = _run(orch.recall(query="成都", city="成都"))
+        assert time.perf_counter() - start < 0.5
+        assert result.errors[0].code == ProviderErrorCode.TIMEOUT
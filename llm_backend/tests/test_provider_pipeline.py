@@ -229,3 +229,95 @@ class TestOrchestrator:
         result = _run(orch.recall(query="莫斯科 旅行", city="莫斯科"))
         assert result.degraded is True
         assert any("AI 知识" in a for a in result.assumptions)
+
+
+# ======================== Concurrent fan-out ========================
+
+
+class _TimedSearch(SearchProvider):
+    """Search provider that answers after ``delay`` seconds."""
+
+    def __init__(self, name: str, delay: float, *, fail: bool = False, ids: list[str] | None = None):
+        self._name = name
+        self._delay = delay
+        self._fail = fail
+        self._ids = ids or [f"{name}_1"]
+        self.cancelled = False
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    async def search(self, *, query, top_k=10, context=None):
+        try:
+            await asyncio.sleep(self._delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self._fail:
+            raise ConnectionError(f"{self._name} down")
+        return ProviderResponse(candidates=[
+            ProviderCandidate(candidate_id=cid, source=self._name, title=cid) for cid in self._ids
+        ])
+
+
+def _timed_registry(*providers: SearchProvider) -> ProviderRegistry:
+    reg = ProviderRegistry()
+    for p in providers:
+        reg.register_search(p)
+    return reg
+
+
+class TestConcurrentOrchestrator:
+    def test_latency_is_max_not_sum(self):
+        reg = _timed_registry(*(_TimedSearch(f"p{i}", 0.1) for i in range(4)))
+        policy = ProviderCallPolicy(concurrent=True, map_enabled=False)
+        start = asyncio.get_event_loop().time()
+        result = _run(ProviderOrchestrator(reg, policy).recall(query="上海", city="上海"))
+        elapsed = asyncio.get_event_loop().time() - start
+        assert elapsed < 0.3
+        assert result.calls_made == 4
+        assert len(result.candidates) == 4
+
+    def test_merge_keeps_registration_priority(self):
+        # The low-priority provider answers first, but the dedup winner must
+        # still come from the provider registered first.
+        slow_primary = _TimedSearch("primary", 0.05, ids=["shared", "a"])
+        fast_fallback = _TimedSearch("fallback", 0.0, ids=["shared", "b"])
+        policy = ProviderCallPolicy(concurrent=True, map_enabled=False)
+        result = _run(ProviderOrchestrator(_timed_registry(slow_primary, fast_fallback), policy)
+                      .recall(query="上海", city="上海"))
+        assert [c.candidate_id for c in result.candidates] == ["shared", "a", "b"]
+        assert result.candidates[0].source == "primary"
+
+    def test_overall_deadline_times_out_stragglers(self):
+        reg = _timed_registry(_TimedSearch("fast", 0.0), _TimedSearch("stuck", 999))
+        policy = ProviderCallPolicy(concurrent=True, map_enabled=False, request_deadline_seconds=0.05)
+        result = _run(ProviderOrchestrator(reg, policy).recall(query="上海", city="上海"))
+        assert [c.source for c in result.candidates] == ["fast"]
+        assert result.degraded is True
+        assert [(e.provider_name, e.code) for e in result.errors] == [("stuck", ProviderErrorCode.TIMEOUT)]
+
+    def test_budget_and_failures_match_sequential(self):
+        providers = [_TimedSearch("ok", 0.0), _TimedSearch("broken", 0.0, fail=True), _TimedSearch("extra", 0.0)]
+        seq = _run(ProviderOrchestrator(
+            _timed_registry(*providers), ProviderCallPolicy(max_calls_per_request=2, map_enabled=False)
+        ).recall(query="上海", city="上海"))
+        conc = _run(ProviderOrchestrator(
+            _timed_registry(*providers),
+            ProviderCallPolicy(max_calls_per_request=2, map_enabled=False, concurrent=True),
+        ).recall(query="上海", city="上海"))
+        assert conc.calls_made == seq.calls_made == 2
+        assert conc.assumptions == seq.assumptions
+        assert [e.provider_name for e in conc.errors] == ["broken"]
+
+    def test_hedging_returns_after_first_good(self):
+        slow = _TimedSearch("slow", 999)
+        reg = _timed_registry(slow, _TimedSearch("broken", 0.0, fail=True), _TimedSearch("fast", 0.01))
+        policy = ProviderCallPolicy(concurrent=True, map_enabled=False, hedge_min_good=1)
+        result = _run(ProviderOrchestrator(reg, policy).recall(query="上海", city="上海"))
+        assert [c.source for c in result.candidates] == ["fast"]
+        assert slow.cancelled is True
+        # Hedged-out calls are not failures; the real failure is still reported.
+        assert [e.provider_name for e in result.errors] == ["broken"]
+        assert result.calls_made == 3
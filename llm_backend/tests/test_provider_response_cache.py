@@ -0,0 +1,233 @@
+"""Tests for the provider response cache.
+
+Covers:
+- Key normalization (case, whitespace, keyword order)
+- Fresh hits, per-provider TTL, stale-while-revalidate refresh
+- Single-flight coalescing of concurrent identical recalls
+- Degraded responses and errors not cached
+- Redis tier round-trip (fake async client)
+- Per-provider hit ratio
+"""
+
+import asyncio
+
+import pytest
+
+from app.services.providers.base import (
+    MapProvider,
+    ProviderCandidate,
+    ProviderResponse,
+    SearchProvider,
+)
+from app.services.providers.response_cache import (
+    CachedMapProvider,
+    CachedSearchProvider,
+    ProviderResponseCache,
+    make_cache_key,
+)
+
+
+def _run(coro):
+    return asyncio.get_event_loop().run_until_complete(coro)
+
+
+class _CountingSearch(SearchProvider):
+    def __init__(self, delay: float = 0.0, degraded: bool = False, fail: bool = False):
+        self.calls = 0
+        self._delay = delay
+        self._degraded = degraded
+        self._fail = fail
+
+    @property
+    def name(self) -> str:
+        return "amap_search"
+
+    async def search(self, *, query, top_k=10, context=None):
+        self.calls += 1
+        await asyncio.sleep(self._delay)
+        if self._fail:
+            raise ConnectionError("amap down")
+        if self._degraded:
+            return ProviderResponse(degraded=True)
+        return ProviderResponse(candidates=[
+            ProviderCandidate(
+                candidate_id=f"{query}-{self.calls}", source=self.name, title=query,
+                tags=["美食"], extra={"rating": 4.5},
+            )
+        ])
+
+
+class _CountingMap(MapProvider):
+    def __init__(self):
+        self.calls = 0
+
+    @property
+    def name(self) -> str:
+        return "amap_map"
+
+    async def nearby_poi(self, *, city, keywords, top_k=20, context=None):
+        self.calls += 1
+        return ProviderResponse(candidates=[
+            ProviderCandidate(candidate_id=f"{city}-{self.calls}", source=self.name, title=city)
+        ])
+
+
+class _FakeRedis:
+    """Minimal async hash store with pipeline support."""
+
+    def __init__(self):
+        self.hashes = {}
+
+    async def hgetall(self, key):
+        return {k.encode(): str(v).encode() for k, v in self.hashes.get(key, {}).items()}
+
+    def pipeline(self, transaction=True):
+        store = self
+
+        class _Pipe:
+            def __init__(self):
+                self.ops = []
+
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *exc):
+                return False
+
+            def hset(self, key, mapping):
+                self.ops.append((key, mapping))
+
+            def expire(self, key, seconds):
+                pass
+
+            async def execute(self):
+                for key, mapping in self.ops:
+                    store.hashes.setdefault(key, {}).update(mapping)
+
+        return _Pipe()
+
+
+class TestCacheKey:
+    def test_normalized(self):
+        a = make_cache_key("amap_map", "nearby_poi", " 成都 ", ["美食", "Hotpot"], 20)
+        b = make_cache_key("amap_map", "nearby_poi", "成都", ["hotpot ", "美食"], 20)
+        assert a == b
+
+    def test_distinguishes_provider_and_top_k(self):
+        base = make_cache_key("amap_map", "nearby_poi", "成都", ["美食"], 20)
+        assert base != make_cache_key("serp_map", "nearby_poi", "成都", ["美食"], 20)
+        assert base != make_cache_key("amap_map", "nearby_poi", "成都", ["美食"], 10)
+
+
+class TestProviderResponseCache:
+    def test_fresh_hit_skips_upstream(self):
+        inner = _CountingSearch()
+        sp = CachedSearchProvider(inner, ProviderResponseCache())
+        first = _run(sp.search(query="成都 美食"))
+        second = _run(sp.search(query="成都  美食"))
+        assert inner.calls == 1
+        assert second.candidates[0].candidate_id == first.candidates[0].candidate_id
+        assert second.meta.get("cache_hit") is True
+        assert "cache_hit" not in first.meta
+        assert sp.name == "amap_search"
+
+    def test_concurrent_identical_recalls_coalesce(self):
+        inner = _CountingSearch(delay=0.02)
+        cache = ProviderResponseCache()
+        sp = CachedSearchProvider(inner, cache)
+
+        async def go():
+            return await asyncio.gather(*(sp.search(query="成都 美食") for _ in range(50)))
+
+        results = _run(go())
+        assert inner.calls == 1
+        assert len({r.candidates[0].candidate_id for r in results}) == 1
+        stats = cache.stats()["amap_search"]
+        assert stats["misses"] == 1 and stats["coalesced"] == 49
+
+    def test_caller_timeout_does_not_cancel_shared_fetch(self):
+        inner = _CountingSearch(delay=0.05)
+        sp = CachedSearchProvider(inner, ProviderResponseCache())
+
+        async def go():
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(sp.search(query="成都"), timeout=0.01)
+            await asyncio.sleep(0.08)
+            return await sp.search(query="成都")
+
+        resp = _run(go())
+        assert inner.calls == 1
+        assert resp.candidates
+
+    def test_stale_while_revalidate(self):
+        inner = _CountingSearch()
+        cache = ProviderResponseCache(ttl_by_provider={"amap_search": 0.0}, stale_ttl=60)
+        sp = CachedSearchProvider(inner, cache)
+
+        async def go():
+            first = await sp.search(query="成都")
+            stale = await sp.search(query="成都")
+            await asyncio.sleep(0)  # let the background refresh run
+            return first, stale
+
+        first, stale = _run(go())
+        assert stale.candidates[0].candidate_id == first.candidates[0].candidate_id
+        assert inner.calls == 2
+        stats = cache.stats()["amap_search"]
+        assert stats["stale_hits"] == 1 and stats["refreshes"] == 1
+
+    def test_expired_beyond_stale_window_refetches(self):
+        inner = _CountingSearch()
+        sp = CachedSearchProvider(inner, ProviderResponseCache(default_ttl=0.0, stale_ttl=0.0))
+        _run(sp.search(query="成都"))
+        second = _run(sp.search(query="成都"))
+        assert inner.calls == 2
+        assert second.candidates[0].candidate_id == "成都-2"
+
+    def test_degraded_and_errors_not_cached(self):
+        degraded = _CountingSearch(degraded=True)
+        sp = CachedSearchProvider(degraded, ProviderResponseCache())
+        _run(sp.search(query="x"))
+        _run(sp.search(query="x"))
+        assert degraded.calls == 2
+
+        broken = _CountingSearch(fail=True)
+        sp = CachedSearchProvider(broken, ProviderResponseCache())
+        for _ in range(2):
+            with pytest.raises(ConnectionError):
+                _run(sp.search(query="x"))
+        assert broken.calls == 2
+
+    def test_map_provider_keywords_order_insensitive(self):
+        inner = _CountingMap()
+        mp = CachedMapProvider(inner, ProviderResponseCache())
+        _run(mp.nearby_poi(city="成都", keywords=["美食", "火锅"]))
+        _run(mp.nearby_poi(city="成都", keywords=["火锅", "美食"]))
+        _run(mp.nearby_poi(city="重庆", keywords=["火锅", "美食"]))
+        assert inner.calls == 2
+
+    def test_redis_tier_shared_between_processes(self):
+        redis = _FakeRedis()
+        inner_a, inner_b = _CountingSearch(), _CountingSearch()
+        a = CachedSearchProvider(inner_a, ProviderResponseCache(redis_client=redis))
+        b = CachedSearchProvider(inner_b, ProviderResponseCache(redis_client=redis))
+        first = _run(a.search(query="成都"))
+        second = _run(b.search(query="成都"))
+        assert inner_b.calls == 0
+        assert second.candidates[0].tags == ["美食"]
+        assert second.candidates[0].extra == {"rating": 4.5}
+        assert second.candidates[0].candidate_id == first.candidates[0].candidate_id
+
+    def test_hit_ratio(self):
+        cache = ProviderResponseCache()
+        sp = CachedSearchProvider(_CountingSearch(), cache)
+        for _ in range(4):
+            _run(sp.search(query="成都"))
+        assert cache.stats()["amap_search"]["hit_ratio"] == 0.75
+
+    def test_lru_bounded(self):
+        inner = _CountingSearch()
+        sp = CachedSearchProvider(inner, ProviderResponseCache(max_entries=2))
+        for q in ["a", "b", "c", "a"]:
+            _run(sp.search(query=q))
+        assert inner.calls == 4
@@ -0,0 +1,103 @@
+"""Tests for the shared provider HTTP transport.
+
+Covers:
+- One long-lived client per host, reused across calls
+- Per-request timeout override
+- Per-host request / error / latency statistics
+- Providers routed through an injected transport
+- Clients closed on shutdown and recreated on next use
+"""
+
+import asyncio
+from unittest.mock import patch
+
+import httpx
+
+from app.services.providers.amap_provider import AmapSearchProvider
+from app.services.providers.factory import build_registry
+from app.services.providers.transport import ProviderTransportManager
+
+
+def _run(coro):
+    return asyncio.get_event_loop().run_until_complete(coro)
+
+
+class _MockTransportManager(ProviderTransportManager):
+    def __init__(self, handler, **kwargs):
+        super().__init__(**kwargs)
+        self._handler = handler
+        self.created = 0
+
+    def _new_client(self) -> httpx.AsyncClient:
+        self.created += 1
+        return httpx.AsyncClient(transport=httpx.MockTransport(self._handler))
+
+
+def _ok(request: httpx.Request) -> httpx.Response:
+    if request.url.path.endswith("/fail"):
+        return httpx.Response(500)
+    return httpx.Response(200, json={"status": "1", "pois": [], "timeout": request.extensions["timeout"]})
+
+
+class TestProviderTransportManager:
+    def test_client_reused_per_host(self):
+        manager = _MockTransportManager(_ok)
+        for _ in range(3):
+            _run(manager.get("https://restapi.amap.com/v3/place/text"))
+        _run(manager.get("https://serpapi.com/search.json"))
+        assert manager.created == 2
+        assert manager.client_for("https://restapi.amap.com/other") is manager.client_for(
+            "https://restapi.amap.com/v3"
+        )
+
+    def test_timeout_override(self):
+        manager = _MockTransportManager(_ok)
+        resp = _run(manager.get("https://serpapi.com/search.json", timeout=3.5))
+        assert resp.json()["timeout"]["read"] == 3.5
+
+    def test_per_host_stats(self):
+        manager = _MockTransportManager(_ok)
+        _run(manager.get("https://restapi.amap.com/v3/place/text"))
+        _run(manager.get("https://restapi.amap.com/fail"))
+        stats = manager.stats()["restapi.amap.com"]
+        assert stats["requests"] == 2
+        assert stats["errors"] == 1
+        assert stats["in_flight"] == 0
+        assert stats["last_status"] == 500
+        assert stats["avg_seconds"] >= 0.0
+
+    def test_transport_errors_counted(self):
+        def boom(request):
+            raise httpx.ConnectError("refused")
+
+        manager = _MockTransportManager(boom)
+        try:
+            _run(manager.get("https://serpapi.com/search.json"))
+        except httpx.ConnectError:
+            pass
+        assert manager.stats()["serpapi.com"]["errors"] == 1
+
+    def test_close_and_reopen(self):
+        manager = _MockTransportManager(_ok)
+        _run(manager.get("https://serpapi.com/search.json"))
+        _run(manager.aclose())
+        assert manager.stats()["serpapi.com"]["open_connections"] == 0
+        _run(manager.get("https://serpapi.com/search.json"))
+        assert manager.created == 2
+
+
+class TestProvidersUseTransport:
+    def test_amap_search_goes_through_injected_transport(self):
+        manager = _MockTransportManager(_ok)
+        sp = AmapSearchProvider("fake-key", transport=manager)
+        resp = _run(sp.search(query="上海 景点"))
+        assert resp.degraded is False
+        assert manager.stats()["restapi.amap.com"]["requests"] == 1
+
+    def test_build_registry_wires_transport(self):
+        manager = _MockTransportManager(_ok)
+        with patch("app.services.providers.factory._get_key", return_value="real-key"):
+            reg = build_registry(include_mock_fallback=False, transport=manager)
+        providers = reg.search_providers + reg.map_providers
+        assert len(providers) == 4
+        assert all(getattr(p, "inner", p)._transport is manager for p in providers)
@@ -323,3 +323,79 @@ class TestExplainability:
             assert 0.0 <= sc.total_score <= 1.0
             for dim, val in sc.breakdown.items():
                 assert 0.0 <= val <= 1.0, f"{dim} = {val} out of bounds"
+
+
+# ======================== Batch (vectorized) path ========================
+
+
+def _reference_rank(scorer, candidates, *, preferences, budget, days, top_k):
+    """The original per-candidate path: score_one + stable sort + slice."""
+    daily_budget = budget / days if budget is not None and days else None
+    scored = [scorer.score_one(c, preferences=preferences, daily_budget=daily_budget) for c in candidates]
+    scored.sort(key=lambda s: s.total_score, reverse=True)
+    return scored[:top_k]
+
+
+def _random_pool(seed: int, n: int) -> list[ProviderCandidate]:
+    import random
+
+    rng = random.Random(seed)
+    tag_pool = ["美食", "文化", "Nature", "购物", "夜景", "博物馆", "history"]
+    pool = []
+    for i in range(n):
+        extra = {}
+        if rng.random() < 0.8:
+            extra["rating"] = rng.choice([0, 0.0, None, rng.uniform(0, 5.5), 4.5, 4])
+        if rng.random() < 0.7:
+            extra["cost_estimate"] = rng.choice([0, None, -5, rng.uniform(0, 2000), 150])
+        key = rng.choice(["reviews_count", "reviews"])
+        if rng.random() < 0.7:
+            extra[key] = rng.choice([0, None, rng.randint(1, 200000), 1000])
+        for f in ("url", "address", "website", "photos", "tel"):
+            if rng.random() < 0.5:
+                extra[f] = rng.choice(["x", "", [], ["p.jpg"], 0])
+        pool.append(ProviderCandidate(
+            candidate_id=f"c{i}",
+            source="mock",
+            title=rng.choice(["外滩", "成都美食街", "Great Wall", "博物馆"]),
+            snippet=rng.choice(["", "历史文化 shopping", "NATURE walk", "夜景 美食"]),
+            score=rng.choice([0.0, 0.5, rng.random()]),
+            tags=rng.sample(tag_pool, rng.randint(0, 3)),
+            extra=extra,
+        ))
+    return pool
+
+
+class TestBatchScoring:
+    def test_matches_score_one_exactly(self):
+        scorer = RankingScorer(weights=RankingWeights(0.3, 0.2, 0.2, 0.2, 0.1))
+        cases = [
+            dict(preferences=["美食", "nature", "HISTORY"], budget=6000, days=4),
+            dict(preferences=None, budget=None, days=None),
+            dict(preferences=["", "夜景"], budget=0, days=3),
+            dict(preferences=["购物"], budget=300, days=0),
+        ]
+        for seed in range(5):
+            pool = _random_pool(seed, 120)
+            for case in cases:
+                for top_k in (1, 7, 15, 120, 500, 0):
+                    expected = _reference_rank(scorer, pool, top_k=top_k, **case)
+                    actual = scorer.rank(pool, top_k=top_k, **case)
+                    assert [s.candidate.candidate_id for s in actual] == [
+                        s.candidate.candidate_id for s in expected
+                    ]
+                    assert [s.total_score for s in actual] == [s.total_score for s in expected]
+                    assert [s.breakdown for s in actual] == [s.breakdown for s in expected]
+
+    def test_ties_keep_input_order(self):
+        pool = [_make_candidate(title=f"同分{i}") for i in range(10)]
+        ranked = RankingScorer().rank(pool, top_k=4)
+        assert [s.candidate.title for s in ranked] == ["同分0", "同分1", "同分2", "同分3"]
+
+    def test_score_batch_shapes(self):
+        scorer = RankingScorer()
+        totals, breakdown = scorer.score_batch([_make_candidate(), _make_candidate()])
+        assert totals.shape == (2,)
+        assert breakdown.shape == (2, 5)
+        totals, breakdown = scorer.score_batch([])
+        assert totals.shape == (0,)
@@ -0,0 +1,121 @@
+"""Tests for the semantic cache vector index backends.
+
+Covers:
+- float32 blob packing round-trip
+- LocalVectorIndex add / overwrite / remove / grow / top-1 search
+- RediSearchVectorIndex query building and result parsing (fake client)
+"""
+
+import asyncio
+
+import numpy as np
+
+from app.services.semantic_cache_index import (
+    LocalVectorIndex,
+    RediSearchVectorIndex,
+    escape_tag,
+    pack_vector,
+    unpack_vector,
+)
+
+
+class TestPacking:
+    def test_round_trip_float32(self):
+        vec = [0.1, -0.5, 3.25]
+        blob = pack_vector(vec)
+        assert len(blob) == 3 * 4
+        assert np.allclose(unpack_vector(blob), vec)
+
+    def test_escape_tag(self):
+        assert escape_tag("deepseek:42") == "deepseek\\:42"
+        assert escape_tag("plain") == "plain"
+
+
+class TestLocalVectorIndex:
+    def test_empty_search_returns_none(self):
+        assert LocalVectorIndex().search([1.0, 0.0]) is None
+
+    def test_top1_is_cosine_similarity(self):
+        index = LocalVectorIndex()
+        index.add("a", [1.0, 0.0])
+        index.add("b", [0.0, 2.0])
+        item_id, score = index.search([0.0, 5.0])
+        assert item_id == "b"
+        assert abs(score - 1.0) < 1e-6
+
+    def test_overwrite_keeps_single_row(self):
+        index = LocalVectorIndex()
+        index.add("a", [1.0, 0.0])
+        index.add("a", [0.0, 1.0])
+        assert len(index) == 1
+        assert index.search([0.0, 1.0])[0] == "a"
+
+    def test_remove_swaps_last_row(self):
+        index = LocalVectorIndex()
+        index.add("a", [1.0, 0.0, 0.0])
+        index.add("b", [0.0, 1.0, 0.0])
+        index.add("c", [0.0, 0.0, 1.0])
+        index.remove("a")
+        assert len(index) == 2
+        assert "a" not in index
+        assert index.search([0.0, 0.0, 1.0])[0] == "c"
+        assert index.search([1.0, 0.0, 0.0])[0] in {"b", "c"}
+
+    def test_grows_beyond_initial_capacity(self):
+        index = LocalVectorIndex(initial_capacity=2)
+        rng = np.random.default_rng(0)
+        vectors = rng.standard_normal((50, 8))
+        for i, vec in enumerate(vectors):
+            index.add(str(i), vec)
+        assert len(index) == 50
+        assert index.search(vectors[37])[0] == "37"
+
+    def test_zero_and_mismatched_vectors_ignored(self):
+        index = LocalVectorIndex()
+        index.add("zero", [0.0, 0.0])
+        assert len(index) == 0
+        index.add("a", [1.0, 0.0])
+        index.add("bad", [1.0, 0.0, 0.0])
+        assert len(index) == 1
+        assert index.search([1.0, 0.0, 0.0]) is None
+
+
+def _run(coro):
+    return asyncio.get_event_loop().run_until_complete(coro)
+
+
+class _FakeRedis:
+    def __init__(self, search_result):
+        self.commands = []
+        self._search_result = search_result
+
+    async def execute_command(self, *args):
+        self.commands.append(args)
+        if args[0] == "FT.INFO":
+            raise Exception("Unknown index name")
+        if args[0] == "FT.SEARCH":
+            return self._search_result
+        return b"OK"
+
+
+class TestRediSearchVectorIndex:
+    def test_creates_index_and_parses_hit(self):
+        client = _FakeRedis([1, b"deepseek:vec:7:abc123", [b"dist", b"0.05"]])
+        index = RediSearchVectorIndex(client, namespace="deepseek", scope="deepseek:7")
+        item_id, score = _run(index.search([1.0, 0.0, 0.0]))
+        assert item_id == "abc123"
+        assert abs(score - 0.95) < 1e-9
+
+        create = next(c for c in client.commands if c[0] == "FT.CREATE")
+        assert "HNSW" in create and "3" in create
+        # 只索引向量 HASH，同一命名空间下的 meta HASH 不进索引
+        assert create[create.index("PREFIX") + 2] == "deepseek:vec:"
+        search = next(c for c in client.commands if c[0] == "FT.SEARCH")
+        assert "@scope:{deepseek\\:7}" in search[2]
+
+    def test_no_result(self):
+        client = _FakeRedis([0])
+        index = RediSearchVectorIndex(client, namespace="deepseek", scope="deepseek", algorithm="flat")
+        assert _run(index.search([1.0, 0.0])) is None
+        create = next(c for c in client.commands if c[0] == "FT.CREATE")
+        assert "FLAT" in create
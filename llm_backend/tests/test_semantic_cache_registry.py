@@ -0,0 +1,110 @@
+"""Tests for the shared semantic cache registry janitor.
+
+Covers:
+- Rebuilding a non-resident user view from the prefix set, so evictions
+  remove the vector HASH under ``{namespace}:vec:{user_id}``
+"""
+
+import asyncio
+
+from app.services import redis_semantic_cache
+from app.services.redis_semantic_cache import PREFIX_SET_KEY, SemanticCacheRegistry
+
+
+def _run(coro):
+    return asyncio.get_event_loop().run_until_complete(coro)
+
+
+class _FakePipeline:
+    def __init__(self, redis):
+        self._redis = redis
+        self._calls = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self._calls.append((name, args, kwargs))
+
+        return queue
+
+    async def execute(self, raise_on_error=True):
+        results = []
+        for name, args, kwargs in self._calls:
+            results.append(await getattr(self._redis, name)(*args, **kwargs))
+        self._calls = []
+        return results
+
+
+class _FakeRedis:
+    """只实现清理任务用到的命令"""
+
+    def __init__(self):
+        self.keys = set()
+        self.sets = {}
+        self.zsets = {}
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self)
+
+    async def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.keys:
+            return False
+        self.keys.add(key)
+        return True
+
+    async def smembers(self, key):
+        return {m.encode("utf-8") for m in self.sets.get(key, set())}
+
+    async def srem(self, key, *members):
+        self.sets.get(key, set()).difference_update(members)
+
+    def _ranked(self, key):
+        return sorted(self.zsets.get(key, {}).items(), key=lambda item: item[1])
+
+    async def zrangebyscore(self, key, low, high):
+        return [m.encode("utf-8") for m, score in self._ranked(key) if score <= float(high)]
+
+    async def zcard(self, key):
+        return len(self.zsets.get(key, {}))
+
+    async def zrange(self, key, start, end):
+        return [m.encode("utf-8") for m, _ in self._ranked(key)[start:end + 1]]
+
+    async def zrem(self, key, *members):
+        for member in members:
+            self.zsets.get(key, {}).pop(member, None)
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.keys.discard(key.decode("utf-8") if isinstance(key, bytes) else key)
+
+
+class TestJanitor:
+    def test_non_resident_view_evicts_user_vector_hash(self, monkeypatch):
+        fake = _FakeRedis()
+        monkeypatch.setattr(redis_semantic_cache, "get_redis", lambda: fake)
+        now = redis_semantic_cache.datetime.now().timestamp()
+        fake.sets[PREFIX_SET_KEY] = {"deepseek:5"}
+        fake.zsets["deepseek:5:lru"] = {"old": now - 10, "new": now}
+        for hash_id in ("old", "new"):
+            fake.keys.update({
+                f"deepseek:vec:5:{hash_id}",
+                f"deepseek:5:resp:{hash_id}",
+                f"deepseek:5:meta:{hash_id}",
+            })
+
+        # 另一个进程或重启后：本进程没有驻留该用户的视图
+        registry = SemanticCacheRegistry(max_entries_per_prefix=1, cleanup_interval=60)
+        _run(registry.run_janitor_once(fake))
+
+        assert registry.metrics.evictions == 1
+        assert "deepseek:vec:5:old" not in fake.keys
+        assert "deepseek:5:resp:old" not in fake.keys
+        assert "deepseek:5:meta:old" not in fake.keys
+        assert "deepseek:vec:5:new" in fake.keys
+        assert list(fake.zsets["deepseek:5:lru"]) == ["new"]
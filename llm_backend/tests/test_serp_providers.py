@@ -88,7 +88,7 @@ FAKE_MAPS_RESPONSE = {
 
 
 def _mock_httpx_get(response_data):
-    """Create a mock for httpx.AsyncClient.get that returns given data."""
+    """Create a mock pooled client whose get() returns given data."""
     mock_response = MagicMock()
     mock_response.status_code = 200
     mock_response.raise_for_status = MagicMock()
@@ -111,7 +111,7 @@ class TestSerpApiSearchProvider:
 
     def test_search_parses_results(self):
         sp = SerpApiSearchProvider("fake-key")
-        with patch("app.services.providers.serp_providers.httpx.AsyncClient") as mock_cls:
+        with patch("app.services.providers.transport.ProviderTransportManager.client_for") as mock_cls:
             mock_cls.return_value = _mock_httpx_get(FAKE_GOOGLE_RESPONSE)
             resp = _run(sp.search(query="上海"))
 
@@ -126,7 +126,7 @@ class TestSerpApiSearchProvider:
 
     def test_search_extracts_tags(self):
         sp = SerpApiSearchProvider("fake-key")
-        with patch("app.services.providers.serp_providers.httpx.AsyncClient") as mock_cls:
+        with patch("app.services.providers.transport.ProviderTransportManager.client_for") as mock_cls:
             mock_cls.return_value = _mock_httpx_get(FAKE_GOOGLE_RESPONSE)
             resp = _run(sp.search(query="上海"))
 
@@ -135,7 +135,7 @@ class TestSerpApiSearchProvider:
 
     def test_search_respects_top_k(self):
         sp = SerpApiSearchProvider("fake-key")
-        with patch("app.services.providers.serp_providers.httpx.AsyncClient") as mock_cls:
+        with patch("app.services.providers.transport.ProviderTransportManager.client_for") as mock_cls:
             mock_cls.return_value = _mock_httpx_get(FAKE_GOOGLE_RESPONSE)
             resp = _run(sp.search(query="上海", top_k=2))
 
@@ -143,7 +143,7 @@ class TestSerpApiSearchProvider:
 
     def test_search_empty_results(self):
         sp = SerpApiSearchProvider("fake-key")
-        with patch("app.services.providers.serp_providers.httpx.AsyncClient") as mock_cls:
+        with patch("app.services.providers.transport.ProviderTransportManager.client_for") as mock_cls:
             mock_cls.return_value = _mock_httpx_get({"organic_results": []})
             resp = _run(sp.search(query="xyznonexistent"))
 
@@ -161,7 +161,7 @@ class TestSerpApiMapProvider:
 
     def test_nearby_poi_parses_results(self):
         mp = SerpApiMapProvider("fake-key")
-        with patch("app.services.providers.serp_providers.httpx.AsyncClient") as mock_cls:
+        with patch("app.services.providers.transport.ProviderTransportManager.client_for") as mock_cls:
             mock_cls.return_value = _mock_httpx_get(FAKE_MAPS_RESPONSE)
             resp = _run(mp.nearby_poi(city="上海", keywords=["景点"]))
 
@@ -178,7 +178,7 @@ class TestSerpApiMapProvider:
 
     def test_nearby_poi_tags(self):
         mp = SerpApiMapProvider("fake-key")
-        with patch("app.services.providers.serp_providers.httpx.AsyncClient") as mock_cls:
+        with patch("app.services.providers.transport.ProviderTransportManager.client_for") as mock_cls:
             mock_cls.return_value = _mock_httpx_get(FAKE_MAPS_RESPONSE)
             resp = _run(mp.nearby_poi(city="上海", keywords=[]))
 
@@ -187,7 +187,7 @@ class TestSerpApiMapProvider:
 
     def test_nearby_poi_score_from_rating(self):
         mp = SerpApiMapProvider("fake-key")
-        with patch("app.services.providers.serp_providers.httpx.AsyncClient") as mock_cls:
+        with patch("app.services.providers.transport.ProviderTransportManager.client_for") as mock_cls:
             mock_cls.return_value = _mock_httpx_get(FAKE_MAPS_RESPONSE)
             resp = _run(mp.nearby_poi(city="上海", keywords=[]))
 
@@ -196,7 +196,7 @@ class TestSerpApiMapProvider:
 
     def test_nearby_poi_empty_degrades(self):
         mp = SerpApiMapProvider("fake-key")
-        with patch("app.services.providers.serp_providers.httpx.AsyncClient") as mock_cls:
+        with patch("app.services.providers.transport.ProviderTransportManager.client_for") as mock_cls:
             mock_cls.return_value = _mock_httpx_get({"local_results": []})
             resp = _run(mp.nearby_poi(city="nonexistent", keywords=[]))
 
@@ -256,7 +256,7 @@ class TestFactoryOrchestrator:
             mock_get.side_effect = lambda s, e: "key-123" if "SERPAPI" in s else None
             reg = build_registry(include_mock_fallback=False)
 
-        with patch("app.services.providers.serp_providers.httpx.AsyncClient") as mock_cls:
+        with patch("app.services.providers.transport.ProviderTransportManager.client_for") as mock_cls:
             mock_cls.return_value = _mock_httpx_get(FAKE_GOOGLE_RESPONSE)
             orch = ProviderOrchestrator(reg)
             result = _run(orch.recall(query="上海", city="上海"))